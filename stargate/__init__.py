@@ -2,5 +2,21 @@
 
 from .simplestochasticgame import SsgVertex, SsgTransition, SimpleStochasticGame, read_ssg_from_file, ssg_to_ssgspec, save_ssg_file, reformat_ssgspec
 from .stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame, read_spg_from_file, spg_to_spgspec, save_spg_file, reformat_spgspec
-from .spg_to_ssg_reduction import compute_alphas_for_spg, spg_to_ssg
-from .ssg_to_smg import ssg_to_smgspec, check_property, check_target_reachability, check_smg_stats, save_smg_file, create_dot_file, create_png_file, create_svg_file
+from .spg_to_ssg_reduction import compute_alphas_for_spg, compute_scc_alphas_for_spg, compute_alphas, spg_to_ssg
+from .ssg_minimization import bisimulation_classes, minimize_ssg, ssg_minimization_report
+from .parity_game_solver import ParityGameSolution, ParityGameIndex, is_deterministic_spg, solve_parity_game
+from .qualitative_analysis import QualitativeRegions, qualitative_regions, fix_qualitative_regions
+from .priority_compression import compress_spg_priorities, priority_compression_report
+from .probability_table import ProbabilityTable, get_probability_table, canonical_probabilities, probability_string
+from .integer_distribution import IntegerDistributions, integer_distribution, alpha_gadget_probabilities
+from .distribution_pool import DistributionPool, InternedDistributions, distribution_interning_report
+from .ssg_value_iteration import SsgSolution, solve_ssg, transfer_solution
+from .warm_start import sweep_order, solve_epsilon_sweep
+from .incremental import IncrementalSolver
+from .adaptive_epsilon import AdaptiveSolution, alphas_underflow, solve_spg_adaptively
+from .prism_output import PrismResult, parse_prism_output
+from .ssg_to_smg import ssg_to_smgspec, check_property, check_target_reachability, check_smgspec_property, check_smgspec_target_reachability, check_smg_stats, save_smg_file, create_dot_file, create_png_file, create_svg_file
+from .async_model_checking import check_property_async, check_target_reachability_async, check_smg_stats_async, gather_property_checks, check_properties
+from .model_handoff import ModelHandoff, model_handoff
+from .game_files import GameSource, GameArrays, write_random_spg_file, write_random_ssg_file, read_binary_game_file, read_binary_game_arrays
+from .frozen_lake import FrozenLake, create_frozen_lake, frozen_lake_field, frozen_lake_to_smgspec, cross_check_frozen_lake_encoding
@@ -0,0 +1,152 @@
+import time
+
+from error_handling import print_debug, print_error, print_warning
+from incremental import IncrementalSolver
+from run_report import measured
+from spg_to_ssg_reduction import compute_alphas
+from stochasticparitygame import StochasticParityGame
+import settings
+
+
+class AdaptiveSolution:
+    def __init__(self, value: float, epsilon: float, lower: float, upper: float, levels: list[dict], stop_reason: str):
+        """
+        Result of the adaptive epsilon refinement of a stochastic parity game.
+        :param value: Value of the initial vertex in the reduction with the last epsilon
+        :type value: float
+        :param epsilon: Last epsilon that was solved
+        :type epsilon: float
+        :param lower: Lower bound of the value of the initial vertex in the SPG
+        :type lower: float
+        :param upper: Upper bound of the value of the initial vertex in the SPG
+        :type upper: float
+        :param levels: Every solved epsilon with its "epsilon", "value", certified "bound" of the value iteration, "lower", "upper", "iterations" and "solving_time"
+        :type levels: list[dict]
+        :param stop_reason: "precision" if the interval is narrow enough, "underflow" if the next alphas would underflow, "min_epsilon" if the smallest allowed epsilon was solved,
+            "bound" if the bounds of the value iteration keep the interval wider at the smallest epsilon that could reach the precision,
+            "inconsistent" if the intervals of two levels do not overlap
+        :type stop_reason: str
+        """
+        self.value = value
+        self.epsilon = epsilon
+        self.lower = lower
+        self.upper = upper
+        self.levels = levels
+        self.stop_reason = stop_reason
+
+    @property
+    def width(self) -> float:
+        return self.upper - self.lower
+
+    def __str__(self):
+        return f"AdaptiveSolution(value: {self.value}, interval: [{self.lower}, {self.upper}], epsilon: {self.epsilon}, levels: {len(self.levels)}, stopped by: {self.stop_reason})"
+
+
+def alphas_underflow(alphas: dict) -> bool:
+    """
+    Checks whether alphas are too small for the floating point value iteration, i.e. 1 - alpha rounds to 1 for an alpha, so its gadget loses the alpha edge.
+    :param alphas: Alphas by priority
+    :type alphas: dict
+    :return: Whether an alpha underflows
+    :rtype: bool
+    """
+    return 1.0 - float(min(alphas.values())) == 1.0
+
+
+@measured("adaptive_epsilon")
+def solve_spg_adaptively(spg: StochasticParityGame, target_precision: float, start_epsilon: float | None = None, factor: float | None = None,
+                         min_epsilon: float = 0.0, precision: float | None = None, debug: bool | None = None) -> AdaptiveSolution:
+    """
+    Solves a stochastic parity game natively with a coarse epsilon first and tightens epsilon geometrically until the value of the initial vertex is known
+    up to target_precision. The SSG of the first level is kept, every further level only replaces its alpha gadgets and starts from the previous values and strategies.
+    The value of the reduction with epsilon is at most epsilon away from the value of the SPG and solve_ssg certifies a bound of its own error,
+    so every level bounds the value by its value plus or minus both, and the bounds of all levels are intersected. If they do not overlap, one of the bounds is wrong,
+    a warning is printed and the hull of the intervals of all levels is returned.
+    The refinement stops early if the alphas of the next epsilon would underflow, i.e. 1 - alpha would round to 1 in floating point.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param target_precision: Width of the interval of the value of the initial vertex that is aimed for
+    :type target_precision: float
+    :param start_epsilon: First epsilon, if None ADAPTIVE_EPSILON_START is used
+    :type start_epsilon: float | None
+    :param factor: Factor between the epsilons of consecutive levels, if None ADAPTIVE_EPSILON_FACTOR is used
+    :type factor: float | None
+    :param min_epsilon: Smallest epsilon that is solved, if it keeps the interval wider than target_precision the refinement stops with "min_epsilon"
+    :type min_epsilon: float
+    :param precision: Precision of the value iteration, if None VALUE_ITERATION_PRECISION is used
+    :type precision: float | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Value, interval and epsilon of the last level and the time of every level
+    :rtype: AdaptiveSolution
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    epsilon = settings.ADAPTIVE_EPSILON_START if start_epsilon is None else start_epsilon
+    factor = settings.ADAPTIVE_EPSILON_FACTOR if factor is None else factor
+    precision = settings.VALUE_ITERATION_PRECISION if precision is None else precision
+    if target_precision <= 0:
+        print_error(f"The target precision must be positive, got {target_precision}")
+    if not 0 < factor < 1:
+        print_error(f"The epsilon factor must be between 0 and 1, got {factor}")
+    if not 0 < epsilon < 1:
+        print_error(f"The start epsilon must be between 0 and 1, got {epsilon}")
+    if target_precision <= 2 * precision:
+        print_error(f"The target precision must be larger than twice the value iteration precision {precision}, got {target_precision}")
+    # A level whose bound is within precision bounds the value by an interval of width 2 * (epsilon + precision), so no level needs a smaller epsilon than precision_epsilon
+    precision_epsilon = (target_precision - 2 * precision) / 2
+    floor_epsilon = max(precision_epsilon, min_epsilon)
+    epsilon = max(epsilon, floor_epsilon)
+
+    solver = IncrementalSolver(spg, epsilon=epsilon, precision=precision, debug=False)
+    if alphas_underflow(solver.alphas):
+        # The values of the reduction are not reliable, so the interval is not narrowed
+        print_warning(f"The alphas of the start epsilon {epsilon} already underflow in floating point, no interval of the value can be given")
+        start_time = time.perf_counter()
+        solution = solver.solve()
+        solving_time = time.perf_counter() - start_time
+        value = solution.value(solver.ssg_vertex_of[spg.init_vertex])
+        levels = [{"epsilon": epsilon, "value": value, "bound": solution.bound(solver.ssg_vertex_of[spg.init_vertex]), "lower": 0.0, "upper": 1.0,
+                   "iterations": solution.iterations, "solving_time": solving_time}]
+        return AdaptiveSolution(value, epsilon, 0.0, 1.0, levels, "underflow")
+    # The size, priorities and probabilities of the game do not depend on epsilon
+    n_states = len(spg.vertices)
+    priorities = {vertex.priority for vertex in spg.vertices.values()}
+    probabilities = {prob for transition in spg.transitions.values() for prob, vertex in transition.end_vertices}
+    lower, upper = 0.0, 1.0
+    levels = []
+    while True:
+        start_time = time.perf_counter()
+        solution = solver.solve()
+        solving_time = time.perf_counter() - start_time
+        value = solution.value(solver.ssg_vertex_of[spg.init_vertex])
+        bound = solution.bound(solver.ssg_vertex_of[spg.init_vertex])
+        level_lower, level_upper = max(0.0, value - epsilon - bound), min(1.0, value + epsilon + bound)
+        lower, upper = max(lower, level_lower), min(upper, level_upper)
+        levels.append({"epsilon": epsilon, "value": value, "bound": bound, "lower": lower, "upper": upper, "iterations": solution.iterations, "solving_time": solving_time})
+        if debug:
+            print_debug(f"Epsilon {epsilon}: value {value} with bound {bound}, interval [{lower}, {upper}], {solution.iterations} sweeps in {solving_time:.6f} seconds")
+        if lower > upper:
+            hull_lower = min(max(0.0, level["value"] - level["epsilon"] - level["bound"]) for level in levels)
+            hull_upper = max(min(1.0, level["value"] + level["epsilon"] + level["bound"]) for level in levels)
+            print_warning(f"The interval [{level_lower}, {level_upper}] of epsilon {epsilon} does not overlap the intervals of the larger epsilons, "
+                          f"returning the hull [{hull_lower}, {hull_upper}] of all levels")
+            lower, upper = hull_lower, hull_upper
+            stop_reason = "inconsistent"
+            break
+        # At precision_epsilon the width is target_precision up to rounding if the bound is within precision
+        if upper - lower <= target_precision or (epsilon <= precision_epsilon and bound <= precision):
+            stop_reason = "precision"
+            break
+        next_epsilon = max(epsilon * factor, floor_epsilon)
+        if next_epsilon >= epsilon:
+            stop_reason = "min_epsilon" if min_epsilon > precision_epsilon else "bound"
+            break
+        next_alphas = compute_alphas(n_states, priorities, probabilities, epsilon=next_epsilon)
+        if alphas_underflow(next_alphas):
+            stop_reason = "underflow"
+            if debug:
+                print_debug(f"The alphas of epsilon {next_epsilon} would underflow, stopping at epsilon {epsilon}")
+            break
+        epsilon = next_epsilon
+        solver.set_epsilon(epsilon, alphas=next_alphas)
+    return AdaptiveSolution(value, epsilon, lower, upper, levels, stop_reason)
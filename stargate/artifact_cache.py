@@ -0,0 +1,245 @@
+import hashlib
+import os
+import pickle
+import stat
+import time
+
+from error_handling import print_warning, print_debug
+import settings
+
+
+class ArtifactCache:
+    def __init__(self, directory: str, max_size: int | None = None, debug: bool | None = None):
+        """
+        Creates a content-addressed on-disk cache for pipeline artifacts (reduced games, SMG specifications and property results).
+        Entries are evicted in least recently used order as soon as the total size exceeds max_size.
+        :param directory: Directory in which the cached artifacts are stored
+        :type directory: str
+        :param max_size: Maximum total size of all cached artifacts in bytes
+        :type max_size: int | None
+        :param debug: Whether to print debug information
+        :type debug: bool | None
+        """
+        max_size = settings.ARTIFACT_CACHE_MAX_SIZE if max_size is None else max_size
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.directory = directory
+        self.max_size = max_size
+        self.debug = debug
+        self._current_size = None
+
+    def _path(self, key: str, kind: str) -> str:
+        """
+        Returns the path of the file that stores the artifact with the given key.
+        :param key: Key of the artifact
+        :type key: str
+        :param kind: Kind of the artifact, e.g. "ssg", "smg" or "property"
+        :type kind: str
+        :return: Path of the artifact file
+        :rtype: str
+        """
+        return os.path.join(self.directory, f"{key}.{kind}")
+
+    def get(self, key: str, kind: str) -> object | None:
+        """
+        Returns the cached artifact with the given key or None if it is not cached.
+        A hit marks the artifact as recently used.
+        :param key: Key of the artifact
+        :type key: str
+        :param kind: Kind of the artifact
+        :type kind: str
+        :return: Cached artifact or None
+        :rtype: object | None
+        """
+        path = self._path(key, kind)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print_warning(f"Could not read cached artifact {path}: {e}")
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        if self.debug:
+            print_debug(f"Artifact cache hit for {kind} {key}")
+        return value
+
+    def put(self, key: str, kind: str, value: object) -> None:
+        """
+        Stores an artifact in the cache and evicts least recently used artifacts if the size limit is exceeded.
+        :param key: Key of the artifact
+        :type key: str
+        :param kind: Kind of the artifact
+        :type kind: str
+        :param value: Artifact to store, must be picklable
+        :type value: object
+        """
+        path = self._path(key, kind)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print_warning(f"Could not write artifact {path} to cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        if self._current_size is None:
+            self._current_size = self.size()
+        else:
+            self._current_size += os.path.getsize(path)
+        if self._current_size > self.max_size:
+            self.evict()
+
+    def size(self) -> int:
+        """
+        Returns the total size of all cached artifacts.
+        :return: Size in bytes
+        :rtype: int
+        """
+        total = 0
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        total += entry.stat().st_size
+        except FileNotFoundError:
+            return 0
+        return total
+
+    def evict(self) -> None:
+        """
+        Removes least recently used artifacts until the total size is below the size limit.
+        """
+        try:
+            with os.scandir(self.directory) as entries:
+                files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries if entry.is_file() and not entry.name.endswith(".tmp")]
+        except FileNotFoundError:
+            self._current_size = 0
+            return
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                if self.debug:
+                    print_debug(f"Evicted {path} from artifact cache")
+            except OSError:
+                pass
+        self._current_size = total
+
+    def clear(self) -> None:
+        """
+        Removes all cached artifacts.
+        """
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        self._current_size = 0
+
+
+_artifact_cache = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """
+    Returns the artifact cache configured in the settings.
+    :return: Shared artifact cache
+    :rtype: ArtifactCache
+    """
+    global _artifact_cache
+    if _artifact_cache is None:
+        directory = settings.ARTIFACT_CACHE_PATH if settings.ARTIFACT_CACHE_PATH else os.path.join(settings.GLOBAL_IN_OUT_PATH, ".stargate_cache")
+        _artifact_cache = ArtifactCache(directory=directory, max_size=settings.ARTIFACT_CACHE_MAX_SIZE)
+    return _artifact_cache
+
+
+def is_cache_enabled(use_cache: bool | None) -> bool:
+    """
+    Resolves the per-call cache switch against the global USE_ARTIFACT_CACHE setting.
+    :param use_cache: Per-call switch, None means that the global setting is used
+    :type use_cache: bool | None
+    :return: Whether the artifact cache should be consulted
+    :rtype: bool
+    """
+    return settings.USE_ARTIFACT_CACHE if use_cache is None else use_cache
+
+
+def make_cache_key(*parts: object) -> str:
+    """
+    Creates a cache key from the given parts.
+    :param parts: Parts of the key, their repr is hashed
+    :type parts: object
+    :return: Hex digest of the key
+    :rtype: str
+    """
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def game_fingerprint(game) -> str:
+    """
+    Computes a hash of a StochasticParityGame or SimpleStochasticGame that does not depend on the iteration order of its vertices and transitions.
+    :param game: Game to hash
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Hex digest of the game
+    :rtype: str
+    """
+    start_time = time.perf_counter()
+    vertex_lines = []
+    for vertex in game.vertices.values():
+        label = vertex.priority if hasattr(vertex, "priority") else vertex.is_target
+        vertex_lines.append(f"{vertex.name}|{vertex.is_eve}|{label}")
+    vertex_lines.sort()
+    transition_lines = []
+    for transition in game.transitions.values():
+        end_vertices = sorted(f"{prob!r}:{vert.name}" for prob, vert in transition.end_vertices)
+        transition_lines.append(f"{transition.start_vertex.name}|{transition.action}|{'+'.join(end_vertices)}")
+    transition_lines.sort()
+    digest = hashlib.sha256()
+    digest.update(type(game).__name__.encode("utf-8"))
+    digest.update(game.init_vertex.name.encode("utf-8"))
+    for line in vertex_lines:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    digest.update(b"transitions\n")
+    for line in transition_lines:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    if settings.GLOBAL_DEBUG:
+        print_debug(f"Game fingerprint computed in {(time.perf_counter() - start_time):.6f} seconds")
+    return digest.hexdigest()
+
+
+def file_fingerprint(file_name: str) -> str | None:
+    """
+    Computes a hash of the content of a file.
+    :param file_name: Path of the file
+    :type file_name: str
+    :return: Hex digest of the file content or None if the file cannot be read
+    :rtype: str | None
+    """
+    digest = hashlib.sha256()
+    try:
+        if not stat.S_ISREG(os.stat(file_name).st_mode):
+            # Named pipes can only be read once, so they are never fingerprinted
+            return None
+        with open(file_name, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
@@ -0,0 +1,225 @@
+import asyncio
+import os
+import posixpath
+import time
+
+from typing import Any
+
+from error_handling import print_debug, print_warning, print_error
+from artifact_cache import get_artifact_cache
+from prism_output import PrismResult, parse_prism_output
+from shell_commands import run_process_async
+from ssg_to_smg import build_prism_argv, property_cache_key, evaluate_property_run
+import settings
+from settings import IS_OS_LINUX
+
+
+def make_limit(max_concurrency: int | None = None) -> asyncio.Semaphore:
+    """
+    Creates a limit for the number of PRISM processes that run at the same time.
+    :param max_concurrency: Maximum number of concurrent PRISM runs, defaults to the number of CPU cores
+    :type max_concurrency: int | None
+    :return: Semaphore that is passed as limit to the asynchronous checks
+    :rtype: asyncio.Semaphore
+    """
+    return asyncio.Semaphore(max(1, max_concurrency if max_concurrency is not None else (os.cpu_count() or 1)))
+
+
+async def _run_limited(limit: asyncio.Semaphore | None, argv: list[str], timeout: float | None, memory_limit: int | None, debug: bool):
+    """
+    Runs PRISM as soon as the limit allows it.
+    :param limit: Semaphore that bounds the number of concurrent PRISM runs, None for no bound
+    :type limit: asyncio.Semaphore | None
+    :param argv: Argument vector of the PRISM run
+    :type argv: list[str]
+    :param timeout: Wall-clock limit of the run in seconds, the time spent waiting for the limit is not counted
+    :type timeout: float | None
+    :param memory_limit: Address space limit of the run in bytes
+    :type memory_limit: int | None
+    :param debug: Whether to print debug information
+    :type debug: bool
+    :return: Result of the PRISM process or None if it could not be started
+    :rtype: ProcessResult | None
+    """
+    if limit is None:
+        return await run_process_async(argv, timeout=timeout, memory_limit=memory_limit, debug=debug)
+    async with limit:
+        return await run_process_async(argv, timeout=timeout, memory_limit=memory_limit, debug=debug)
+
+
+async def check_property_async(smg_file: str, property_string: str, use_global_path: bool = False, strategy_filename: str = None, debug: bool | None = None, prism_path: str | None = None, max_iters: int | None = None, prism_epsilon: float | None = None, prism_solving_algorithm: str | None = None, use_cache: bool | None = None, timeout: float | None = None, memory_limit: int | None = None, limit: asyncio.Semaphore | None = None) -> PrismResult:
+    """
+    Asynchronous variant of check_property. Cancelling the awaiting task kills PRISM.
+    :param smg_file: SMG file to check
+    :type smg_file: str
+    :param property_string: Property string to check
+    :type property_string: str
+    :param use_global_path: Whether to use the global path for the SMG file and strategy filename, defaults to False
+    :type use_global_path: bool
+    :param strategy_filename: Name of the strategy file to export, if None no strategy will be exported
+    :type strategy_filename: str | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :param prism_path: Path to the PRISM executable, defaults to PRISM_PATH
+    :type prism_path: str | None
+    :param max_iters: Maximum number of iterations for the PRISM solver, defaults to MAX_ITERS
+    :type max_iters: int | None
+    :param prism_epsilon: Precision for the PRISM solver, defaults to PRISM_EPSILON
+    :type prism_epsilon: float | None
+    :param prism_solving_algorithm: Algorithm to use for solving the PRISM model, defaults to PRISM_SOLVING_ALGORITHM
+    :type prism_solving_algorithm: str | None
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None
+    :param timeout: Wall-clock limit of the PRISM run in seconds, defaults to PRISM_TIMEOUT
+    :type timeout: float | None
+    :param memory_limit: Address space limit of the PRISM run in bytes, defaults to PRISM_MEMORY_LIMIT
+    :type memory_limit: int | None
+    :param limit: Semaphore created by make_limit that bounds the number of concurrent PRISM runs, None for no bound
+    :type limit: asyncio.Semaphore | None
+    :return: Parsed result of the PRISM run
+    :rtype: PrismResult
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    prism_path = settings.PRISM_PATH if prism_path is None else prism_path
+    max_iters = settings.MAX_ITERS if max_iters is None else max_iters
+    prism_epsilon = settings.PRISM_EPSILON if prism_epsilon is None else prism_epsilon
+    prism_solving_algorithm = settings.PRISM_SOLVING_ALGORITHM if prism_solving_algorithm is None else prism_solving_algorithm
+    timeout = settings.PRISM_TIMEOUT if timeout is None else timeout
+    memory_limit = settings.PRISM_MEMORY_LIMIT if memory_limit is None else memory_limit
+    if debug:
+        start_time = time.perf_counter()
+    if use_global_path:
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+        strategy_filename = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, strategy_filename) if strategy_filename else None
+    cache_key = property_cache_key(smg_file, property_string, strategy_filename, prism_path, max_iters, prism_epsilon, prism_solving_algorithm, use_cache)
+    if cache_key is not None:
+        cached_result = get_artifact_cache().get(cache_key, "prism")
+        if cached_result is not None:
+            return cached_result
+    argv = build_prism_argv(prism_path, smg_file, property_string, max_iters, prism_epsilon, prism_solving_algorithm, strategy_filename)
+    result = await _run_limited(limit, argv, timeout, memory_limit, debug)
+    prism_result = evaluate_property_run(result, property_string, timeout, cache_key)
+    if debug:
+        print_debug(f"Property {property_string} " + ("checked" if prism_result.ok else "check failed after") + f" {(time.perf_counter() - start_time):.6f} seconds")
+    return prism_result
+
+
+async def check_target_reachability_async(smg_file: str, debug: bool | None = None, use_global_path: bool = False, prism_path: str | None = None, max_iters: int | None = None, prism_epsilon: float | None = None, prism_solving_algorithm: str | None = None, use_cache: bool | None = None, timeout: float | None = None, memory_limit: int | None = None, limit: asyncio.Semaphore | None = None) -> tuple[PrismResult, PrismResult]:
+    """
+    Asynchronous variant of check_target_reachability, both properties are checked concurrently.
+    :param smg_file: SMG file to check
+    :type smg_file: str
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :param use_global_path: Whether to use the global path for the SMG file, defaults to False
+    :type use_global_path: bool
+    :param prism_path: Path to the PRISM executable, defaults to PRISM_PATH
+    :type prism_path: str | None
+    :param max_iters: Maximum number of iterations for the PRISM solver, defaults to MAX_ITERS
+    :type max_iters: int | None
+    :param prism_epsilon: Precision for the PRISM solver, defaults to PRISM_EPSILON
+    :type prism_epsilon: float | None
+    :param prism_solving_algorithm: Algorithm to use for solving the PRISM model, defaults to PRISM_SOLVING_ALGORITHM
+    :type prism_solving_algorithm: str | None
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None
+    :param timeout: Wall-clock limit of each PRISM run in seconds, defaults to PRISM_TIMEOUT
+    :type timeout: float | None
+    :param memory_limit: Address space limit of each PRISM run in bytes, defaults to PRISM_MEMORY_LIMIT
+    :type memory_limit: int | None
+    :param limit: Semaphore created by make_limit that bounds the number of concurrent PRISM runs, None for no bound
+    :type limit: asyncio.Semaphore | None
+    :return: Parsed PRISM results of the minimum and the maximum check
+    :rtype: tuple[PrismResult, PrismResult]
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    prism_path = settings.PRISM_PATH if prism_path is None else prism_path
+    max_iters = settings.MAX_ITERS if max_iters is None else max_iters
+    prism_epsilon = settings.PRISM_EPSILON if prism_epsilon is None else prism_epsilon
+    prism_solving_algorithm = settings.PRISM_SOLVING_ALGORITHM if prism_solving_algorithm is None else prism_solving_algorithm
+    timeout = settings.PRISM_TIMEOUT if timeout is None else timeout
+    memory_limit = settings.PRISM_MEMORY_LIMIT if memory_limit is None else memory_limit
+    arguments = dict(use_global_path=use_global_path, debug=debug, prism_path=prism_path, max_iters=max_iters, prism_epsilon=prism_epsilon, prism_solving_algorithm=prism_solving_algorithm, use_cache=use_cache, timeout=timeout, memory_limit=memory_limit, limit=limit)
+    result1, result2 = await asyncio.gather(check_property_async(smg_file, "<<eve>> Pmin=? [F \"target\"]", **arguments),
+                                            check_property_async(smg_file, "<<eve>> Pmax=? [F \"target\"]", **arguments))
+    return result1, result2
+
+
+async def check_smg_stats_async(smg_file: str, debug: bool | None = None, use_global_path: bool = False, prism_result: PrismResult | None = None, timeout: float | None = None, memory_limit: int | None = None, limit: asyncio.Semaphore | None = None) -> PrismResult:
+    """
+    Asynchronous variant of check_smg_stats.
+    :param smg_file: Path to the SMG file
+    :type smg_file: str
+    :param debug: Whether to print debug information
+    :type debug: bool | None
+    :param use_global_path: Whether to use the global path for the SMG file
+    :type use_global_path: bool
+    :param prism_result: Result of a previous PRISM run on the SMG file, if it contains the statistics PRISM is not run again
+    :type prism_result: PrismResult | None
+    :param timeout: Wall-clock limit of the PRISM run in seconds, defaults to PRISM_TIMEOUT
+    :type timeout: float | None
+    :param memory_limit: Address space limit of the PRISM run in bytes, defaults to PRISM_MEMORY_LIMIT
+    :type memory_limit: int | None
+    :param limit: Semaphore created by make_limit that bounds the number of concurrent PRISM runs, None for no bound
+    :type limit: asyncio.Semaphore | None
+    :return: Parsed PRISM result that contains the number of states and transitions and the construction time
+    :rtype: PrismResult
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    timeout = settings.PRISM_TIMEOUT if timeout is None else timeout
+    memory_limit = settings.PRISM_MEMORY_LIMIT if memory_limit is None else memory_limit
+    if prism_result is not None and prism_result.states is not None:
+        return prism_result
+    if use_global_path:
+        local_file = os.path.join(settings.GLOBAL_IN_OUT_PATH_WINDOWS, smg_file) if not IS_OS_LINUX else None
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+    else:
+        local_file = None
+    if not os.path.exists(local_file or smg_file):
+        print_error(f"SMG file {local_file or smg_file} does not exist.")
+    result = await _run_limited(limit, build_prism_argv(settings.PRISM_PATH, smg_file, extra_arguments=["-noprobchecks"]), timeout, memory_limit, debug)
+    if result is None:
+        return PrismResult(errors=["PRISM could not be started"])
+    if result.returncode != 0:
+        print_warning(f"Error running PRISM on {smg_file}: {result.stderr.strip()}")
+    return parse_prism_output(result.stdout, process=result)
+
+
+async def gather_property_checks(jobs: list[tuple[str, str] | dict[str, Any]], max_concurrency: int | None = None, return_exceptions: bool = False, **arguments) -> list[PrismResult]:
+    """
+    Checks many properties concurrently while at most max_concurrency PRISM processes run at the same time.
+    If the awaiting task is cancelled, all running PRISM processes are killed.
+    :param jobs: Checks as (smg_file, property_string) tuples or as keyword argument dictionaries of check_property_async
+    :type jobs: list[tuple[str, str] | dict[str, Any]]
+    :param max_concurrency: Maximum number of concurrent PRISM runs, defaults to the number of CPU cores
+    :type max_concurrency: int | None
+    :param return_exceptions: Whether exceptions of single checks are returned instead of raised
+    :type return_exceptions: bool
+    :param arguments: Keyword arguments of check_property_async that are used for all jobs, e.g. timeout or prism_solving_algorithm
+    :return: Results in the order of jobs
+    :rtype: list[PrismResult]
+    """
+    limit = make_limit(max_concurrency)
+    checks = []
+    for job in jobs:
+        job_arguments = dict(arguments)
+        if isinstance(job, dict):
+            job_arguments.update(job)
+        else:
+            job_arguments["smg_file"], job_arguments["property_string"] = job
+        checks.append(check_property_async(limit=limit, **job_arguments))
+    return await asyncio.gather(*checks, return_exceptions=return_exceptions)
+
+
+def check_properties(jobs: list[tuple[str, str] | dict[str, Any]], max_concurrency: int | None = None, **arguments) -> list[PrismResult]:
+    """
+    Synchronous entry point of gather_property_checks for code that does not use asyncio.
+    :param jobs: Checks as (smg_file, property_string) tuples or as keyword argument dictionaries of check_property_async
+    :type jobs: list[tuple[str, str] | dict[str, Any]]
+    :param max_concurrency: Maximum number of concurrent PRISM runs, defaults to the number of CPU cores
+    :type max_concurrency: int | None
+    :param arguments: Keyword arguments of check_property_async that are used for all jobs
+    :return: Results in the order of jobs
+    :rtype: list[PrismResult]
+    """
+    return asyncio.run(gather_property_checks(jobs, max_concurrency=max_concurrency, **arguments))
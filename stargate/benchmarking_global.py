@@ -1,23 +1,36 @@
 # Imports
 import math
-import queue as pyqueue
-import random
-import threading
+import secrets
 import time
 import json
 import os
-import psutil
 
-from pympler import asizeof
-from multiprocessing import Process, Manager
 from typing import Any
 
-from ssg_to_smg import check_target_reachability
-from stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame, read_spg_from_file, spg_to_spgspec, save_spg_file
+from stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame, read_spg_from_file
 from error_handling import print_error, print_debug, print_warning
 from spg_to_ssg_reduction import spg_to_ssg
-from ssg_to_smg import ssg_to_smgspec, save_smg_file, check_property
-from settings import GLOBAL_DEBUG, MAX_ITERS, PRISM_PATH, PRISM_EPSILON, GLOBAL_IN_OUT_PATH
+from warm_start import solve_epsilon_sweep
+from ssg_to_smg import ssg_to_smgspec, check_property, check_smgspec_target_reachability
+from model_handoff import model_handoff, resolve_handoff_mode, remove_model_file
+from worker_pool import WorkerPool, TaskResult
+from result_store import BenchmarkResultStore
+from game_files import write_random_spg_file, read_binary_game_file, paused_garbage_collection, BINARY_EXTENSIONS, DEFAULT_CHUNK_SIZE
+from frozen_lake import create_frozen_lake
+from run_report import RunReport, run_measured
+import settings
+
+
+def _object_size(obj: Any) -> int:
+    """
+    Returns the deep size of an object in bytes. pympler is imported on first use since it pulls in numpy.
+    :param obj: Object to measure
+    :type obj: Any
+    :return: Size in bytes
+    :rtype: int
+    """
+    from pympler import asizeof
+    return asizeof.asizeof(obj)
 
 
 def create_chain_spg(length: int, min_prob: float) -> StochasticParityGame:
@@ -141,9 +154,11 @@ def create_mutex_spg() -> StochasticParityGame:
     return StochasticParityGame(vertices=vertices, transitions=transitions, init_vertex=initial_vertex)
 
 
-def create_frozen_lake_spg(columns: int, rows: int, point0: tuple[int, int] | None = None, point1: tuple[int, int] | None = None, share_of_holes: float = 0.5, wind_probability: float = 0.5, slide_probability: float = 0.5) -> StochasticParityGame:
+def create_frozen_lake_spg(columns: int, rows: int, point0: tuple[int, int] | None = None, point1: tuple[int, int] | None = None, share_of_holes: float = 0.5, wind_probability: float = 0.5, slide_probability: float = 0.5,
+                           seed: int | None = None) -> StochasticParityGame:
     """
     Creates a Stochastic Parity Game that represents a frozen lake scenario.
+    The grid is computed with array operations by frozen_lake.FrozenLake, use create_frozen_lake to write large lakes to a file without creating the game objects.
     :param columns: Number of columns in the grid.
     :type columns: int
     :param rows: Number of rows in the grid.
@@ -158,291 +173,101 @@ def create_frozen_lake_spg(columns: int, rows: int, point0: tuple[int, int] | No
     :type wind_probability: float
     :param slide_probability: Probability of sliding one field further after a move, must be between 0 and 1.
     :type slide_probability: float
+    :param seed: Seed of the random target and hole placement, the same seed always creates the same lake. If None, a fresh seed is used.
+    :type seed: int | None
     :return: Resulting Stochastic Parity Game
     :rtype: StochasticParityGame
     """
-    field = [[2 for _ in range(rows)] for _ in range(columns)]
-    if point0 is not None and point1 is not None:
-        if point0 == point1:
-            print_error(f"point1 and point2 must be different, but they are both {point0}.")
-    if point0 is not None:
-        if not (0 <= point0[0] < columns and 0 <= point0[1] < rows):
-            print_error(f"point1 {point0} is out of bounds for a {columns}x{rows} grid.")
-    if point1 is not None:
-        if not (0 <= point1[0] < columns and 0 <= point1[1] < rows):
-            print_error(f"point2 {point1} is out of bounds for a {columns}x{rows} grid.")
-    if share_of_holes < 0 or share_of_holes > 1:
-        print_error(f"share_of_holes must be between 0 and 1, but it is {share_of_holes}.")
-    if point0 is None:
-        point0 = (random.randint(0, columns - 1), random.randint(0, rows - 1))
-        if point1 is not None:
-            while point0 == point1:
-                point0 = (random.randint(0, columns - 1), random.randint(0, rows - 1))
-    if point1 is None:
-        point1 = (random.randint(0, columns - 1), random.randint(0, rows - 1))
-        if point0 == point1:
-            while point1 == point0:
-                point1 = (random.randint(0, columns - 1), random.randint(0, rows - 1))
-    field[point0[0]][point0[1]] = 0
-    field[point1[0]][point1[1]] = 1
-    number_of_holes = int((columns * rows - 2) * share_of_holes)
-    holes = set()
-    while number_of_holes > 0:
-        x = random.randint(0, columns - 1)
-        y = random.randint(0, rows - 1)
-        if field[x][y] == 2:
-            field[x][y] = 3
-            holes.add((x, y))
-            number_of_holes -= 1
-        else:
-            while field[x][y] != 2:
-                x = random.randint(0, columns - 1)
-                y = random.randint(0, rows - 1)
-            field[x][y] = 3
-            holes.add((x, y))
-            number_of_holes -= 1
-    vertices = dict()
-    for x in range(columns):
-        for y in range(rows):
-            if field[x][y] == 0:
-                vertices[f"v_{x}_{y}_0_0"] = SpgVertex(name=f"v_{x}_{y}_0_0", is_eve=True, priority=2)
-                vertices[f"v_{x}_{y}_0_1"] = SpgVertex(name=f"v_{x}_{y}_0_1", is_eve=True, priority=3)
-                vertices[f"v_{x}_{y}_1_1"] = SpgVertex(name=f"v_{x}_{y}_1_1", is_eve=False, priority=3)
-            elif field[x][y] == 1:
-                vertices[f"v_{x}_{y}_0_0"] = SpgVertex(name=f"v_{x}_{y}_0_0", is_eve=True, priority=3)
-                vertices[f"v_{x}_{y}_1_0"] = SpgVertex(name=f"v_{x}_{y}_1_0", is_eve=False, priority=3)
-                vertices[f"v_{x}_{y}_0_1"] = SpgVertex(name=f"v_{x}_{y}_0_1", is_eve=True, priority=2)
-            elif field[x][y] == 2:
-                vertices[f"v_{x}_{y}_0_0"] = SpgVertex(name=f"v_{x}_{y}_0_0", is_eve=True, priority=3)
-                vertices[f"v_{x}_{y}_1_0"] = SpgVertex(name=f"v_{x}_{y}_1_0", is_eve=False, priority=3)
-                vertices[f"v_{x}_{y}_0_1"] = SpgVertex(name=f"v_{x}_{y}_0_1", is_eve=True, priority=3)
-                vertices[f"v_{x}_{y}_1_1"] = SpgVertex(name=f"v_{x}_{y}_1_1", is_eve=False, priority=3)
-            elif field[x][y] == 3:
-                vertices[f"v_{x}_{y}_0_0"] = SpgVertex(name=f"v_{x}_{y}_0_0", is_eve=True, priority=1)
-                vertices[f"v_{x}_{y}_0_1"] = SpgVertex(name=f"v_{x}_{y}_0_1", is_eve=True, priority=1)
-
-    transitions = dict()
-    for x in range(columns):
-        for y in range(rows):
-            match field[x][y]:
-                case 0:
-                    # change the current target to the other target field
-                    transitions[(vertices[f"v_{x}_{y}_0_0"], "change_target")] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x}_{y}_0_1"])}, action="change_target")
-                    for direction in ["left", "right", "up", "down"]:
-                        match direction:
-                            case "left":
-                                next_field = field[x - 1][y] if x > 0 else None
-                                second_next_field = field[x - 2][y] if x > 1 else None
-                                move = (-1, 0)
-                            case "right":
-                                next_field = field[x + 1][y] if x < columns - 1 else None
-                                second_next_field = field[x + 2][y] if x < columns - 2 else None
-                                move = (1, 0)
-                            case "up":
-                                next_field = field[x][y - 1] if y > 0 else None
-                                second_next_field = field[x][y - 2] if y > 1 else None
-                                move = (0, -1)
-                            case "down":
-                                next_field = field[x][y + 1] if y < rows - 1 else None
-                                second_next_field = field[x][y + 2] if y < rows - 2 else None
-                                move = (0, 1)
-                        match (next_field, second_next_field):
-                            case (None, _):
-                                pass
-                            case (1, _):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, None):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1-wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 1):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 2):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 3):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (3, _):
-                                transitions[(vertices[f"v_{x}_{y}_0_1"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_1"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-
-                case 1:
-                    # change the current target to the other target field
-                    transitions[(vertices[f"v_{x}_{y}_0_1"], "change_target")] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x}_{y}_0_0"])}, action="change_target")
-                    for direction in ["left", "right", "up", "down"]:
-                        match direction:
-                            case "left":
-                                next_field = field[x - 1][y] if x > 0 else None
-                                second_next_field = field[x - 2][y] if x > 1 else None
-                                move = (-1, 0)
-                            case "right":
-                                next_field = field[x + 1][y] if x < columns - 1 else None
-                                second_next_field = field[x + 2][y] if x < columns - 2 else None
-                                move = (1, 0)
-                            case "up":
-                                next_field = field[x][y - 1] if y > 0 else None
-                                second_next_field = field[x][y - 2] if y > 1 else None
-                                move = (0, -1)
-                            case "down":
-                                next_field = field[x][y + 1] if y < rows - 1 else None
-                                second_next_field = field[x][y + 2] if y < rows - 2 else None
-                                move = (0, 1)
-                        match (next_field, second_next_field):
-                            case (None, _):
-                                pass
-                            case (0, _):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                            case (2, None):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1-wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                            case (2, 0):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                            case (2, 2):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                            case (2, 3):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                            case (3, _):
-                                transitions[(vertices[f"v_{x}_{y}_0_0"], direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[(vertices[f"v_{x}_{y}_1_0"], "blow_" + direction)] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                case 2:
-                    for direction in ["left", "right", "up", "down"]:
-                        match direction:
-                            case "left":
-                                next_field = field[x - 1][y] if x > 0 else None
-                                second_next_field = field[x - 2][y] if x > 1 else None
-                                move = (-1, 0)
-                            case "right":
-                                next_field = field[x + 1][y] if x < columns - 1 else None
-                                second_next_field = field[x + 2][y] if x < columns - 2 else None
-                                move = (1, 0)
-                            case "up":
-                                next_field = field[x][y - 1] if y > 0 else None
-                                second_next_field = field[x][y - 2] if y > 1 else None
-                                move = (0, -1)
-                            case "down":
-                                next_field = field[x][y + 1] if y < rows - 1 else None
-                                second_next_field = field[x][y + 2] if y < rows - 2 else None
-                                move = (0, 1)
-                        match (next_field, second_next_field):
-                            case (None, _):
-                                pass
-                            case (0, None):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1 - wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (0, 1):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (0, 2):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (0, 3):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (1, None):
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1 - wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (1, 0):
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (1, 2):
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (1, 3):
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, None):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1 - wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1 - wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 0):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 1):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 2):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability * (1 - wind_probability), vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"]), (slide_probability * wind_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (2, 3):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_0"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={((1 - slide_probability) * (1 - wind_probability), vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"]), (slide_probability, vertices[f"v_{x + 2 * move[0]}_{y + 2 * move[1]}_0_1"]), ((1 - slide_probability) * wind_probability, vertices[f"v_{x + move[0]}_{y + move[1]}_1_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                            case (3, _):
-                                transitions[vertices[f"v_{x}_{y}_0_0"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_0_1"], direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action=direction)
-                                transitions[vertices[f"v_{x}_{y}_1_0"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_0"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_0"])}, action="blow_" + direction)
-                                transitions[vertices[f"v_{x}_{y}_1_1"], "blow_" + direction] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_1_1"], end_vertices={(1.0, vertices[f"v_{x + move[0]}_{y + move[1]}_0_1"])}, action="blow_" + direction)
-                case 3:
-                    # if fallen into a hole, go back to the current start field
-                    transitions[(vertices[f"v_{x}_{y}_0_0"], "go_back")] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_0"], end_vertices={(1.0, vertices[f"v_{point1[0]}_{point1[1]}_0_0"])}, action="go_back")
-                    transitions[(vertices[f"v_{x}_{y}_0_1"], "go_back")] = SpgTransition(start_vertex=vertices[f"v_{x}_{y}_0_1"], end_vertices={(1.0, vertices[f"v_{point0[0]}_{point0[1]}_0_0"])}, action="go_back")
-    initial_vertex = vertices[f"v_{point0[0]}_{point0[1]}_0_0"]
-    return StochasticParityGame(vertices=vertices, transitions=transitions, init_vertex=initial_vertex)
+    return create_frozen_lake(columns, rows, point0, point1, share_of_holes, wind_probability, slide_probability, seed=seed).to_game()
+
+
+def new_seed() -> int:
+    """
+    Draws a fresh seed for the random game generators from the operating system, so that it can be recorded and the games can be recreated.
+    :return: Non-negative 63 bit seed
+    :rtype: int
+    """
+    return secrets.randbits(63)
 
 
-def create_random_spg(number_of_vertices: int, number_of_outgoing_transitions: int, number_of_priorities: int) -> StochasticParityGame:
+def derive_seed(seed: int, *parameters: int) -> int:
+    """
+    Derives the seed of a single benchmark instance from the seed of the benchmark and the parameters of the instance.
+    The derived seed does not depend on the order in which the instances are generated.
+    :param seed: Seed of the benchmark
+    :type seed: int
+    :param parameters: Parameters of the instance, e.g. number of vertices, transitions and priorities
+    :type parameters: int
+    :return: Non-negative 63 bit seed of the instance
+    :rtype: int
+    """
+    import numpy
+    return int(numpy.random.SeedSequence([seed, *parameters]).generate_state(1, numpy.uint64)[0] >> 1)
+
+
+def create_random_spg(number_of_vertices: int, number_of_outgoing_transitions: int, number_of_priorities: int, seed: int | None = None) -> StochasticParityGame:
     """
     Creates a random stochastic parity game with the specified number of vertices, outgoing transitions, and priorities.
-    :param number_of_vertices: Number of vertices in the game
+    Owners, priorities, successors and the kind of every transition are drawn in bulk from a NumPy generator:
+    The first action of a vertex moves to two distinct uniformly chosen successors with probability 0.5 each, every further action does so or moves to a single uniformly chosen successor, each with probability 0.5.
+    :param number_of_vertices: Number of vertices in the game, at least 2
     :type number_of_vertices: int
     :param number_of_outgoing_transitions: Number of outgoing transitions for each vertex
     :type number_of_outgoing_transitions: int
     :param number_of_priorities: Number of priorities in the game
     :type number_of_priorities: int
+    :param seed: Seed of the generator, the same seed always creates the same game. If None, a fresh seed is used
+    :type seed: int | None
     :return: Resulting random stochastic parity game
     :rtype: StochasticParityGame
     """
-    vertices = {f"v_{i}": SpgVertex(name=f"v_{i}", is_eve=bool(random.randint(0, 1)), priority=random.randint(0, number_of_priorities - 1)) for i in range(number_of_vertices)}
-    transitions = {}
-    for vertex in vertices.values():
-        for i in range(number_of_outgoing_transitions):
-            if i == 0:
-                random_vertex1 = random.choice(list(vertices.values()))
-                random_vertex2 = random.choice(list(vertices.values()))
-                while random_vertex2 == random_vertex1:
-                    random_vertex2 = random.choice(list(vertices.values()))
-                transitions[(vertex, f"action_{i}")] = SpgTransition(start_vertex=vertex, end_vertices={(0.5, random_vertex1), (0.5, random_vertex2)}, action=f"action_{i}")
-            else:
-                if random.randint(0, 1) == 1:
-                    transitions[(vertex, f"action_{i}")] = SpgTransition(start_vertex=vertex, end_vertices={(1.0, random.choice(list(vertices.values())))}, action=f"action_{i}")
+    import numpy
+    if number_of_vertices < 2:
+        raise ValueError("A random SPG needs at least two vertices")
+    rng = numpy.random.default_rng(seed)
+    shape = (number_of_vertices, number_of_outgoing_transitions)
+    is_eve = rng.integers(0, 2, number_of_vertices).astype(bool).tolist()
+    priorities = rng.integers(0, number_of_priorities, number_of_vertices).tolist()
+    single_successor = rng.integers(0, 2, shape).astype(bool)
+    single_successor[:, 0] = False
+    first_successors, second_successors = _distinct_successor_pairs(rng, number_of_vertices, shape)
+    initial_vertex = int(rng.integers(0, number_of_vertices))
+
+    actions = [f"action_{i}" for i in range(number_of_outgoing_transitions)]
+    # Read once for the whole game instead of twice per transition, the drawn distributions are valid, so they are not checked again
+    exact_arithmetic = settings.USE_EXACT_ARITHMETIC
+    integer_probabilities = settings.INTEGER_PROBABILITIES
+    with paused_garbage_collection():
+        vertex_list = [SpgVertex(name=f"v_{i}", is_eve=is_eve[i], priority=priorities[i]) for i in range(number_of_vertices)]
+        vertices = {vertex.name: vertex for vertex in vertex_list}
+        transitions = {}
+        for vertex, singles, firsts, seconds in zip(vertex_list, single_successor.tolist(), first_successors.tolist(), second_successors.tolist()):
+            for action, single, first, second in zip(actions, singles, firsts, seconds):
+                if single:
+                    end_vertices = {(1.0, vertex_list[first])}
                 else:
-                    random_vertex1 = random.choice(list(vertices.values()))
-                    random_vertex2 = random.choice(list(vertices.values()))
-                    while random_vertex2 == random_vertex1:
-                        random_vertex2 = random.choice(list(vertices.values()))
-                    transitions[(vertex, f"action_{i}")] = SpgTransition(start_vertex=vertex, end_vertices={(0.5, random_vertex1), (0.5, random_vertex2)}, action=f"action_{i}")
-    initial_vertex = random.choice(list(vertices.values()))
-    return StochasticParityGame(vertices, transitions, initial_vertex)
+                    end_vertices = {(0.5, vertex_list[first]), (0.5, vertex_list[second])}
+                transitions[(vertex, action)] = SpgTransition(start_vertex=vertex, end_vertices=end_vertices, action=action, exact_arithmetic=exact_arithmetic,
+                                                              integer_probabilities=integer_probabilities, check_probabilities=False)
+        return StochasticParityGame(vertices, transitions, vertex_list[initial_vertex])
+
+
+def _distinct_successor_pairs(rng, number_of_vertices: int, shape: tuple[int, ...]):
+    """
+    Draws pairs of distinct vertex indices, each pair uniformly among all ordered pairs of distinct vertices.
+    :param rng: NumPy generator
+    :type rng: numpy.random.Generator
+    :param number_of_vertices: Number of vertices to choose from, at least 2
+    :type number_of_vertices: int
+    :param shape: Shape of the arrays of first and second indices
+    :type shape: tuple[int, ...]
+    :return: Arrays of first and second indices
+    :rtype: tuple[numpy.ndarray, numpy.ndarray]
+    """
+    first = rng.integers(0, number_of_vertices, shape)
+    second = rng.integers(0, number_of_vertices - 1, shape)
+    second += second >= first
+    return first, second
 
 
 def benchmark_own_examples_for_correctness(filenames_of_benchmarks: list[str], expected_values: list[tuple[float, float]], use_global_path: bool = False, debug: bool = False) -> None:
@@ -464,264 +289,160 @@ def benchmark_own_examples_for_correctness(filenames_of_benchmarks: list[str], e
         spg = read_spg_from_file(filename, use_global_path=use_global_path)
         ssg = spg_to_ssg(spg=spg, epsilon=1e-6, print_alphas=True)
         smg_spec = ssg_to_smgspec(ssg=ssg, version=1, debug=False, print_correspondingvertices=debug)
-        save_smg_file(smg_spec, file_name="temp.smg", use_global_path=use_global_path, force=True)
-        result = check_target_reachability(smg_file="temp.smg", print_probabilities=False, use_global_path=use_global_path)
+        result = check_smgspec_target_reachability(smg_spec, print_probabilities=False)
         print("####################################################################################")
         print()
         print(f"Expected minimum probability of Eve winning with even parity for {filename}: {expected_values[i][0]}")
-        print(f"Computed minimum probability of Eve winning with even parity for {filename}: {result[0]}")
+        print(f"Computed minimum probability of Eve winning with even parity for {filename}: {result[0].value}")
         print("---------------------------------------------------------------------------------------")
         print(f"Expected maximum probability of Eve winning with even parity for {filename}: {expected_values[i][1]}")
-        print(f"Computed maximum probability of Eve winning with even parity for {filename}: {result[1]}")
+        print(f"Computed maximum probability of Eve winning with even parity for {filename}: {result[1].value}")
         print()
         i += 1
 
 
-def benchmark_chain_spgs_for_correctness(use_global_path: bool = False, debug: bool = GLOBAL_DEBUG) -> None:
+def benchmark_chain_spgs_for_correctness(use_global_path: bool = False, debug: bool | None = None) -> None:
     """
     Benchmarks chain SPGs for correctness by checking the reachability of the target.
     :param use_global_path: Whether to use the global path for file operations
     :type use_global_path: bool
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     for i in range(1, 20):
         spg = create_chain_spg(length=2 ** i, min_prob=0.5)
         ssg = spg_to_ssg(spg=spg, epsilon=1e-6, print_alphas=debug)
         smg_spec = ssg_to_smgspec(ssg=ssg, version=1, debug=False, print_correspondingvertices=False)
-        save_smg_file(smg_spec, file_name="temp.smg", use_global_path=use_global_path, force=True)
-        result = check_target_reachability(smg_file="temp.smg", print_probabilities=False, use_global_path=use_global_path, prism_solving_algorithm="-valiter")
+        result = check_smgspec_target_reachability(smg_spec, print_probabilities=False, prism_solving_algorithm="-valiter")
         print("####################################################################################")
         print()
         print(f"Expected minimum probability of Eve winning with even parity for chain of length {2 ** i}: 1.0")
-        print(f"Computed minimum probability of Eve winning with even parity for chain of length {2 ** i}: {result[0]}")
+        print(f"Computed minimum probability of Eve winning with even parity for chain of length {2 ** i}: {result[0].value}")
         print("---------------------------------------------------------------------------------------")
         print(f"Expected maximum probability of Eve winning with even parity for chain of length {2 ** i}: 1.0")
-        print(f"Computed maximum probability of Eve winning with even parity for chain of length {2 ** i}: {result[1]}")
+        print(f"Computed maximum probability of Eve winning with even parity for chain of length {2 ** i}: {result[1].value}")
         print()
 
 
-def benchmark_mutex_spg_for_correctness(use_global_path: bool = False, debug: bool = GLOBAL_DEBUG) -> None:
+def benchmark_mutex_spg_for_correctness(use_global_path: bool = False, debug: bool | None = None) -> None:
     """
     Benchmarks mutex SPG for correctness by checking the reachability of the target.
     :param use_global_path: Whether to use the global path for file operations
     :type use_global_path: bool
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     spg = create_small_mutex_spg()
     ssg = spg_to_ssg(spg=spg, epsilon=1e-6, print_alphas=debug)
     smg_spec = ssg_to_smgspec(ssg=ssg, version=1, debug=False, print_correspondingvertices=True)
-    save_smg_file(smg_spec, file_name="temp.smg", use_global_path=use_global_path, force=True)
-    result = check_target_reachability(smg_file="temp.smg", print_probabilities=False, use_global_path=use_global_path)
+    result = check_smgspec_target_reachability(smg_spec, print_probabilities=False)
     print("####################################################################################")
     print()
     print(f"Expected probability of satisfied mutex condition when Eve tries to violate it: 0.0")
-    print(f"Computed probability of satisfied mutex condition when Eve tries to violate it: {result[0]}")
+    print(f"Computed probability of satisfied mutex condition when Eve tries to violate it: {result[0].value}")
     print("---------------------------------------------------------------------------------------")
     print(f"Expected probability of satisfied mutex condition when Eve tries to satisfy it: 0.0")
-    print(f"Computed probability of satisfied mutex condition when Eve tries to satisfy it: {result[1]}")
+    print(f"Computed probability of satisfied mutex condition when Eve tries to satisfy it: {result[1].value}")
     print()
 
 
-def _iteration_worker(q, method_with_args, debug: bool = GLOBAL_DEBUG):
+def _stage_failed(result: TaskResult, description: str, timeout: float | None, debug: bool | None = None) -> bool:
     """
-    Worker function for running a method with arguments in a separate process.
-    :param q: Queue for communication between processes
-    :type q: multiprocessing.Queue
-    :param method_with_args: Method and its arguments to be executed
-    :type method_with_args: tuple[callable, tuple]
+    Reports why a benchmark stage that was executed by a WorkerPool failed.
+    :param result: Result of the stage
+    :type result: TaskResult
+    :param description: Description of the stage used in the messages
+    :type description: str
+    :param timeout: Timeout of the stage in seconds
+    :type timeout: float | None
+    :param debug: Whether to print debug information
+    :type debug: bool | None
+    :return: True if the stage timed out or raised an exception, False otherwise
+    :rtype: bool
     """
-    if debug:
-        import traceback
-        print("[Worker] Starte Subprozess...")
-    method, args = method_with_args
-    try:
-        if debug:
-            print(f"[Worker] Methode: {method.__name__}, args: {args}")
-        result = method(*args)
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if result.timed_out:
         if debug:
-            print("[Worker] Ergebnis erfolgreich erhalten.")
-        q.put(result)
-    except Exception as e:
-        if debug:
-            print("[Worker] Ausnahme aufgetreten:", e)
-            traceback.print_exc()
-        q.put(e)
+            print_debug(f"Timeout of {timeout} seconds reached for {description}.")
+        return True
+    if result.error is not None:
+        print(f"Subprocess failed with exception: {result.error}")
+        return True
+    return False
 
 
-def benchmark_frozen_lake(timeout: int = 3600, abort_when_alpha_underflow: bool = True, use_global_path: bool = False, debug: bool = True) -> dict:
+def benchmark_frozen_lake(timeout: int = 3600, abort_when_alpha_underflow: bool = True, use_global_path: bool = False, max_workers: int | None = None, debug: bool = True) -> dict:
     """
     Benchmarks the creation and transformation of a frozen lake SMG and the solving of a target reachability property.
-    :param timeout: Number of seconds to wait for each subprocess before terminating it
+    :param timeout: Number of seconds to wait for each stage before killing it
     :type timeout: int
     :param abort_when_alpha_underflow: Whether to abort the benchmark when an alpha underflow is detected
     :type abort_when_alpha_underflow: bool
     :param use_global_path: Whether to use the global path for file operations
     :type use_global_path: bool
+    :param max_workers: Maximum number of concurrently running stages, defaults to the number of CPU cores
+    :type max_workers: int | None
     :param debug: Whether to print debug information
     :type debug: bool
     :return: Dictionary containing benchmark results
     :rtype: dict
     """
     benchmark_results = dict()
-    with Manager() as manager:
+    with WorkerPool(max_workers=max_workers, timeout=timeout, debug=debug) as pool:
         for size in range(1):
-            q = manager.Queue()
-
-            p = Process(target=_iteration_worker, args=(q, (create_frozen_lake_spg, (1, 3, (0, 0), (0, 2), 0.1, 0.5, 0.5)), False))
-            start_time = time.perf_counter()
             if debug:
                 print_debug(f"Start creating frozen lake benchmark for size {size} by {size}...")
-            p.start()
-            p.join(timeout)
-            end_time = time.perf_counter()
-
-            if p.is_alive():
-                if debug:
-                    print_debug(f"Timeout of {timeout} seconds reached for frozen lake creation with size {size} by {size}.")
-                kill_process_and_children(p.pid)
-                p.join()
-            try:
-                result = q.get(timeout=5)
-                print(f"Creating frozen lake with size {size} by {size} took {end_time - start_time:.2f} seconds.")
-                benchmark_results[(size, "spg_creation_time")] = end_time - start_time
-                print(f"Size of SPG: {asizeof.asizeof(result)} bytes.")
-                benchmark_results[(size, "spg_size")] = asizeof.asizeof(result)
-            except pyqueue.Empty:
-                print_error(f"Error: No result received from subprocess for creating frozen lake with size {size} by {size}.")
-                break
-
-            if isinstance(result, Exception):
-                print_error(f"Subprocess failed with exception: {result}")
+            result = pool.run(create_frozen_lake_spg, (1, 3, (0, 0), (0, 2), 0.1, 0.5, 0.5))
+            if _stage_failed(result, f"frozen lake creation with size {size} by {size}", timeout, debug):
                 break
+            spg = result.value
+            print(f"Creating frozen lake with size {size} by {size} took {result.elapsed_time:.2f} seconds.")
+            benchmark_results[(size, "spg_creation_time")] = result.elapsed_time
+            print(f"Size of SPG: {_object_size(spg)} bytes.")
+            benchmark_results[(size, "spg_size")] = _object_size(spg)
 
-            spg = result
-
-            q = manager.Queue()
-            p = Process(target=_iteration_worker, args=(q, (spg_to_ssg, (spg, 1e-6, True)), False))
-            start_time = time.perf_counter()
             if debug:
                 print_debug(f"Start transforming frozen lake benchmark for size {size} by {size} to SSG...")
-            p.start()
-            p.join(timeout)
-            end_time = time.perf_counter()
-
-            if p.is_alive():
-                if debug:
-                    print_debug(f"Timeout of {timeout} seconds reached for transforming frozen lake with size {size} by {size}.")
-                kill_process_and_children(p.pid)
-                p.join()
-            try:
-                result = q.get(timeout=5)
-                print(f"Transforming frozen lake with size {size} by {size} to SSG took {end_time - start_time:.2f} seconds.")
-                benchmark_results[(size, "ssg_transformation_time")] = end_time - start_time
-                print(f"Size of SSG: {asizeof.asizeof(result)} bytes.")
-                benchmark_results[(size, "ssg_size")] = asizeof.asizeof(result)
-            except pyqueue.Empty:
-                print_error(f"Error: No result received from subprocess for transforming frozen lake with size {size} by {size}.")
-                break
-
-            if isinstance(result, Exception):
-                print_error(f"Subprocess failed with exception: {result}")
+            result = pool.run(spg_to_ssg, (spg, 1e-6, True))
+            if _stage_failed(result, f"transforming frozen lake with size {size} by {size}", timeout, debug):
                 break
-
-            ssg = result
+            ssg = result.value
+            print(f"Transforming frozen lake with size {size} by {size} to SSG took {result.elapsed_time:.2f} seconds.")
+            benchmark_results[(size, "ssg_transformation_time")] = result.elapsed_time
+            print(f"Size of SSG: {_object_size(ssg)} bytes.")
+            benchmark_results[(size, "ssg_size")] = _object_size(ssg)
             if ssg.has_alpha_underflow():
                 print_warning(f"Alpha underflow detected in frozen lake with size {size} by {size}.")
                 if abort_when_alpha_underflow:
                     break
 
-            q = manager.Queue()
-            p = Process(target=_iteration_worker, args=(q, (ssg_to_smgspec, (ssg, 1, True, True)), False))
-            start_time = time.perf_counter()
             if debug:
                 print_debug(f"Start transforming frozen lake benchmark for size {size} by {size} to SMG...")
-            p.start()
-            p.join(timeout)
-            end_time = time.perf_counter()
-
-            if p.is_alive():
-                if debug:
-                    print_debug(f"Timeout of {timeout} seconds reached for transforming frozen lake with size {size} by {size}.")
-                kill_process_and_children(p.pid)
-                p.join()
-            try:
-                result = q.get(timeout=5)
-                print(f"Transforming frozen lake with size {size} by {size} to SMG took {end_time - start_time:.2f} seconds.")
-                benchmark_results[(size, "smg_transformation_time")] = end_time - start_time
-                print(f"Size of SMG specification: {asizeof.asizeof(result)} bytes.")
-                benchmark_results[(size, "smg_size")] = asizeof.asizeof(result)
-            except pyqueue.Empty:
-                print_error(f"Error: No result received from subprocess for transforming frozen lake with size {size} by {size}.")
-                break
-
-            if isinstance(result, Exception):
-                print_error(f"Subprocess failed with exception: {result}")
+            result = pool.run(ssg_to_smgspec, (ssg, 1, True, True))
+            if _stage_failed(result, f"transforming frozen lake with size {size} by {size}", timeout, debug):
                 break
+            smgspec = result.value
+            print(f"Transforming frozen lake with size {size} by {size} to SMG took {result.elapsed_time:.2f} seconds.")
+            benchmark_results[(size, "smg_transformation_time")] = result.elapsed_time
+            print(f"Size of SMG specification: {_object_size(smgspec)} bytes.")
+            benchmark_results[(size, "smg_size")] = _object_size(smgspec)
 
-            smgspec = result
-            save_smg_file(smg_spec=smgspec, file_name=f"temp.smg", use_global_path=use_global_path, force=True)
-
-            q = manager.Queue()
-            p = Process(target=_iteration_worker, args=(q, (check_property, ("temp.smg", "<<eve>> Pmin=? [F \"target\"]", use_global_path, None, False)), False))
-            start_time = time.perf_counter()
             if debug:
-                print_debug(f"Start checking first target reachability property of frozen lake benchmark for size {size} by {size}...")
-            p.start()
-            p.join(timeout)
-            end_time = time.perf_counter()
-
-            if p.is_alive():
-                if debug:
-                    print_debug(f"Timeout of {timeout} seconds reached for checking frozen lake with size {size} by {size}.")
-                kill_process_and_children(p.pid)
-                p.join()
-            try:
-                result = q.get(timeout=5)
-                print(f"Checking frozen lake with size {size} by {size} to SMG took {end_time - start_time:.2f} seconds.")
-                benchmark_results[(size, "property_check_time")] = end_time - start_time
-            except pyqueue.Empty:
-                print_error(f"Error: No result received from subprocess for transforming frozen lake with size {size} by {size}.")
-                break
-
-            if isinstance(result, Exception):
-                print_error(f"Subprocess failed with exception: {result}")
-                break
-
-            result1 = result
-            print(f"Probability of Eve winning when trying to lose: {result1}")
-
-            q = manager.Queue()
-            p = Process(target=_iteration_worker, args=(q, (check_property, ("temp.smg", "<<eve>> Pmax=? [F \"target\"]", use_global_path, None, False)), debug))
-            start_time = time.perf_counter()
-            if debug:
-                print_debug(f"Start checking second target reachability property of frozen lake benchmark for size {size} by {size}...")
-            p.start()
-            p.join(timeout)
-            end_time = time.perf_counter()
-
-            if p.is_alive():
-                if debug:
-                    print_debug(f"Timeout of {timeout} seconds reached for checking frozen lake with size {size} by {size}.")
-                kill_process_and_children(p.pid)
-                p.join()
-            try:
-                result = q.get(timeout=5)
-                print(f"Checking frozen lake with size {size} by {size} to SMG took {end_time - start_time:.2f} seconds.")
-                benchmark_results[(size, "property_check_time_2")] = end_time - start_time
-            except pyqueue.Empty:
-                print_error(f"Error: No result received from subprocess for transforming frozen lake with size {size} by {size}.")
-                break
-
-            if isinstance(result, Exception):
-                print_error(f"Subprocess failed with exception: {result}")
-                break
-
-            result2 = result
-            print(f"Probability of Eve winning when trying to win: {result2}")
-            from ssg_to_smg import create_dot_file, create_svg_file
-            create_dot_file(smg_file="temp.smg", dot_file="temp.dot", use_global_path=use_global_path, force=True)
+                print_debug(f"Start checking target reachability properties of frozen lake benchmark for size {size} by {size}...")
+            with model_handoff(smgspec, name=f"frozen_lake_{size}") as smg_file:
+                check_results = pool.map(check_property, [(smg_file, "<<eve>> Pmin=? [F \"target\"]", False, None, False, None, None, None, None, False),
+                                                          (smg_file, "<<eve>> Pmax=? [F \"target\"]", False, None, False, None, None, None, None, False)])
+                if any(_stage_failed(result, f"checking frozen lake with size {size} by {size}", timeout, debug) for result in check_results):
+                    break
+                print(f"Checking frozen lake with size {size} by {size} took {check_results[0].elapsed_time:.2f} and {check_results[1].elapsed_time:.2f} seconds.")
+                benchmark_results[(size, "property_check_time")] = check_results[0].elapsed_time
+                benchmark_results[(size, "property_check_time_2")] = check_results[1].elapsed_time
+                print(f"Probability of Eve winning when trying to lose: {check_results[0].value.value}")
+                print(f"Probability of Eve winning when trying to win: {check_results[1].value.value}")
+                from ssg_to_smg import create_dot_file, create_svg_file
+                create_dot_file(smg_file=smg_file, dot_file=os.path.join(settings.GLOBAL_IN_OUT_PATH, "temp.dot") if use_global_path else "temp.dot", force=True)
             create_svg_file(dot_file="temp.dot", svg_file="temp.svg", use_global_path=use_global_path, force=True, open_svg=True)
     return benchmark_results
 
@@ -762,55 +483,85 @@ def nested_to_tuples(data: dict[Any, Any], prefix: Any = ()) -> dict[tuple, Any]
     return results
 
 
-def kill_process_and_children(pid: int) -> None:
-    """
-    Kills a process and all its child processes.
-    :param pid: Process ID of the parent process
-    :type pid: int
-    """
-    try:
-        parent = psutil.Process(pid)
-        for child in parent.children(recursive=True):
-            child.kill()
-        parent.kill()
-    except psutil.NoSuchProcess:
-        pass
-
-
-def create_random_spg_benchmark_set(number_of_vertices: list[int], share_of_outgoing_transitions: list[float], number_of_priorities: list[int]):
+def create_random_spg_benchmark_set(number_of_vertices: list[int], share_of_outgoing_transitions: list[float], number_of_priorities: list[int], seed: int | None = None, binary: bool = False, max_workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
     """
-    Creates a benchmark set of random SPGs with the specified parameters.
+    Creates a benchmark set of random SPGs with the specified parameters in GLOBAL_IN_OUT_PATH/benchmark_set_random_spg.
+    The SPGs are streamed to their files without creating the game objects and all combinations are written in parallel by a WorkerPool.
     :param number_of_vertices: List of numbers of vertices for the random SPGs
     :type number_of_vertices: list[int]
     :param share_of_outgoing_transitions: List of shares of outgoing transitions for the random SPGs
     :type share_of_outgoing_transitions: list[float]
     :param number_of_priorities: List of numbers of priorities for the random SPGs
     :type number_of_priorities: list[int]
+    :param seed: Seed of the benchmark set, every SPG is created with a seed derived from it and its parameters. If None, a fresh seed is used
+    :type seed: int | None
+    :param binary: Whether to write binary .spgb files instead of .spg files
+    :type binary: bool
+    :param max_workers: Maximum number of files that are written concurrently, defaults to the number of CPU cores
+    :type max_workers: int | None
+    :param chunk_size: Number of vertices or transitions that each worker generates and writes at once
+    :type chunk_size: int
+    :return: Seed of the benchmark set, which recreates the same set
+    :rtype: int
     """
+    seed = new_seed() if seed is None else seed
+    print_debug(f"Creating random SPG benchmark set with seed {seed}")
+    extension = BINARY_EXTENSIONS["spg"] if binary else ".spg"
     already_created_combination = set()
-    for n_of_vertices in number_of_vertices:
-        for s_of_transitions in share_of_outgoing_transitions:
-            for n_of_priorities in number_of_priorities:
-                if (n_of_vertices, max(1, math.ceil(s_of_transitions * n_of_vertices)), n_of_priorities) in already_created_combination:
-                    print_debug(f"Skipping already created combination with {n_of_vertices} vertices, {max(1, math.ceil(s_of_transitions * n_of_vertices))} transitions and {n_of_priorities} priorities.")
-                    continue
-                if n_of_vertices <= 0 or s_of_transitions < 0 or n_of_priorities <= 0:
-                    print_debug(f"Skipping invalid combination: Vertices: {n_of_vertices}, Transitions: {max(1, math.ceil(s_of_transitions * n_of_vertices))}, Priorities: {n_of_priorities}")
-                    continue
-                if n_of_priorities > n_of_vertices:
-                    print_debug(f"Skipping combination with more priorities than vertices: Vertices: {n_of_vertices}, Transitions: {max(1, math.ceil(s_of_transitions * n_of_vertices))}, Priorities: {n_of_priorities}")
-                else:
-                    already_created_combination.add((n_of_vertices, max(1, math.ceil(s_of_transitions * n_of_vertices)), n_of_priorities))
-                    print_debug(f"Creating random SPG with {n_of_vertices} vertices, {max(1, math.ceil(s_of_transitions * n_of_vertices))} transitions and {n_of_priorities} priorities...")
-                    spg = create_random_spg(n_of_vertices, max(1, math.ceil(s_of_transitions * n_of_vertices)), n_of_priorities)
-                    spgspec = spg_to_spgspec(spg=spg, debug=False)
-                    save_spg_file(spg_spec=spgspec, file_name=os.path.join("benchmark_set_random_spg", f"random_spg_{n_of_vertices}_{max(1, math.ceil(s_of_transitions * n_of_vertices))}_{n_of_priorities}.spg"), use_global_path=True, force=True)
-                    print_debug("DONE")
+    with WorkerPool(max_workers=max_workers, debug=False) as pool:
+        for n_of_vertices in number_of_vertices:
+            for s_of_transitions in share_of_outgoing_transitions:
+                for n_of_priorities in number_of_priorities:
+                    n_of_transitions = max(1, math.ceil(s_of_transitions * n_of_vertices))
+                    if (n_of_vertices, n_of_transitions, n_of_priorities) in already_created_combination:
+                        print_debug(f"Skipping already created combination with {n_of_vertices} vertices, {n_of_transitions} transitions and {n_of_priorities} priorities.")
+                        continue
+                    if n_of_vertices <= 1 or s_of_transitions < 0 or n_of_priorities <= 0:
+                        print_debug(f"Skipping invalid combination: Vertices: {n_of_vertices}, Transitions: {n_of_transitions}, Priorities: {n_of_priorities}")
+                        continue
+                    if n_of_priorities > n_of_vertices:
+                        print_debug(f"Skipping combination with more priorities than vertices: Vertices: {n_of_vertices}, Transitions: {n_of_transitions}, Priorities: {n_of_priorities}")
+                        continue
+                    already_created_combination.add((n_of_vertices, n_of_transitions, n_of_priorities))
+                    print_debug(f"Creating random SPG with {n_of_vertices} vertices, {n_of_transitions} transitions and {n_of_priorities} priorities...")
+                    file_name = os.path.join("benchmark_set_random_spg", f"random_spg_{n_of_vertices}_{n_of_transitions}_{n_of_priorities}{extension}")
+                    spg_seed = derive_seed(seed, n_of_vertices, n_of_transitions, n_of_priorities)
+                    pool.submit(write_random_spg_file, (file_name, n_of_vertices, n_of_transitions, n_of_priorities, spg_seed, binary, True, True, chunk_size, False), task_id=file_name)
+        for result in pool.as_completed():
+            if result.ok:
+                print_debug(f"Created {result.task_id} in {result.elapsed_time:.2f} seconds")
+            else:
+                print_warning(f"Creating {result.task_id} failed: {result.error}")
+    return seed
+
+
+RANDOM_SPG_BENCHMARK_METRICS = ["spg_creation_time", "spg_size", "ssg_transformation_time", "ssg_size", "smg_transformation_time", "smg_size", "property_check_time_1", "property_check_time_2"]
+
 
+def _mark_random_spg_benchmark_failed(store: BenchmarkResultStore, combination: tuple[str, str, str], epsilons: list, algorithms: list[str], metrics: list[str]) -> None:
+    """
+    Marks the given metrics of a random SPG benchmark combination as failed.
+    :param store: Result store to update
+    :type store: BenchmarkResultStore
+    :param combination: Number of vertices, share of transitions and number of priorities as strings
+    :type combination: tuple[str, str, str]
+    :param epsilons: Epsilons whose results failed
+    :type epsilons: list
+    :param algorithms: PRISM algorithms whose results failed
+    :type algorithms: list[str]
+    :param metrics: Metrics that failed
+    :type metrics: list[str]
+    """
+    for epsilon in epsilons:
+        for algorithm in algorithms:
+            for metric in metrics:
+                store.put(combination, epsilon, algorithm, metric, -1 if metric.endswith("_size") else -1.0)
 
-def benchmark_random_spgs(number_of_vertices: list[int], share_of_outgoing_transitions: list[float], number_of_priorities: list[int], spg_transformation_epsilon: list[float], prism_algorithm: list[str], ssg_to_smg_version: int = 1, timeout: int = 3600, abort_when_alpha_underflow=True, use_global_path=False, save_results: bool = True, debug=True) -> dict:
+
+def benchmark_random_spgs(number_of_vertices: list[int], share_of_outgoing_transitions: list[float], number_of_priorities: list[int], spg_transformation_epsilon: list[float], prism_algorithm: list[str], ssg_to_smg_version: int = 1, timeout: int = 3600, abort_when_alpha_underflow=True, use_global_path=False, save_results: bool = True, max_workers: int | None = None, debug=True, seed: int | None = None, native_sweep: bool = False) -> dict:
     """
     Benchmarks the creation and transformation of random SPGs and the solving of target reachability properties.
+    All stages of all combinations are executed by one WorkerPool, a stage is started as soon as the stage it depends on has finished.
     :param number_of_vertices: List of numbers of vertices for the random SPGs
     :type number_of_vertices: list[int]
     :param share_of_outgoing_transitions: List of shares of outgoing transitions for the random SPGs
@@ -823,7 +574,7 @@ def benchmark_random_spgs(number_of_vertices: list[int], share_of_outgoing_trans
     :type prism_algorithm: list[str]
     :param ssg_to_smg_version: Version of the SSG to SMG transformation
     :type ssg_to_smg_version: int
-    :param timeout: Number of seconds to wait for each subprocess before terminating it
+    :param timeout: Number of seconds to wait for each stage before killing it
     :type timeout: int
     :param abort_when_alpha_underflow: Whether to abort the benchmark when an alpha underflow is detected
     :type abort_when_alpha_underflow: bool
@@ -831,296 +582,147 @@ def benchmark_random_spgs(number_of_vertices: list[int], share_of_outgoing_trans
     :type use_global_path: bool
     :param save_results: Whether to save the benchmark results to a file
     :type save_results: bool
+    :param max_workers: Maximum number of concurrently running stages, defaults to the number of CPU cores
+    :type max_workers: int | None
     :param debug: Whether to print debug information
     :type debug: bool
+    :param seed: Seed of the benchmark, every SPG is created with a seed derived from it and its parameters and the seed of each SPG is stored as metric "spg_seed". If None, a fresh seed is used
+    :type seed: int | None
+    :param native_sweep: Whether every SPG is also solved natively for all epsilons by solve_epsilon_sweep, every epsilon warm-started from its neighbor,
+        the value, its bound, sweeps, sweeps saved, whether the warm and cold solution agree and solving time are stored as metrics of the algorithm "native"
+    :type native_sweep: bool
     :return: Dictionary containing benchmark results
     :rtype: dict
     """
-    print(f"###Benchmarking {len(number_of_vertices) * len(share_of_outgoing_transitions) * len(number_of_priorities)* len(prism_algorithm)} random SPGs" + (" that are saved to random_ssg_results.json" if save_results else " without saving results") + "###")
-    benchmark_results = dict()
-    if save_results:
-        result_path = "random_ssg_results.json" if not use_global_path else os.path.join(GLOBAL_IN_OUT_PATH, "random_ssg_results.json")
-        if os.path.exists(result_path):
-            with open(result_path, "r") as f:
-                benchmark_results = json.load(f)
-                benchmark_results = nested_to_tuples(benchmark_results)
+    seed = new_seed() if seed is None else seed
+    print(f"###Benchmarking {len(number_of_vertices) * len(share_of_outgoing_transitions) * len(number_of_priorities)* len(prism_algorithm)} random SPGs with seed {seed}" + (" that are saved to random_ssg_results.json" if save_results else " without saving results") + "###")
+    result_path = "random_ssg_results.json" if not use_global_path else os.path.join(settings.GLOBAL_IN_OUT_PATH, "random_ssg_results.json")
+    store = open_benchmark_result_store(result_path, persistent=save_results, nested=True)
     already_checked_combination = set()
-    with Manager() as manager:
+    open_checks = dict()
+    with WorkerPool(max_workers=max_workers, timeout=timeout, debug=debug) as pool:
         for n_of_vertices in number_of_vertices:
             for s_of_transitions in share_of_outgoing_transitions:
                 for n_of_priorities in number_of_priorities:
-                    if (n_of_vertices, max(1, int(s_of_transitions * n_of_vertices)), n_of_priorities) in already_checked_combination:
+                    n_of_transitions = max(1, int(s_of_transitions * n_of_vertices))
+                    if (n_of_vertices, n_of_transitions, n_of_priorities) in already_checked_combination:
                         if debug:
-                            print_debug(f"Skipping already checked combination: Vertices: {n_of_vertices}, Transitions: {max(1, int(s_of_transitions * n_of_vertices)) }, Priorities: {n_of_priorities}")
+                            print_debug(f"Skipping already checked combination: Vertices: {n_of_vertices}, Transitions: {n_of_transitions}, Priorities: {n_of_priorities}")
                         continue
-                    else:
-                        already_checked_combination.add((n_of_vertices, max(1, int(s_of_transitions * n_of_vertices)), n_of_priorities))
-                    print(f"#####Vertices : {n_of_vertices} || Share of transitions: {s_of_transitions} || Priorities: {n_of_priorities}")
-                    q = manager.Queue()
-
-                    p = Process(target=_iteration_worker,
-                                args=(q, (create_random_spg, (n_of_vertices, max(1, int(s_of_transitions * n_of_vertices)), n_of_priorities)), False))
-                    start_time = time.perf_counter()
+                    already_checked_combination.add((n_of_vertices, n_of_transitions, n_of_priorities))
                     if debug:
-                        print_debug(f"Start creating random SPG for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities...")
-                    p.start()
-                    p.join(timeout)
-                    end_time = time.perf_counter()
-
-                    if p.is_alive():
+                        print_debug(f"Start creating random SPG for {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities...")
+                    combination = (str(n_of_vertices), str(s_of_transitions), str(n_of_priorities))
+                    if not store.missing([(combination, epsilon, algorithm, metric) for epsilon in spg_transformation_epsilon for algorithm in prism_algorithm for metric in RANDOM_SPG_BENCHMARK_METRICS]):
                         if debug:
-                            print_debug(f"Timeout of {timeout} seconds reached for creating random SPG for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities.")
-                        kill_process_and_children(p.pid)
-                        p.join()
-                        for epsilon in spg_transformation_epsilon:
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_creation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
+                            print_debug(f"Skipping combination with stored results: Vertices: {n_of_vertices}, Transitions: {n_of_transitions}, Priorities: {n_of_priorities}")
                         continue
-                    try:
-                        result = q.get(timeout=5)
-                        print(f"Creating random SPG for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities took {end_time - start_time:.2f} seconds.")
-                        for epsilon in spg_transformation_epsilon:
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_creation_time")] = end_time - start_time
-                        print(f"Size of SPG: {asizeof.asizeof(result)} bytes.")
-                        for epsilon in spg_transformation_epsilon:
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_size")] = asizeof.asizeof(result)
-                    except pyqueue.Empty:
-                        print(
-                            f"No result received from subprocess for creating random SPG for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities.")
-                        for epsilon in spg_transformation_epsilon:
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_creation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                        continue
-                    if isinstance(result, Exception):
-                        print(f"Subprocess failed with exception: {result}")
-                        for epsilon in spg_transformation_epsilon:
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_creation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "spg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                        continue
-
-                    spg = result
+                    spg_seed = derive_seed(seed, n_of_vertices, n_of_transitions, n_of_priorities)
                     for epsilon in spg_transformation_epsilon:
-                        q = manager.Queue()
-                        p = Process(target=_iteration_worker, args=(q, (spg_to_ssg, (spg, epsilon, True)), False))
-                        start_time = time.perf_counter()
-                        if debug:
-                            print_debug(f"Start transforming random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SSG with epsilon {epsilon}...")
-                        p.start()
-                        p.join(timeout)
-                        end_time = time.perf_counter()
-
-                        if p.is_alive():
-                            if debug:
-                                print_debug(
-                                    f"Timeout of {timeout} seconds reached for transforming random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SSG.")
-                            kill_process_and_children(p.pid)
-                            p.join()
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-                        try:
-                            result = q.get(timeout=5)
-                            print(f"Transforming random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SSG took {end_time - start_time:.2f} seconds.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = end_time - start_time
-                            print(f"Size of SSG: {asizeof.asizeof(result)} bytes.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = asizeof.asizeof(result)
-                        except pyqueue.Empty:
-                            print(
-                                f"Error: No result received from subprocess for transforming random SPG for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SSG.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-
-                        if isinstance(result, Exception):
-                            print(f"Subprocess failed with exception: {result}")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-
-                        ssg = result
-                        if ssg.has_alpha_underflow():
-                            print_warning(f"Alpha underflow detected in random SPG with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities.")
-                            if abort_when_alpha_underflow:
-                                for algorithm in prism_algorithm:
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_transformation_time")] = -1.0
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "ssg_size")] = -1
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                                continue
-
-                        q = manager.Queue()
-                        p = Process(target=_iteration_worker, args=(q, (ssg_to_smgspec, (ssg, ssg_to_smg_version, True, False)), False))
-                        start_time = time.perf_counter()
-                        if debug:
-                            print_debug(f"Start transforming random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SMG...")
-                        p.start()
-                        p.join(timeout)
-                        end_time = time.perf_counter()
-
-                        if p.is_alive():
-                            if debug:
-                                print_debug(
-                                    f"Timeout of {timeout} seconds reached for transforming random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SMG.")
-                            kill_process_and_children(p.pid)
-                            p.join()
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-                        try:
-                            result = q.get(timeout=5)
-                            print(f"Transforming random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SMG took {end_time - start_time:.2f} seconds.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = end_time - start_time
-                            print(f"Size of SMG specification: {asizeof.asizeof(result)} bytes.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = asizeof.asizeof(result)
-                        except pyqueue.Empty:
-                            print(
-                                f"Error: No result received from subprocess for transforming random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities to SMG.")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-
-                        if isinstance(result, Exception):
-                            print(f"Subprocess failed with exception: {result}")
-                            for algorithm in prism_algorithm:
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_transformation_time")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "smg_size")] = -1
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                            continue
-
-                        smgspec = result
-                        save_smg_file(smg_spec=smgspec, file_name=f"temp.smg", use_global_path=use_global_path, force=True)
-                        alg_count = 0
                         for algorithm in prism_algorithm:
-                            if debug:
-                                alg_count += 1
-                                print_debug(f"CHECK {alg_count}/{len(prism_algorithm)}")
-                            q = manager.Queue()
-                            p = Process(target=_iteration_worker, args=(q, (check_property, ("temp.smg", "<<eve>> Pmin=? [F \"target\"]", use_global_path, None, False, PRISM_PATH, MAX_ITERS, PRISM_EPSILON, algorithm)), False))
-                            start_time = time.perf_counter()
-                            if debug:
-                                print_debug(f"Start checking first target reachability property for random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}...")
-                            p.start()
-                            p.join(timeout)
-                            end_time = time.perf_counter()
-                            check_worked = True
-                            if p.is_alive():
-                                if debug:
-                                    print_debug(
-                                        f"Timeout of {timeout} seconds reached for checking first target reachability property for random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}.")
-                                kill_process_and_children(p.pid)
-                                p.join()
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                check_worked = False
-                            if check_worked:
-                                try:
-                                    result = q.get(timeout=5)
-                                    print(
-                                        f"Checking first target reachability property for random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm} took {end_time - start_time:.2f} seconds.")
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = end_time - start_time
-                                except pyqueue.Empty:
-                                    print(
-                                        f"Error: No result received from subprocess for checking random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}.")
-                                    check_worked = False
-                                    benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-                                if check_worked:
-                                    if isinstance(result, Exception):
-                                        print(f"Subprocess failed with exception: {result}")
-                                        benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_1")] = -1.0
-
-                            q = manager.Queue()
-                            p = Process(target=_iteration_worker, args=(q, (check_property, ("temp.smg", "<<eve>> Pmax=? [F \"target\"]", use_global_path, None, False, PRISM_PATH, MAX_ITERS, PRISM_EPSILON, algorithm)), False))
-
-                            start_time = time.perf_counter()
-                            if debug:
-                                print_debug(
-                                    f"Start checking second target reachability property for random spg for {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}...")
-                            p.start()
-                            p.join(timeout)
-                            end_time = time.perf_counter()
-
-                            if p.is_alive():
-                                if debug:
-                                    print_debug(
-                                        f"Timeout of {timeout} seconds reached for checking second target reachability property for random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}.")
-                                kill_process_and_children(p.pid)
-                                p.join()
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                                continue
-                            try:
-                                result = q.get(timeout=5)
-                                print(
-                                    f"Checking second target reachability property for random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm} took {end_time - start_time:.2f} seconds.")
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = end_time - start_time
-                            except pyqueue.Empty:
-                                print(
-                                    f"Error: No result received from subprocess for checking random spg with {n_of_vertices} vertices, {max(1, int(s_of_transitions * n_of_vertices))} outgoing transitions and {n_of_priorities} priorities with {algorithm}.")
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                                continue
-
-                            if isinstance(result, Exception):
-                                print(f"Subprocess failed with exception: {result}")
-                                benchmark_results[(str(n_of_vertices), str(s_of_transitions), str(n_of_priorities), str(epsilon), str(algorithm), "property_check_time_2")] = -1.0
-                                continue
-
-                            if save_results:
-                                with open(result_path, "w") as f:
-                                    nested = tuples_to_nested(benchmark_results)
-                                    json.dump(nested, f, indent=4)
+                            store.put(combination, epsilon, algorithm, "spg_seed", spg_seed)
+                    pool.submit(run_measured, (create_random_spg, (n_of_vertices, n_of_transitions, n_of_priorities, spg_seed), None, "spg_creation"), task_id=("spg", combination, n_of_transitions))
+
+        for result in pool.as_completed():
+            stage, combination, *task_parameters = result.task_id
+            n_of_vertices, s_of_transitions, n_of_priorities = combination
+            if stage == "spg":
+                n_of_transitions = task_parameters[0]
+                description = f"random SPG for {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities"
+                if _stage_failed(result, f"creating {description}", timeout, debug):
+                    _mark_random_spg_benchmark_failed(store, combination, spg_transformation_epsilon, prism_algorithm, RANDOM_SPG_BENCHMARK_METRICS)
+                    continue
+                spg, report = result.value
+                spg_size = _object_size(spg)
+                print(f"Creating {description} took {result.elapsed_time:.2f} seconds.")
+                print(f"Size of SPG: {spg_size} bytes.")
+                for epsilon in spg_transformation_epsilon:
+                    for algorithm in prism_algorithm:
+                        store.put(combination, epsilon, algorithm, "spg_creation_time", result.elapsed_time)
+                        store.put(combination, epsilon, algorithm, "spg_size", spg_size)
+                        store.put_run_report(combination, epsilon, algorithm, report)
+                    if debug:
+                        print_debug(f"Start transforming {description} to SSG with epsilon {epsilon}...")
+                    pool.submit(run_measured, (spg_to_ssg, (spg, epsilon, True)), task_id=("ssg", combination, n_of_transitions, epsilon))
+                if native_sweep:
+                    pool.submit(solve_epsilon_sweep, (spg, spg_transformation_epsilon, True, True, None, False), task_id=("native", combination, n_of_transitions))
+            elif stage == "native":
+                n_of_transitions = task_parameters[0]
+                if _stage_failed(result, f"solving random SPG for {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities natively", timeout, debug):
+                    continue
+                for epsilon, sweep_result in result.value.items():
+                    store.put(combination, epsilon, "native", "native_value", sweep_result["value"])
+                    store.put(combination, epsilon, "native", "native_bound", sweep_result["bound"])
+                    store.put(combination, epsilon, "native", "native_iterations", sweep_result["iterations"])
+                    store.put(combination, epsilon, "native", "native_iterations_saved", sweep_result.get("iterations_saved", 0))
+                    if "cold_agrees" in sweep_result:
+                        store.put(combination, epsilon, "native", "native_cold_agrees", sweep_result["cold_agrees"])
+                    store.put(combination, epsilon, "native", "native_solving_time", sweep_result["solving_time"])
+                print(f"Solving random SPG for {n_of_vertices} vertices natively saved {sum(sweep_result.get('iterations_saved', 0) for sweep_result in result.value.values())} sweeps by warm starts.")
+            elif stage == "ssg":
+                n_of_transitions, epsilon = task_parameters
+                description = f"random spg for {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities"
+                if _stage_failed(result, f"transforming {description} to SSG", timeout, debug):
+                    _mark_random_spg_benchmark_failed(store, combination, [epsilon], prism_algorithm, RANDOM_SPG_BENCHMARK_METRICS[2:])
+                    continue
+                ssg, report = result.value
+                ssg_size = _object_size(ssg)
+                print(f"Transforming {description} to SSG took {result.elapsed_time:.2f} seconds.")
+                print(f"Size of SSG: {ssg_size} bytes.")
+                for algorithm in prism_algorithm:
+                    store.put(combination, epsilon, algorithm, "ssg_transformation_time", result.elapsed_time)
+                    store.put(combination, epsilon, algorithm, "ssg_size", ssg_size)
+                    store.put_run_report(combination, epsilon, algorithm, report)
+                if ssg.has_alpha_underflow():
+                    print_warning(f"Alpha underflow detected in random SPG with {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities.")
+                    if abort_when_alpha_underflow:
+                        _mark_random_spg_benchmark_failed(store, combination, [epsilon], prism_algorithm, RANDOM_SPG_BENCHMARK_METRICS[2:])
+                        continue
+                if debug:
+                    print_debug(f"Start transforming {description} to SMG...")
+                pool.submit(run_measured, (ssg_to_smgspec, (ssg, ssg_to_smg_version, True, False, False)), task_id=("smg", combination, n_of_transitions, epsilon))
+            elif stage == "smg":
+                n_of_transitions, epsilon = task_parameters
+                description = f"random spg for {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities"
+                if _stage_failed(result, f"transforming {description} to SMG", timeout, debug):
+                    _mark_random_spg_benchmark_failed(store, combination, [epsilon], prism_algorithm, RANDOM_SPG_BENCHMARK_METRICS[4:])
+                    continue
+                smgspec, report = result.value
+                smg_size = _object_size(smgspec)
+                print(f"Transforming {description} to SMG took {result.elapsed_time:.2f} seconds.")
+                print(f"Size of SMG specification: {smg_size} bytes.")
+                for algorithm in prism_algorithm:
+                    store.put(combination, epsilon, algorithm, "smg_transformation_time", result.elapsed_time)
+                    store.put(combination, epsilon, algorithm, "smg_size", smg_size)
+                    store.put_run_report(combination, epsilon, algorithm, report)
+                handoff = model_handoff(smgspec, name=f"temp_{n_of_vertices}_{n_of_transitions}_{n_of_priorities}_{epsilon}", directory=settings.GLOBAL_IN_OUT_PATH if use_global_path else "")
+                with RunReport(debug=False) as report:
+                    smg_file = handoff.open()
+                for algorithm in prism_algorithm:
+                    store.put_run_report(combination, epsilon, algorithm, report)
+                open_checks[smg_file] = [2 * len(prism_algorithm), handoff]
+                for algorithm in prism_algorithm:
+                    for index, property_string in ((1, "<<eve>> Pmin=? [F \"target\"]"), (2, "<<eve>> Pmax=? [F \"target\"]")):
+                        if debug:
+                            print_debug(f"Start checking target reachability property {index} for {description} with {algorithm}...")
+                        pool.submit(run_measured, (check_property, (smg_file, property_string, False, None, False, None, None, None, algorithm, False)), task_id=("check", combination, n_of_transitions, epsilon, algorithm, index, smg_file))
+            else:
+                n_of_transitions, epsilon, algorithm, index, smg_file = task_parameters
+                description = f"target reachability property {index} for random spg with {n_of_vertices} vertices, {n_of_transitions} outgoing transitions and {n_of_priorities} priorities with {algorithm}"
+                if _stage_failed(result, f"checking {description}", timeout, debug):
+                    store.put(combination, epsilon, algorithm, f"property_check_time_{index}", -1.0)
+                else:
+                    print(f"Checking {description} took {result.elapsed_time:.2f} seconds.")
+                    store.put(combination, epsilon, algorithm, f"property_check_time_{index}", result.elapsed_time)
+                    store.put_prism_result(combination, epsilon, algorithm, result.value[0], prefix=f"property_check_{index}_")
+                    store.put_run_report(combination, epsilon, algorithm, result.value[1], prefix=f"property_check_{index}_")
+                open_checks[smg_file][0] -= 1
+                if open_checks[smg_file][0] == 0:
+                    open_checks.pop(smg_file)[1].close()
     if save_results:
-        with open(result_path, "w") as f:
-            nested = tuples_to_nested(benchmark_results)
-            json.dump(nested, f, indent=4)
+        store.export_json(result_path, nested=True)
+    benchmark_results = {(*instance.split(","), epsilon, algorithm, metric): value for (instance, epsilon, algorithm, metric), value in store.items()}
+    store.close()
     return benchmark_results
 
 
@@ -1201,7 +803,61 @@ def load_benchmark_results(filename: str) -> dict:
     return benchmark_results
 
 
-def benchmark_stargate(epsilons: list[float], prism_algorithms: list[str], save_results: bool = True):
+def _transform_benchmark_spg(spg_file: str, epsilon: float | None, smg_name: str, trace_memory: bool = True) -> tuple[float, int, dict, str, str]:
+    """
+    Transforms a benchmark SPG from the global path into an SMG file with a unique name that outlives the worker process.
+    :param spg_file: SPG file (.spg or binary .spgb) relative to GLOBAL_IN_OUT_PATH
+    :type spg_file: str
+    :param epsilon: Epsilon of the transformation
+    :type epsilon: float | None
+    :param smg_name: Prefix of the name of the SMG file
+    :type smg_name: str
+    :param trace_memory: Whether the run report measures the peak memory of the stages, which slows down the transformation
+    :type trace_memory: bool
+    :return: Transformation time (SPG to SMG specification), size of the SMG specification, the run report of all stages, the SMG file for PRISM and its local path that has to be removed with remove_model_file
+    :rtype: tuple[float, int, dict, str, str]
+    """
+    with RunReport(trace_memory=trace_memory, debug=False) as report:
+        if spg_file.endswith(BINARY_EXTENSIONS["spg"]):
+            spg = read_binary_game_file(spg_file, use_global_path=True, debug=False)
+        else:
+            spg = read_spg_from_file(spg_file, use_global_path=True, debug=False)
+        start_time = time.perf_counter()
+        ssg = spg_to_ssg(spg=spg, epsilon=epsilon, print_alphas=False, use_cache=False)
+        smgspec = ssg_to_smgspec(ssg=ssg, version=1, debug=False, print_correspondingvertices=False, use_cache=False)
+        transformation_time = time.perf_counter() - start_time
+        # Memory files and named pipes die with the worker, so only files can be handed to the checks
+        smg_file, local_path = model_handoff(smgspec, mode="file" if resolve_handoff_mode() == "file" else "tmpfs", name=smg_name, debug=False).detach()
+    smgspec_size = _object_size(smgspec)
+    return transformation_time, smgspec_size, report.to_dict(), smg_file, local_path
+
+
+def open_benchmark_result_store(result_file: str, persistent: bool = True, nested: bool = False) -> BenchmarkResultStore:
+    """
+    Opens the result store that belongs to a JSON result file. The store is kept next to the JSON file with the extension .sqlite.
+    If the store is empty, the results of an existing JSON file are imported so that older benchmarks can be resumed.
+    :param result_file: Path of the JSON result file
+    :type result_file: str
+    :param persistent: Whether the store is written to disk, if False an in-memory store is used
+    :type persistent: bool
+    :param nested: Whether the JSON file uses the nested shape of tuples_to_nested instead of the shape of save_benchmark_results
+    :type nested: bool
+    :return: Opened result store
+    :rtype: BenchmarkResultStore
+    """
+    store = BenchmarkResultStore(os.path.splitext(result_file)[0] + ".sqlite" if persistent else ":memory:")
+    if persistent and len(store) == 0 and os.path.exists(result_file):
+        if nested:
+            with open(result_file, "r") as f:
+                legacy_results = {(key[:-3], *key[-3:]): value for key, value in nested_to_tuples(json.load(f)).items()}
+        else:
+            legacy_results = load_benchmark_results(result_file)
+        imported = store.import_results(legacy_results)
+        print_debug(f"Imported {imported} results from {result_file}")
+    return store
+
+
+def benchmark_stargate(epsilons: list[float], prism_algorithms: list[str], save_results: bool = True, max_workers: int | None = None, timeout: int = 600, trace_memory: bool = True):
     """
     Benchmarks the already created SPGS in GLOBAL_IN_OUT_PATH/benchmark_set_random_spg and plots the results
     :param epsilons: list of to be benchmarked epsilons
@@ -1210,78 +866,90 @@ def benchmark_stargate(epsilons: list[float], prism_algorithms: list[str], save_
     :type prism_algorithms: list[str]
     :param save_results: whether or not to save results to file
     :type save_results: bool
+    :param max_workers: Maximum number of concurrently running transformations and property checks, defaults to the number of CPU cores
+    :type max_workers: int | None
+    :param timeout: Timeout of a property check in seconds
+    :type timeout: int
+    :param trace_memory: Whether the stored run reports contain the peak memory of every stage, measuring it slows down the transformation
+    :type trace_memory: bool
     """
-    result_file = os.path.join(GLOBAL_IN_OUT_PATH, "thesis_global_benchmarks.json")
-    benchmark_results = load_benchmark_results(result_file)
+    result_file = os.path.join(settings.GLOBAL_IN_OUT_PATH, "thesis_global_benchmarks.json")
+    store = open_benchmark_result_store(result_file, persistent=save_results)
 
-    spg_combinations = []
-    with os.scandir(os.path.join(GLOBAL_IN_OUT_PATH, "benchmark_set_random_spg")) as entries:
+    spg_files = dict()
+    with os.scandir(os.path.join(settings.GLOBAL_IN_OUT_PATH, "benchmark_set_random_spg")) as entries:
         for entry in entries:
-            if entry.is_file():
-                parts = entry.name.split("_")
+            name, extension = os.path.splitext(entry.name)
+            if entry.is_file() and extension in (".spg", BINARY_EXTENSIONS["spg"]):
+                parts = name.split("_")
                 if "random" in parts:
                     parts.remove("random")
                 if "spg" in parts:
                     parts.remove("spg")
-                parts[2] = parts[2][:-4]
-                spg_combinations.append(tuple(int(p) for p in parts))
-    spg_combinations.sort()
-
-    if not len(benchmark_results) == 2432:
-        for spg_combination in spg_combinations:
-            print_debug(f"||||> Start with combination {spg_combination}...")
-            spg = read_spg_from_file(os.path.join("benchmark_set_random_spg", f"random_spg_{spg_combination[0]}_{spg_combination[1]}_{spg_combination[2]}.spg"), use_global_path=True, debug=False)
-            for epsilon in epsilons:
-                if (spg_combination, epsilon, "transformation_time") in benchmark_results and (spg_combination, epsilon, "smgspec_size") in benchmark_results:
-                    print_debug(f"Skip transformation for {spg_combination}, ε={epsilon} (already computed)")
-                else:
-                    start_time = time.perf_counter()
-                    ssg = spg_to_ssg(spg=spg, epsilon=epsilon, print_alphas=False)
-                    print_debug(f"SSG with epsilon={epsilon} created")
-                    smgspec = ssg_to_smgspec(ssg=ssg, version=1, debug=False, print_correspondingvertices=False)
-                    transformation_time = time.perf_counter() - start_time
-                    smgspec_size = asizeof.asizeof(smgspec)
-                    print_debug(f"SMG created")
-                    save_smg_file(smg_spec=smgspec, file_name="temp.smg", force=True, debug=False, use_global_path=True)
-
-                    benchmark_results[spg_combination, epsilon, "transformation_time"] = transformation_time
-                    benchmark_results[spg_combination, epsilon, "smgspec_size"] = smgspec_size
-
-                for algorithm in prism_algorithms:
-                    if (spg_combination, epsilon, algorithm, "property_check_time") in benchmark_results:
-                        print_debug(f"Skip check_property for {spg_combination}, ε={epsilon}, alg={algorithm} (already computed)")
+                spg_files[tuple(int(p) for p in parts)] = entry.name
+    spg_combinations = sorted(spg_files)
+
+    expected_results = []
+    for spg_combination in spg_combinations:
+        for epsilon in epsilons:
+            expected_results.append((spg_combination, epsilon, None, "transformation_time"))
+            expected_results.append((spg_combination, epsilon, None, "smgspec_size"))
+            expected_results.extend((spg_combination, epsilon, algorithm, "property_check_time") for algorithm in prism_algorithms)
+    missing_results = store.missing(expected_results)
+    print_debug(f"{len(expected_results) - len(missing_results)} of {len(expected_results)} results already computed")
+
+    if missing_results:
+        open_checks = dict()
+        with WorkerPool(max_workers=max_workers, timeout=timeout, debug=False) as pool:
+            for spg_combination, epsilon in dict.fromkeys((key[0], key[1]) for key in missing_results):
+                print_debug(f"||||> Start with combination {spg_combination}, ε={epsilon}...")
+                spg_file = os.path.join("benchmark_set_random_spg", spg_files[spg_combination])
+                smg_name = f"temp_{spg_combination[0]}_{spg_combination[1]}_{spg_combination[2]}_{epsilon}"
+                pool.submit(_transform_benchmark_spg, (spg_file, epsilon, smg_name, trace_memory), task_id=("transform", spg_combination, epsilon), timeout=None)
+
+            for result in pool.as_completed():
+                stage, spg_combination, epsilon, *task_parameters = result.task_id
+                if stage == "transform":
+                    if not result.ok:
+                        print_warning(f"Transformation of {spg_combination} with ε={epsilon} failed: {result.error}")
                         continue
-
-                    q = multiprocessing.Manager().Queue()
-                    args = ("temp.smg", "<<eve>> Pmax=? [F \"target\"]", True, None, False, PRISM_PATH, MAX_ITERS,
-                            PRISM_EPSILON, algorithm)
-                    p = multiprocessing.Process(target=_iteration_worker, args=(q, (check_property, args), False))
-
-                    start_time = time.perf_counter()
-                    p.start()
-                    p.join(600)
-                    elapsed_time = time.perf_counter() - start_time
-
-                    if p.is_alive():
-                        kill_process_and_children(p.pid)
-                        p.join()
-                        print_debug(f"Timeout of 600 seconds with {'value iteration' if algorithm == '-valiter' else 'policy iteration'}")
-                        benchmark_results[spg_combination, epsilon, algorithm, "property_check_time"] = 600.0
+                    print_debug(f"SMG with epsilon={epsilon} created")
+                    if store.has(spg_combination, epsilon, None, "transformation_time") and store.has(spg_combination, epsilon, None, "smgspec_size"):
+                        print_debug(f"Skip transformation for {spg_combination}, ε={epsilon} (already computed)")
+                    else:
+                        transformation_time, smgspec_size, report, _, _ = result.value
+                        store.put(spg_combination, epsilon, None, "transformation_time", transformation_time)
+                        store.put(spg_combination, epsilon, None, "smgspec_size", smgspec_size)
+                        store.put_run_report(spg_combination, epsilon, None, report)
+                    smg_file, local_path = result.value[3:]
+                    open_checks[smg_file] = [0, local_path]
+                    for algorithm in prism_algorithms:
+                        if store.has(spg_combination, epsilon, algorithm, "property_check_time"):
+                            print_debug(f"Skip check_property for {spg_combination}, ε={epsilon}, alg={algorithm} (already computed)")
+                            continue
+                        open_checks[smg_file][0] += 1
+                        pool.submit(run_measured, (check_property, (smg_file, "<<eve>> Pmax=? [F \"target\"]", False, None, False, None, None, None, algorithm, False)), task_id=("check", spg_combination, epsilon, algorithm, smg_file))
+                else:
+                    algorithm, smg_file = task_parameters
+                    algorithm_name = 'value iteration' if algorithm == '-valiter' else 'policy iteration'
+                    if result.timed_out:
+                        print_debug(f"Timeout of {timeout} seconds with {algorithm_name}")
+                        store.put(spg_combination, epsilon, algorithm, "property_check_time", float(timeout))
+                    elif result.error is not None or not result.value[0].ok:
+                        print_debug(f"Error with {algorithm_name}")
+                        store.put(spg_combination, epsilon, algorithm, "property_check_time", -1.0)
                     else:
-                        if not q.empty():
-                            result = q.get()
-                            if isinstance(result, Exception) or result is None:
-                                print_debug(f"Error with {'value iteration' if algorithm == '-valiter' else 'policy iteration'}")
-                                benchmark_results[spg_combination, epsilon, algorithm, "property_check_time"] = -1.0
-                            else:
-                                print_debug(f"Propery Check worked with {'value iteration' if algorithm == '-valiter' else 'policy iteration'}")
-                                benchmark_results[spg_combination, epsilon, algorithm, "property_check_time"] = elapsed_time
-                        else:
-                            print_debug(f"Error with {'value iteration' if algorithm == '-valiter' else 'policy iteration'}")
-                            benchmark_results[spg_combination, epsilon, algorithm, "property_check_time"] = -1.0
-
-                if save_results:
-                    save_benchmark_results(benchmark_results, result_file)
+                        print_debug(f"Propery Check worked with {algorithm_name}")
+                        store.put(spg_combination, epsilon, algorithm, "property_check_time", result.elapsed_time)
+                        store.put_prism_result(spg_combination, epsilon, algorithm, result.value[0])
+                        store.put_run_report(spg_combination, epsilon, algorithm, result.value[1])
+                    open_checks[smg_file][0] -= 1
+                if smg_file in open_checks and open_checks[smg_file][0] == 0:
+                    remove_model_file(open_checks.pop(smg_file)[1])
+        if save_results:
+            store.export_json(result_file)
+    benchmark_results = {parse_key_str(key_str): value for key_str, value in store.export_dict().items()}
+    store.close()
     import io
     import matplotlib
     import contextlib
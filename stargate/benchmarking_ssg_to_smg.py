@@ -1,19 +1,17 @@
 import random
 import os
-import matplotlib
 import time
 import contextlib
 import io
-import queue as pyqueue
 import math
 
-from multiprocessing import Process, Queue
-
-from benchmarking_global import kill_process_and_children
+from worker_pool import WorkerPool
 from ssg_to_smg import ssg_to_smgspec, save_smg_file, check_target_reachability, check_smg_stats
-from simplestochasticgame import SsgVertex, SsgTransition, SimpleStochasticGame, is_deadlock_vertex
+from simplestochasticgame import SsgVertex, SsgTransition, SimpleStochasticGame
+from benchmarking_global import new_seed
+from game_files import paused_garbage_collection
 from error_handling import print_error, print_debug, print_warning
-from settings import GLOBAL_DEBUG,  GLOBAL_IN_OUT_PATH
+import settings
 
 
 def make_float_list_from_string(s: str) -> list[float]:
@@ -70,10 +68,11 @@ def make_str_int_tuple_from_string(s: str) -> tuple[str, str, int, int]:
         return "", "", -1, -1
 
 
-def create_random_ssg(number_of_vertices: int, number_of_transitions: int, number_of_target_vertices: int, no_additional_selfloops: bool = False, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+def create_random_ssg(number_of_vertices: int, number_of_transitions: int, number_of_target_vertices: int, no_additional_selfloops: bool = False, debug: bool | None = None, seed: int | None = None) -> SimpleStochasticGame:
     """
     Create a new SSG with random parameters.
-    :param number_of_vertices: Number of vertices in the SSG
+    Owners, targets, successors and the kind of every transition are drawn in bulk from a NumPy generator, with the same distributions as create_random_spg.
+    :param number_of_vertices: Number of vertices in the SSG, at least 2
     :type number_of_vertices: int
     :param number_of_transitions: Number of outgoing transitions for each vertex
     :type number_of_transitions: int
@@ -82,58 +81,70 @@ def create_random_ssg(number_of_vertices: int, number_of_transitions: int, numbe
     :param no_additional_selfloops: Whether to add additional self-loops
     :type no_additional_selfloops: bool
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
+    :param seed: Seed of the generator, the same seed always creates the same SSG. If None, a fresh seed is used
+    :type seed: int | None
     :return: SSG with random parameters
     :rtype: SimpleStochasticGame
     """
+    import numpy
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.time()
-
-    vertices: dict[str, SsgVertex] = dict()
-    for i in range(number_of_vertices):
-        vertices[f"vertex_{i}"] = SsgVertex(f"vertex_{i}", bool(random.randint(0, 1)), False)
-    target_vertices = random.sample(list(vertices.values()), number_of_target_vertices)
-    for vertex in target_vertices:
-        vertex.is_target = True
-    init_vertex = random.choice(list(vertices.values()))
-    transitions: dict[tuple[SsgVertex, str], SsgTransition] = dict()
-    action = 0
-    for vertex in vertices.values():
-        for i in range(number_of_transitions):
-            if i == 0:
-                random_vertex1 = random.choice(list(vertices.values()))
-                random_vertex2 = random.choice(list(vertices.values()))
-                while random_vertex2 == random_vertex1:
-                    random_vertex2 = random.choice(list(vertices.values()))
-                transitions[(vertex, f"action_{i}")] = SsgTransition(start_vertex=vertex, end_vertices={(0.5, random_vertex1), (0.5, random_vertex2)}, action=f"action_{i}")
-            else:
-                if random.randint(0, 1) == 1:
-                    transitions[(vertex, f"action_{i}")] = SsgTransition(start_vertex=vertex, end_vertices={(1.0, random.choice(list(vertices.values())))}, action=f"action_{i}")
+    if number_of_vertices < 2:
+        raise ValueError("A random SSG needs at least two vertices")
+
+    rng = numpy.random.default_rng(seed)
+    shape = (number_of_vertices, number_of_transitions)
+    is_eve = rng.integers(0, 2, number_of_vertices).astype(bool).tolist()
+    is_target = numpy.zeros(number_of_vertices, dtype=bool)
+    is_target[rng.choice(number_of_vertices, size=number_of_target_vertices, replace=False)] = True
+    is_target = is_target.tolist()
+    init_index = int(rng.integers(0, number_of_vertices))
+    single_successor = rng.integers(0, 2, shape).astype(bool)
+    single_successor[:, 0] = False
+    first_successors = rng.integers(0, number_of_vertices, shape)
+    second_successors = rng.integers(0, number_of_vertices - 1, shape)
+    second_successors += second_successors >= first_successors
+
+    # Read once for the whole game instead of twice per transition, the drawn distributions are valid, so they are not checked again
+    exact_arithmetic = settings.USE_EXACT_ARITHMETIC
+    integer_probabilities = settings.INTEGER_PROBABILITIES
+    with paused_garbage_collection():
+        vertex_list = [SsgVertex(f"vertex_{i}", is_eve[i], is_target[i]) for i in range(number_of_vertices)]
+        vertices: dict[str, SsgVertex] = {vertex.name: vertex for vertex in vertex_list}
+        init_vertex = vertex_list[init_index]
+        transitions: dict[tuple[SsgVertex, str], SsgTransition] = dict()
+        actions = [f"action_{i}" for i in range(number_of_transitions)]
+        for vertex, singles, firsts, seconds in zip(vertex_list, single_successor.tolist(), first_successors.tolist(), second_successors.tolist()):
+            for action_name, single, first, second in zip(actions, singles, firsts, seconds):
+                if single:
+                    end_vertices = {(1.0, vertex_list[first])}
                 else:
-                    random_vertex1 = random.choice(list(vertices.values()))
-                    random_vertex2 = random.choice(list(vertices.values()))
-                    while random_vertex2 == random_vertex1:
-                        random_vertex2 = random.choice(list(vertices.values()))
-                    transitions[(vertex, f"action_{i}")] = SsgTransition(start_vertex=vertex, end_vertices={(0.5, random_vertex1), (0.5, random_vertex2)}, action=f"action_{i}")
-    if no_additional_selfloops:
-        vertices["eve_sink"] = SsgVertex("eve_sink", True, False)
-        vertices["adam_sink"] = SsgVertex("adam_sink", False, False)
-        transitions[(vertices["eve_sink"], str(action))] = SsgTransition(vertices["eve_sink"], {(1.0, vertices["eve_sink"])}, str(action))
-        transitions[(vertices["adam_sink"], str(action))] = SsgTransition(vertices["adam_sink"], {(1.0, vertices["adam_sink"])}, str(action))
-        for vertex in vertices.values():
-            if vertex.name != "eve_sink" and vertex.name != "adam_sink":
-                if is_deadlock_vertex(vertex, transitions):
+                    end_vertices = {(0.5, vertex_list[first]), (0.5, vertex_list[second])}
+                transitions[(vertex, action_name)] = SsgTransition(start_vertex=vertex, end_vertices=end_vertices, action=action_name, exact_arithmetic=exact_arithmetic,
+                                                                   integer_probabilities=integer_probabilities, check_probabilities=False)
+        action = 0
+        if no_additional_selfloops:
+            vertices["eve_sink"] = SsgVertex("eve_sink", True, False)
+            vertices["adam_sink"] = SsgVertex("adam_sink", False, False)
+            transitions[(vertices["eve_sink"], str(action))] = SsgTransition(vertices["eve_sink"], {(1.0, vertices["eve_sink"])}, str(action))
+            transitions[(vertices["adam_sink"], str(action))] = SsgTransition(vertices["adam_sink"], {(1.0, vertices["adam_sink"])}, str(action))
+            # Collected once, calling is_deadlock_vertex for every vertex scans all transitions each time
+            vertices_with_transitions = {start_vertex for start_vertex, _ in transitions}
+            for vertex in vertex_list:
+                if vertex not in vertices_with_transitions:
                     if vertex.is_eve:
                         transitions[(vertex, str(action))] = SsgTransition(vertex, {(1.0, vertices["adam_sink"])}, "b")
                     else:
                         transitions[(vertex, str(action))] = SsgTransition(vertex, {(1.0, vertices["eve_sink"])}, "b")
+        ssg = SimpleStochasticGame(vertices, transitions, init_vertex)
     if debug:
         print_debug(f"Created random SSG with {len(vertices)} vertices and {len(transitions)} transitions in {time.time() - start_time:.2f} seconds.")
-
-    return SimpleStochasticGame(vertices, transitions, init_vertex)
+    return ssg
 
 
-def create_binary_tree_ssg(number_of_layers: int, share_of_target_vertices: float, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+def create_binary_tree_ssg(number_of_layers: int, share_of_target_vertices: float, debug: bool | None = None) -> SimpleStochasticGame:
     """
     Create a binary tree SSG with the given number of layers and target vertices.
     :param number_of_layers: Number of layers in the binary tree
@@ -141,10 +152,11 @@ def create_binary_tree_ssg(number_of_layers: int, share_of_target_vertices: floa
     :param share_of_target_vertices: Share of target vertices in the binary tree
     :type share_of_target_vertices: float
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :return: Binary tree SSG
     :rtype: SimpleStochasticGame
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.time()
     vertices = {}
@@ -177,7 +189,7 @@ def create_binary_tree_ssg(number_of_layers: int, share_of_target_vertices: floa
     return SimpleStochasticGame(vertices, transitions, init_vertex)
 
 
-def create_complete_graph_ssg(number_of_vertices: int, number_of_target_vertices: int, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+def create_complete_graph_ssg(number_of_vertices: int, number_of_target_vertices: int, debug: bool | None = None) -> SimpleStochasticGame:
     """
     Create a complete graph SSG with the given number of vertices and target vertices.
     :param number_of_vertices: Number of vertices in the SSG
@@ -185,10 +197,11 @@ def create_complete_graph_ssg(number_of_vertices: int, number_of_target_vertices
     :param number_of_target_vertices: Number of target vertices in the SSG
     :type number_of_target_vertices: int
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :return: Complete graph SSG
     :rtype: SimpleStochasticGame
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     vertices = {}
     transitions = {}
     for i in range(number_of_vertices):
@@ -210,18 +223,17 @@ def create_complete_graph_ssg(number_of_vertices: int, number_of_target_vertices
     return SimpleStochasticGame(vertices, transitions, init_vertex)
 
 
-def create_chain_ssg(number_of_vertices: int, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+def create_chain_ssg(number_of_vertices: int, debug: bool | None = None) -> SimpleStochasticGame:
     """
     Create a chain SSG with the given number of vertices.
     :param number_of_vertices: Number of vertices in the SSG
     :type number_of_vertices: int
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :return: Chain SSG
     :rtype: SimpleStochasticGame
     """
-    if debug is None:
-        debug = GLOBAL_DEBUG
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.time()
     vertices = {}
@@ -242,16 +254,17 @@ def create_chain_ssg(number_of_vertices: int, debug: bool = GLOBAL_DEBUG) -> Sim
     return SimpleStochasticGame(vertices, transitions, init_vertex)
 
 
-def create_empty_ssg(number_of_vertices: int, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+def create_empty_ssg(number_of_vertices: int, debug: bool | None = None) -> SimpleStochasticGame:
     """
     Create an empty SSG with the given number of vertices.
     :param number_of_vertices: Number of vertices in the SSG
     :type number_of_vertices: int
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :return: Empty SSG
     :rtype: SimpleStochasticGame
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.time()
     vertices = {}
@@ -268,17 +281,18 @@ def create_empty_ssg(number_of_vertices: int, debug: bool = GLOBAL_DEBUG) -> Sim
     return SimpleStochasticGame(vertices, transitions, init_vertex)
 
 
-def print_smg_stats(smg_file: str, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False) -> None:
+def print_smg_stats(smg_file: str, debug: bool | None = None, use_global_path: bool = False) -> None:
     """
     Print the statistics of an SMG file.
     :param smg_file: Path to the SMG file
     :type smg_file: str
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the SMG file
     :type use_global_path: bool
     """
-    states, transitions, constr_time = check_smg_stats(smg_file=smg_file, debug=debug, use_global_path=use_global_path)
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    states, transitions, constr_time = check_smg_stats(smg_file=smg_file, debug=debug, use_global_path=use_global_path).model_stats()
     output = f"SMG file: {smg_file}\n\n"
     if states != -1:
         output += f"\tNumber of States: \t\t{states}\n"
@@ -295,7 +309,7 @@ def print_smg_stats(smg_file: str, debug: bool = GLOBAL_DEBUG, use_global_path:
     print(output)
 
 
-def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save_results: bool = None, result_path: str = None, use_global_path: bool = False, force: bool = True, debug: bool = GLOBAL_DEBUG) -> tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]:
+def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save_results: bool = None, result_path: str = None, use_global_path: bool = False, force: bool = True, debug: bool | None = None, seed: int | None = None) -> tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]:
     """
     Benchmark the creation and property checking of multiple SSGs.
     :param ssg_count: Number of SSGs to create
@@ -313,10 +327,14 @@ def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save
     :param force: Whether to force the creation of the SSG
     :type force: bool
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
+    :param seed: Seed of the random SSGs, the i-th SSG is created with seed + i, it is written to the last line of the result file. If None, a fresh seed is used
+    :type seed: int | None
     :return: Tuple containing the average transformation and property checking times for both versions
     :rtype: tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    seed = new_seed() if seed is None else seed
     import time
     all_v1_trans_times = []
     all_v2_trans_times = []
@@ -330,15 +348,15 @@ def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save
     if result_path is None:
         result_path = f"benchmark_results_normal_{ssg_count}_{ssg_type}_{size_param}.txt"
     if use_global_path:
-        result_path = os.path.join(GLOBAL_IN_OUT_PATH, result_path)
+        result_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, result_path)
     if save_results is None:
         save_results = False if not force and os.path.exists(result_path) and os.path.getsize(result_path) > 0 else True
     if debug:
         match ssg_type:
             case "random":
-                print_debug(f"Creating {ssg_count} random SSGs with {size_param} vertices and {5 * size_param} transitions.")
+                print_debug(f"Creating {ssg_count} random SSGs with {size_param} vertices and {5 * size_param} transitions and seed {seed}.")
             case "random_no_additional_selfloops":
-                print_debug(f"Creating {ssg_count} random SSGs with {size_param} vertices and {5 * size_param} transitions without additional self-loops.")
+                print_debug(f"Creating {ssg_count} random SSGs with {size_param} vertices and {5 * size_param} transitions without additional self-loops and seed {seed}.")
             case "binary":
                 print_debug(f"Creating {ssg_count} binary tree SSGs with {size_param} layers and {round(0.3 * (2 ** size_param) / 2)} target vertices.")
             case "complete":
@@ -351,9 +369,9 @@ def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save
         if debug:
             print_debug(f"{i}/{ssg_count} SSGs created and evaluated.")
         if ssg_type == "random":
-            ssg_i = create_random_ssg(size_param, 5 * size_param, max(1, size_param // 10), no_additional_selfloops=False)
+            ssg_i = create_random_ssg(size_param, 5 * size_param, max(1, size_param // 10), no_additional_selfloops=False, seed=seed + i)
         elif ssg_type == "random_no_additional_selfloops":
-            ssg_i = create_random_ssg(size_param, 5 * size_param, max(1, size_param // 10), no_additional_selfloops=True)
+            ssg_i = create_random_ssg(size_param, 5 * size_param, max(1, size_param // 10), no_additional_selfloops=True, seed=seed + i)
         elif ssg_type == "binary":
             ssg_i = create_binary_tree_ssg(size_param, 0.3)
         elif ssg_type == "complete":
@@ -364,26 +382,26 @@ def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save
             ssg_i = create_empty_ssg(size_param)
 
         start_v1 = time.perf_counter()
-        smg_v1 = ssg_to_smgspec(ssg_i, version=1)
+        smg_v1 = ssg_to_smgspec(ssg_i, version=1, use_cache=False)
         trans_v1_time = time.perf_counter() - start_v1
         save_smg_file(smg_v1, f"ssg_{i+1}_v1.smg", use_global_path=True, force=True)
         start_v1_prop = time.perf_counter()
-        check_target_reachability(f"ssg_{i+1}_v1.smg", print_probabilities=False, use_global_path=True)
+        prism_results_v1 = check_target_reachability(f"ssg_{i+1}_v1.smg", print_probabilities=False, use_global_path=True, use_cache=False)
         prop_v1_time = time.perf_counter() - start_v1_prop
-        vert_v1, trans_v1, build_time1 = check_smg_stats(f"ssg_{i + 1}_v1.smg", use_global_path=True)
+        vert_v1, trans_v1, build_time1 = check_smg_stats(f"ssg_{i + 1}_v1.smg", use_global_path=True, prism_result=prism_results_v1[0]).model_stats()
 
         start_v2 = time.perf_counter()
-        smg_v2 = ssg_to_smgspec(ssg_i, version=3)
+        smg_v2 = ssg_to_smgspec(ssg_i, version=3, use_cache=False)
         trans_v2_time = time.perf_counter() - start_v2
         save_smg_file(smg_v2, f"ssg_{i+1}_v2.smg", use_global_path=True, force=True)
         start_v2_prop = time.perf_counter()
-        check_target_reachability(f"ssg_{i+1}_v2.smg", print_probabilities=False, use_global_path=True)
+        prism_results_v2 = check_target_reachability(f"ssg_{i+1}_v2.smg", print_probabilities=False, use_global_path=True, use_cache=False)
         prop_v2_time = time.perf_counter() - start_v2_prop
-        vert_v2, trans_v2, build_time2 = check_smg_stats(f"ssg_{i + 1}_v2.smg", use_global_path=True)
+        vert_v2, trans_v2, build_time2 = check_smg_stats(f"ssg_{i + 1}_v2.smg", use_global_path=True, prism_result=prism_results_v2[0]).model_stats()
 
         if use_global_path:
-            smg_v1_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i+1}_v1.smg")
-            smg_v2_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i+1}_v2.smg")
+            smg_v1_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i+1}_v1.smg")
+            smg_v2_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i+1}_v2.smg")
         else:
             smg_v1_path = f"ssg_{i+1}_v1.smg"
             smg_v2_path = f"ssg_{i+1}_v2.smg"
@@ -413,31 +431,13 @@ def benchmark_multiple_ssgs(ssg_count: int, ssg_type: str, size_param: int, save
         output += str(all_v1_transitions) + "\n"
         output += str(all_v2_transitions) + "\n"
         output += f"[norm, {ssg_type}, {ssg_count}, {size_param}]" + "\n"
+        output += f"[seed, {seed}]" + "\n"
         with open(result_path, "w") as f:
             f.write(output)
 
     return all_v1_trans_times, all_v2_trans_times, all_v1_prop_times, all_v2_prop_times, all_v1_vertices, all_v2_vertices, all_v1_transitions, all_v2_transitions, ("norm", ssg_type, ssg_count, size_param)
 
 
-def _iteration_worker(q, ssg_type, i, use_global_path):
-    """
-    Worker function to run a single benchmark iteration and return results via Queue.
-    :param q: Queue to put the results into
-    :type q: Queue
-    :param ssg_type: Type of SSG to create (random, binary, empty)
-    :type ssg_type: str
-    :param i: Index of the SSG to create
-    :type i: int
-    :param use_global_path: Whether to use the global path for the SMG file
-    :type use_global_path: bool
-    """
-    try:
-        result = single_iteration_for_exponential_benchmark(ssg_type, i, use_global_path)
-        q.put(result)
-    except Exception as e:
-        q.put(e)
-
-
 def single_iteration_for_exponential_benchmark(ssg_type: str, i: int, use_global_path: bool = True) -> tuple[float, float, float, float, int, int, int, int, str, str, int]:
     """
     Run a single iteration of the benchmark for a specific SSG type and index.
@@ -470,30 +470,30 @@ def single_iteration_for_exponential_benchmark(ssg_type: str, i: int, use_global
         ssg_i = create_empty_ssg(size_param)
 
     start_v1 = time.perf_counter()
-    smg_v1 = ssg_to_smgspec(ssg_i, version=1)
+    smg_v1 = ssg_to_smgspec(ssg_i, version=1, use_cache=False)
     trans_v1_time = time.perf_counter() - start_v1
     print_debug(f"Transformation with version1 took {trans_v1_time} seconds.")
     save_smg_file(smg_v1, f"ssg_{i + 1}_v1.smg", use_global_path=use_global_path, force=True)
     start_v1_prop = time.perf_counter()
-    check_target_reachability(f"ssg_{i + 1}_v1.smg", print_probabilities=False, use_global_path=use_global_path)
+    prism_results_v1 = check_target_reachability(f"ssg_{i + 1}_v1.smg", print_probabilities=False, use_global_path=use_global_path, use_cache=False)
     prop_v1_time = time.perf_counter() - start_v1_prop
     print_debug(f"Property checking with version1 took {prop_v1_time} seconds.")
-    vert_v1, trans_v1, build_time1 = check_smg_stats(f"ssg_{i + 1}_v1.smg", use_global_path=use_global_path)
+    vert_v1, trans_v1, build_time1 = check_smg_stats(f"ssg_{i + 1}_v1.smg", use_global_path=use_global_path, prism_result=prism_results_v1[0]).model_stats()
 
     start_v2 = time.perf_counter()
-    smg_v2 = ssg_to_smgspec(ssg_i, version=2)
+    smg_v2 = ssg_to_smgspec(ssg_i, version=2, use_cache=False)
     trans_v2_time = time.perf_counter() - start_v2
     print_debug(f"Transformation with version2 took {trans_v2_time} seconds.")
     save_smg_file(smg_v2, f"ssg_{i + 1}_v2.smg", use_global_path=use_global_path, force=True)
     start_v2_prop = time.perf_counter()
-    check_target_reachability(f"ssg_{i + 1}_v2.smg", print_probabilities=False, use_global_path=use_global_path)
+    prism_results_v2 = check_target_reachability(f"ssg_{i + 1}_v2.smg", print_probabilities=False, use_global_path=use_global_path, use_cache=False)
     prop_v2_time = time.perf_counter() - start_v2_prop
     print_debug(f"Property checking with version2 took {prop_v2_time} seconds.")
-    vert_v2, trans_v2, build_time2 = check_smg_stats(f"ssg_{i + 1}_v2.smg", use_global_path=use_global_path)
+    vert_v2, trans_v2, build_time2 = check_smg_stats(f"ssg_{i + 1}_v2.smg", use_global_path=use_global_path, prism_result=prism_results_v2[0]).model_stats()
 
     if use_global_path:
-        smg_v1_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v1.smg")
-        smg_v2_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v2.smg")
+        smg_v1_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v1.smg")
+        smg_v2_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v2.smg")
     else:
         smg_v1_path = f"ssg_{i + 1}_v1.smg"
         smg_v2_path = f"ssg_{i + 1}_v2.smg"
@@ -503,7 +503,7 @@ def single_iteration_for_exponential_benchmark(ssg_type: str, i: int, use_global
     return trans_v1_time, trans_v2_time, prop_v1_time, prop_v2_time, vert_v1, vert_v2, trans_v1, trans_v2, smg_v1_path, smg_v2_path, size_param
 
 
-def benchmark_exponential_ssgs(ssg_type: str, time_per_iteration: int = 120, save_results: bool = None, result_path: str = None, use_global_path: bool = True, force: bool = True, debug: bool = GLOBAL_DEBUG) -> tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]:
+def benchmark_exponential_ssgs(ssg_type: str, time_per_iteration: int = 120, save_results: bool = None, result_path: str = None, use_global_path: bool = True, force: bool = True, debug: bool | None = None) -> tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]:
     """
     Benchmark the creation and property checking of multiple SSGs.
     :param ssg_type: Type of SSG to create (random, binary, empty)
@@ -519,10 +519,11 @@ def benchmark_exponential_ssgs(ssg_type: str, time_per_iteration: int = 120, sav
     :param force: Whether to force the creation of the SSG
     :type force: bool
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :return: Tuple containing the average transformation and property checking times for both versions
     :rtype: tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int], tuple[str, str, int, int]]
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
 
     all_v1_trans_times = []
     all_v2_trans_times = []
@@ -535,7 +536,7 @@ def benchmark_exponential_ssgs(ssg_type: str, time_per_iteration: int = 120, sav
     if result_path is None:
         result_path = f"benchmark_results_exponential_{ssg_type}_max_{time_per_iteration}.txt"
     if use_global_path:
-        result_path = os.path.join(GLOBAL_IN_OUT_PATH, result_path)
+        result_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, result_path)
     if save_results is None:
         save_results = False if not force and os.path.exists(result_path) and os.path.getsize(result_path) > 0 else True
     if debug:
@@ -557,71 +558,60 @@ def benchmark_exponential_ssgs(ssg_type: str, time_per_iteration: int = 120, sav
             case _:
                 print_debug(f"Creating empty SSGs that grow exponentially until timeout of {time_per_iteration} seconds.")
     i = 0
-    while True:
-        q = Queue()
-        p = Process(target=_iteration_worker, args=(q, ssg_type, i, use_global_path))
-        start_time = time.perf_counter()
-        p.start()
-        p.join(timeout=time_per_iteration)
-        end_time = time.perf_counter()
-
-        if p.is_alive():
+    with WorkerPool(max_workers=1, timeout=time_per_iteration, debug=debug) as pool:
+        while True:
+            result = pool.run(single_iteration_for_exponential_benchmark, (ssg_type, i, use_global_path))
+
+            if result.timed_out:
+                if debug:
+                    print_debug(f"Timeout of {time_per_iteration} seconds reached for SSG {i + 1}.")
+                try:
+                    if use_global_path:
+                        smg_v1_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v1.smg")
+                        smg_v2_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v2.smg")
+                    else:
+                        smg_v1_path = f"ssg_{i + 1}_v1.smg"
+                        smg_v2_path = f"ssg_{i + 1}_v2.smg"
+                    os.remove(smg_v1_path)
+                    os.remove(smg_v2_path)
+                except FileNotFoundError:
+                    pass
+                break
+
+            if result.error is not None:
+                print_warning(f"Subprocess failed with exception: {result.error}")
+                break
+
+            (trans_v1_time, trans_v2_time, prop_v1_time, prop_v2_time,
+             vert_v1, vert_v2, trans_v1, trans_v2,
+             smg_v1_path, smg_v2_path, size_param) = result.value
+
+            if vert_v1 < 0 or vert_v2 < 0 or trans_v1 < 0 or trans_v2 < 0:
+                print_warning(f"Negative values for vertices or transitions in SSG {i + 1}.")
+                break
+
             if debug:
-                print_debug(f"Timeout of {time_per_iteration} seconds reached for SSG {i + 1}.")
-            kill_process_and_children(p.pid)
-            p.join()
+                print_debug(f"SSG {i + 1} with size parameter {size_param} successfully completed in {result.elapsed_time:.2f} seconds.")
+                print_debug(f"Preparing SSG {i + 2}.")
+
+            # Remove temporary .smg files
             try:
-                if use_global_path:
-                    smg_v1_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v1.smg")
-                    smg_v2_path = os.path.join(GLOBAL_IN_OUT_PATH, f"ssg_{i + 1}_v2.smg")
-                else:
-                    smg_v1_path = f"ssg_{i + 1}_v1.smg"
-                    smg_v2_path = f"ssg_{i + 1}_v2.smg"
                 os.remove(smg_v1_path)
                 os.remove(smg_v2_path)
             except FileNotFoundError:
                 pass
-            break
-        try:
-            result = q.get_nowait()
-        except pyqueue.Empty:
-            print_warning(f"No result received from subprocess for SSG {i + 1}.")
-            break
-
-        if isinstance(result, Exception):
-            print_warning(f"Subprocess failed with exception: {result}")
-            break
-
-        (trans_v1_time, trans_v2_time, prop_v1_time, prop_v2_time,
-         vert_v1, vert_v2, trans_v1, trans_v2,
-         smg_v1_path, smg_v2_path, size_param) = result
-
-        if vert_v1 < 0 or vert_v2 < 0 or trans_v1 < 0 or trans_v2 < 0:
-            print_warning(f"Negative values for vertices or transitions in SSG {i + 1}.")
-            break
-
-        if debug:
-            print_debug(f"SSG {i + 1} with size parameter {size_param} successfully completed in {end_time-start_time:.2f} seconds.")
-            print_debug(f"Preparing SSG {i + 2}.")
-
-        # Remove temporary .smg files
-        try:
-            os.remove(smg_v1_path)
-            os.remove(smg_v2_path)
-        except FileNotFoundError:
-            pass
-
-        # Collect results
-        all_v1_trans_times.append(trans_v1_time)
-        all_v2_trans_times.append(trans_v2_time)
-        all_v1_prop_times.append(prop_v1_time)
-        all_v2_prop_times.append(prop_v2_time)
-        all_v1_vertices.append(vert_v1)
-        all_v2_vertices.append(vert_v2)
-        all_v1_transitions.append(trans_v1)
-        all_v2_transitions.append(trans_v2)
 
-        i += 1
+            # Collect results
+            all_v1_trans_times.append(trans_v1_time)
+            all_v2_trans_times.append(trans_v2_time)
+            all_v1_prop_times.append(prop_v1_time)
+            all_v2_prop_times.append(prop_v2_time)
+            all_v1_vertices.append(vert_v1)
+            all_v2_vertices.append(vert_v2)
+            all_v1_transitions.append(trans_v1)
+            all_v2_transitions.append(trans_v2)
+
+            i += 1
     if ssg_type == "binary":
         size_param = i + 2
     else:
@@ -653,7 +643,7 @@ def read_benchmark_results(file_path: str, use_global_path: bool = True) -> tupl
     :rtype: tuple[list[float], list[float], list[float], list[float], list[int], list[int], list[int], list[int]]
     """
     if use_global_path:
-        file_path = os.path.join(GLOBAL_IN_OUT_PATH, file_path)
+        file_path = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_path)
     with open(file_path, "r") as f:
         content = f.readlines()
     if len(content) < 8:
@@ -693,6 +683,7 @@ def plot_benchmark_results(all_v1_trans_times: list[float], all_v2_trans_times:
     :param use_global_path: Whether to use the global path for the plot file
     :type use_global_path: bool
     """
+    import matplotlib
     with contextlib.redirect_stdout(io.StringIO()):
         matplotlib.use("TkAgg")
     import matplotlib.pyplot as plt
@@ -805,7 +796,7 @@ def plot_benchmark_results(all_v1_trans_times: list[float], all_v2_trans_times:
     if save_plots:
         filename = f"{plot_name}_times_combined.png"
         if use_global_path:
-            filename = os.path.join(GLOBAL_IN_OUT_PATH, "benchmarks", "exponential", filename)
+            filename = os.path.join(settings.GLOBAL_IN_OUT_PATH, "benchmarks", "exponential", filename)
         fig.savefig(filename)
 
     if not show_times:
@@ -855,7 +846,7 @@ def plot_benchmark_results(all_v1_trans_times: list[float], all_v2_trans_times:
     if save_plots:
         filename = f"{plot_name}_stats_combined.png"
         if use_global_path:
-            filename = os.path.join(GLOBAL_IN_OUT_PATH, "benchmarks", "exponential", filename)
+            filename = os.path.join(settings.GLOBAL_IN_OUT_PATH, "benchmarks", "exponential", filename)
         fig_stat.savefig(filename)
 
     if not show_stats:
@@ -884,6 +875,7 @@ def plot_combined_benchmark_results(benchmarks_results: list[tuple[list[float],
     :type versions: tuple[int, int]
     :return:
     """
+    import matplotlib
     with contextlib.redirect_stdout(io.StringIO()):
         matplotlib.use("TkAgg")
     import matplotlib.pyplot as plt
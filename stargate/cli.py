@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# Only the standard library modules needed to parse the arguments are imported here, STARGATE modules are imported by the commands
+import argparse
+import contextlib
+import glob
+import json
+import os
+import sys
+import time
+
+from typing import Any, Iterator, TextIO
+
+GAME_EXTENSIONS = {"reduce": (".spg", ".spgb"), "emit": (".spg", ".ssg", ".spgb", ".ssgb"), "solve": (".spg", ".ssg", ".spgb", ".ssgb", ".smg"), "stats": (".spg", ".ssg", ".spgb", ".ssgb", ".smg")}
+OUTPUT_EXTENSIONS = {"reduce": ".ssg", "emit": ".smg"}
+PRISM_ALGORITHMS = ("VALUE_ITERATION", "GAUSS_SEIDEL_VALUE_ITERATION", "POLICY_ITERATION", "MODIFIED_POLICY_ITERATION", "INTERVAL_ITERATION", "SOUND_VALUE_ITERATION", "TOPOLOGICAL_VALUE_ITERATION")
+
+
+def collect_inputs(patterns: list[str], extensions: tuple[str, ...], recursive: bool = False) -> list[str]:
+    """
+    Expands files, directories and glob patterns into the list of game files to process.
+    :param patterns: Files, directories or glob patterns
+    :type patterns: list[str]
+    :param extensions: Accepted file extensions, e.g. (".spg", ".ssg")
+    :type extensions: tuple[str, ...]
+    :param recursive: Whether directories are searched recursively
+    :type recursive: bool
+    :return: Sorted game files without duplicates
+    :rtype: list[str]
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if recursive:
+                candidates = [os.path.join(root, name) for root, _, names in os.walk(pattern) for name in names]
+            else:
+                candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+            files.extend(sorted(candidate for candidate in candidates if candidate.endswith(extensions) and os.path.isfile(candidate)))
+        elif glob.has_magic(pattern):
+            files.extend(sorted(match for match in glob.glob(pattern, recursive=True) if match.endswith(extensions) and os.path.isfile(match)))
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+
+def output_file_for(input_file: str, command: str, output: str | None, batch: bool) -> str:
+    """
+    Returns the file a reduce or emit command writes for an input file.
+    :param input_file: Game file that is processed
+    :type input_file: str
+    :param command: "reduce" or "emit"
+    :type command: str
+    :param output: Output file for a single input or output directory for a batch, None writes next to the input
+    :type output: str | None
+    :param batch: Whether several inputs are processed
+    :type batch: bool
+    :return: Output file
+    :rtype: str
+    """
+    name = os.path.splitext(os.path.basename(input_file))[0] + OUTPUT_EXTENSIONS[command]
+    if output is None:
+        return os.path.join(os.path.dirname(input_file), name)
+    if batch or os.path.isdir(output):
+        return os.path.join(output, name)
+    return output
+
+
+def _read_game(input_file: str):
+    """
+    Reads an SPG or SSG file depending on its extension.
+    :param input_file: .spg or .ssg file, or a binary .spgb or .ssgb file
+    :type input_file: str
+    :return: Stochastic parity game or simple stochastic game
+    :rtype: StochasticParityGame | SimpleStochasticGame
+    """
+    if input_file.endswith((".spgb", ".ssgb")):
+        from game_files import read_binary_game_file
+        return read_binary_game_file(input_file, debug=False)
+    if input_file.endswith(".spg"):
+        from stochasticparitygame import read_spg_from_file
+        return read_spg_from_file(input_file, debug=False)
+    from simplestochasticgame import read_ssg_from_file
+    return read_ssg_from_file(input_file, debug=False)
+
+
+def _to_ssg(game, epsilon: float | None):
+    """
+    Reduces a game to an SSG if it is an SPG.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :param epsilon: Epsilon of the reduction
+    :type epsilon: float | None
+    :return: Simple stochastic game
+    :rtype: SimpleStochasticGame
+    """
+    from stochasticparitygame import StochasticParityGame
+    if isinstance(game, StochasticParityGame):
+        from spg_to_ssg_reduction import spg_to_ssg
+        return spg_to_ssg(spg=game, epsilon=epsilon)
+    return game
+
+
+def _solve_natively(game) -> dict[str, Any] | None:
+    """
+    Solves a stochastic parity game without random transitions directly as a parity game, if SOLVE_DETERMINISTIC_SPG_NATIVELY is set.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Fields of the result line, None if the game has to be solved with PRISM
+    :rtype: dict[str, Any] | None
+    """
+    import settings
+    from stochasticparitygame import StochasticParityGame
+    if not settings.SOLVE_DETERMINISTIC_SPG_NATIVELY or not isinstance(game, StochasticParityGame):
+        return None
+    from parity_game_solver import is_deterministic_spg, solve_parity_game
+    if not is_deterministic_spg(game):
+        return None
+    solution = solve_parity_game(game, debug=False)
+    return {"ok": True, "min_value": solution.value(), "max_value": solution.value(), "solver": solution.algorithm,
+            "eve_winning_vertices": len(solution.winning_region_eve), "adam_winning_vertices": len(solution.winning_region_adam)}
+
+
+def _game_stats(game) -> dict[str, Any]:
+    """
+    Counts the vertices, transitions and players of a game.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Statistics of the game
+    :rtype: dict[str, Any]
+    """
+    vertices = game.vertices.values()
+    stats = {"vertices": len(game.vertices), "transitions": len(game.transitions), "eve_vertices": sum(1 for vertex in vertices if vertex.is_eve),
+             "probabilistic_edges": sum(len(transition.end_vertices) for transition in game.transitions.values())}
+    if hasattr(next(iter(vertices), None), "priority"):
+        stats["priorities"] = len({vertex.priority for vertex in vertices})
+        stats["max_priority"] = max((vertex.priority for vertex in vertices), default=None)
+    else:
+        stats["target_vertices"] = sum(1 for vertex in vertices if vertex.is_target)
+    return stats
+
+
+def _prism_fields(prism_result, prefix: str = "") -> dict[str, Any]:
+    """
+    Selects the fields of a PRISM result that are written to the result line.
+    :param prism_result: Parsed PRISM result
+    :type prism_result: PrismResult
+    :param prefix: Prefix of the field names
+    :type prefix: str
+    :return: Fields of the result
+    :rtype: dict[str, Any]
+    """
+    return {f"{prefix}value": prism_result.value, f"{prefix}ok": prism_result.ok, f"{prefix}converged": prism_result.converged, f"{prefix}iterations": prism_result.solver_iterations,
+            f"{prefix}errors": prism_result.errors}
+
+
+def process_game_file(command: str, input_file: str, options: dict[str, Any]) -> dict[str, Any]:
+    """
+    Runs a command on a single game file. Defined at module level so that it can be executed by a WorkerPool.
+    Everything the pipeline prints goes to standard error, so that standard output only contains result lines.
+    :param command: "reduce", "emit", "solve" or "stats"
+    :type command: str
+    :param input_file: Game file to process
+    :type input_file: str
+    :param options: Options of the command
+    :type options: dict[str, Any]
+    :return: Result line of the file
+    :rtype: dict[str, Any]
+    """
+    from run_report import RunReport
+    record = {"command": command, "input": input_file}
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr), RunReport(trace_memory=options.get("report", False), debug=False) as report:
+        try:
+            record.update(_run_command(command, input_file, options))
+            record["ok"] = record.get("ok", True)
+        except SystemExit as e:
+            record.update(ok=False, error=f"Aborted with exit code {e.code}")
+        except Exception as e:
+            record.update(ok=False, error=f"{type(e).__name__}: {e}")
+    record["time"] = time.perf_counter() - start_time
+    if options.get("report"):
+        record["report"] = report.summary()
+    return record
+
+
+def _run_command(command: str, input_file: str, options: dict[str, Any]) -> dict[str, Any]:
+    """
+    Executes a command on a game file.
+    :param command: "reduce", "emit", "solve" or "stats"
+    :type command: str
+    :param input_file: Game file to process
+    :type input_file: str
+    :param options: Options of the command
+    :type options: dict[str, Any]
+    :return: Fields of the result line
+    :rtype: dict[str, Any]
+    """
+    if not os.path.isfile(input_file):
+        raise FileNotFoundError(f"{input_file} does not exist")
+    if not input_file.endswith(GAME_EXTENSIONS[command]):
+        raise ValueError(f"{command} expects {', '.join(GAME_EXTENSIONS[command])} files")
+    if command in OUTPUT_EXTENSIONS and os.path.exists(options["output_file"]) and not options["force"]:
+        raise FileExistsError(f"{options['output_file']} already exists, use --force to overwrite it")
+    if command == "reduce":
+        from simplestochasticgame import ssg_to_ssgspec, save_ssg_file
+        ssg = _to_ssg(_read_game(input_file), options["epsilon"])
+        save_ssg_file(ssg_spec=ssg_to_ssgspec(ssg), file_name=options["output_file"], force=options["force"], debug=False)
+        return {"output": options["output_file"], "alpha_underflow": ssg.has_alpha_underflow()}
+    if command == "emit":
+        from ssg_to_smg import ssg_to_smgspec, save_smg_file
+        smg_spec = ssg_to_smgspec(ssg=_to_ssg(_read_game(input_file), options["epsilon"]), version=options["version"], debug=False)
+        save_smg_file(smg_spec=smg_spec, file_name=options["output_file"], force=options["force"], debug=False)
+        return {"output": options["output_file"]}
+    if command == "solve":
+        if input_file.endswith(".smg"):
+            from ssg_to_smg import check_target_reachability
+            min_result, max_result = check_target_reachability(input_file, debug=False)
+        else:
+            game = _read_game(input_file)
+            native_result = _solve_natively(game)
+            if native_result is not None:
+                return native_result
+            from ssg_to_smg import ssg_to_smgspec, check_smgspec_target_reachability
+            smg_spec = ssg_to_smgspec(ssg=_to_ssg(game, options["epsilon"]), version=options["version"], debug=False)
+            min_result, max_result = check_smgspec_target_reachability(smg_spec, handoff_mode=options["handoff"], debug=False)
+        return {"ok": min_result.ok and max_result.ok, **_prism_fields(min_result, "min_"), **_prism_fields(max_result, "max_"),
+                "states": max_result.states, "prism_transitions": max_result.transitions}
+    if command == "stats":
+        if input_file.endswith(".smg"):
+            from ssg_to_smg import check_smg_stats
+            stats_result = check_smg_stats(input_file, debug=False)
+            states, transitions, construction_time = stats_result.model_stats()
+            return {"ok": not stats_result.errors and not stats_result.timed_out, "states": states, "prism_transitions": transitions, "construction_time": construction_time, "errors": stats_result.errors}
+        return _game_stats(_read_game(input_file))
+    raise ValueError(f"Unknown command {command}")
+
+
+def _write_record(record: dict[str, Any], out: TextIO) -> None:
+    """
+    Writes a result as a JSON line.
+    :param record: Result line
+    :type record: dict[str, Any]
+    :param out: Stream to write to
+    :type out: TextIO
+    """
+    out.write(json.dumps(record, default=str) + "\n")
+    out.flush()
+
+
+def run_batch(command: str, input_files: list[str], options: dict[str, Any], jobs: int, timeout: float | None) -> Iterator[dict[str, Any]]:
+    """
+    Runs a command on all game files, in this process for a single job and across a WorkerPool otherwise.
+    :param command: "reduce", "emit", "solve" or "stats"
+    :type command: str
+    :param input_files: Game files to process
+    :type input_files: list[str]
+    :param options: Options of the command
+    :type options: dict[str, Any]
+    :param jobs: Number of files that are processed concurrently
+    :type jobs: int
+    :param timeout: Timeout per file in seconds, only enforced with more than one job
+    :type timeout: float | None
+    :return: Iterator over the result lines in completion order
+    :rtype: Iterator[dict[str, Any]]
+    """
+    batch = len(input_files) > 1
+    tasks = []
+    for input_file in input_files:
+        file_options = dict(options)
+        if command in OUTPUT_EXTENSIONS:
+            file_options["output_file"] = output_file_for(input_file, command, options.get("output"), batch)
+        tasks.append((input_file, file_options))
+    if command in OUTPUT_EXTENSIONS and batch and options.get("output"):
+        os.makedirs(options["output"], exist_ok=True)
+    if jobs <= 1:
+        for input_file, file_options in tasks:
+            yield process_game_file(command, input_file, file_options)
+        return
+    from worker_pool import WorkerPool
+    with WorkerPool(max_workers=jobs, timeout=timeout, debug=False) as pool:
+        for input_file, file_options in tasks:
+            pool.submit(process_game_file, (command, input_file, file_options), task_id=input_file)
+        for result in pool.as_completed():
+            if result.ok:
+                yield result.value
+            else:
+                yield {"command": command, "input": result.task_id, "ok": False, "error": "timeout" if result.timed_out else str(result.error), "time": result.elapsed_time}
+
+
+def _parse_setting(text: str) -> tuple[str, str]:
+    """
+    Splits a NAME=VALUE argument.
+    """
+    name, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {text}")
+    return name.strip().upper(), value
+
+
+def _add_batch_arguments(parser: argparse.ArgumentParser, command: str) -> None:
+    """
+    Adds the input and batch options that all file commands share.
+    """
+    parser.add_argument("inputs", nargs="+", help=f"Game files ({', '.join(GAME_EXTENSIONS[command])}), directories or glob patterns")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Number of files processed concurrently, 0 uses all CPU cores")
+    parser.add_argument("--timeout", type=float, default=None, help="Timeout per file in seconds (with more than one job)")
+    parser.add_argument("--jsonl", default=None, help="Append the result lines to this file instead of printing them")
+    parser.add_argument("--report", action="store_true", help="Add wall time, CPU time and peak memory of every pipeline stage to the results")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the argument parser of the stargate command.
+    :return: Argument parser
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog="stargate", description="STARGATE: reduce stochastic parity games to simple stochastic games and solve them with PRISM-games. Results are written as JSON lines.")
+    parser.add_argument("--set", dest="settings", metavar="NAME=VALUE", type=_parse_setting, action="append", default=[], help="Override a setting of settings.py, e.g. --set PRISM_EPSILON=1e-8")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    reduce_parser = subparsers.add_parser("reduce", help="Reduce SPGs to SSGs", description="Reduce SPG files to SSG files.")
+    _add_batch_arguments(reduce_parser, "reduce")
+    reduce_parser.add_argument("-o", "--output", default=None, help="Output file for a single input, output directory for several inputs, defaults to the directory of the input")
+    reduce_parser.add_argument("--epsilon", type=float, default=1e-6, help="Epsilon parameter for the SPG to SSG reduction")
+    reduce_parser.add_argument("--force", action="store_true", help="Overwrite existing output files")
+
+    emit_parser = subparsers.add_parser("emit", help="Transform SPGs or SSGs to PRISM-games SMG models", description="Transform SPG or SSG files to SMG files, SPGs are reduced first.")
+    _add_batch_arguments(emit_parser, "emit")
+    emit_parser.add_argument("-o", "--output", default=None, help="Output file for a single input, output directory for several inputs, defaults to the directory of the input")
+    emit_parser.add_argument("--epsilon", type=float, default=1e-6, help="Epsilon parameter for the SPG to SSG reduction")
+    emit_parser.add_argument("--version", type=int, default=None, help="SSG to SMG transformation version: (1) improved alternating, (2) older alternating, (3) synchronous")
+    emit_parser.add_argument("--force", action="store_true", help="Overwrite existing output files")
+
+    solve_parser = subparsers.add_parser("solve", help="Compute the minimum and maximum winning probabilities of Eve", description="Solve SPG, SSG or SMG files for target reachability with PRISM-games.")
+    _add_batch_arguments(solve_parser, "solve")
+    solve_parser.add_argument("--epsilon", type=float, default=1e-6, help="Epsilon parameter for the SPG to SSG reduction")
+    solve_parser.add_argument("--version", type=int, default=None, help="SSG to SMG transformation version")
+    solve_parser.add_argument("--algorithm", choices=PRISM_ALGORITHMS, default=None, help="PRISM solving algorithm, defaults to PRISM_SOLVING_ALGORITHM")
+    solve_parser.add_argument("--handoff", choices=("file", "tmpfs", "memfd", "fifo"), default=None, help="How the model is handed to PRISM, defaults to MODEL_HANDOFF")
+
+    stats_parser = subparsers.add_parser("stats", help="Print the size of games", description="Count vertices, transitions and priorities of SPG and SSG files, SMG files are measured with PRISM.")
+    _add_batch_arguments(stats_parser, "stats")
+
+    bench_parser = subparsers.add_parser("bench", help="Run a benchmark suite", description="Run one of the benchmark suites of benchmarking_global.")
+    bench_parser.add_argument("suite", choices=("random", "stargate", "frozen-lake"), help="Benchmark suite")
+    bench_parser.add_argument("--vertices", type=int, nargs="+", default=[10, 100, 1000], help="Numbers of vertices (random)")
+    bench_parser.add_argument("--share", type=float, nargs="+", default=[0.5], help="Shares of outgoing transitions (random)")
+    bench_parser.add_argument("--priorities", type=int, nargs="+", default=[2, 4], help="Numbers of priorities (random)")
+    bench_parser.add_argument("--epsilon", type=float, nargs="+", default=[1e-6], help="Epsilons of the reduction (random, stargate)")
+    bench_parser.add_argument("--algorithm", choices=PRISM_ALGORITHMS, nargs="+", default=["VALUE_ITERATION", "POLICY_ITERATION"], help="PRISM solving algorithms (random, stargate)")
+    bench_parser.add_argument("-j", "--jobs", type=int, default=0, help="Number of concurrently running stages, 0 uses all CPU cores")
+    bench_parser.add_argument("--timeout", type=float, default=600, help="Timeout of a single stage in seconds")
+    bench_parser.add_argument("--no-save", action="store_true", help="Do not store the results")
+    return parser
+
+
+def _run_bench(args: argparse.Namespace) -> None:
+    """
+    Runs the selected benchmark suite.
+    """
+    import settings
+    max_workers = args.jobs or None
+    algorithms = [settings.prism_algorithm_flag(algorithm) for algorithm in args.algorithm]
+    if args.suite == "random":
+        from benchmarking_global import benchmark_random_spgs
+        benchmark_random_spgs(args.vertices, args.share, args.priorities, args.epsilon, algorithms, timeout=args.timeout, save_results=not args.no_save, max_workers=max_workers, debug=False)
+    elif args.suite == "stargate":
+        from benchmarking_global import benchmark_stargate
+        benchmark_stargate(args.epsilon, algorithms, save_results=not args.no_save, max_workers=max_workers, timeout=args.timeout)
+    else:
+        from benchmarking_global import benchmark_frozen_lake
+        benchmark_frozen_lake(timeout=args.timeout, max_workers=max_workers, debug=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point of the stargate command.
+    :param argv: Command line arguments without the program name, defaults to sys.argv[1:]
+    :type argv: list[str] | None
+    :return: Exit code, 1 if any file failed
+    :rtype: int
+    """
+    args = build_parser().parse_args(argv)
+    if args.settings:
+        import settings
+        try:
+            settings.configure(**{name: settings.parse_setting_value(name, value) for name, value in args.settings})
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 2
+    if args.command == "bench":
+        _run_bench(args)
+        return 0
+    input_files = collect_inputs(args.inputs, GAME_EXTENSIONS[args.command], args.recursive)
+    if not input_files:
+        print("ERROR: No input files found", file=sys.stderr)
+        return 2
+    options = {"report": args.report, "epsilon": getattr(args, "epsilon", None), "version": getattr(args, "version", None), "force": getattr(args, "force", False),
+               "output": getattr(args, "output", None), "handoff": getattr(args, "handoff", None)}
+    if getattr(args, "algorithm", None):
+        import settings
+        settings.configure(PRISM_SOLVING_ALGORITHM=args.algorithm)
+    jobs = min(args.jobs if args.jobs > 0 else (os.cpu_count() or 1), len(input_files))
+    failed = 0
+    with (open(args.jsonl, "a") if args.jsonl else contextlib.nullcontext(sys.stdout)) as out:
+        for record in run_batch(args.command, input_files, options, jobs, args.timeout):
+            failed += not record["ok"]
+            _write_record(record, out)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import sys
+from operator import itemgetter
+
+from probability_table import probability_string
+
+
+class DistributionPool:
+    def __init__(self):
+        """
+        Hash-consing table of probability patterns. A distribution is split into its pattern, the sorted tuple of its probabilities,
+        and its successors in the same order. Transitions with the same probabilities over different successors share one pattern,
+        and the PRISM text of every pattern is formatted only once.
+        """
+        self.ids: dict[tuple, int] = dict()
+        self.patterns: list[tuple] = []
+        self._prefixes: dict[int, list[str]] = dict()
+
+    def intern(self, end_vertices) -> tuple[int, tuple]:
+        """
+        Interns the pattern of a distribution.
+        :param end_vertices: Probabilities and successors of a transition
+        :type end_vertices: Iterable[tuple[float | Fraction, object]]
+        :return: Id of the pattern and the successors in the order of the pattern
+        :rtype: tuple[int, tuple]
+        """
+        edges = sorted(end_vertices, key=itemgetter(0))
+        pattern = tuple(prob for prob, _ in edges)
+        distribution_id = self.ids.get(pattern)
+        if distribution_id is None:
+            distribution_id = len(self.patterns)
+            self.ids[pattern] = distribution_id
+            self.patterns.append(pattern)
+        return distribution_id, tuple(successor for _, successor in edges)
+
+    def prism_prefixes(self, distribution_id: int) -> list[str]:
+        """
+        Returns the PRISM text "(p) : " of every probability of a pattern, formatted on the first request.
+        :param distribution_id: Id of the pattern
+        :type distribution_id: int
+        :return: Text before every successor update
+        :rtype: list[str]
+        """
+        prefixes = self._prefixes.get(distribution_id)
+        if prefixes is None:
+            prefixes = [f"({probability_string(prob)}) : " for prob in self.patterns[distribution_id]]
+            self._prefixes[distribution_id] = prefixes
+        return prefixes
+
+    def __len__(self):
+        return len(self.patterns)
+
+
+class InternedDistributions:
+    def __init__(self, game):
+        """
+        Distributions of all transitions of a game in hash-consed form: every transition stores the id of its pattern in a DistributionPool
+        and a slice of the successor array, which holds the vertex indices in the order of the pattern.
+        :param game: Stochastic parity game or simple stochastic game
+        :type game: StochasticParityGame | SimpleStochasticGame
+        """
+        import numpy as np
+        self.pool = DistributionPool()
+        self.vertices = list(game.vertices.values())
+        index_of = {vertex: index for index, vertex in enumerate(self.vertices)}
+        self.transitions = list(game.transitions.values())
+        distribution_ids = []
+        successors = []
+        offsets = [0]
+        for transition in self.transitions:
+            distribution_id, transition_successors = self.pool.intern(transition.end_vertices)
+            distribution_ids.append(distribution_id)
+            successors.extend(index_of[successor] for successor in transition_successors)
+            offsets.append(len(successors))
+        self.distribution_ids = np.asarray(distribution_ids, dtype=np.int64)
+        self.successors = np.asarray(successors, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def distribution(self, transition_index: int) -> set:
+        """
+        Returns the probabilities and successors of a transition.
+        :param transition_index: Index of the transition
+        :type transition_index: int
+        :return: Set of tuples of probabilities and end vertices
+        :rtype: set[tuple[float | Fraction, SpgVertex | SsgVertex]]
+        """
+        pattern = self.pool.patterns[self.distribution_ids[transition_index]]
+        successors = self.successors[self.offsets[transition_index]:self.offsets[transition_index + 1]]
+        return {(prob, self.vertices[successor]) for prob, successor in zip(pattern, successors)}
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory of the interned form in bytes: the arrays and the pattern tuples, the probabilities are shared with the game.
+        """
+        return (self.distribution_ids.nbytes + self.successors.nbytes + self.offsets.nbytes
+                + sum(sys.getsizeof(pattern) for pattern in self.pool.patterns) + sys.getsizeof(self.pool.ids))
+
+
+def distribution_set_bytes(game) -> int:
+    """
+    Returns the memory of the sets of (probability, vertex) tuples of all transitions of a game in bytes, the probabilities and vertices are not counted.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Memory of the distribution sets
+    :rtype: int
+    """
+    return sum(sys.getsizeof(transition.end_vertices) + sum(sys.getsizeof(edge) for edge in transition.end_vertices) for transition in game.transitions.values())
+
+
+def distribution_interning_report(game) -> dict[str, int]:
+    """
+    Reports the effect of hash-consing the distributions of a game.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Number of transitions and distinct patterns, and the memory of the distribution sets and of the interned form in bytes
+    :rtype: dict[str, int]
+    """
+    interned = InternedDistributions(game)
+    return {"transitions": len(interned.transitions), "patterns": len(interned.pool),
+            "bytes_sets": distribution_set_bytes(game), "bytes_interned": interned.nbytes}
@@ -1,6 +1,7 @@
 import sys
 from fractions import Fraction
-from settings import MAX_DENOMINATOR
+from probability_table import get_probability_table
+import settings
 
 
 def print_warning(reason: str) -> None:
@@ -48,17 +49,18 @@ def is_float_expr(s: str) -> bool:
         return False
 
 
-def float_or_fraction(f: float, max_d: int = MAX_DENOMINATOR) -> str:
+def float_or_fraction(f: float, max_d: int | None = None) -> str:
     """
     Convert a float to a string representation, either as a float or as a fraction depending on the better representation.
     :param f: Float to convert
     :type f: float
     :param max_d: Maximum denominator for the fraction
-    :type max_d: int
+    :type max_d: int | None
     :return: String representation of the float or fraction
     :rtype: str
     """
-    fract = Fraction(f).limit_denominator(max_d)
+    max_d = settings.MAX_DENOMINATOR if max_d is None else max_d
+    fract = get_probability_table().rational(f, max_d)
     if len(str(f)) < len(str(fract)):
         return str(f)
     else:
@@ -0,0 +1,477 @@
+import math
+import re
+import time
+
+from error_handling import print_debug, print_error, print_warning
+from game_files import GameSource, DEFAULT_CHUNK_SIZE
+from run_report import start_stage
+from spg_to_ssg_reduction import compute_alphas, spg_to_ssg
+import settings
+
+# Field types of the grid
+TARGET0, TARGET1, ICE, HOLE = 0, 1, 2, 3
+FROZEN_LAKE_ACTIONS = ["left", "right", "up", "down", "blow_left", "blow_right", "blow_up", "blow_down", "change_target", "go_back"]
+_DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_CHANGE_TARGET, _GO_BACK = 8, 9
+# Vertex v_x_y_b_k of a field is stored in slot 2 * k + b, where b is 1 for the Adam vertex that lets the wind blow and k is the layer (0 while heading for target 0).
+# Vertices are numbered field by field, columns first, and within a field by slot.
+_SLOT_EXISTS = ((True, False, True, True), (True, True, True, False), (True, True, True, True), (True, False, True, False))
+_SLOT_PRIORITY = ((2, 0, 3, 3), (3, 3, 2, 0), (3, 3, 3, 3), (1, 0, 1, 0))
+
+
+def frozen_lake_field(columns: int, rows: int, point0: tuple[int, int] | None = None, point1: tuple[int, int] | None = None, share_of_holes: float = 0.5, seed: int | None = None):
+    """
+    Creates the grid of a frozen lake, with field[x, y] being TARGET0, TARGET1, ICE or HOLE.
+    :param columns: Number of columns in the grid.
+    :type columns: int
+    :param rows: Number of rows in the grid.
+    :type rows: int
+    :param point0: Location of the first target point, if None, a random point will be chosen.
+    :type point0: tuple[int, int] | None
+    :param point1: Location of the second target point, if None, a random point will be chosen.
+    :type point1: tuple[int, int] | None
+    :param share_of_holes: Share of holes among the fields that are no target, must be between 0 and 1.
+    :type share_of_holes: float
+    :param seed: Seed of the random target and hole placement, if None a fresh seed is used.
+    :type seed: int | None
+    :return: Grid and the locations of both target points
+    :rtype: tuple[numpy.ndarray, tuple[int, int], tuple[int, int]]
+    """
+    import numpy
+    if columns * rows < 2:
+        print_error(f"A frozen lake needs at least two fields, but it is {columns}x{rows}.")
+    if point0 is not None and point1 is not None:
+        if point0 == point1:
+            print_error(f"point1 and point2 must be different, but they are both {point0}.")
+    if point0 is not None:
+        if not (0 <= point0[0] < columns and 0 <= point0[1] < rows):
+            print_error(f"point1 {point0} is out of bounds for a {columns}x{rows} grid.")
+    if point1 is not None:
+        if not (0 <= point1[0] < columns and 0 <= point1[1] < rows):
+            print_error(f"point2 {point1} is out of bounds for a {columns}x{rows} grid.")
+    if share_of_holes < 0 or share_of_holes > 1:
+        print_error(f"share_of_holes must be between 0 and 1, but it is {share_of_holes}.")
+    rng = numpy.random.default_rng(seed)
+    while point0 is None or point0 == point1:
+        point0 = (int(rng.integers(columns)), int(rng.integers(rows)))
+    while point1 is None or point1 == point0:
+        point1 = (int(rng.integers(columns)), int(rng.integers(rows)))
+    field = numpy.full((columns, rows), ICE, dtype=numpy.int8)
+    field[point0] = TARGET0
+    field[point1] = TARGET1
+    number_of_holes = int((columns * rows - 2) * share_of_holes)
+    ice = numpy.flatnonzero(field == ICE)
+    field.reshape(-1)[rng.choice(ice, size=number_of_holes, replace=False)] = HOLE
+    return field, point0, point1
+
+
+class FrozenLake(GameSource):
+    def __init__(self, field, point0: tuple[int, int], point1: tuple[int, int], wind_probability: float = 0.5, slide_probability: float = 0.5, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Stochastic parity game of a frozen lake, computed with array operations for the whole grid instead of field by field.
+        The transitions of a field follow each other, ordered as the field-by-field construction used to add them, so small lakes keep their vertex and transition order.
+        :param field: Grid as returned by frozen_lake_field
+        :type field: numpy.ndarray
+        :param point0: Location of the first target point
+        :type point0: tuple[int, int]
+        :param point1: Location of the second target point
+        :type point1: tuple[int, int]
+        :param wind_probability: Probability of wind having an action after a move, must be between 0 and 1.
+        :type wind_probability: float
+        :param slide_probability: Probability of sliding one field further after a move, must be between 0 and 1.
+        :type slide_probability: float
+        :param chunk_size: Number of fields whose transitions are computed at once
+        :type chunk_size: int
+        """
+        import numpy
+        self.kind = "spg"
+        self.action_names = FROZEN_LAKE_ACTIONS
+        self.field = numpy.asarray(field, dtype=numpy.int8)
+        self.columns, self.rows = self.field.shape
+        self.point0 = tuple(point0)
+        self.point1 = tuple(point1)
+        self.wind_probability = wind_probability
+        self.slide_probability = slide_probability
+        self.chunk_size = max(1, chunk_size)
+        exists = numpy.array(_SLOT_EXISTS)[self.field]
+        # Number of the vertex in every slot of every field, -1 for slots without vertex and outside of the grid
+        self.vertex_ids = numpy.where(exists, numpy.cumsum(exists.ravel()).reshape(exists.shape) - 1, -1)
+        self.number_of_vertices = int(exists.sum())
+        vertex_positions = numpy.flatnonzero(exists)
+        self.vertex_field = vertex_positions // 4
+        self.vertex_slot = (vertex_positions % 4).astype(numpy.int8)
+        self.initial_vertex = int(self.vertex_ids[self.point0][0])
+        # Padding by two fields lets the arrays of the next and second next fields be slices in every direction
+        self._padded_field = numpy.pad(self.field, 2, constant_values=-1)
+        self._padded_ids = numpy.pad(self.vertex_ids, ((2, 2), (2, 2), (0, 0)), constant_values=-1)
+
+    def description(self) -> str:
+        return f"Frozen lake with {self.columns}x{self.rows} fields"
+
+    def vertex_names(self, indices) -> list[str]:
+        fields = self.vertex_field[indices]
+        slots = self.vertex_slot[indices]
+        return [f"v_{x}_{y}_{slot & 1}_{slot >> 1}" for x, y, slot in zip((fields // self.rows).tolist(), (fields % self.rows).tolist(), slots.tolist())]
+
+    def vertex_chunks(self):
+        import numpy
+        priorities = numpy.array(_SLOT_PRIORITY, dtype=numpy.uint32)
+        for start in range(0, self.number_of_vertices, self.chunk_size):
+            end = min(self.number_of_vertices, start + self.chunk_size)
+            slots = self.vertex_slot[start:end]
+            yield start, slots % 2 == 0, priorities[self.field.reshape(-1)[self.vertex_field[start:end]], slots]
+
+    def transition_chunks(self):
+        columns_per_chunk = max(1, self.chunk_size // self.rows)
+        for first_column in range(0, self.columns, columns_per_chunk):
+            yield self._column_transitions(first_column, min(self.columns, first_column + columns_per_chunk))
+
+    def _column_transitions(self, first_column: int, end_column: int):
+        """
+        Computes the transitions of all fields in a range of columns.
+        :param first_column: First column of the range
+        :type first_column: int
+        :param end_column: End of the range, exclusive
+        :type end_column: int
+        :return: Start vertices, action indices, edge counts, edge targets and edge probabilities of the transitions
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        import numpy
+        wind, slide = self.wind_probability, self.slide_probability
+        fields = self.field[first_column:end_column]
+        ids = self.vertex_ids[first_column:end_column]
+        field_numbers = numpy.arange(first_column * self.rows, end_column * self.rows).reshape(fields.shape)
+        # Every transition is a field number, a key that orders the transitions of a field, a start vertex, an action and up to four edges
+        parts = []
+
+        def add(mask, key, start, action, targets, probabilities):
+            count = int(mask.sum())
+            edge_targets = numpy.full((count, 4), -1, dtype=numpy.int64)
+            edge_probabilities = numpy.zeros((count, 4))
+            for column, (target, probability) in enumerate(zip(targets, probabilities)):
+                edge_targets[:, column] = target
+                edge_probabilities[:, column] = probability
+            parts.append((field_numbers[mask], numpy.broadcast_to(key, count), start, numpy.full(count, action), edge_targets, edge_probabilities))
+
+        for mask, key, start_slot, end_slot in ((fields == TARGET0, 0, 0, 2), (fields == TARGET1, 0, 2, 0)):
+            add(mask, key, ids[..., start_slot][mask], _CHANGE_TARGET, (ids[..., end_slot][mask],), (1.0,))
+        holes = fields == HOLE
+        add(holes, 0, ids[..., 0][holes], _GO_BACK, (self.vertex_ids[self.point1][0],), (1.0,))
+        add(holes, 1, ids[..., 2][holes], _GO_BACK, (self.vertex_ids[self.point0][0],), (1.0,))
+        for direction, (dx, dy) in enumerate(_DIRECTIONS):
+            next_slice = (slice(2 + first_column + dx, 2 + end_column + dx), slice(2 + dy, 2 + self.rows + dy))
+            second_slice = (slice(2 + first_column + 2 * dx, 2 + end_column + 2 * dx), slice(2 + 2 * dy, 2 + self.rows + 2 * dy))
+            next_fields, second_fields = self._padded_field[next_slice], self._padded_field[second_slice]
+            next_ids, second_ids = self._padded_ids[next_slice], self._padded_ids[second_slice]
+            for layer in (0, 1):
+                # Layer k moves on ice and on the target that is not the current one
+                moving = ((fields == ICE) | (fields == 1 - layer)) & (next_fields != -1)
+                next_field, second_field = next_fields[moving], second_fields[moving]
+                next0, next1 = next_ids[..., 2 * layer][moving], next_ids[..., 2 * layer + 1][moving]
+                second0, second1 = second_ids[..., 2 * layer][moving], second_ids[..., 2 * layer + 1][moving]
+                stops = (next_field == layer) | (next_field == HOLE)
+                slides_on = ~stops & ((second_field == ICE) | (second_field == 1 - layer))
+                slides_into = ~stops & ~slides_on & (second_field != -1)
+                # Reaching the edge of the grid, the current target or a hole ends the move, sliding into them happens with the full slide probability
+                no_slide = ~stops & (second_field == -1)
+                edge_probabilities = numpy.select([stops, no_slide, slides_on], [1.0, 1 - wind, (1 - slide) * (1 - wind)], (1 - slide) * (1 - wind))
+                add(moving, 1 + 4 * direction + numpy.where(next_field == TARGET1, 1 - layer, layer), ids[..., 2 * layer][moving], direction,
+                    (next0,
+                     numpy.select([stops, no_slide], [-1, next1], second0),
+                     numpy.where(slides_on | slides_into, next1, -1),
+                     numpy.where(slides_on, second1, -1)),
+                    (edge_probabilities,
+                     numpy.select([no_slide, slides_on], [wind, slide * (1 - wind)], slide),
+                     (1 - slide) * wind,
+                     slide * wind))
+                add(moving, 1 + 4 * direction + 2 + layer, ids[..., 2 * layer + 1][moving], 4 + direction, (next0,), (1.0,))
+        field_number, key, start, action, edge_targets, edge_probabilities = (numpy.concatenate(column) for column in zip(*parts))
+        order = numpy.lexsort((key, field_number))
+        edge_targets, edge_probabilities = edge_targets[order], edge_probabilities[order]
+        has_edge = edge_targets != -1
+        return start[order], action[order], has_edge.sum(axis=1), edge_targets[has_edge], edge_probabilities[has_edge]
+
+
+def create_frozen_lake(columns: int, rows: int, point0: tuple[int, int] | None = None, point1: tuple[int, int] | None = None, share_of_holes: float = 0.5, wind_probability: float = 0.5, slide_probability: float = 0.5,
+                       seed: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> FrozenLake:
+    """
+    Creates a frozen lake with random targets and holes. Use to_game(), to_arrays() or write() of the result to get the game objects, the game in compressed sparse row form or a file.
+    :param columns: Number of columns in the grid.
+    :type columns: int
+    :param rows: Number of rows in the grid.
+    :type rows: int
+    :param point0: Location of the first target point, if None, a random point will be chosen.
+    :type point0: tuple[int, int] | None
+    :param point1: Location of the second target point, if None, a random point will be chosen.
+    :type point1: tuple[int, int] | None
+    :param share_of_holes: Share of holes in the grid, must be between 0 and 1.
+    :type share_of_holes: float
+    :param wind_probability: Probability of wind having an action after a move, must be between 0 and 1.
+    :type wind_probability: float
+    :param slide_probability: Probability of sliding one field further after a move, must be between 0 and 1.
+    :type slide_probability: float
+    :param seed: Seed of the random target and hole placement, the same seed always creates the same lake. If None, a fresh seed is used.
+    :type seed: int | None
+    :param chunk_size: Number of fields whose transitions are computed at once
+    :type chunk_size: int
+    :return: Frozen lake
+    :rtype: FrozenLake
+    """
+    field, point0, point1 = frozen_lake_field(columns, rows, point0, point1, share_of_holes, seed)
+    return FrozenLake(field, point0, point1, wind_probability, slide_probability, chunk_size)
+
+
+# Offsets of the fields that the guards of the structured encoding look at, named by the directions that lead to them
+_OFFSETS = {"": (0, 0), "l": (-1, 0), "ll": (-2, 0), "r": (1, 0), "rr": (2, 0), "u": (0, -1), "uu": (0, -2), "d": (0, 1), "dd": (0, 2)}
+_DIRECTION_OFFSETS = ("l", "r", "u", "d")
+
+
+def _hole_formula(lake: FrozenLake, dx: int, dy: int) -> str:
+    """
+    Returns a PRISM expression over x and y that is true if the field at (x + dx, y + dy) is a hole, as a disjunction over the runs of holes in each column.
+    :param lake: Frozen lake
+    :type lake: FrozenLake
+    :param dx: Column offset
+    :type dx: int
+    :param dy: Row offset
+    :type dy: int
+    :return: PRISM expression
+    :rtype: str
+    """
+    import numpy
+    columns = []
+    for x in numpy.flatnonzero((lake.field == HOLE).any(axis=1)).tolist():
+        holes = numpy.flatnonzero(lake.field[x] == HOLE)
+        run_starts = holes[numpy.concatenate(([True], numpy.diff(holes) != 1))].tolist()
+        run_ends = holes[numpy.concatenate((numpy.diff(holes) != 1, [True]))].tolist()
+        runs = [f"y={start - dy}" if start == end else f"y>={start - dy} & y<={end - dy}" for start, end in zip(run_starts, run_ends)]
+        columns.append(f"(x={x - dx} & ({' | '.join(runs)}))")
+    return " | ".join(columns) if columns else "false"
+
+
+def _offset_guard(lake: FrozenLake, dx: int, dy: int) -> str:
+    """
+    Returns a PRISM expression that is true if the field at (x + dx, y + dy) lies inside of the grid.
+    """
+    bounds = []
+    if dx < 0:
+        bounds.append(f"x>={-dx}")
+    elif dx > 0:
+        bounds.append(f"x<={lake.columns - 1 - dx}")
+    if dy < 0:
+        bounds.append(f"y>={-dy}")
+    elif dy > 0:
+        bounds.append(f"y<={lake.rows - 1 - dy}")
+    return " & ".join(bounds)
+
+
+def _move(dx: int, dy: int) -> str:
+    """
+    Returns the PRISM update that moves by (dx, dy).
+    """
+    if dx:
+        return f"(x'=x{dx:+d})"
+    return f"(y'=y{dy:+d})"
+
+
+def frozen_lake_to_smgspec(lake: FrozenLake, epsilon: float = None, debug: bool | None = None) -> str:
+    """
+    Converts a frozen lake to a structured SMG specification of the simple stochastic game that spg_to_ssg creates from it.
+    Instead of numbering every vertex and writing one command per transition like ssg_to_smgspec, the state consists of the position x and y, the layer k,
+    b = 1 for the Adam vertices that let the wind blow, g = 1 for the intermediate vertices of the reduction and s for the play (0), v_win (1) and v_lose (2).
+    Holes are given by formulas, the moves by one command per direction and case with boundary guards, so the size of the specification only grows with the number of runs of holes.
+    The game is not made alternating, Eve and Adam own the states in which their actions are enabled.
+    :param lake: Frozen lake to convert
+    :type lake: FrozenLake
+    :param epsilon: Precision parameter of the reduction, see compute_alphas_for_spg
+    :type epsilon: float
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: SMG specification string
+    :rtype: str
+    """
+    import numpy
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    probabilities = set()
+    for _, _, _, _, edge_probabilities in lake.transition_chunks():
+        probabilities.update(numpy.unique(edge_probabilities).tolist())
+    priorities = set()
+    for _, _, labels in lake.vertex_chunks():
+        priorities.update(numpy.unique(labels).tolist())
+    alphas = compute_alphas(lake.number_of_vertices, priorities, probabilities, epsilon=epsilon, max_d=settings.MAX_DENOMINATOR)
+    emission_stage = start_stage("emission")
+    wind, slide = lake.wind_probability, lake.slide_probability
+    (x0, y0), (x1, y1) = lake.point0, lake.point1
+    eve_actions = ["left", "right", "up", "down", "change_target", "go_back", "alpha_e", "win"]
+    adam_actions = ["blow_left", "blow_right", "blow_up", "blow_down", "alpha_a", "lose"]
+    content = ["smg\n\n", f"player eve\n\t{', '.join(f'[{action}]' for action in eve_actions)}\nendplayer\n\n",
+               f"player adam\n\t{', '.join(f'[{action}]' for action in adam_actions)}\nendplayer\n\n"]
+    # h_<offset> is true if the field at the offset is a hole, goal_<offset> if it is the target of the current layer
+    for name, (dx, dy) in _OFFSETS.items():
+        suffix = f"_{name}" if name else ""
+        content.append(f"formula h{suffix} = {_hole_formula(lake, dx, dy)};\n")
+        content.append(f"formula goal{suffix} = (k=0 & x={x0 - dx} & y={y0 - dy}) | (k=1 & x={x1 - dx} & y={y1 - dy});\n")
+    content.append(f"\nmodule lake\n\tx : [0..{max(1, lake.columns - 1)}] init {x0} ;\n\ty : [0..{max(1, lake.rows - 1)}] init {y0} ;\n"
+                   "\tk : [0..1] init 0 ;\n\tb : [0..1] init 0 ;\n\tg : [0..1] init 0 ;\n\ts : [0..2] init 0 ;\n")
+    for action, near in zip(FROZEN_LAKE_ACTIONS, _DIRECTION_OFFSETS):
+        dx, dy = _OFFSETS[near]
+        far = near * 2
+        move, slide_move = _move(dx, dy), _move(2 * dx, 2 * dy)
+        # Eve moves on ice and on the target of the other layer, the move ends at the edge of the grid, at the current target or in a hole
+        guard = f"s=0 & g=0 & b=0 & !h & !goal & {_offset_guard(lake, dx, dy)}"
+        content.append(f"\t[{action}] {guard} & (h_{near} | goal_{near}) \t-> {move} & (g'=1) ;\n")
+        content.append(f"\t[{action}] {guard} & !h_{near} & !goal_{near} & !({_offset_guard(lake, 2 * dx, 2 * dy)}) \t-> "
+                       f"{1 - wind} : {move} & (g'=1) + {wind} : {move} & (b'=1) & (g'=1) ;\n")
+        content.append(f"\t[{action}] {guard} & !h_{near} & !goal_{near} & {_offset_guard(lake, 2 * dx, 2 * dy)} & !h_{far} & !goal_{far} \t-> "
+                       f"{(1 - slide) * (1 - wind)} : {move} & (g'=1) + {slide * (1 - wind)} : {slide_move} & (g'=1) + "
+                       f"{(1 - slide) * wind} : {move} & (b'=1) & (g'=1) + {slide * wind} : {slide_move} & (b'=1) & (g'=1) ;\n")
+        content.append(f"\t[{action}] {guard} & !h_{near} & !goal_{near} & {_offset_guard(lake, 2 * dx, 2 * dy)} & (h_{far} | goal_{far}) \t-> "
+                       f"{(1 - slide) * (1 - wind)} : {move} & (g'=1) + {slide} : {slide_move} & (g'=1) + {(1 - slide) * wind} : {move} & (b'=1) & (g'=1) ;\n")
+        content.append(f"\t[blow_{action}] s=0 & g=0 & b=1 & {_offset_guard(lake, dx, dy)} \t-> {move} & (b'=0) & (g'=1) ;\n")
+    content.append("\t[change_target] s=0 & g=0 & b=0 & goal \t-> (k'=1-k) & (g'=1) ;\n")
+    content.append(f"\t[go_back] s=0 & g=0 & b=0 & h & k=0 \t-> (x'={x1}) & (y'={y1}) & (g'=1) ;\n")
+    content.append(f"\t[go_back] s=0 & g=0 & b=0 & h & k=1 \t-> (x'={x0}) & (y'={y0}) & (k'=0) & (g'=1) ;\n")
+    # Intermediate vertices of the reduction: with probability alpha of the priority the play ends in v_win (even) or v_lose (odd), otherwise it returns to the vertex
+    win, lose = "(s'=1) & (x'=0) & (y'=0) & (k'=0) & (b'=0) & (g'=0)", "(s'=2) & (x'=0) & (y'=0) & (k'=0) & (b'=0) & (g'=0)"
+    for action, guard, priority in (("alpha_a", "b=0 & goal", 2), ("alpha_a", "b=0 & h", 1), ("alpha_a", "b=0 & !h & !goal", 3), ("alpha_e", "b=1", 3)):
+        if priority in alphas:
+            alpha = alphas[priority]
+            content.append(f"\t[{action}] s=0 & g=1 & {guard} \t-> {alpha} : {win if priority % 2 == 0 else lose} + {1 - alpha} : (g'=0) ;\n")
+    content.append("\t[win] s=1 \t-> true ;\n\t[lose] s=2 \t-> true ;\nendmodule\n\nlabel \"target\" = (s=1);")
+    smg_spec = "".join(content)
+    emission_stage.stop()
+    if debug:
+        print_debug(f"Structured SMG specification of the {lake.columns}x{lake.rows} frozen lake created in {(time.perf_counter() - start_time):.6f} seconds")
+    return smg_spec
+
+
+def _prism_expression_to_python(expression: str) -> str:
+    """
+    Translates the PRISM expressions written by frozen_lake_to_smgspec to Python expressions.
+    """
+    expression = re.sub(r"(?<![<>!=])=(?!=)", "==", expression)
+    return expression.replace("&", " and ").replace("|", " or ").replace("!", " not ").replace("true", "True").replace("false", "False")
+
+
+def _expand_smgspec(smg_spec: str) -> tuple[dict, dict]:
+    """
+    Builds the reachable states of a single module SMG specification as written by frozen_lake_to_smgspec.
+    :param smg_spec: SMG specification
+    :type smg_spec: str
+    :return: Owner of every state (True for Eve) and the distributions of the enabled commands of every state, states are tuples of the variable values
+    :rtype: tuple[dict[tuple, bool], dict[tuple, list[list[tuple[float, tuple]]]]]
+    """
+    owners = {action: player == "eve" for player, actions in re.findall(r"player (\w+)\n\t(.*)\nendplayer", smg_spec) for action in re.findall(r"\[(\w+)\]", actions)}
+    formulas = [(name, compile(_prism_expression_to_python(expression), name, "eval")) for name, expression in re.findall(r"formula (\w+) = (.*);", smg_spec)]
+    variables = re.findall(r"\t(\w+) : \[-?\d+\.\.-?\d+\] init (-?\d+) ;", smg_spec)
+    names = [name for name, _ in variables]
+    commands = []
+    for action, guard, updates in re.findall(r"\t\[(\w+)\] (.*?) \t-> (.*) ;", smg_spec):
+        branches = []
+        for update in updates.split(" + "):
+            probability, assignments = update.split(" : ") if " : " in update else ("1", update)
+            branches.append((eval(probability), [(names.index(variable), compile(_prism_expression_to_python(value), variable, "eval")) for variable, value in re.findall(r"\((\w+)'=([^)]*)\)", assignments)]))
+        commands.append((action, compile(_prism_expression_to_python(guard), action, "eval"), branches))
+    initial_state = tuple(int(value) for _, value in variables)
+    state_owners, distributions = {}, {}
+    stack = [initial_state]
+    while stack:
+        state = stack.pop()
+        if state in distributions:
+            continue
+        environment = dict(zip(names, state))
+        for name, formula in formulas:
+            environment[name] = eval(formula, {}, environment)
+        distributions[state] = []
+        for action, guard, branches in commands:
+            if not eval(guard, {}, environment):
+                continue
+            if state_owners.setdefault(state, owners[action]) != owners[action]:
+                raise ValueError(f"State {state} has actions of both players")
+            distribution = []
+            for probability, assignments in branches:
+                successor = list(state)
+                for index, value in assignments:
+                    successor[index] = eval(value, {}, environment)
+                distribution.append((probability, tuple(successor)))
+                stack.append(tuple(successor))
+            distributions[state].append(distribution)
+    return state_owners, distributions
+
+
+def cross_check_frozen_lake_encoding(lake: FrozenLake, epsilon: float = None, check_with_prism: bool = False, tolerance: float = 1e-6, debug: bool | None = None) -> bool:
+    """
+    Checks the structured encoding of frozen_lake_to_smgspec against the enumerated encoding of small lakes.
+    The reachable states of the structured specification are expanded and compared with the simple stochastic game of spg_to_ssg, vertex by vertex.
+    With check_with_prism, PRISM also checks the target reachability of both specifications and the values are compared.
+    :param lake: Frozen lake to check, small enough to create the game objects
+    :type lake: FrozenLake
+    :param epsilon: Precision parameter of the reduction, see compute_alphas_for_spg
+    :type epsilon: float
+    :param check_with_prism: Whether to compare the values computed by PRISM as well
+    :type check_with_prism: bool
+    :param tolerance: Maximum difference of the values computed by PRISM
+    :type tolerance: float
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: True if both encodings describe the same game
+    :rtype: bool
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    structured_spec = frozen_lake_to_smgspec(lake, epsilon=epsilon, debug=debug)
+    ssg = spg_to_ssg(lake.to_game(), epsilon=epsilon, use_cache=False)
+    owners, distributions = _expand_smgspec(structured_spec)
+
+    def vertex_name(state):
+        x, y, k, b, g, s = state
+        return "v_win" if s == 1 else "v_lose" if s == 2 else f"v_{x}_{y}_{b}_{k}" + ("'" if g else "")
+
+    def canonical(distribution):
+        return sorted((name, float(probability)) for probability, name in distribution)
+
+    def same(first, second):
+        return len(first) == len(second) and all(name1 == name2 and math.isclose(p1, p2, rel_tol=1e-9) for (name1, p1), (name2, p2) in zip(first, second))
+
+    ssg_distributions = {}
+    for transition in ssg.transitions.values():
+        ssg_distributions.setdefault(transition.start_vertex.name, []).append(canonical((probability, vertex.name) for probability, vertex in transition.end_vertices))
+    reachable = {ssg.init_vertex.name}
+    stack = [ssg.init_vertex.name]
+    while stack:
+        for distribution in ssg_distributions.get(stack.pop(), []):
+            for name, _ in distribution:
+                if name not in reachable:
+                    reachable.add(name)
+                    stack.append(name)
+    consistent = True
+    if reachable != {vertex_name(state) for state in distributions}:
+        print_warning(f"The structured encoding reaches {len(distributions)} states, the enumerated encoding {len(reachable)} vertices")
+        consistent = False
+    for state, state_distributions in distributions.items():
+        name = vertex_name(state)
+        if name not in ssg.vertices:
+            continue
+        if owners.get(state) != ssg.vertices[name].is_eve:
+            print_warning(f"State {name} has a different owner in the structured encoding")
+            consistent = False
+        expected = sorted(ssg_distributions.get(name, []))
+        actual = sorted(canonical((probability, vertex_name(successor)) for probability, successor in distribution) for distribution in state_distributions)
+        if len(expected) != len(actual) or not all(same(first, second) for first, second in zip(expected, actual)):
+            print_warning(f"State {name} has different transitions in the structured encoding")
+            consistent = False
+    if check_with_prism:
+        from ssg_to_smg import ssg_to_smgspec, check_smgspec_target_reachability
+        structured_results = check_smgspec_target_reachability(structured_spec, debug=debug)
+        enumerated_results = check_smgspec_target_reachability(ssg_to_smgspec(ssg, debug=debug, use_cache=False), debug=debug)
+        for structured, enumerated, kind in zip(structured_results, enumerated_results, ("Minimum", "Maximum")):
+            if not structured.ok or not enumerated.ok:
+                print_warning(f"{kind} target reachability could not be checked by PRISM")
+                consistent = False
+            elif abs(structured.value - enumerated.value) > tolerance:
+                print_warning(f"{kind} target reachability is {structured.value} in the structured and {enumerated.value} in the enumerated encoding")
+                consistent = False
+    if debug:
+        print_debug(f"Structured encoding of the {lake.columns}x{lake.rows} frozen lake {'matches' if consistent else 'does not match'} the enumerated encoding")
+    return consistent
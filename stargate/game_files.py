@@ -0,0 +1,614 @@
+import contextlib
+import gc
+import os
+import struct
+import time
+
+from typing import Iterator
+
+from error_handling import print_debug, print_error, print_warning
+from run_report import measured
+from simplestochasticgame import SsgVertex, SsgTransition, SimpleStochasticGame
+from stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame
+from probability_table import probability_string
+from integer_distribution import IntegerDistributions
+import settings
+
+# Binary game files start with a header, followed by blocks of a block header (type and number of records) and an array of records.
+# An optional block with the newline separated action names comes first, then all vertex blocks, pairs of a transition block and the edge block of its transitions, and an end block.
+BINARY_MAGIC = b"STGB"
+BINARY_VERSION = 1
+BINARY_KINDS = {"spg": 0, "ssg": 1}
+BINARY_EXTENSIONS = {"spg": ".spgb", "ssg": ".ssgb"}
+_HEADER = struct.Struct("<4sBBxxQQ")
+_BLOCK_HEADER = struct.Struct("<BQ")
+_END_BLOCK, _VERTEX_BLOCK, _TRANSITION_BLOCK, _EDGE_BLOCK, _ACTION_BLOCK = 0, 1, 2, 3, 4
+# Vertex label is the priority of an SPG vertex and 1 for an SSG target vertex
+_VERTEX_RECORD = [("is_eve", "u1"), ("label", "<u4")]
+_TRANSITION_RECORD = [("start", "<u8"), ("action", "<u4"), ("edges", "u1")]
+_EDGE_RECORD = [("probability", "<f8"), ("target", "<u8")]
+_VERTEX_PREFIX = {"spg": "v_", "ssg": "vertex_"}
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+@contextlib.contextmanager
+def paused_garbage_collection() -> Iterator[None]:
+    """
+    Pauses the cyclic garbage collector while a large game is built. The millions of vertex, transition and tuple objects of a game would
+    otherwise trigger many collections that find nothing to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _chunks(total: int, chunk_size: int) -> Iterator[tuple[int, int, int]]:
+    """
+    Splits the indices 0, ..., total - 1 into consecutive chunks.
+    :param total: Number of indices
+    :type total: int
+    :param chunk_size: Maximum number of indices per chunk
+    :type chunk_size: int
+    :return: Iterator over the index, first index and end index of every chunk
+    :rtype: Iterator[tuple[int, int, int]]
+    """
+    for chunk_index, start in enumerate(range(0, total, chunk_size)):
+        yield chunk_index, start, min(total, start + chunk_size)
+
+
+class GameSource:
+    """
+    Game that is available as chunks of arrays instead of game objects. Vertices are numbered 0, ..., number_of_vertices - 1.
+    Subclasses set kind ("spg" or "ssg"), number_of_vertices, initial_vertex and action_names and implement vertex_chunks and transition_chunks.
+    """
+    kind: str
+    number_of_vertices: int
+    initial_vertex: int
+    action_names: list[str]
+
+    def vertex_chunks(self):
+        """
+        Returns the vertices in the order of their numbers.
+        :return: Iterator over the first vertex, the owners (True for Eve) and the labels (priorities of an SPG, target flags of an SSG) of every chunk
+        :rtype: Iterator[tuple[int, numpy.ndarray, numpy.ndarray]]
+        """
+        raise NotImplementedError
+
+    def transition_chunks(self):
+        """
+        Returns the transitions in compressed sparse row form. A transition has edge_counts[i] consecutive edges in the edge arrays of its chunk.
+        :return: Iterator over the start vertices, action indices, edge counts, edge targets and edge probabilities of every chunk
+        :rtype: Iterator[tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]]
+        """
+        raise NotImplementedError
+
+    def vertex_names(self, indices) -> list[str]:
+        """
+        Returns the names of vertices, like those of create_random_spg and create_random_ssg.
+        :param indices: Numbers of the vertices
+        :type indices: numpy.ndarray
+        :return: Names of the vertices
+        :rtype: list[str]
+        """
+        prefix = _VERTEX_PREFIX[self.kind]
+        return [f"{prefix}{index}" for index in indices.tolist()]
+
+    def description(self) -> str:
+        """
+        :return: Short description of the game for debug output
+        :rtype: str
+        """
+        return f"{self.kind.upper()} with {self.number_of_vertices} vertices"
+
+    def to_arrays(self) -> "GameArrays":
+        """
+        Collects all chunks into a single GameArrays object.
+        :return: Game in compressed sparse row form
+        :rtype: GameArrays
+        """
+        import numpy
+        vertex_chunks = list(self.vertex_chunks())
+        transition_chunks = list(self.transition_chunks())
+
+        def concatenate(chunks, column, dtype):
+            return numpy.concatenate([chunk[column] for chunk in chunks]) if chunks else numpy.empty(0, dtype=dtype)
+        edge_counts = concatenate(transition_chunks, 2, numpy.int64)
+        edge_offsets = numpy.zeros(len(edge_counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(edge_counts, out=edge_offsets[1:])
+        return GameArrays(self.kind, concatenate(vertex_chunks, 1, bool), concatenate(vertex_chunks, 2, numpy.uint32), self.initial_vertex,
+                          concatenate(transition_chunks, 0, numpy.int64), concatenate(transition_chunks, 1, numpy.int64), edge_offsets,
+                          concatenate(transition_chunks, 3, numpy.int64), concatenate(transition_chunks, 4, numpy.float64), self.action_names, self.vertex_names)
+
+    def to_game(self) -> StochasticParityGame | SimpleStochasticGame:
+        """
+        Creates the game objects.
+        :return: Stochastic parity game or simple stochastic game
+        :rtype: StochasticParityGame | SimpleStochasticGame
+        """
+        import numpy
+        with paused_garbage_collection():
+            vertex_list = []
+            for start, is_eve, labels in self.vertex_chunks():
+                names = self.vertex_names(numpy.arange(start, start + len(is_eve)))
+                if self.kind == "spg":
+                    vertex_list.extend(SpgVertex(name, eve, label) for name, eve, label in zip(names, is_eve.tolist(), labels.tolist()))
+                else:
+                    vertex_list.extend(SsgVertex(name, eve, bool(label)) for name, eve, label in zip(names, is_eve.tolist(), labels.tolist()))
+            if len(vertex_list) != self.number_of_vertices:
+                print_error(f"{self.description()} declares {self.number_of_vertices} vertices but contains {len(vertex_list)}")
+            transition_class = SpgTransition if self.kind == "spg" else SsgTransition
+            exact_arithmetic = settings.USE_EXACT_ARITHMETIC
+            integer_probabilities = settings.INTEGER_PROBABILITIES
+            # With integer probabilities the distributions are checked in bulk after the game is built
+            check_in_bulk = exact_arithmetic and integer_probabilities
+            transitions = {}
+            for starts, actions, edge_counts, edge_targets, edge_probabilities in self.transition_chunks():
+                targets = edge_targets.tolist()
+                probabilities = edge_probabilities.tolist()
+                edge_index = 0
+                for start, action, count in zip(starts.tolist(), actions.tolist(), edge_counts.tolist()):
+                    vertex = vertex_list[start]
+                    action_name = self.action_names[action]
+                    end_vertices = {(probabilities[i], vertex_list[targets[i]]) for i in range(edge_index, edge_index + count)}
+                    edge_index += count
+                    transitions[(vertex, action_name)] = transition_class(vertex, end_vertices, action_name, exact_arithmetic, integer_probabilities, not check_in_bulk)
+            vertices = {vertex.name: vertex for vertex in vertex_list}
+            game_class = StochasticParityGame if self.kind == "spg" else SimpleStochasticGame
+            game = game_class(vertices, transitions, vertex_list[self.initial_vertex])
+        if check_in_bulk:
+            for transition in IntegerDistributions.from_game(game).invalid_transitions():
+                print_warning(f"Probabilities of edge from {transition.start_vertex.name} with action {transition.action} are negative or do not add up to 1")
+        return game
+
+    def write(self, file_name: str, binary: bool = False, use_global_path: bool = False, force: bool = False, debug: bool | None = None) -> str | None:
+        """
+        Streams the game to a file, in the text format of its kind or in the binary game format, without creating the game objects.
+        :param file_name: Name of the file, must end with .spg or .ssg or, if binary, with .spgb or .ssgb
+        :type file_name: str
+        :param binary: Whether to write the binary game format
+        :type binary: bool
+        :param use_global_path: If True, the file_name is joined with the global_in_out_path
+        :type use_global_path: bool
+        :param force: True if the file should be overwritten if it already exists
+        :type force: bool
+        :param debug: True if debug information should be printed
+        :type debug: bool | None
+        :return: Path of the written file or None if nothing was written
+        :rtype: str | None
+        """
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        if use_global_path:
+            file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
+        extension = BINARY_EXTENSIONS[self.kind] if binary else f".{self.kind}"
+        if not file_name.endswith(extension):
+            print_warning(f"File {file_name} is not an {extension} file. Nothing was changed")
+            return None
+        if not force and os.path.exists(file_name) and os.path.getsize(file_name) != 0:
+            print_warning(f"File {file_name} already exists. Nothing was changed")
+            return None
+        if debug:
+            start_time = time.perf_counter()
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Written under a temporary name, so that an interrupted run never leaves a truncated game behind
+        temporary_file_name = f"{file_name}.{os.getpid()}.part"
+        try:
+            if binary:
+                with open(temporary_file_name, "wb") as file:
+                    _write_binary_game(file, self)
+            else:
+                with open(temporary_file_name, "w", buffering=1 << 20) as file:
+                    _write_text_game(file, self)
+            os.replace(temporary_file_name, file_name)
+        finally:
+            if os.path.exists(temporary_file_name):
+                os.remove(temporary_file_name)
+        if debug:
+            print_debug(f"{self.description()} written to {file_name} in {(time.perf_counter() - start_time):.6f} seconds")
+        return file_name
+
+
+class GameArrays(GameSource):
+    def __init__(self, kind: str, is_eve, labels, initial_vertex: int, transition_start, transition_action, edge_offsets, edge_target, edge_probability, action_names: list[str], vertex_names=None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Game in compressed sparse row form: the edges of transition i are edge_target[edge_offsets[i]:edge_offsets[i + 1]] with the probabilities at the same positions.
+        :param kind: "spg" or "ssg"
+        :type kind: str
+        :param is_eve: Owner of every vertex, True for Eve
+        :type is_eve: numpy.ndarray
+        :param labels: Priority of every SPG vertex or target flag of every SSG vertex
+        :type labels: numpy.ndarray
+        :param initial_vertex: Number of the initial vertex
+        :type initial_vertex: int
+        :param transition_start: Start vertex of every transition
+        :type transition_start: numpy.ndarray
+        :param transition_action: Index into action_names of every transition
+        :type transition_action: numpy.ndarray
+        :param edge_offsets: Offset of the first edge of every transition, followed by the number of edges
+        :type edge_offsets: numpy.ndarray
+        :param edge_target: Target vertex of every edge
+        :type edge_target: numpy.ndarray
+        :param edge_probability: Probability of every edge
+        :type edge_probability: numpy.ndarray
+        :param action_names: Names of the actions
+        :type action_names: list[str]
+        :param vertex_names: Function that returns the names of an array of vertices, if None the vertices are named like those of create_random_spg and create_random_ssg
+        :type vertex_names: Callable[[numpy.ndarray], list[str]] | None
+        :param chunk_size: Number of transitions per chunk when the game is written or converted
+        :type chunk_size: int
+        """
+        if kind not in BINARY_KINDS:
+            raise ValueError(f"Unknown game kind {kind}")
+        self.kind = kind
+        self.is_eve = is_eve
+        self.labels = labels
+        self.number_of_vertices = len(is_eve)
+        self.initial_vertex = int(initial_vertex)
+        self.transition_start = transition_start
+        self.transition_action = transition_action
+        self.edge_offsets = edge_offsets
+        self.edge_target = edge_target
+        self.edge_probability = edge_probability
+        self.action_names = action_names
+        self.chunk_size = max(1, chunk_size)
+        if vertex_names is not None:
+            self.vertex_names = vertex_names
+
+    def vertex_chunks(self):
+        for _, start, end in _chunks(self.number_of_vertices, self.chunk_size):
+            yield start, self.is_eve[start:end], self.labels[start:end]
+
+    def transition_chunks(self):
+        for _, start, end in _chunks(len(self.transition_start), self.chunk_size):
+            first_edge, end_edge = int(self.edge_offsets[start]), int(self.edge_offsets[end])
+            yield (self.transition_start[start:end], self.transition_action[start:end], self.edge_offsets[start + 1:end + 1] - self.edge_offsets[start:end],
+                   self.edge_target[first_edge:end_edge], self.edge_probability[first_edge:end_edge])
+
+    def to_arrays(self) -> "GameArrays":
+        return self
+
+
+class _RandomGameStream(GameSource):
+    def __init__(self, kind: str, number_of_vertices: int, number_of_outgoing_transitions: int, number_of_priorities: int = 1, number_of_target_vertices: int = 0, seed: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Random game that is generated chunk by chunk, so that it can be written without holding more than one chunk in memory.
+        Every chunk has its own generator derived from the seed, which lets the vertices be generated again for each section of a file.
+        The distributions are those of create_random_spg and create_random_ssg, the same seed does not create the same game as these functions though.
+        :param kind: "spg" or "ssg"
+        :type kind: str
+        :param number_of_vertices: Number of vertices, at least 2
+        :type number_of_vertices: int
+        :param number_of_outgoing_transitions: Number of outgoing transitions for each vertex, at least 1
+        :type number_of_outgoing_transitions: int
+        :param number_of_priorities: Number of priorities of an SPG
+        :type number_of_priorities: int
+        :param number_of_target_vertices: Number of target vertices of an SSG
+        :type number_of_target_vertices: int
+        :param seed: Seed of the game, if None a fresh seed is used
+        :type seed: int | None
+        :param chunk_size: Number of vertices or transitions that are generated at once
+        :type chunk_size: int
+        """
+        import numpy
+        if kind not in BINARY_KINDS:
+            raise ValueError(f"Unknown game kind {kind}")
+        if number_of_vertices < 2:
+            raise ValueError("A random game needs at least two vertices")
+        if number_of_outgoing_transitions < 1:
+            raise ValueError("A random game needs at least one outgoing transition per vertex")
+        if not 0 <= number_of_target_vertices <= number_of_vertices:
+            raise ValueError(f"Cannot choose {number_of_target_vertices} target vertices among {number_of_vertices} vertices")
+        self.kind = kind
+        self.number_of_vertices = number_of_vertices
+        self.number_of_outgoing_transitions = number_of_outgoing_transitions
+        self.number_of_priorities = number_of_priorities
+        self.action_names = [f"action_{i}" for i in range(number_of_outgoing_transitions)]
+        self.seed = numpy.random.SeedSequence(seed).entropy
+        self.chunk_size = max(1, chunk_size)
+        self.vertices_per_transition_chunk = max(1, self.chunk_size // number_of_outgoing_transitions)
+        plan = self._generator(0)
+        self.initial_vertex = int(plan.integers(0, number_of_vertices))
+        # Number of targets per vertex chunk, drawn sequentially so that the target set is uniform among all sets of its size
+        self.targets_per_chunk = []
+        remaining_targets = number_of_target_vertices
+        for _, start, end in _chunks(number_of_vertices, self.chunk_size):
+            targets = int(plan.hypergeometric(remaining_targets, number_of_vertices - start - remaining_targets, end - start)) if remaining_targets else 0
+            self.targets_per_chunk.append(targets)
+            remaining_targets -= targets
+
+    def _generator(self, section: int, chunk_index: int = 0):
+        """
+        Returns the generator of a chunk.
+        :param section: 0 for the initial vertex and targets, 1 for vertices, 2 for transitions
+        :type section: int
+        :param chunk_index: Index of the chunk
+        :type chunk_index: int
+        :return: Generator of the chunk
+        :rtype: numpy.random.Generator
+        """
+        import numpy
+        return numpy.random.default_rng([self.seed, section, chunk_index])
+
+    def description(self) -> str:
+        return f"Random {self.kind.upper()} with {self.number_of_vertices} vertices and seed {self.seed}"
+
+    def vertex_chunks(self):
+        import numpy
+        for chunk_index, start, end in _chunks(self.number_of_vertices, self.chunk_size):
+            rng = self._generator(1, chunk_index)
+            is_eve = rng.integers(0, 2, end - start).astype(bool)
+            if self.kind == "spg":
+                labels = rng.integers(0, self.number_of_priorities, end - start)
+            else:
+                labels = numpy.zeros(end - start, dtype=numpy.uint32)
+                labels[rng.choice(end - start, size=self.targets_per_chunk[chunk_index], replace=False)] = 1
+            yield start, is_eve, labels
+
+    def transition_chunks(self):
+        """
+        Generates the transitions. The first action of a vertex moves to two distinct successors with probability 0.5 each, every further action does so or moves to a single successor, each with probability 0.5.
+        """
+        import numpy
+        for chunk_index, start, end in _chunks(self.number_of_vertices, self.vertices_per_transition_chunk):
+            rng = self._generator(2, chunk_index)
+            shape = (end - start, self.number_of_outgoing_transitions)
+            single_successor = rng.integers(0, 2, shape).astype(bool)
+            single_successor[:, 0] = False
+            first = rng.integers(0, self.number_of_vertices, shape)
+            second = rng.integers(0, self.number_of_vertices - 1, shape)
+            second += second >= first
+            single = single_successor.ravel()
+            # A transition with two successors has its first and then its second successor as edges
+            keep = numpy.stack([numpy.ones_like(single), ~single], axis=1)
+            yield (numpy.repeat(numpy.arange(start, end), shape[1]), numpy.tile(numpy.arange(shape[1]), shape[0]), numpy.where(single, 1, 2),
+                   numpy.stack([first.ravel(), second.ravel()], axis=1)[keep], numpy.stack([numpy.where(single, 1.0, 0.5), numpy.full(len(single), 0.5)], axis=1)[keep])
+
+
+def _write_text_game(file, source: GameSource) -> None:
+    """
+    Writes a game in the .spg or .ssg specification format.
+    :param file: Text file to write to
+    :type file: TextIO
+    :param source: Game to write
+    :type source: GameSource
+    """
+    import numpy
+    file.write(f"{source.kind}\n\n")
+    for section, owner in (("evevertices", True), ("adamvertices", False)):
+        file.write(f"{section}\n")
+        for start, is_eve, labels in source.vertex_chunks():
+            names = source.vertex_names(numpy.arange(start, start + len(is_eve)))
+            if source.kind == "spg":
+                file.writelines(f"\t{name} : {label}\n" for name, eve, label in zip(names, is_eve.tolist(), labels.tolist()) if eve == owner)
+            else:
+                file.writelines(f"\t{name} T\n" if label else f"\t{name}\n" for name, eve, label in zip(names, is_eve.tolist(), labels.tolist()) if eve == owner)
+        file.write(f"end{section}\n\n")
+    file.write(f"initialvertex : {source.vertex_names(numpy.array([source.initial_vertex]))[0]}\n\ntransitions\n")
+    for starts, actions, edge_counts, edge_targets, edge_probabilities in source.transition_chunks():
+        start_names = source.vertex_names(starts)
+        target_names = source.vertex_names(edge_targets)
+        probabilities = edge_probabilities.tolist()
+        # Games have few distinct probabilities, formatting each of them once is much faster than formatting every edge
+        probability_texts = {probability: probability_string(probability) for probability in set(probabilities)}
+        edges = [f"{probability_texts[probability]} | {target}" for probability, target in zip(probabilities, target_names)]
+        action_names = source.action_names
+        lines = []
+        edge_index = 0
+        for name, action, count in zip(start_names, actions.tolist(), edge_counts.tolist()):
+            if count == 1 and probabilities[edge_index] == 1.0:
+                lines.append(f"\t{name} {action_names[action]} : {target_names[edge_index]}\n")
+            else:
+                lines.append(f"\t{name} {action_names[action]} : {' + '.join(edges[edge_index:edge_index + count])}\n")
+            edge_index += count
+        file.writelines(lines)
+    file.write("endtransitions")
+
+
+def _write_binary_game(file, source: GameSource) -> None:
+    """
+    Writes a game in the binary game format.
+    :param file: Binary file to write to
+    :type file: BinaryIO
+    :param source: Game to write
+    :type source: GameSource
+    """
+    import numpy
+    file.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, BINARY_KINDS[source.kind], source.number_of_vertices, source.initial_vertex))
+    action_names = "\n".join(source.action_names).encode()
+    file.write(_BLOCK_HEADER.pack(_ACTION_BLOCK, len(action_names)))
+    file.write(action_names)
+    for start, is_eve, labels in source.vertex_chunks():
+        vertices = numpy.empty(len(is_eve), dtype=_VERTEX_RECORD)
+        vertices["is_eve"] = is_eve
+        vertices["label"] = labels
+        file.write(_BLOCK_HEADER.pack(_VERTEX_BLOCK, len(vertices)))
+        file.write(vertices.tobytes())
+    for starts, actions, edge_counts, edge_targets, edge_probabilities in source.transition_chunks():
+        transitions = numpy.empty(len(starts), dtype=_TRANSITION_RECORD)
+        transitions["start"] = starts
+        transitions["action"] = actions
+        transitions["edges"] = edge_counts
+        edges = numpy.empty(len(edge_targets), dtype=_EDGE_RECORD)
+        edges["target"] = edge_targets
+        edges["probability"] = edge_probabilities
+        file.write(_BLOCK_HEADER.pack(_TRANSITION_BLOCK, len(transitions)))
+        file.write(transitions.tobytes())
+        file.write(_BLOCK_HEADER.pack(_EDGE_BLOCK, len(edges)))
+        file.write(edges.tobytes())
+    file.write(_BLOCK_HEADER.pack(_END_BLOCK, 0))
+
+
+def write_random_spg_file(file_name: str, number_of_vertices: int, number_of_outgoing_transitions: int, number_of_priorities: int, seed: int | None = None, binary: bool = False, use_global_path: bool = False, force: bool = False,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, debug: bool | None = None) -> str | None:
+    """
+    Generates a random stochastic parity game and streams it to a .spg file (or a binary .spgb file) without creating the game objects.
+    Memory stays bounded by chunk_size, independent of the size of the game. The distributions are those of create_random_spg.
+    :param file_name: Name of the file, must end with .spg or, if binary, with .spgb
+    :type file_name: str
+    :param number_of_vertices: Number of vertices in the game, at least 2
+    :type number_of_vertices: int
+    :param number_of_outgoing_transitions: Number of outgoing transitions for each vertex
+    :type number_of_outgoing_transitions: int
+    :param number_of_priorities: Number of priorities in the game
+    :type number_of_priorities: int
+    :param seed: Seed of the game, the same seed always writes the same file. If None, a fresh seed is used
+    :type seed: int | None
+    :param binary: Whether to write the binary game format
+    :type binary: bool
+    :param use_global_path: If True, the file_name is joined with the global_in_out_path
+    :type use_global_path: bool
+    :param force: True if the file should be overwritten if it already exists
+    :type force: bool
+    :param chunk_size: Number of vertices or transitions that are generated and written at once
+    :type chunk_size: int
+    :param debug: True if debug information should be printed
+    :type debug: bool | None
+    :return: Path of the written file or None if nothing was written
+    :rtype: str | None
+    """
+    stream = _RandomGameStream("spg", number_of_vertices, number_of_outgoing_transitions, number_of_priorities=number_of_priorities, seed=seed, chunk_size=chunk_size)
+    return stream.write(file_name, binary=binary, use_global_path=use_global_path, force=force, debug=debug)
+
+
+def write_random_ssg_file(file_name: str, number_of_vertices: int, number_of_transitions: int, number_of_target_vertices: int, seed: int | None = None, binary: bool = False, use_global_path: bool = False, force: bool = False,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, debug: bool | None = None) -> str | None:
+    """
+    Generates a random simple stochastic game and streams it to a .ssg file (or a binary .ssgb file) without creating the game objects.
+    Memory stays bounded by chunk_size, independent of the size of the game. The distributions are those of create_random_ssg.
+    :param file_name: Name of the file, must end with .ssg or, if binary, with .ssgb
+    :type file_name: str
+    :param number_of_vertices: Number of vertices in the game, at least 2
+    :type number_of_vertices: int
+    :param number_of_transitions: Number of outgoing transitions for each vertex
+    :type number_of_transitions: int
+    :param number_of_target_vertices: Number of target vertices in the game
+    :type number_of_target_vertices: int
+    :param seed: Seed of the game, the same seed always writes the same file. If None, a fresh seed is used
+    :type seed: int | None
+    :param binary: Whether to write the binary game format
+    :type binary: bool
+    :param use_global_path: If True, the file_name is joined with the global_in_out_path
+    :type use_global_path: bool
+    :param force: True if the file should be overwritten if it already exists
+    :type force: bool
+    :param chunk_size: Number of vertices or transitions that are generated and written at once
+    :type chunk_size: int
+    :param debug: True if debug information should be printed
+    :type debug: bool | None
+    :return: Path of the written file or None if nothing was written
+    :rtype: str | None
+    """
+    stream = _RandomGameStream("ssg", number_of_vertices, number_of_transitions, number_of_target_vertices=number_of_target_vertices, seed=seed, chunk_size=chunk_size)
+    return stream.write(file_name, binary=binary, use_global_path=use_global_path, force=force, debug=debug)
+
+
+def iter_binary_game_blocks(file_name: str):
+    """
+    Reads a binary game file block by block.
+    :param file_name: Path of a .spgb or .ssgb file
+    :type file_name: str
+    :return: Iterator that first yields the kind ("spg" or "ssg"), the number of vertices and the initial vertex, then ("actions", action names), ("vertices", records) and ("transitions", transition records, edge records) for every block
+    :rtype: Iterator[tuple]
+    """
+    import numpy
+    with open(file_name, "rb") as file:
+        magic, version, kind, number_of_vertices, initial_vertex = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{file_name} is not a binary game file")
+        if version != BINARY_VERSION:
+            raise ValueError(f"{file_name} has binary game format version {version}, only version {BINARY_VERSION} is supported")
+        kinds = {value: name for name, value in BINARY_KINDS.items()}
+        if kind not in kinds:
+            raise ValueError(f"{file_name} contains an unknown game kind {kind}")
+        yield kinds[kind], number_of_vertices, initial_vertex
+        while True:
+            header = file.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                raise ValueError(f"{file_name} is truncated")
+            block_type, count = _BLOCK_HEADER.unpack(header)
+            if block_type == _END_BLOCK:
+                return
+            if block_type == _ACTION_BLOCK:
+                yield "actions", file.read(count).decode().split("\n")
+            elif block_type == _VERTEX_BLOCK:
+                yield "vertices", numpy.fromfile(file, dtype=_VERTEX_RECORD, count=count)
+            elif block_type == _TRANSITION_BLOCK:
+                transitions = numpy.fromfile(file, dtype=_TRANSITION_RECORD, count=count)
+                edge_type, edge_count = _BLOCK_HEADER.unpack(file.read(_BLOCK_HEADER.size))
+                if edge_type != _EDGE_BLOCK:
+                    raise ValueError(f"{file_name} has a transition block without edge block")
+                yield "transitions", transitions, numpy.fromfile(file, dtype=_EDGE_RECORD, count=edge_count)
+            else:
+                raise ValueError(f"{file_name} contains an unknown block type {block_type}")
+
+
+def read_binary_game_arrays(file_name: str, use_global_path: bool = False) -> GameArrays:
+    """
+    Reads a game from a binary game file without creating the game objects.
+    :param file_name: Path of a .spgb or .ssgb file
+    :type file_name: str
+    :param use_global_path: If True, the file_name is joined with the global_in_out_path
+    :type use_global_path: bool
+    :return: Game in compressed sparse row form
+    :rtype: GameArrays
+    """
+    import numpy
+    if use_global_path:
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
+    if not os.path.isfile(file_name):
+        print_error(f"File '{file_name}' not found.")
+    blocks = iter_binary_game_blocks(file_name)
+    kind, number_of_vertices, initial_vertex = next(blocks)
+    action_names = None
+    vertex_blocks, transition_blocks, edge_blocks = [], [], []
+    for block in blocks:
+        if block[0] == "actions":
+            action_names = block[1]
+        elif block[0] == "vertices":
+            vertex_blocks.append(block[1])
+        else:
+            transition_blocks.append(block[1])
+            edge_blocks.append(block[2])
+    vertices = numpy.concatenate(vertex_blocks) if vertex_blocks else numpy.empty(0, dtype=_VERTEX_RECORD)
+    transitions = numpy.concatenate(transition_blocks) if transition_blocks else numpy.empty(0, dtype=_TRANSITION_RECORD)
+    edges = numpy.concatenate(edge_blocks) if edge_blocks else numpy.empty(0, dtype=_EDGE_RECORD)
+    if len(vertices) != number_of_vertices:
+        print_error(f"File {file_name} declares {number_of_vertices} vertices but contains {len(vertices)}")
+    # Files without action names block name the actions by their index
+    if action_names is None:
+        action_names = [f"action_{i}" for i in range(int(transitions["action"].max()) + 1 if len(transitions) else 0)]
+    edge_offsets = numpy.zeros(len(transitions) + 1, dtype=numpy.int64)
+    numpy.cumsum(transitions["edges"], out=edge_offsets[1:])
+    return GameArrays(kind, vertices["is_eve"].astype(bool), vertices["label"], initial_vertex, transitions["start"], transitions["action"], edge_offsets,
+                      edges["target"], edges["probability"], action_names)
+
+
+@measured("parse")
+def read_binary_game_file(file_name: str, use_global_path: bool = False, debug: bool | None = None) -> StochasticParityGame | SimpleStochasticGame:
+    """
+    Reads a game from a binary game file and returns the corresponding StochasticParityGame or SimpleStochasticGame object.
+    Vertices are named like those of create_random_spg and create_random_ssg, actions keep the names they were written with (action_<index> for files without action names).
+    :param file_name: Path of a .spgb or .ssgb file
+    :type file_name: str
+    :param use_global_path: If True, the file_name is joined with the global_in_out_path
+    :type use_global_path: bool
+    :param debug: True if debug information should be printed
+    :type debug: bool | None
+    :return: Stochastic parity game or simple stochastic game
+    :rtype: StochasticParityGame | SimpleStochasticGame
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    if use_global_path:
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
+    arrays = read_binary_game_arrays(file_name)
+    game = arrays.to_game()
+    if debug:
+        print_debug(f"Binary {arrays.kind.upper()} file {file_name} read in {(time.perf_counter() - start_time):.6f} seconds")
+    return game
@@ -0,0 +1,85 @@
+from typing import Hashable, Iterable
+
+from simplestochasticgame import SimpleStochasticGame
+from stochasticparitygame import StochasticParityGame
+
+
+def successor_lists(game: StochasticParityGame | SimpleStochasticGame) -> dict:
+    """
+    Returns the successors of every vertex of a game, over all actions and all edges with positive probability.
+    :param game: Stochastic parity game or simple stochastic game
+    :type game: StochasticParityGame | SimpleStochasticGame
+    :return: Dictionary mapping every vertex to the list of its distinct successors
+    :rtype: dict[SpgVertex | SsgVertex, list[SpgVertex | SsgVertex]]
+    """
+    successors = {vertex: [] for vertex in game.vertices.values()}
+    seen = {vertex: set() for vertex in game.vertices.values()}
+    for transition in game.transitions.values():
+        start_vertex = transition.start_vertex
+        for prob, end_vertex in transition.end_vertices:
+            if prob > 0 and end_vertex not in seen[start_vertex]:
+                seen[start_vertex].add(end_vertex)
+                successors[start_vertex].append(end_vertex)
+    return successors
+
+
+def strongly_connected_components(vertices: Iterable[Hashable], successors: dict) -> list[list]:
+    """
+    Computes the strongly connected components of a graph with Tarjan's algorithm, without recursion so that long paths do not exceed the recursion limit.
+    :param vertices: Vertices of the graph
+    :type vertices: Iterable[Hashable]
+    :param successors: Dictionary mapping every vertex to its successors
+    :type successors: dict
+    :return: Components in reverse topological order, i.e. every component comes after all components it can reach
+    :rtype: list[list]
+    """
+    index_of = {}
+    low_link = {}
+    on_stack = set()
+    stack = []
+    components = []
+    for root in vertices:
+        if root in index_of:
+            continue
+        index_of[root] = low_link[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            vertex, children = work[-1]
+            for child in children:
+                if child not in index_of:
+                    index_of[child] = low_link[child] = len(index_of)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack and index_of[child] < low_link[vertex]:
+                    low_link[vertex] = index_of[child]
+            else:
+                work.pop()
+                if work and low_link[vertex] < low_link[work[-1][0]]:
+                    low_link[work[-1][0]] = low_link[vertex]
+                if low_link[vertex] == index_of[vertex]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is vertex:
+                            break
+                    components.append(component)
+    return components
+
+
+def is_trivial_component(component: list, successors: dict) -> bool:
+    """
+    Checks whether a strongly connected component consists of a single vertex without self-loop, i.e. no play visits it more than once.
+    :param component: Strongly connected component
+    :type component: list
+    :param successors: Dictionary mapping every vertex to its successors
+    :type successors: dict
+    :return: True if the component is trivial
+    :rtype: bool
+    """
+    return len(component) == 1 and component[0] not in successors[component[0]]
@@ -0,0 +1,152 @@
+import time
+
+from error_handling import print_debug
+from game_graph import successor_lists
+from run_report import measured
+from simplestochasticgame import SsgVertex, SsgTransition
+from spg_to_ssg_reduction import compute_alphas_for_spg, reduce_spg, alpha_gadget_pair, alpha_gadget_transition
+from ssg_value_iteration import SsgSolution, solve_ssg
+from stochasticparitygame import SpgVertex, StochasticParityGame
+import settings
+
+
+class IncrementalSolver:
+    def __init__(self, spg: StochasticParityGame, epsilon: float | None = None, precision: float | None = None, debug: bool | None = None):
+        """
+        Keeps the reduced SSG and the values of a stochastic parity game up to date while the game is edited with set_priority, set_transition and
+        remove_transition. Only the edited vertices are reduced again and patched into the SSG, and only the vertices that can reach them are solved again.
+        Stopping components start from the previous values, the others from 0, as iterating them from above can stay at a larger fixed point.
+        If an edit changes the alphas, all alpha gadgets are replaced and all values are iterated again.
+        set_epsilon changes the epsilon in the same way.
+        The reduction uses the alphas of compute_alphas_for_spg, without priority compression, SCC-local alphas or qualitative preprocessing.
+        :param spg: Stochastic parity game, it is edited in place
+        :type spg: StochasticParityGame
+        :param epsilon: Epsilon of the alphas, if None the alphas are computed without epsilon
+        :type epsilon: float | None
+        :param precision: Precision of the value iteration, if None VALUE_ITERATION_PRECISION is used
+        :type precision: float | None
+        :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+        :type debug: bool | None
+        """
+        self.spg = spg
+        self.epsilon = epsilon
+        self.precision = precision
+        self.debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.alphas = compute_alphas_for_spg(spg, epsilon=epsilon)
+        self.ssg, self.ssg_vertex_of, self.intermediate_of, self.win_vertex, self.lose_vertex = reduce_spg(spg, {vertex: self.alphas[vertex.priority] for vertex in spg.vertices.values()})
+        spg.edited_vertices.clear()
+        self.solution: SsgSolution | None = None
+        self._changed_vertices: set[SsgVertex] = set()
+
+    def _gadget(self, vertex: SpgVertex, gadgets: dict) -> SsgTransition:
+        """
+        Creates the alpha transition of the intermediate vertex of a vertex of the SPG for its current priority.
+        """
+        alpha = self.alphas[vertex.priority]
+        if id(alpha) not in gadgets:
+            gadgets[id(alpha)] = alpha_gadget_pair(alpha)
+        sink = self.win_vertex if vertex.priority % 2 == 0 else self.lose_vertex
+        return alpha_gadget_transition(self.intermediate_of[vertex], gadgets[id(alpha)], sink, self.ssg_vertex_of[vertex])
+
+    def update(self) -> set[SsgVertex]:
+        """
+        Patches the SSG with the edits of the SPG since the last update.
+        :return: Vertices of the SSG whose transitions were changed
+        :rtype: set[SsgVertex]
+        """
+        edited = set(self.spg.edited_vertices)
+        self.spg.edited_vertices.clear()
+        if not edited:
+            return set()
+        gadgets = dict()
+        alphas = compute_alphas_for_spg(self.spg, epsilon=self.epsilon)
+        if alphas != self.alphas:
+            # Other priorities or probabilities change the alphas of all vertices
+            self.alphas = alphas
+            for vertex in self.spg.vertices.values():
+                self.ssg.transitions[(self.intermediate_of[vertex], "alpha")] = self._gadget(vertex, gadgets)
+                self._changed_vertices.add(self.intermediate_of[vertex])
+        edited_ssg_vertices = {self.ssg_vertex_of[vertex] for vertex in edited}
+        for key in [key for key in self.ssg.transitions if key[0] in edited_ssg_vertices]:
+            del self.ssg.transitions[key]
+        for transition in self.spg.transitions.values():
+            if transition.start_vertex in edited:
+                start_vertex = self.ssg_vertex_of[transition.start_vertex]
+                end_vertices = {(prob, self.intermediate_of[end_vertex]) for prob, end_vertex in transition.end_vertices}
+                self.ssg.transitions[(start_vertex, transition.action)] = SsgTransition(start_vertex, end_vertices, transition.action)
+        for vertex in edited:
+            self.ssg.transitions[(self.intermediate_of[vertex], "alpha")] = self._gadget(vertex, gadgets)
+            self._changed_vertices.add(self.ssg_vertex_of[vertex])
+            self._changed_vertices.add(self.intermediate_of[vertex])
+        return edited_ssg_vertices | {self.intermediate_of[vertex] for vertex in edited}
+
+    def set_epsilon(self, epsilon: float | None, alphas: dict | None = None) -> None:
+        """
+        Changes the epsilon of the alphas. Only the alpha gadgets of the SSG are replaced, the next solve iterates all values again, the stopping components
+        from the previous values.
+        :param epsilon: New epsilon, if None the alphas are computed without epsilon
+        :type epsilon: float | None
+        :param alphas: Alphas of the new epsilon by priority if they are already known, otherwise they are computed
+        :type alphas: dict | None
+        """
+        self.epsilon = epsilon
+        alphas = compute_alphas_for_spg(self.spg, epsilon=epsilon) if alphas is None else alphas
+        if alphas == self.alphas:
+            return
+        self.alphas = alphas
+        gadgets = dict()
+        for vertex in self.spg.vertices.values():
+            self.ssg.transitions[(self.intermediate_of[vertex], "alpha")] = self._gadget(vertex, gadgets)
+            self._changed_vertices.add(self.intermediate_of[vertex])
+
+    def _vertices_reaching(self, vertices: set[SsgVertex]) -> set[SsgVertex]:
+        """
+        Returns the vertices of the SSG that can reach one of the given vertices, these are the only vertices whose values can change.
+        """
+        predecessors = {vertex: [] for vertex in self.ssg.vertices.values()}
+        for vertex, successors in successor_lists(self.ssg).items():
+            for successor in successors:
+                predecessors[successor].append(vertex)
+        reaching = set(vertices)
+        queue = list(vertices)
+        while queue:
+            for predecessor in predecessors[queue.pop()]:
+                if predecessor not in reaching:
+                    reaching.add(predecessor)
+                    queue.append(predecessor)
+        return reaching
+
+    @measured("incremental_solving")
+    def solve(self) -> SsgSolution:
+        """
+        Applies the pending edits and solves the SSG, the first time completely and afterwards only the vertices that can reach a changed vertex,
+        starting from the previous values and strategies where solve_ssg can use them. The other vertices keep their values and bounds.
+        :return: Values and optimal strategies of the SSG
+        :rtype: SsgSolution
+        """
+        if self.debug:
+            start_time = time.perf_counter()
+        self.update()
+        if self.solution is None:
+            self.solution = solve_ssg(self.ssg, precision=self.precision, debug=False)
+        elif self._changed_vertices:
+            affected = self._vertices_reaching(self._changed_vertices)
+            solution = solve_ssg(self.ssg, precision=self.precision, initial_values=self.solution.values, vertices=affected, initial_strategy=self.solution.strategy,
+                                 initial_bounds=self.solution.bounds, debug=False)
+            solution.strategy = {**{vertex: transition for vertex, transition in self.solution.strategy.items() if vertex not in affected}, **solution.strategy}
+            self.solution = solution
+        self._changed_vertices.clear()
+        if self.debug:
+            print_debug(f"Incremental solve finished in {(time.perf_counter() - start_time):.6f} seconds, {self.solution.solved_vertices} of {len(self.ssg.vertices)} vertices solved")
+        return self.solution
+
+    def value(self, vertex_name: str | None = None) -> float:
+        """
+        Returns the value of a vertex of the SPG in the reduced SSG, which approximates its value in the SPG.
+        :param vertex_name: Name of the vertex, if None the initial vertex is used
+        :type vertex_name: str | None
+        :return: Value of the vertex
+        :rtype: float
+        """
+        vertex = self.spg.init_vertex if vertex_name is None else self.spg.vertices[vertex_name]
+        return self.solve().value(self.ssg_vertex_of[vertex])
@@ -0,0 +1,131 @@
+from fractions import Fraction
+from math import gcd, lcm
+
+from probability_table import get_probability_table
+import settings
+
+
+def integer_distribution(rationals) -> tuple[list[int], int]:
+    """
+    Writes the rationals of a distribution as integer numerators over their least common denominator.
+    If all denominators are powers of two, the common denominator is the largest of them.
+    :param rationals: Probabilities of the distribution
+    :type rationals: Iterable[Fraction]
+    :return: Numerators in the given order and the common denominator
+    :rtype: tuple[list[int], int]
+    """
+    rationals = list(rationals)
+    denominator = lcm(*(rational.denominator for rational in rationals))
+    return [rational.numerator * (denominator // rational.denominator) for rational in rationals], denominator
+
+
+def alpha_gadget_probabilities(alpha: float | Fraction, max_denominator: int | None = None) -> tuple[Fraction, Fraction]:
+    """
+    Returns the probabilities (alpha, 1 - alpha) of an alpha gadget as canonical rationals. The complement is taken from the canonical alpha
+    with the same denominator, so no arithmetic on the exact alpha is needed and both numerators add up to the denominator.
+    :param alpha: Alpha of the gadget
+    :type alpha: float | Fraction
+    :param max_denominator: Maximum denominator, if None MAX_DENOMINATOR is used
+    :type max_denominator: int | None
+    :return: Canonical alpha and its complement
+    :rtype: tuple[Fraction, Fraction]
+    """
+    table = get_probability_table()
+    rational = table.rational(alpha, max_denominator)
+    return rational, table.rational(Fraction(rational.denominator - rational.numerator, rational.denominator), max_denominator)
+
+
+class IntegerDistributions:
+    def __init__(self, transitions: list, max_denominator: int | None = None):
+        """
+        Distributions of a list of transitions in arrays. Edges are numbered in the order of their transition and within a transition in the order of its end vertices.
+        Every probability is replaced by its canonical rational and every distribution is stored as integer numerators over a common denominator,
+        in int64 arrays if all denominators fit and in object arrays otherwise. The distributions that transitions keep with integer probabilities are reused.
+        :param transitions: Transitions of a stochastic parity game or a simple stochastic game
+        :type transitions: list[SpgTransition | SsgTransition]
+        :param max_denominator: Maximum denominator of the canonical rationals, if None MAX_DENOMINATOR is used
+        :type max_denominator: int | None
+        """
+        import numpy as np
+        max_denominator = settings.MAX_DENOMINATOR if max_denominator is None else max_denominator
+        rational = get_probability_table().rational
+        self.transitions = transitions
+        self.end_vertices = []
+        numerators = []
+        denominators = []
+        offsets = [0]
+        for transition in transitions:
+            # Transitions created with integer probabilities keep their distribution
+            if getattr(transition, "distribution", None) is not None:
+                transition_numerators, denominator = transition.distribution
+            else:
+                transition_numerators, denominator = integer_distribution(rational(prob, max_denominator) for prob, _ in transition.end_vertices)
+            self.end_vertices.extend(end_vertex for _, end_vertex in transition.end_vertices)
+            numerators.extend(transition_numerators)
+            denominators.append(denominator)
+            offsets.append(len(numerators))
+        dtype = np.int64 if max(denominators, default=1) < 2 ** 62 else object
+        self.numerators = np.asarray(numerators, dtype=dtype)
+        self.denominators = np.asarray(denominators, dtype=dtype)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_game(cls, game, max_denominator: int | None = None):
+        """
+        Creates the distributions of all transitions of a game.
+        :param game: Stochastic parity game or simple stochastic game
+        :type game: StochasticParityGame | SimpleStochasticGame
+        :param max_denominator: Maximum denominator of the canonical rationals, if None MAX_DENOMINATOR is used
+        :type max_denominator: int | None
+        :return: Distributions of the game
+        :rtype: IntegerDistributions
+        """
+        return cls(list(game.transitions.values()), max_denominator)
+
+    def edge_transitions(self):
+        """
+        Returns the index of the transition of every edge.
+        :return: Transition index of every edge
+        :rtype: np.ndarray
+        """
+        import numpy as np
+        return np.repeat(np.arange(len(self.transitions)), np.diff(self.offsets))
+
+    def invalid_transitions(self) -> list:
+        """
+        Returns the transitions whose probabilities are negative or do not add up to exactly 1, checked on the integers without any fractions.
+        :return: Invalid transitions
+        :rtype: list[SpgTransition | SsgTransition]
+        """
+        import numpy as np
+        totals = np.zeros(len(self.transitions), dtype=self.numerators.dtype)
+        np.add.at(totals, self.edge_transitions(), self.numerators)
+        invalid = totals != self.denominators
+        if len(self.numerators):
+            invalid[self.edge_transitions()[self.numerators < 0]] = True
+        return [self.transitions[index] for index in np.flatnonzero(invalid)]
+
+    def reduced_edge_probabilities(self, numerators, transition_indices):
+        """
+        Reduces numerators over the common denominators of their transitions to lowest terms, so equal probabilities of different transitions become equal pairs.
+        :param numerators: Numerators, for example sums of numerators of edges of the same transition
+        :type numerators: np.ndarray
+        :param transition_indices: Transition of every numerator
+        :type transition_indices: np.ndarray
+        :return: Reduced numerators and denominators, 2-dimensional with one row per numerator
+        :rtype: np.ndarray
+        """
+        import numpy as np
+        denominators = self.denominators[transition_indices]
+        if self.numerators.dtype == object:
+            divisors = np.fromiter((gcd(numerator, denominator) for numerator, denominator in zip(numerators, denominators)), dtype=object, count=len(numerators))
+        else:
+            divisors = np.gcd(numerators, denominators)
+        return np.stack((numerators // divisors, denominators // divisors), axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory of the arrays in bytes, object arrays are counted with their references only.
+        """
+        return self.numerators.nbytes + self.denominators.nbytes + self.offsets.nbytes
@@ -0,0 +1,239 @@
+import itertools
+import os
+import tempfile
+import threading
+
+from error_handling import print_debug, print_warning
+from path_conversion import windows_to_linux_path
+from run_report import measure_stage
+import settings
+from settings import IS_OS_LINUX
+
+HANDOFF_MODES = ("file", "tmpfs", "memfd", "fifo")
+_TMPFS_DIRECTORY = "/dev/shm"
+_handoff_counter = itertools.count()
+
+
+def handoff_directory() -> str:
+    """
+    Returns the directory that is used for the tmpfs and fifo handoff, /dev/shm if it is writable and the system temporary directory otherwise.
+    :return: Directory in Linux format
+    :rtype: str
+    """
+    if os.path.isdir(_TMPFS_DIRECTORY) and os.access(_TMPFS_DIRECTORY, os.W_OK | os.X_OK):
+        return _TMPFS_DIRECTORY
+    return tempfile.gettempdir()
+
+
+def unique_model_name(name: str = "model", suffix: str = ".smg") -> str:
+    """
+    Returns a file name that is unique for this process and job, so concurrent jobs never share a model file.
+    :param name: Prefix of the file name
+    :type name: str
+    :param suffix: Extension of the file name
+    :type suffix: str
+    :return: File name without directory
+    :rtype: str
+    """
+    return f"{name}_{os.getpid()}_{threading.get_ident()}_{next(_handoff_counter)}{suffix}"
+
+
+def resolve_handoff_mode(mode: str | None = None) -> str:
+    """
+    Returns the handoff mode that is actually used. Modes that are not supported on the current system fall back to the next slower mode: memfd and fifo to tmpfs, and tmpfs to file if PRISM runs under WSL.
+    :param mode: Requested mode, if None MODEL_HANDOFF is used
+    :type mode: str | None
+    :return: Supported mode
+    :rtype: str
+    """
+    mode = settings.MODEL_HANDOFF if mode is None else mode
+    if mode not in HANDOFF_MODES:
+        raise ValueError(f"Unknown model handoff mode {mode}, expected one of {', '.join(HANDOFF_MODES)}")
+    if mode == "memfd" and not (IS_OS_LINUX and hasattr(os, "memfd_create") and os.path.isdir(f"/proc/{os.getpid()}/fd")):
+        mode = "tmpfs"
+    if mode == "fifo" and not (IS_OS_LINUX and hasattr(os, "mkfifo")):
+        mode = "tmpfs"
+    if mode == "tmpfs" and not IS_OS_LINUX:
+        mode = "file"
+    return mode
+
+
+class ModelHandoff:
+    def __init__(self, smg_spec: str, mode: str | None = None, name: str = "model", directory: str | None = None, debug: bool | None = None):
+        """
+        Hands an SMG specification to PRISM under a unique path that is removed again when the handoff is closed.
+        Modes:
+        "file" writes a regular file to directory (default GLOBAL_IN_OUT_PATH),
+        "tmpfs" writes a file to /dev/shm, so the model never touches the disk,
+        "memfd" keeps the model in an anonymous memory file that PRISM opens through /proc/<pid>/fd,
+        "fifo" streams the model through a named pipe in /dev/shm to every PRISM run that opens it, one run after the other.
+        :param smg_spec: SMG specification
+        :type smg_spec: str
+        :param mode: Handoff mode, if None MODEL_HANDOFF is used
+        :type mode: str | None
+        :param name: Prefix of the unique file name
+        :type name: str
+        :param directory: Directory of the file mode, defaults to GLOBAL_IN_OUT_PATH
+        :type directory: str | None
+        :param debug: Whether to print debug information
+        :type debug: bool | None
+        """
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.smg_spec = smg_spec
+        self.mode = resolve_handoff_mode(mode)
+        self.name = name
+        self.directory = directory
+        self.debug = debug
+        self.path = None
+        self.local_path = None
+        self._fd = None
+        self._writer = None
+        self._closed = threading.Event()
+
+    def __enter__(self) -> str:
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def open(self) -> str:
+        """
+        Makes the model available to PRISM.
+        :return: Path of the model in Linux format, to be passed to PRISM without use_global_path
+        :rtype: str
+        """
+        if self.path is not None:
+            return self.path
+        file_name = unique_model_name(self.name)
+        data = self.smg_spec.encode()
+        with measure_stage("file_write"):
+            self._hand_off(file_name, data)
+        if self.debug:
+            print_debug(f"Handed model to PRISM via {self.mode} at {self.path}")
+        return self.path
+
+    def _hand_off(self, file_name: str, data: bytes) -> None:
+        """
+        Writes the model for the selected mode and sets its path.
+        :param file_name: Unique file name of the model
+        :type file_name: str
+        :param data: Encoded SMG specification
+        :type data: bytes
+        """
+        if self.mode == "memfd":
+            self._fd = os.memfd_create(file_name, getattr(os, "MFD_CLOEXEC", 0))
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._fd, view):]
+            self.path = f"/proc/{os.getpid()}/fd/{self._fd}"
+        elif self.mode == "fifo":
+            self.local_path = os.path.join(handoff_directory(), file_name)
+            os.mkfifo(self.local_path, 0o600)
+            self.path = self.local_path
+            self._writer = threading.Thread(target=self._serve_fifo, args=(data,), daemon=True)
+            self._writer.start()
+        else:
+            directory = handoff_directory() if self.mode == "tmpfs" else (self.directory if self.directory is not None else settings.GLOBAL_IN_OUT_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.local_path = os.path.join(directory, file_name)
+            with open(self.local_path, "wb") as file:
+                file.write(data)
+            self.path = os.path.abspath(self.local_path) if IS_OS_LINUX else windows_to_linux_path(os.path.abspath(self.local_path))
+
+    def _serve_fifo(self, data: bytes) -> None:
+        """
+        Writes the model into the named pipe for every reader until the handoff is closed.
+        :param data: Encoded SMG specification
+        :type data: bytes
+        """
+        while not self._closed.is_set():
+            try:
+                with open(self.local_path, "wb") as fifo:
+                    if self._closed.is_set():
+                        return
+                    # A reader only sees the end of the model once no writer is left on its pipe, so the next reader gets a fresh pipe under the same path
+                    replacement = f"{self.local_path}.next"
+                    os.mkfifo(replacement, 0o600)
+                    os.replace(replacement, self.local_path)
+                    fifo.write(data)
+            except BrokenPipeError:
+                continue
+            except OSError as e:
+                if not self._closed.is_set():
+                    print_warning(f"Could not write model to named pipe {self.local_path}: {e}")
+                return
+
+    def detach(self) -> tuple[str, str]:
+        """
+        Opens the handoff and hands the ownership of the model file to the caller, which is needed when the model is written in one process and removed in another.
+        Only the file and tmpfs modes can be detached, memory files and named pipes do not outlive their process.
+        :return: Path of the model in Linux format and local path that has to be removed with remove_model_file
+        :rtype: tuple[str, str]
+        """
+        if self.mode not in ("file", "tmpfs"):
+            raise ValueError(f"A model handoff via {self.mode} cannot be detached")
+        path = self.open()
+        local_path = self.local_path
+        self.path = None
+        self.local_path = None
+        return path, local_path
+
+    def close(self) -> None:
+        """
+        Removes the model. Closing an already closed handoff does nothing.
+        """
+        self._closed.set()
+        if self._writer is not None:
+            try:
+                # Unblock a writer that waits for the next reader
+                unblock_fd = os.open(self.local_path, os.O_RDONLY | os.O_NONBLOCK)
+                os.close(unblock_fd)
+            except OSError:
+                pass
+            self._writer.join(timeout=5)
+            self._writer = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self.local_path is not None:
+            try:
+                os.remove(self.local_path)
+            except OSError:
+                pass
+            self.local_path = None
+        self.path = None
+
+
+def model_handoff(smg_spec: str, mode: str | None = None, name: str = "model", directory: str | None = None, debug: bool | None = None) -> ModelHandoff:
+    """
+    Creates a handoff of an SMG specification to PRISM, meant to be used as context manager that yields the model path:
+    with model_handoff(smg_spec, "tmpfs") as smg_file:
+        check_property(smg_file, property_string)
+    :param smg_spec: SMG specification
+    :type smg_spec: str
+    :param mode: Handoff mode "file", "tmpfs", "memfd" or "fifo", if None MODEL_HANDOFF is used
+    :type mode: str | None
+    :param name: Prefix of the unique file name
+    :type name: str
+    :param directory: Directory of the file mode, defaults to GLOBAL_IN_OUT_PATH
+    :type directory: str | None
+    :param debug: Whether to print debug information
+    :type debug: bool | None
+    :return: Handoff that is opened when the context is entered
+    :rtype: ModelHandoff
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    return ModelHandoff(smg_spec, mode=mode, name=name, directory=directory, debug=debug)
+
+
+def remove_model_file(local_path: str) -> None:
+    """
+    Removes a model file of a detached handoff, missing files are ignored.
+    :param local_path: Local path returned by ModelHandoff.detach
+    :type local_path: str
+    """
+    try:
+        os.remove(local_path)
+    except OSError:
+        pass
@@ -0,0 +1,294 @@
+import time
+
+from error_handling import print_debug, print_error
+from run_report import measured
+from stochasticparitygame import SpgVertex, StochasticParityGame
+import settings
+
+
+PARITY_GAME_ALGORITHMS = ("zielonka", "priority_promotion")
+
+
+class ParityGameSolution:
+    def __init__(self, spg: StochasticParityGame, winning_region_eve: set[SpgVertex], winning_region_adam: set[SpgVertex], strategy_eve: dict[SpgVertex, str], strategy_adam: dict[SpgVertex, str], algorithm: str):
+        """
+        Solution of a parity game without randomness.
+        :param spg: Solved game
+        :type spg: StochasticParityGame
+        :param winning_region_eve: Vertices from which Eve wins
+        :type winning_region_eve: set[SpgVertex]
+        :param winning_region_adam: Vertices from which Adam wins
+        :type winning_region_adam: set[SpgVertex]
+        :param strategy_eve: Positional winning strategy of Eve, maps every Eve vertex of her winning region to an action
+        :type strategy_eve: dict[SpgVertex, str]
+        :param strategy_adam: Positional winning strategy of Adam, maps every Adam vertex of his winning region to an action
+        :type strategy_adam: dict[SpgVertex, str]
+        :param algorithm: Algorithm that computed the solution
+        :type algorithm: str
+        """
+        self.spg = spg
+        self.winning_region_eve = winning_region_eve
+        self.winning_region_adam = winning_region_adam
+        self.strategy_eve = strategy_eve
+        self.strategy_adam = strategy_adam
+        self.algorithm = algorithm
+
+    def value(self, vertex: SpgVertex | None = None) -> float:
+        """
+        Returns the probability that Eve wins from a vertex, which is 1 or 0 in a game without randomness.
+        :param vertex: Vertex, defaults to the initial vertex
+        :type vertex: SpgVertex | None
+        :return: 1.0 if the vertex is in the winning region of Eve, 0.0 otherwise
+        :rtype: float
+        """
+        vertex = self.spg.init_vertex if vertex is None else vertex
+        return 1.0 if vertex in self.winning_region_eve else 0.0
+
+    def __str__(self):
+        return f"ParityGameSolution({self.algorithm}, Eve wins {len(self.winning_region_eve)} vertices, Adam wins {len(self.winning_region_adam)} vertices)"
+
+
+def is_deterministic_spg(spg: StochasticParityGame) -> bool:
+    """
+    Checks whether every transition of a stochastic parity game leads to a single vertex, i.e. the game is an ordinary parity game.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :return: True if no transition has two successors with positive probability
+    :rtype: bool
+    """
+    return all(sum(1 for prob, _ in transition.end_vertices if prob > 0) == 1 for transition in spg.transitions.values())
+
+
+class ParityGameIndex:
+    def __init__(self, is_eve: list[bool], priority: list[int], successors: list[list[int]]):
+        """
+        Index structure of a parity game: vertices are numbered, successors and predecessors are lists of numbers.
+        :param is_eve: Owner of every vertex, True for Eve
+        :type is_eve: list[bool]
+        :param priority: Priority of every vertex
+        :type priority: list[int]
+        :param successors: Distinct successors of every vertex, every vertex needs at least one
+        :type successors: list[list[int]]
+        """
+        self.is_eve = is_eve
+        self.priority = priority
+        self.successors = successors
+        self.predecessors: list[list[int]] = [[] for _ in successors]
+        for start, ends in enumerate(successors):
+            for end in ends:
+                self.predecessors[end].append(start)
+
+    def solve(self, algorithm: str) -> tuple[list[set[int]], list[dict[int, int]]]:
+        """
+        Solves the game with zielonka or priority_promotion.
+        :param algorithm: "zielonka" or "priority_promotion"
+        :type algorithm: str
+        :return: Winning regions and winning strategies of Eve and Adam, a strategy maps a vertex to its successor
+        :rtype: tuple[list[set[int]], list[dict[int, int]]]
+        """
+        all_vertices = set(range(len(self.successors)))
+        if algorithm == "zielonka":
+            return self.zielonka(all_vertices)
+        return self.priority_promotion(all_vertices)
+
+    def owner(self, vertex: int) -> int:
+        """
+        :return: 0 if Eve owns the vertex, 1 if Adam owns it
+        :rtype: int
+        """
+        return 0 if self.is_eve[vertex] else 1
+
+    def attractor(self, player: int, target: set[int], subgame: set[int], strategy: dict[int, int]) -> set[int]:
+        """
+        Computes the vertices of a subgame from which a player can force the play into a target set, and records the attractor moves of the player in strategy.
+        :param player: 0 for Eve, 1 for Adam
+        :type player: int
+        :param target: Target set, subset of the subgame
+        :type target: set[int]
+        :param subgame: Vertices of the subgame
+        :type subgame: set[int]
+        :param strategy: Strategy of the player that is extended by the attractor moves
+        :type strategy: dict[int, int]
+        :return: Attractor of the target set
+        :rtype: set[int]
+        """
+        attractor = set(target)
+        escapes = dict()
+        queue = list(target)
+        while queue:
+            vertex = queue.pop()
+            for predecessor in self.predecessors[vertex]:
+                if predecessor not in subgame or predecessor in attractor:
+                    continue
+                if self.owner(predecessor) == player:
+                    strategy[predecessor] = vertex
+                else:
+                    if predecessor not in escapes:
+                        escapes[predecessor] = sum(1 for successor in self.successors[predecessor] if successor in subgame)
+                    escapes[predecessor] -= 1
+                    if escapes[predecessor] > 0:
+                        continue
+                attractor.add(predecessor)
+                queue.append(predecessor)
+        return attractor
+
+    def stay_inside(self, vertices: set[int], region: set[int], strategy: dict[int, int]) -> None:
+        """
+        Lets every vertex of vertices that has no move into the region yet in strategy move to a successor in the region, if it has one.
+        """
+        for vertex in vertices:
+            if strategy.get(vertex) not in region:
+                strategy[vertex] = next((successor for successor in self.successors[vertex] if successor in region), None)
+                if strategy[vertex] is None:
+                    del strategy[vertex]
+
+    def zielonka(self, subgame: set[int]) -> tuple[list[set[int]], list[dict[int, int]]]:
+        """
+        Solves a subgame with Zielonka's recursive algorithm.
+        The smallest priority p of the subgame is good for player p % 2. If the opponent wins nothing after removing the attractor of the priority,
+        the player wins everywhere, otherwise the attractor of the winning region of the opponent is removed and the rest is solved again.
+        The recursion is run on an explicit stack, since its depth can reach the number of vertices.
+        :param subgame: Vertices of the subgame, every vertex has a successor in the subgame
+        :type subgame: set[int]
+        :return: Winning regions and winning strategies of Eve and Adam
+        :rtype: tuple[list[set[int]], list[dict[int, int]]]
+        """
+        # A frame is [subgame, stage, player, top, attractor strategy of the current stage, attractor of the current stage]
+        stack = [[subgame, 0, None, None, None, None]]
+        result = None
+        while stack:
+            frame = stack[-1]
+            current_subgame, stage = frame[0], frame[1]
+            if stage == 0:
+                if not current_subgame:
+                    stack.pop()
+                    result = ([set(), set()], [dict(), dict()])
+                    continue
+                lowest = min(self.priority[vertex] for vertex in current_subgame)
+                player = lowest % 2
+                top = {vertex for vertex in current_subgame if self.priority[vertex] == lowest}
+                player_strategy = dict()
+                attractor = self.attractor(player, top, current_subgame, player_strategy)
+                frame[1:] = [1, player, top, player_strategy, attractor]
+                stack.append([current_subgame - attractor, 0, None, None, None, None])
+                continue
+            regions, strategies = result
+            player, top, stage_strategy, attractor = frame[2:]
+            opponent = 1 - player
+            if stage == 1:
+                if not regions[opponent]:
+                    strategy = strategies[player]
+                    strategy.update(stage_strategy)
+                    self.stay_inside({vertex for vertex in top if self.owner(vertex) == player}, current_subgame, strategy)
+                    result_regions = [set(), set()]
+                    result_regions[player] = set(current_subgame)
+                    result_strategies = [dict(), dict()]
+                    result_strategies[player] = strategy
+                    stack.pop()
+                    result = (result_regions, result_strategies)
+                    continue
+                opponent_strategy = dict(strategies[opponent])
+                opponent_attractor = self.attractor(opponent, regions[opponent], current_subgame, opponent_strategy)
+                frame[1:] = [2, player, top, opponent_strategy, opponent_attractor]
+                stack.append([current_subgame - opponent_attractor, 0, None, None, None, None])
+                continue
+            regions[opponent] |= attractor
+            strategies[opponent].update(stage_strategy)
+            stack.pop()
+            result = (regions, strategies)
+        return result[0], result[1]
+
+    def priority_promotion(self, subgame: set[int]) -> tuple[list[set[int]], list[dict[int, int]]]:
+        """
+        Solves a subgame with the priority promotion algorithm of Benerecetti, Dell'Erba and Mogavero.
+        Regions are built from the most significant (smallest) priority on as attractors of the vertices with that region priority. If the opponent can escape
+        from a region to a less significant one, the region is kept and the search goes on with the next priority. If he cannot escape at all, the region is a dominion
+        and is removed together with its attractor. Otherwise the region is promoted to the least significant region the opponent can escape to
+        and all less significant regions are reset.
+        :param subgame: Vertices of the subgame, every vertex has a successor in the subgame
+        :type subgame: set[int]
+        :return: Winning regions and winning strategies of Eve and Adam
+        :rtype: tuple[list[set[int]], list[dict[int, int]]]
+        """
+        regions = [set(), set()]
+        strategies = [dict(), dict()]
+        game = set(subgame)
+        while game:
+            region_priority = {vertex: self.priority[vertex] for vertex in game}
+            region_strategy = dict()
+            current = min(region_priority.values())
+            while True:
+                player = current % 2
+                search_game = {vertex for vertex in game if region_priority[vertex] >= current}
+                top = {vertex for vertex in search_game if region_priority[vertex] == current}
+                region = self.attractor(player, top, search_game, region_strategy)
+                self.stay_inside({vertex for vertex in top if self.owner(vertex) == player}, region, region_strategy)
+                # The opponent escapes from the region over his own edges that leave it and over the vertices of the player without an edge into the region.
+                # Successors outside of game lie in removed winning regions, the opponent has no edges into his own and the player never has to move into the other ones
+                escape_targets = {successor for vertex in region if self.owner(vertex) != player or vertex not in region_strategy
+                                  for successor in self.successors[vertex] if successor in game and successor not in region}
+                if any(region_priority[successor] >= current for successor in escape_targets):
+                    for vertex in region:
+                        region_priority[vertex] = current
+                    current = min(region_priority[vertex] for vertex in search_game - region)
+                    continue
+                escapes = [region_priority[successor] for successor in escape_targets]
+                if not escapes:
+                    break
+                promotion = max(escapes)
+                for vertex in game - region:
+                    if region_priority[vertex] > promotion:
+                        region_priority[vertex] = self.priority[vertex]
+                        region_strategy.pop(vertex, None)
+                for vertex in region:
+                    region_priority[vertex] = promotion
+                current = promotion
+            dominion_strategy = {vertex: region_strategy[vertex] for vertex in region if self.owner(vertex) == player}
+            dominion = self.attractor(player, region, game, dominion_strategy)
+            regions[player] |= dominion
+            strategies[player].update(dominion_strategy)
+            game -= dominion
+        return regions, strategies
+
+
+@measured("parity_game_solving")
+def solve_parity_game(spg: StochasticParityGame, algorithm: str | None = None, debug: bool | None = None) -> ParityGameSolution:
+    """
+    Solves a stochastic parity game without randomness (see is_deterministic_spg) directly, without the reduction to a simple stochastic game and PRISM.
+    Eve wins a play if the smallest priority that occurs infinitely often is even.
+    :param spg: Stochastic parity game in which every transition leads to a single vertex
+    :type spg: StochasticParityGame
+    :param algorithm: "zielonka" or "priority_promotion", if None PARITY_GAME_ALGORITHM is used
+    :type algorithm: str | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Winning regions and positional winning strategies of both players
+    :rtype: ParityGameSolution
+    """
+    algorithm = settings.PARITY_GAME_ALGORITHM if algorithm is None else algorithm
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if algorithm not in PARITY_GAME_ALGORITHMS:
+        print_error(f"Unknown parity game algorithm {algorithm}, expected one of {', '.join(PARITY_GAME_ALGORITHMS)}")
+    if not is_deterministic_spg(spg):
+        print_error("The stochastic parity game has random transitions and cannot be solved as a parity game.")
+    if debug:
+        start_time = time.perf_counter()
+    vertices = list(spg.vertices.values())
+    index_of = {vertex: index for index, vertex in enumerate(vertices)}
+    actions: list[dict[int, str]] = [dict() for _ in vertices]
+    for transition in spg.transitions.values():
+        start = index_of[transition.start_vertex]
+        for prob, end_vertex in transition.end_vertices:
+            if prob > 0:
+                actions[start].setdefault(index_of[end_vertex], transition.action)
+    index = ParityGameIndex([vertex.is_eve for vertex in vertices], [vertex.priority for vertex in vertices], [list(successors) for successors in actions])
+    regions, strategies = index.solve(algorithm)
+    solution = ParityGameSolution(spg=spg,
+                                  winning_region_eve={vertices[vertex] for vertex in regions[0]},
+                                  winning_region_adam={vertices[vertex] for vertex in regions[1]},
+                                  strategy_eve={vertices[vertex]: actions[vertex][successor] for vertex, successor in strategies[0].items() if vertex in regions[0]},
+                                  strategy_adam={vertices[vertex]: actions[vertex][successor] for vertex, successor in strategies[1].items() if vertex in regions[1]},
+                                  algorithm=algorithm)
+    if debug:
+        print_debug(f"Parity game with {len(vertices)} vertices solved with {algorithm} in {(time.perf_counter() - start_time):.6f} seconds, Eve wins {len(regions[0])} vertices")
+    return solution
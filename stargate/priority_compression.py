@@ -0,0 +1,93 @@
+import time
+
+from error_handling import print_debug
+from game_graph import successor_lists, strongly_connected_components, is_trivial_component
+from run_report import measured
+from stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame
+import settings
+
+
+def compressed_priorities(spg: StochasticParityGame) -> dict[SpgVertex, int]:
+    """
+    Computes priorities with the same winning plays and as few distinct values as possible.
+    The smallest priority that is visited infinitely often decides a play, and every infinite play eventually stays in one strongly connected component.
+    Therefore the priorities of each component are renumbered on their own: consecutive priorities of the same parity within the component get the same value
+    and the values count up from 0 or 1 without gaps. Vertices on no cycle are visited at most once, their priority does not matter and they get the largest value in use.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :return: Dictionary mapping every vertex to its new priority
+    :rtype: dict[SpgVertex, int]
+    """
+    successors = successor_lists(spg)
+    new_priorities: dict[SpgVertex, int] = dict()
+    transient_vertices: list[SpgVertex] = []
+    for component in strongly_connected_components(spg.vertices.values(), successors):
+        if is_trivial_component(component, successors):
+            transient_vertices.extend(component)
+            continue
+        mapping = dict()
+        value = None
+        previous = None
+        for priority in sorted({vertex.priority for vertex in component}):
+            if value is None:
+                value = priority % 2
+            elif priority % 2 != previous % 2:
+                value += 1
+            mapping[priority] = value
+            previous = priority
+        for vertex in component:
+            new_priorities[vertex] = mapping[vertex.priority]
+    largest = max(new_priorities.values(), default=0)
+    for vertex in transient_vertices:
+        new_priorities[vertex] = largest
+    return new_priorities
+
+
+@measured("priority_compression")
+def compress_spg_priorities(spg: StochasticParityGame, debug: bool | None = None) -> StochasticParityGame:
+    """
+    Preprocessing of spg_to_ssg that reduces the number of distinct priorities, and with it the number of alpha levels, without changing the winner of any play.
+    See compressed_priorities for the renumbering.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Stochastic parity game with compressed priorities, the given game if no priority changes
+    :rtype: StochasticParityGame
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    new_priorities = compressed_priorities(spg)
+    if all(new_priorities[vertex] == vertex.priority for vertex in spg.vertices.values()):
+        compressed = spg
+    else:
+        new_vertices = {vertex: SpgVertex(name=vertex.name, is_eve=vertex.is_eve, priority=new_priorities[vertex]) for vertex in spg.vertices.values()}
+        transitions = dict()
+        for (vertex, action), transition in spg.transitions.items():
+            start_vertex = new_vertices[vertex]
+            transitions[(start_vertex, action)] = SpgTransition(start_vertex=start_vertex, end_vertices={(prob, new_vertices[end_vertex]) for prob, end_vertex in transition.end_vertices}, action=action)
+        compressed = StochasticParityGame(vertices={vertex.name: vertex for vertex in new_vertices.values()}, transitions=transitions, init_vertex=new_vertices[spg.init_vertex])
+    if debug:
+        print_debug(f"Priorities compressed from {len({vertex.priority for vertex in spg.vertices.values()})} to {len(set(new_priorities.values()))} distinct values in {(time.perf_counter() - start_time):.6f} seconds")
+    return compressed
+
+
+def priority_compression_report(spg: StochasticParityGame, epsilon: float = None) -> dict[str, int | float]:
+    """
+    Reports the effect of compress_spg_priorities on the reduction to a simple stochastic game.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param epsilon: Precision parameter of the reduction, see compute_alphas_for_spg
+    :type epsilon: float
+    :return: Number of distinct priorities and smallest alpha before and after the compression
+    :rtype: dict[str, int | float]
+    """
+    from spg_to_ssg_reduction import compute_alphas_for_spg
+    compressed = compress_spg_priorities(spg, debug=False)
+    report = dict()
+    for key, game in (("before", spg), ("after", compressed)):
+        alphas = compute_alphas_for_spg(game, epsilon=epsilon)
+        report[f"priorities_{key}"] = len(alphas)
+        report[f"smallest_alpha_{key}"] = float(min(alphas.values()))
+    return report
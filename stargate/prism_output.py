@@ -0,0 +1,227 @@
+import math
+import re
+
+from typing import Any
+
+_RESULT_PATTERN = re.compile(r'^Result:\s*(\S+)', re.MULTILINE)
+_PROPERTY_PATTERN = re.compile(r'^Model checking:\s*(.+?)\s*$', re.MULTILINE)
+_STATES_PATTERN = re.compile(r'^States:\s*(\d+)(?:\s*\((\d+) initial\))?', re.MULTILINE)
+_TRANSITIONS_PATTERN = re.compile(r'^Transitions:\s*(\d+)', re.MULTILINE)
+_CHOICES_PATTERN = re.compile(r'^Choices:\s*(\d+)', re.MULTILINE)
+_MODEL_TYPE_PATTERN = re.compile(r'^Type:\s*(\S+)', re.MULTILINE)
+_ENGINE_PATTERN = re.compile(r'engine:\s*(\w+)|^Engine:\s*(\S+)', re.MULTILINE | re.IGNORECASE)
+_CONSTRUCTION_TIME_PATTERN = re.compile(r'^Time for model construction:\s*([\d.]+(?:[eE][-+]?\d+)?)', re.MULTILINE)
+_CHECKING_TIME_PATTERN = re.compile(r'^Time for model checking:\s*([\d.]+(?:[eE][-+]?\d+)?)', re.MULTILINE)
+_ITERATIONS_PATTERN = re.compile(r'^(.+?) took (\d+) (?:iterations|cycles)', re.MULTILINE)
+_WARNING_PATTERN = re.compile(r'^Warning:\s*(.+?)\s*$', re.MULTILINE)
+_ERROR_PATTERN = re.compile(r'^Error:\s*(.+?)\s*$', re.MULTILINE)
+
+
+def parse_prism_value(value: str) -> float | bool | None:
+    """
+    Parses a value printed by PRISM, e.g. "0.5", "1", "1.2E-5", "true", "Infinity" or "NaN".
+    :param value: Value as printed by PRISM
+    :type value: str
+    :return: Parsed value, or None if it is not a number or boolean
+    :rtype: float | bool | None
+    """
+    value = value.strip().rstrip(",;")
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    if value == "Infinity":
+        return math.inf
+    if value == "-Infinity":
+        return -math.inf
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class PrismResult:
+    def __init__(self, values: list[float | bool | None] | None = None, properties: list[str] | None = None, model_type: str | None = None, states: int | None = None, initial_states: int | None = None, transitions: int | None = None, choices: int | None = None,
+                 construction_time: float | None = None, checking_time: float | None = None, iterations: dict[str, int] | None = None, engine: str | None = None, warnings: list[str] | None = None, errors: list[str] | None = None, output: str = "", return_code: int | None = None, timed_out: bool = False, wall_time: float | None = None, cpu_time: float | None = None, max_rss: int | None = None):
+        """
+        Typed result of a PRISM run.
+        :param values: Results of the checked properties in the order of properties, None for results that could not be parsed
+        :type values: list[float | bool | None] | None
+        :param properties: Checked properties as printed by PRISM
+        :type properties: list[str] | None
+        :param model_type: Type of the model, e.g. "SMG"
+        :type model_type: str | None
+        :param states: Number of reachable states
+        :type states: int | None
+        :param initial_states: Number of initial states
+        :type initial_states: int | None
+        :param transitions: Number of transitions
+        :type transitions: int | None
+        :param choices: Number of choices
+        :type choices: int | None
+        :param construction_time: Time PRISM needed for the model construction in seconds, summed up over all constructions
+        :type construction_time: float | None
+        :param checking_time: Time PRISM needed for model checking in seconds, summed up over all properties
+        :type checking_time: float | None
+        :param iterations: Number of iterations (or cycles) of every iterative method PRISM reported, e.g. {"Value iteration (maxmin)": 23}
+        :type iterations: dict[str, int] | None
+        :param engine: Engine that built the model, e.g. "explicit"
+        :type engine: str | None
+        :param warnings: Warnings printed by PRISM
+        :type warnings: list[str] | None
+        :param errors: Errors printed by PRISM
+        :type errors: list[str] | None
+        :param output: Complete output of PRISM
+        :type output: str
+        :param return_code: Exit code of PRISM or None if it is not known
+        :type return_code: int | None
+        :param timed_out: Whether PRISM was killed because it exceeded its timeout
+        :type timed_out: bool
+        :param wall_time: Wall-clock time of the PRISM process in seconds
+        :type wall_time: float | None
+        :param cpu_time: User and system CPU time of the PRISM process in seconds
+        :type cpu_time: float | None
+        :param max_rss: Peak resident set size of the PRISM process in bytes
+        :type max_rss: int | None
+        """
+        self.values = values if values is not None else []
+        self.properties = properties if properties is not None else []
+        self.model_type = model_type
+        self.states = states
+        self.initial_states = initial_states
+        self.transitions = transitions
+        self.choices = choices
+        self.construction_time = construction_time
+        self.checking_time = checking_time
+        self.iterations = iterations if iterations is not None else {}
+        self.engine = engine
+        self.warnings = warnings if warnings is not None else []
+        self.errors = errors if errors is not None else []
+        self.output = output
+        self.return_code = return_code
+        self.timed_out = timed_out
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.max_rss = max_rss
+
+    @property
+    def value(self) -> float | bool | None:
+        """
+        Result of the first checked property.
+        :return: Value or None if PRISM returned no result
+        :rtype: float | bool | None
+        """
+        return self.values[0] if self.values else None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether PRISM returned a result for every checked property without reporting an error.
+        :return: True if the run succeeded
+        :rtype: bool
+        """
+        return not self.timed_out and not self.errors and bool(self.values) and all(value is not None for value in self.values) and self.return_code in (None, 0)
+
+    @property
+    def converged(self) -> bool | None:
+        """
+        Whether no iterative method reported that it did not converge.
+        :return: False if PRISM warned about missing convergence, None if PRISM returned no result
+        :rtype: bool | None
+        """
+        if not self.values:
+            return None
+        return not any("converge" in warning.lower() for warning in self.warnings + self.errors)
+
+    @property
+    def solver_iterations(self) -> int | None:
+        """
+        Number of iterations of the solving algorithm, i.e. without the precomputations Prob0 and Prob1.
+        :return: Summed up iterations or None if PRISM reported none
+        :rtype: int | None
+        """
+        iterations = [count for method, count in self.iterations.items() if not method.startswith(("Prob0", "Prob1"))]
+        return sum(iterations) if iterations else None
+
+    def model_stats(self) -> tuple[int, int, float]:
+        """
+        Returns the size of the model and its construction time with -1 for values that PRISM did not report.
+        :return: Number of states, number of transitions and construction time in seconds
+        :rtype: tuple[int, int, float]
+        """
+        return (self.states if self.states is not None else -1,
+                self.transitions if self.transitions is not None else -1,
+                self.construction_time if self.construction_time is not None else -1.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the parsed values as a JSON serializable dictionary, without the raw output.
+        :return: Dictionary of the parsed values
+        :rtype: dict[str, Any]
+        """
+        return {"values": self.values, "properties": self.properties, "model_type": self.model_type, "states": self.states, "initial_states": self.initial_states, "transitions": self.transitions, "choices": self.choices,
+                "construction_time": self.construction_time, "checking_time": self.checking_time, "iterations": self.iterations, "engine": self.engine, "warnings": self.warnings, "errors": self.errors, "return_code": self.return_code,
+                "timed_out": self.timed_out, "wall_time": self.wall_time, "cpu_time": self.cpu_time, "max_rss": self.max_rss}
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return f"PrismResult(values={self.values}, states={self.states}, transitions={self.transitions}, construction_time={self.construction_time}, checking_time={self.checking_time})"
+
+
+def parse_prism_output(output: str, return_code: int | None = None, error_output: str = "", process=None) -> PrismResult:
+    """
+    Parses the output of a PRISM run into a PrismResult.
+    :param output: Standard output of PRISM
+    :type output: str
+    :param return_code: Exit code of PRISM
+    :type return_code: int | None
+    :param error_output: Standard error of PRISM, errors printed there are added to the errors of the result
+    :type error_output: str
+    :param process: Result of run_process for the PRISM run, its exit code, output, limits and resource usage are used
+    :type process: ProcessResult | None
+    :return: Parsed result
+    :rtype: PrismResult
+    """
+    if process is not None:
+        output, return_code, error_output = process.stdout, process.returncode, process.stderr
+    output = output or ""
+    result = PrismResult(output=output, return_code=return_code)
+    if process is not None:
+        result.timed_out = process.timed_out
+        result.wall_time = process.wall_time
+        result.cpu_time = process.cpu_time
+        result.max_rss = process.max_rss
+    result.values = [parse_prism_value(match.group(1)) for match in _RESULT_PATTERN.finditer(output)]
+    result.properties = [match.group(1) for match in _PROPERTY_PATTERN.finditer(output)]
+    match = _MODEL_TYPE_PATTERN.search(output)
+    if match:
+        result.model_type = match.group(1)
+    states = _STATES_PATTERN.findall(output)
+    if states:
+        result.states = int(states[-1][0])
+        result.initial_states = int(states[-1][1]) if states[-1][1] else None
+    transitions = _TRANSITIONS_PATTERN.findall(output)
+    if transitions:
+        result.transitions = int(transitions[-1])
+    choices = _CHOICES_PATTERN.findall(output)
+    if choices:
+        result.choices = int(choices[-1])
+    match = _ENGINE_PATTERN.search(output)
+    if match:
+        result.engine = (match.group(1) or match.group(2)).lower()
+    construction_times = _CONSTRUCTION_TIME_PATTERN.findall(output)
+    if construction_times:
+        result.construction_time = sum(float(time) for time in construction_times)
+    checking_times = _CHECKING_TIME_PATTERN.findall(output)
+    if checking_times:
+        result.checking_time = sum(float(time) for time in checking_times)
+    for method, count in _ITERATIONS_PATTERN.findall(output):
+        method = method.strip()
+        result.iterations[method] = result.iterations.get(method, 0) + int(count)
+    result.warnings = _WARNING_PATTERN.findall(output)
+    result.errors = _ERROR_PATTERN.findall(output) + _ERROR_PATTERN.findall(error_output or "")
+    if process is not None and process.memory_exceeded:
+        result.errors.append("PRISM ran out of memory")
+    return result
@@ -0,0 +1,136 @@
+from fractions import Fraction
+
+import settings
+
+
+class _InternedFraction(Fraction):
+    """
+    Canonical rational of the probability table. The table hands out one object per distinct value, and sets of (probability, vertex) tuples hash
+    their probabilities over and over, so the hash, which needs a modular inverse for fractions, is computed only once.
+    Arithmetic on it returns ordinary fractions.
+    """
+    __slots__ = ("_hash",)
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = Fraction.__hash__(self)
+            return self._hash
+
+
+class ProbabilityTable:
+    def __init__(self, max_size: int | None = None):
+        """
+        Interning table of probabilities. Games use few distinct probabilities, so the conversion of a probability to its canonical rational
+        and to its string in PRISM models is computed once per distinct value instead of once per edge.
+        The table is cleared when it holds more than max_size entries.
+        :param max_size: Maximum number of entries, if None PROBABILITY_TABLE_SIZE is used
+        :type max_size: int | None
+        """
+        self.max_size = max_size
+        self._rationals: dict[tuple[float | Fraction, int], Fraction] = dict()
+        # Floats and fractions with equal values have different strings, so they are kept apart
+        self._float_strings: dict[float, str] = dict()
+        self._other_strings: dict[Fraction, str] = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def _make_room(self) -> None:
+        """
+        Clears the table if it is full.
+        """
+        max_size = settings.PROBABILITY_TABLE_SIZE if self.max_size is None else self.max_size
+        if len(self) >= max_size:
+            self.clear()
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+        self._rationals.clear()
+        self._float_strings.clear()
+        self._other_strings.clear()
+
+    def rational(self, prob: float | Fraction, max_denominator: int | None = None) -> Fraction:
+        """
+        Returns the canonical rational of a probability, the closest fraction with a bounded denominator.
+        :param prob: Probability
+        :type prob: float | Fraction
+        :param max_denominator: Maximum denominator, if None MAX_DENOMINATOR is used, callers that convert many probabilities should read it once and pass it
+        :type max_denominator: int | None
+        :return: Canonical rational
+        :rtype: Fraction
+        """
+        max_denominator = settings.MAX_DENOMINATOR if max_denominator is None else max_denominator
+        if type(prob) is _InternedFraction and prob.denominator <= max_denominator:
+            # Already canonical, limit_denominator would return the same value
+            self.hits += 1
+            return prob
+        key = (prob, max_denominator)
+        rational = self._rationals.get(key)
+        if rational is not None:
+            self.hits += 1
+            return rational
+        self.misses += 1
+        self._make_room()
+        rational = Fraction(prob).limit_denominator(max_denominator)
+        rational = _InternedFraction(rational.numerator, rational.denominator)
+        self._rationals[key] = rational
+        return rational
+
+    def prism_string(self, prob: float | Fraction) -> str:
+        """
+        Returns the string of a probability in PRISM models and game files, which is str of the probability as it is stored in the transition.
+        :param prob: Probability
+        :type prob: float | Fraction
+        :return: Preformatted string
+        :rtype: str
+        """
+        strings = self._float_strings if type(prob) is float else self._other_strings
+        string = strings.get(prob)
+        if string is not None:
+            self.hits += 1
+            return string
+        self.misses += 1
+        self._make_room()
+        string = str(prob)
+        strings[prob] = string
+        return string
+
+    def __len__(self):
+        return len(self._rationals) + len(self._float_strings) + len(self._other_strings)
+
+
+_PROBABILITY_TABLE = ProbabilityTable()
+
+
+def get_probability_table() -> ProbabilityTable:
+    """
+    Returns the probability table shared by the transition classes, the reduction and the emitters.
+    :return: Shared probability table
+    :rtype: ProbabilityTable
+    """
+    return _PROBABILITY_TABLE
+
+
+def canonical_probabilities(end_vertices, max_denominator: int | None = None) -> set:
+    """
+    Replaces the probabilities of a set of (probability, vertex) tuples by their canonical rationals, see ProbabilityTable.rational.
+    :param end_vertices: Probabilities and end vertices of a transition
+    :type end_vertices: Iterable[tuple[float | Fraction, SpgVertex | SsgVertex]]
+    :param max_denominator: Maximum denominator, if None MAX_DENOMINATOR is used
+    :type max_denominator: int | None
+    :return: Set of tuples of canonical rationals and end vertices
+    :rtype: set[tuple[Fraction, SpgVertex | SsgVertex]]
+    """
+    max_denominator = settings.MAX_DENOMINATOR if max_denominator is None else max_denominator
+    rational = _PROBABILITY_TABLE.rational
+    return {(rational(prob, max_denominator), vertex) for prob, vertex in end_vertices}
+
+
+def probability_string(prob: float | Fraction) -> str:
+    """
+    Shortcut for get_probability_table().prism_string(prob).
+    """
+    return _PROBABILITY_TABLE.prism_string(prob)
@@ -0,0 +1,178 @@
+import time
+
+from error_handling import print_debug
+from parity_game_solver import ParityGameIndex
+from run_report import measured
+from stochasticparitygame import SpgVertex, SpgTransition, StochasticParityGame
+import settings
+
+
+class QualitativeRegions:
+    def __init__(self, almost_sure_eve: set[SpgVertex], almost_sure_adam: set[SpgVertex], positive_eve: set[SpgVertex], positive_adam: set[SpgVertex]):
+        """
+        Qualitative winning regions of a stochastic parity game.
+        :param almost_sure_eve: Vertices from which Eve wins with probability 1
+        :type almost_sure_eve: set[SpgVertex]
+        :param almost_sure_adam: Vertices from which Adam wins with probability 1
+        :type almost_sure_adam: set[SpgVertex]
+        :param positive_eve: Vertices from which Eve wins with positive probability
+        :type positive_eve: set[SpgVertex]
+        :param positive_adam: Vertices from which Adam wins with positive probability
+        :type positive_adam: set[SpgVertex]
+        """
+        self.almost_sure_eve = almost_sure_eve
+        self.almost_sure_adam = almost_sure_adam
+        self.positive_eve = positive_eve
+        self.positive_adam = positive_adam
+
+    def __str__(self):
+        return (f"QualitativeRegions(almost sure Eve: {len(self.almost_sure_eve)}, almost sure Adam: {len(self.almost_sure_adam)}, "
+                f"positive Eve: {len(self.positive_eve)}, positive Adam: {len(self.positive_adam)})")
+
+
+def _almost_sure_gadget_game(spg: StochasticParityGame, vertices: list[SpgVertex], for_eve: bool) -> ParityGameIndex:
+    """
+    Builds the two-player parity game whose winning region of Eve is the almost-sure winning region of a player in the stochastic parity game
+    (gadget reduction of Chatterjee, Jurdzinski and Henzinger). The first len(vertices) vertices of the result are the vertices of the game in the given order.
+    Every random transition is replaced by a gadget: Eve claims an even priority c, then Adam either accepts, the play sees c and Adam picks the successor,
+    or he challenges, the play sees c + 1 and Eve picks the successor. A random transition that is taken infinitely often reaches every successor infinitely often,
+    so Eve wins almost surely exactly where she wins the game with gadgets.
+    For Adam the owners are swapped and all priorities are increased by one.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param vertices: Vertices of the game in the order of the first vertices of the result
+    :type vertices: list[SpgVertex]
+    :param for_eve: True for the almost-sure region of Eve, False for Adam
+    :type for_eve: bool
+    :return: Two-player parity game
+    :rtype: ParityGameIndex
+    """
+    shift = 0 if for_eve else 1
+    index_of = {vertex: index for index, vertex in enumerate(vertices)}
+    is_eve = [vertex.is_eve == for_eve for vertex in vertices]
+    priority = [vertex.priority + shift for vertex in vertices]
+    successors: list[list[int]] = [[] for _ in vertices]
+    highest_even = max(priority, default=0) + max(priority, default=0) % 2
+    claims = range(0, highest_even + 1, 2)
+
+    def add_vertex(owner_is_eve: bool, vertex_priority: int, vertex_successors: list[int]) -> int:
+        is_eve.append(owner_is_eve)
+        priority.append(vertex_priority)
+        successors.append(vertex_successors)
+        return len(successors) - 1
+
+    random_gadgets = dict()
+    for transition in spg.transitions.values():
+        start = index_of[transition.start_vertex]
+        ends = sorted({index_of[end_vertex] for prob, end_vertex in transition.end_vertices if prob > 0})
+        if len(ends) == 1:
+            if ends[0] not in successors[start]:
+                successors[start].append(ends[0])
+            continue
+        key = tuple(ends)
+        if key not in random_gadgets:
+            # The gadget vertices get the least significant priority, every cycle also passes a vertex of the game
+            claim_vertices = []
+            for claim in claims:
+                answers = [add_vertex(False, claim, list(ends))]
+                if claim < highest_even:
+                    answers.append(add_vertex(True, claim + 1, list(ends)))
+                claim_vertices.append(add_vertex(False, highest_even, answers))
+            random_gadgets[key] = add_vertex(True, highest_even, claim_vertices)
+        if random_gadgets[key] not in successors[start]:
+            successors[start].append(random_gadgets[key])
+    return ParityGameIndex(is_eve, priority, successors)
+
+
+@measured("qualitative_analysis")
+def qualitative_regions(spg: StochasticParityGame, algorithm: str | None = None, debug: bool | None = None) -> QualitativeRegions:
+    """
+    Computes the almost-sure and the positive winning regions of both players of a stochastic parity game by graph algorithms only, without any probabilities.
+    The almost-sure regions are the winning regions of Eve in two-player parity games with gadgets for the random transitions, see _almost_sure_gadget_game.
+    Stochastic parity games are qualitatively determined, so a player wins with positive probability exactly where the other player does not win almost surely.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param algorithm: Parity game algorithm, "zielonka" or "priority_promotion", if None PARITY_GAME_ALGORITHM is used
+    :type algorithm: str | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Qualitative winning regions of both players
+    :rtype: QualitativeRegions
+    """
+    algorithm = settings.PARITY_GAME_ALGORITHM if algorithm is None else algorithm
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    vertices = list(spg.vertices.values())
+    almost_sure = []
+    for for_eve in (True, False):
+        regions, _ = _almost_sure_gadget_game(spg, vertices, for_eve).solve(algorithm)
+        almost_sure.append({vertices[vertex] for vertex in regions[0] if vertex < len(vertices)})
+    all_vertices = set(vertices)
+    result = QualitativeRegions(almost_sure_eve=almost_sure[0], almost_sure_adam=almost_sure[1], positive_eve=all_vertices - almost_sure[1], positive_adam=all_vertices - almost_sure[0])
+    if debug:
+        print_debug(f"Qualitative regions computed in {(time.perf_counter() - start_time):.6f} seconds: {result}")
+    return result
+
+
+def _unused_name(names, name: str) -> str:
+    """
+    Returns name, or name followed by the smallest number that makes it unused.
+    """
+    if name not in names:
+        return name
+    i = 0
+    while f"{name}{i}" in names:
+        i += 1
+    return f"{name}{i}"
+
+
+@measured("qualitative_preprocessing")
+def fix_qualitative_regions(spg: StochasticParityGame, regions: QualitativeRegions | None = None, debug: bool | None = None) -> StochasticParityGame:
+    """
+    Fixes the values of the almost-sure winning regions before the reduction: every vertex that one of the players wins almost surely moves to a sink
+    with priority 0 (Eve wins) or 1 (Adam wins) instead, and the vertices that are no longer reachable from the initial vertex are removed.
+    The values of all remaining vertices stay the same, the reduction only has to handle the part of the game where the winner is not certain.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param regions: Qualitative regions of the game, computed with qualitative_regions if None
+    :type regions: QualitativeRegions | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Stochastic parity game with fixed almost-sure regions
+    :rtype: StochasticParityGame
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    regions = qualitative_regions(spg, debug=False) if regions is None else regions
+    win_name = _unused_name(spg.vertices, "v_as_win")
+    lose_name = _unused_name(spg.vertices, "v_as_lose")
+    sinks = {True: SpgVertex(name=win_name, is_eve=True, priority=0), False: SpgVertex(name=lose_name, is_eve=False, priority=1)}
+    new_vertices = {spg.init_vertex: SpgVertex(name=spg.init_vertex.name, is_eve=spg.init_vertex.is_eve, priority=spg.init_vertex.priority)}
+    transitions = dict()
+    queue = [spg.init_vertex]
+    outgoing: dict[SpgVertex, list[SpgTransition]] = dict()
+    for transition in spg.transitions.values():
+        outgoing.setdefault(transition.start_vertex, []).append(transition)
+    used_sinks = set()
+    while queue:
+        vertex = queue.pop()
+        start_vertex = new_vertices[vertex]
+        if vertex in regions.almost_sure_eve or vertex in regions.almost_sure_adam:
+            sink = sinks[vertex in regions.almost_sure_eve]
+            used_sinks.add(sink)
+            transitions[(start_vertex, "fixed")] = SpgTransition(start_vertex=start_vertex, end_vertices={(1.0, sink)}, action="fixed")
+            continue
+        for transition in outgoing.get(vertex, []):
+            for _, end_vertex in transition.end_vertices:
+                if end_vertex not in new_vertices:
+                    new_vertices[end_vertex] = SpgVertex(name=end_vertex.name, is_eve=end_vertex.is_eve, priority=end_vertex.priority)
+                    queue.append(end_vertex)
+            transitions[(start_vertex, transition.action)] = SpgTransition(start_vertex=start_vertex, end_vertices={(prob, new_vertices[end_vertex]) for prob, end_vertex in transition.end_vertices}, action=transition.action)
+    for sink in used_sinks:
+        transitions[(sink, "selfloop")] = SpgTransition(start_vertex=sink, end_vertices={(1.0, sink)}, action="selfloop")
+    vertices = {vertex.name: vertex for vertex in new_vertices.values()}
+    vertices.update({sink.name: sink for sink in used_sinks})
+    fixed = StochasticParityGame(vertices=vertices, transitions=transitions, init_vertex=new_vertices[spg.init_vertex])
+    if debug:
+        print_debug(f"Qualitative regions fixed, {len(spg.vertices)} vertices reduced to {len(fixed.vertices)} vertices")
+    return fixed
@@ -0,0 +1,275 @@
+import json
+import os
+import sqlite3
+import time
+
+from typing import Any, Iterator
+
+from error_handling import print_debug, print_warning
+from run_report import RunReport
+from prism_output import PrismResult
+import settings
+
+
+class BenchmarkResultStore:
+    def __init__(self, path: str, debug: bool | None = None):
+        """
+        Append-only store for benchmark results backed by SQLite.
+        Every result is identified by (instance, epsilon, algorithm, metric) and committed on its own, so an interrupted benchmark can be resumed without losing finished results.
+        :param path: Path of the SQLite database, created if it does not exist
+        :type path: str
+        :param debug: Whether to print debug information
+        :type debug: bool | None
+        """
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.path = path
+        self.debug = debug
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                 "instance TEXT NOT NULL, "
+                                 "epsilon TEXT NOT NULL, "
+                                 "algorithm TEXT NOT NULL, "
+                                 "metric TEXT NOT NULL, "
+                                 "value TEXT NOT NULL, "
+                                 "recorded_at REAL NOT NULL, "
+                                 "PRIMARY KEY (instance, epsilon, algorithm, metric))")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_by_metric ON results (metric, epsilon, algorithm)")
+        self._connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key: tuple) -> bool:
+        return self.has(*key)
+
+    @staticmethod
+    def _key(instance: Any, epsilon: Any, algorithm: Any, metric: str) -> tuple[str, str, str, str]:
+        """
+        Normalizes the parts of a key to the strings that are stored in the database.
+        Tuples are joined with commas, None becomes "None" for the epsilon and "" for the algorithm.
+        :return: Normalized key
+        :rtype: tuple[str, str, str, str]
+        """
+        if isinstance(instance, (tuple, list)):
+            instance = ",".join(str(x) for x in instance)
+        return str(instance), "None" if epsilon is None else str(epsilon), "" if algorithm is None else str(algorithm), str(metric)
+
+    def put(self, instance: Any, epsilon: Any, algorithm: Any, metric: str, value: Any) -> None:
+        """
+        Stores a result and commits it immediately. An existing result with the same key is replaced.
+        :param instance: Benchmark instance, e.g. the (vertices, transitions, priorities) tuple of a random SPG
+        :type instance: Any
+        :param epsilon: Epsilon of the reduction or None
+        :type epsilon: Any
+        :param algorithm: PRISM algorithm or None for metrics that do not depend on it
+        :type algorithm: Any
+        :param metric: Name of the metric
+        :type metric: str
+        :param value: JSON serializable value of the metric
+        :type value: Any
+        """
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", (*self._key(instance, epsilon, algorithm, metric), json.dumps(value), time.time()))
+
+    def put_run_report(self, instance: Any, epsilon: Any, algorithm: Any, report: RunReport | dict, prefix: str = "") -> None:
+        """
+        Stores the aggregated stages of a run report, every measured field becomes a metric named "<prefix><stage>_<field>", e.g. "reduction_wall_time".
+        :param instance: Benchmark instance
+        :type instance: Any
+        :param epsilon: Epsilon of the reduction or None
+        :type epsilon: Any
+        :param algorithm: PRISM algorithm or None
+        :type algorithm: Any
+        :param report: Run report or dictionary created by RunReport.to_dict
+        :type report: RunReport | dict
+        :param prefix: Prefix of the metric names, used to distinguish several reports of the same key
+        :type prefix: str
+        """
+        if isinstance(report, dict):
+            report = RunReport.from_dict(report)
+        rows = []
+        for stage, fields in report.summary().items():
+            for field, value in fields.items():
+                if value is not None:
+                    rows.append((*self._key(instance, epsilon, algorithm, f"{prefix}{stage}_{field}"), json.dumps(value), time.time()))
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def put_prism_result(self, instance: Any, epsilon: Any, algorithm: Any, prism_result: PrismResult, prefix: str = "") -> None:
+        """
+        Stores the value, the model size and the iteration count of a PRISM run as metrics named "<prefix>prism_<field>".
+        :param instance: Benchmark instance
+        :type instance: Any
+        :param epsilon: Epsilon of the reduction or None
+        :type epsilon: Any
+        :param algorithm: PRISM algorithm or None
+        :type algorithm: Any
+        :param prism_result: Parsed result of the PRISM run
+        :type prism_result: PrismResult
+        :param prefix: Prefix of the metric names, used to distinguish several PRISM runs of the same key
+        :type prefix: str
+        """
+        fields = {"value": prism_result.value, "states": prism_result.states, "transitions": prism_result.transitions, "iterations": prism_result.solver_iterations, "converged": prism_result.converged}
+        rows = [(*self._key(instance, epsilon, algorithm, f"{prefix}prism_{field}"), json.dumps(value), time.time()) for field, value in fields.items() if value is not None]
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def get(self, instance: Any, epsilon: Any, algorithm: Any, metric: str, default: Any = None) -> Any:
+        """
+        Returns a stored result.
+        :param instance: Benchmark instance
+        :type instance: Any
+        :param epsilon: Epsilon of the reduction or None
+        :type epsilon: Any
+        :param algorithm: PRISM algorithm or None
+        :type algorithm: Any
+        :param metric: Name of the metric
+        :type metric: str
+        :param default: Value that is returned if the result is not stored
+        :type default: Any
+        :return: Stored value or default
+        :rtype: Any
+        """
+        row = self._connection.execute("SELECT value FROM results WHERE instance=? AND epsilon=? AND algorithm=? AND metric=?", self._key(instance, epsilon, algorithm, metric)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def has(self, instance: Any, epsilon: Any, algorithm: Any, metric: str) -> bool:
+        """
+        Checks whether a result is stored.
+        :return: True if the result is stored
+        :rtype: bool
+        """
+        return self._connection.execute("SELECT 1 FROM results WHERE instance=? AND epsilon=? AND algorithm=? AND metric=?", self._key(instance, epsilon, algorithm, metric)).fetchone() is not None
+
+    def missing(self, keys: list[tuple]) -> list[tuple]:
+        """
+        Returns the keys whose results are not stored yet, used to resume a benchmark.
+        :param keys: Expected (instance, epsilon, algorithm, metric) keys
+        :type keys: list[tuple]
+        :return: Keys without a stored result
+        :rtype: list[tuple]
+        """
+        return [key for key in keys if not self.has(*key)]
+
+    def query(self, instance: Any = None, epsilon: Any = ..., algorithm: Any = ..., metric: str = None) -> Iterator[tuple[tuple[str, str, str, str], Any]]:
+        """
+        Iterates over the stored results that match all given key parts, omitted parts match everything.
+        :param instance: Benchmark instance
+        :type instance: Any
+        :param epsilon: Epsilon of the reduction, None selects the results without epsilon
+        :type epsilon: Any
+        :param algorithm: PRISM algorithm, None selects the results without algorithm
+        :type algorithm: Any
+        :param metric: Name of the metric
+        :type metric: str
+        :return: Iterator over (key, value) pairs with normalized keys
+        :rtype: Iterator[tuple[tuple[str, str, str, str], Any]]
+        """
+        conditions = []
+        parameters = []
+        if instance is not None:
+            conditions.append("instance=?")
+            parameters.append(self._key(instance, None, None, "")[0])
+        if epsilon is not ...:
+            conditions.append("epsilon=?")
+            parameters.append("None" if epsilon is None else str(epsilon))
+        if algorithm is not ...:
+            conditions.append("algorithm=?")
+            parameters.append("" if algorithm is None else str(algorithm))
+        if metric is not None:
+            conditions.append("metric=?")
+            parameters.append(metric)
+        sql = "SELECT instance, epsilon, algorithm, metric, value FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        for instance_str, epsilon_str, algorithm_str, metric_str, value in self._connection.execute(sql + " ORDER BY instance, epsilon, algorithm, metric", parameters):
+            yield (instance_str, epsilon_str, algorithm_str, metric_str), json.loads(value)
+
+    def items(self) -> Iterator[tuple[tuple[str, str, str, str], Any]]:
+        """
+        Iterates over all stored results.
+        :return: Iterator over (key, value) pairs with normalized keys
+        :rtype: Iterator[tuple[tuple[str, str, str, str], Any]]
+        """
+        return self.query()
+
+    def export_dict(self) -> dict[str, Any]:
+        """
+        Returns all results in the flat JSON shape of save_benchmark_results, i.e. keys of the form "instance | epsilon | algorithm | metric" where the algorithm is omitted if it is empty.
+        :return: Serializable dictionary of all results
+        :rtype: dict[str, Any]
+        """
+        results = {}
+        for (instance, epsilon, algorithm, metric), value in self.items():
+            key_parts = [instance, epsilon, algorithm, metric] if algorithm else [instance, epsilon, metric]
+            results[" | ".join(key_parts)] = value
+        return results
+
+    def export_nested_dict(self) -> dict[str, Any]:
+        """
+        Returns all results in the nested JSON shape of tuples_to_nested, where the parts of a comma separated instance form the outermost levels.
+        :return: Nested serializable dictionary of all results
+        :rtype: dict[str, Any]
+        """
+        nested = {}
+        for (instance, epsilon, algorithm, metric), value in self.items():
+            current = nested
+            for part in (*instance.split(","), epsilon, *([algorithm] if algorithm else [])):
+                current = current.setdefault(part, {})
+            current[metric] = value
+        return nested
+
+    def export_json(self, path: str, nested: bool = False) -> None:
+        """
+        Writes all results to a JSON file in the shape that was used before the store existed. The file is replaced atomically.
+        :param path: Path of the JSON file
+        :type path: str
+        :param nested: Whether to use the nested shape of tuples_to_nested instead of the flat shape of save_benchmark_results
+        :type nested: bool
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.export_nested_dict() if nested else self.export_dict(), f, indent=4 if nested else 2)
+        os.replace(tmp_path, path)
+        if self.debug:
+            print_debug(f"Exported {len(self)} benchmark results to {path}")
+
+    def import_results(self, results: dict[tuple, Any]) -> int:
+        """
+        Imports results with (instance, epsilon, algorithm, metric) or (instance, epsilon, metric) tuple keys in a single transaction, e.g. from a legacy JSON file.
+        :param results: Results to import
+        :type results: dict[tuple, Any]
+        :return: Number of imported results
+        :rtype: int
+        """
+        rows = []
+        for key, value in results.items():
+            if len(key) == 4:
+                instance, epsilon, algorithm, metric = key
+            elif len(key) == 3:
+                instance, epsilon, metric = key
+                algorithm = None
+            else:
+                print_warning(f"Skipping result with invalid key {key}")
+                continue
+            rows.append((*self._key(instance, epsilon, algorithm, metric), json.dumps(value), time.time()))
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self._connection.close()
@@ -0,0 +1,395 @@
+import contextvars
+import functools
+import time
+import tracemalloc
+
+from typing import Any, Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from error_handling import print_debug
+import settings
+
+_active_report = contextvars.ContextVar("active_run_report", default=None)
+
+STAGE_FIELDS = ("wall_time", "cpu_time", "peak_memory", "child_cpu_time", "child_max_rss")
+
+
+def _children_rusage() -> tuple[float, int] | None:
+    """
+    Returns the CPU time and the maximum resident set size of all terminated and waited-for child processes.
+    :return: CPU time in seconds and maximum resident set size in bytes, or None if rusage is not available
+    :rtype: tuple[float, int] | None
+    """
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * 1024
+
+
+class StageMeasurement:
+    def __init__(self, name: str, wall_time: float | None = None, cpu_time: float | None = None, peak_memory: int | None = None, child_cpu_time: float | None = None, child_max_rss: int | None = None, source: str = "measured"):
+        """
+        Measurement of one stage of a pipeline run.
+        :param name: Name of the stage, e.g. "parse", "reduction" or "prism_model_checking"
+        :type name: str
+        :param wall_time: Wall-clock time of the stage in seconds
+        :type wall_time: float | None
+        :param cpu_time: CPU time of this process during the stage in seconds
+        :type cpu_time: float | None
+        :param peak_memory: Peak of the memory allocated by Python during the stage in bytes, relative to the allocations at its start
+        :type peak_memory: int | None
+        :param child_cpu_time: CPU time of the child processes (e.g. PRISM) that terminated during the stage in seconds
+        :type child_cpu_time: float | None
+        :param child_max_rss: Largest resident set size of any child process that terminated so far in bytes, only set if a child process terminated during the stage
+        :type child_max_rss: int | None
+        :param source: "measured" if the stage was measured by stargate, "prism" if its values were parsed from the output of PRISM
+        :type source: str
+        """
+        self.name = name
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.peak_memory = peak_memory
+        self.child_cpu_time = child_cpu_time
+        self.child_max_rss = child_max_rss
+        self.source = source
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the measurement as a JSON serializable dictionary.
+        :return: Dictionary with the name, the source and all measured fields
+        :rtype: dict[str, Any]
+        """
+        return {"name": self.name, "source": self.source, **{field: getattr(self, field) for field in STAGE_FIELDS}}
+
+    def __repr__(self):
+        return f"StageMeasurement({self.name!r}, wall_time={self.wall_time}, cpu_time={self.cpu_time}, peak_memory={self.peak_memory})"
+
+
+class _RunningStage:
+    def __init__(self, report: "RunReport", name: str):
+        """
+        Stage that is currently measured, created by start_stage.
+        :param report: Report the measurement is added to
+        :type report: RunReport
+        :param name: Name of the stage
+        :type name: str
+        """
+        self.report = report
+        self.name = name
+        self.stopped = False
+        self.max_peak = 0
+        if report.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report._propagate_peak(peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+        else:
+            self.start_memory = None
+        self.start_children = _children_rusage()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        report._running.append(self)
+
+    def stop(self) -> StageMeasurement | None:
+        """
+        Stops the measurement and adds it to the report. Stopping a stage twice has no effect.
+        :return: Measurement of the stage or None if it was already stopped
+        :rtype: StageMeasurement | None
+        """
+        if self.stopped:
+            return None
+        wall_time = time.perf_counter() - self.start_wall
+        cpu_time = time.process_time() - self.start_cpu
+        self.stopped = True
+        peak_memory = None
+        if self.start_memory is not None and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.max_peak)
+            peak_memory = max(0, peak - self.start_memory)
+            if self in self.report._running:
+                self.report._running.remove(self)
+            self.report._propagate_peak(peak)
+        elif self in self.report._running:
+            self.report._running.remove(self)
+        child_cpu_time = None
+        child_max_rss = None
+        end_children = _children_rusage()
+        if self.start_children is not None and end_children is not None:
+            child_cpu_time = end_children[0] - self.start_children[0]
+            if child_cpu_time > 0 or end_children[1] != self.start_children[1]:
+                child_max_rss = end_children[1]
+        measurement = StageMeasurement(self.name, wall_time, cpu_time, peak_memory, child_cpu_time, child_max_rss)
+        self.report.stages.append(measurement)
+        if self.report.debug:
+            print_debug(f"Stage {self.name} took {wall_time:.6f} seconds")
+        return measurement
+
+
+class _NoStage:
+    def stop(self) -> None:
+        """
+        Does nothing, returned by start_stage if no report is active.
+        """
+        return None
+
+
+_NO_STAGE = _NoStage()
+
+
+class RunReport:
+    def __init__(self, trace_memory: bool = True, debug: bool | None = None):
+        """
+        Structured report of a pipeline run that collects the wall time, CPU time and peak memory of every stage.
+        A report only collects measurements while it is active (see activate), the pipeline functions record their stages into the active report.
+        Peak memory is measured with tracemalloc, which slows down allocation heavy stages, child processes are measured with their rusage.
+        :param trace_memory: Whether to measure the peak memory of the stages with tracemalloc
+        :type trace_memory: bool
+        :param debug: Whether to print debug information
+        :type debug: bool | None
+        """
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.trace_memory = trace_memory
+        self.debug = debug
+        self.stages: list[StageMeasurement] = []
+        self._running: list[_RunningStage] = []
+        self._started_tracing = False
+
+    def _propagate_peak(self, peak: int) -> None:
+        """
+        Remembers a tracemalloc peak for all running stages before the peak is reset by a nested stage.
+        :param peak: Absolute peak in bytes
+        :type peak: int
+        """
+        for stage in self._running:
+            stage.max_peak = max(stage.max_peak, peak)
+
+    def activate(self) -> "RunReport":
+        """
+        Makes this report the active report of the current context and starts tracemalloc if needed.
+        Use the report as context manager to deactivate it automatically.
+        :return: The report itself
+        :rtype: RunReport
+        """
+        self._token = _active_report.set(self)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def deactivate(self) -> None:
+        """
+        Deactivates the report, stops all stages that are still running and stops tracemalloc if it was started by the report.
+        """
+        for stage in list(self._running):
+            stage.stop()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        _active_report.reset(self._token)
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.deactivate()
+
+    def add_stage(self, name: str, wall_time: float | None = None, cpu_time: float | None = None, peak_memory: int | None = None, source: str = "measured") -> StageMeasurement:
+        """
+        Adds a stage that was not measured by start_stage, e.g. a stage whose duration was reported by PRISM.
+        :param name: Name of the stage
+        :type name: str
+        :param wall_time: Wall-clock time of the stage in seconds
+        :type wall_time: float | None
+        :param cpu_time: CPU time of the stage in seconds
+        :type cpu_time: float | None
+        :param peak_memory: Peak memory of the stage in bytes
+        :type peak_memory: int | None
+        :param source: Origin of the values
+        :type source: str
+        :return: Added measurement
+        :rtype: StageMeasurement
+        """
+        measurement = StageMeasurement(name, wall_time=wall_time, cpu_time=cpu_time, peak_memory=peak_memory, source=source)
+        self.stages.append(measurement)
+        return measurement
+
+    def merge(self, other: "RunReport | dict") -> None:
+        """
+        Appends the stages of another report, e.g. of a stage that was executed in a worker process.
+        :param other: Report or dictionary created by to_dict
+        :type other: RunReport | dict
+        """
+        if isinstance(other, dict):
+            other = RunReport.from_dict(other)
+        self.stages.extend(other.stages)
+
+    def summary(self) -> dict[str, dict[str, float | int | None]]:
+        """
+        Aggregates the stages by name: times are summed up, memory values are maximized.
+        :return: Dictionary mapping stage names to their aggregated fields
+        :rtype: dict[str, dict[str, float | int | None]]
+        """
+        summary = {}
+        for stage in self.stages:
+            entry = summary.setdefault(stage.name, dict.fromkeys(STAGE_FIELDS))
+            for field in STAGE_FIELDS:
+                value = getattr(stage, field)
+                if value is None:
+                    continue
+                if entry[field] is None:
+                    entry[field] = value
+                elif field in ("peak_memory", "child_max_rss"):
+                    entry[field] = max(entry[field], value)
+                else:
+                    entry[field] += value
+        return summary
+
+    def total_wall_time(self) -> float:
+        """
+        Returns the summed up wall-clock time of all measured stages, stages parsed from PRISM are part of the measured PRISM stage and not counted.
+        :return: Wall-clock time in seconds
+        :rtype: float
+        """
+        return sum(stage.wall_time for stage in self.stages if stage.source == "measured" and stage.wall_time is not None)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns the report as a JSON serializable dictionary.
+        :return: Dictionary with the list of stages
+        :rtype: dict[str, Any]
+        """
+        return {"stages": [stage.to_dict() for stage in self.stages]}
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "RunReport":
+        """
+        Creates a report from a dictionary created by to_dict.
+        :param data: Dictionary of the report
+        :type data: dict[str, Any]
+        :return: Inactive report with the stages of the dictionary
+        :rtype: RunReport
+        """
+        report = RunReport(trace_memory=False)
+        for stage in data.get("stages", []):
+            report.stages.append(StageMeasurement(stage["name"], source=stage.get("source", "measured"), **{field: stage.get(field) for field in STAGE_FIELDS}))
+        return report
+
+    def __str__(self):
+        lines = [f"{'Stage':<28}{'Wall [s]':>12}{'CPU [s]':>12}{'Peak [B]':>14}{'Child CPU [s]':>15}"]
+        for name, entry in self.summary().items():
+            lines.append(f"{name:<28}"
+                         f"{'-' if entry['wall_time'] is None else format(entry['wall_time'], '.6f'):>12}"
+                         f"{'-' if entry['cpu_time'] is None else format(entry['cpu_time'], '.6f'):>12}"
+                         f"{'-' if entry['peak_memory'] is None else entry['peak_memory']:>14}"
+                         f"{'-' if entry['child_cpu_time'] is None else format(entry['child_cpu_time'], '.6f'):>15}")
+        return "\n".join(lines)
+
+
+def get_active_report() -> RunReport | None:
+    """
+    Returns the report that is active in the current context.
+    :return: Active report or None
+    :rtype: RunReport | None
+    """
+    return _active_report.get()
+
+
+def start_stage(name: str) -> _RunningStage | _NoStage:
+    """
+    Starts measuring a stage in the active report. The returned object must be stopped with stop() when the stage ends.
+    If no report is active nothing is measured.
+    :param name: Name of the stage
+    :type name: str
+    :return: Running stage
+    :rtype: _RunningStage | _NoStage
+    """
+    report = _active_report.get()
+    if report is None:
+        return _NO_STAGE
+    return _RunningStage(report, name)
+
+
+class measure_stage:
+    def __init__(self, name: str):
+        """
+        Context manager that measures the enclosed code as a stage of the active report.
+        :param name: Name of the stage
+        :type name: str
+        """
+        self.name = name
+        self._stage = None
+
+    def __enter__(self):
+        self._stage = start_stage(self.name)
+        return self._stage
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._stage.stop()
+
+
+def measured(name: str) -> Callable:
+    """
+    Decorator that measures every call of the decorated function as a stage of the active report.
+    :param name: Name of the stage
+    :type name: str
+    :return: Decorator
+    :rtype: Callable
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if _active_report.get() is None:
+                return method(*args, **kwargs)
+            with measure_stage(name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_stage(name: str, wall_time: float | None = None, cpu_time: float | None = None, peak_memory: int | None = None, source: str = "measured") -> None:
+    """
+    Adds a stage with externally measured values to the active report, does nothing if no report is active.
+    :param name: Name of the stage
+    :type name: str
+    :param wall_time: Wall-clock time of the stage in seconds
+    :type wall_time: float | None
+    :param cpu_time: CPU time of the stage in seconds
+    :type cpu_time: float | None
+    :param peak_memory: Peak memory of the stage in bytes
+    :type peak_memory: int | None
+    :param source: Origin of the values
+    :type source: str
+    """
+    report = _active_report.get()
+    if report is not None:
+        report.add_stage(name, wall_time=wall_time, cpu_time=cpu_time, peak_memory=peak_memory, source=source)
+
+
+def run_measured(method: Callable, args: tuple = (), kwargs: dict | None = None, stage: str | None = None, trace_memory: bool = True) -> tuple[Any, dict[str, Any]]:
+    """
+    Calls a function with an active report and returns its result together with the report.
+    Meant to be submitted to a WorkerPool, so that the report of a stage that runs in a worker process is sent back with its result.
+    :param method: Function to call
+    :type method: Callable
+    :param args: Positional arguments of the function
+    :type args: tuple
+    :param kwargs: Keyword arguments of the function
+    :type kwargs: dict | None
+    :param stage: If given, the whole call is additionally measured as a stage with this name
+    :type stage: str | None
+    :param trace_memory: Whether to measure the peak memory with tracemalloc
+    :type trace_memory: bool
+    :return: Return value of the function and the report as dictionary
+    :rtype: tuple[Any, dict[str, Any]]
+    """
+    with RunReport(trace_memory=trace_memory, debug=False) as report:
+        if stage is not None:
+            with measure_stage(stage):
+                value = method(*args, **(kwargs or {}))
+        else:
+            value = method(*args, **(kwargs or {}))
+    return value, report.to_dict()
@@ -1,11 +1,31 @@
+import contextlib
+import contextvars
+import json
 import os
 import subprocess
-import sys
+
+from typing import Any, Callable, Iterator
 
 from path_conversion import windows_to_linux_path
 
+# The values below are the defaults. They can be overridden without editing this file by environment variables
+# STARGATE_<NAME>, by a TOML file (STARGATE_CONFIG or stargate.toml in the working directory), process-wide with
+# configure(...) and for a single call or task with override(...). All values are resolved when they are read.
+
 USE_EXACT_ARITHMETIC = False  # If True, replaces floats with exact arithmetic (fractions), default is True
 MAX_DENOMINATOR = 2_147_483_647  # 2,147,483,647 is the optimal value for PRISM-games
+PROBABILITY_TABLE_SIZE = 65_536  # Maximum number of entries of the table that caches the rationals and strings of probabilities, default is 65,536
+INTEGER_PROBABILITIES = False  # If True and USE_EXACT_ARITHMETIC is True, distributions are checked and compared as integer numerators over a common denominator instead of as sums of fractions, default is False
+VALUE_ITERATION_PRECISION = 1e-12  # Value iteration of a strongly connected component stops when its values are certified within this, default is 1e-12
+VALUE_ITERATION_MAX_ITERATIONS = 1_000_000  # Maximum number of value iteration sweeps per strongly connected component, default is 1,000,000
+ADAPTIVE_EPSILON_START = 0.1  # First epsilon of the adaptive epsilon refinement, default is 0.1
+ADAPTIVE_EPSILON_FACTOR = 0.1  # Factor by which the adaptive epsilon refinement tightens epsilon from one level to the next, default is 0.1
+COMPRESS_PRIORITIES = False  # If True, spg_to_ssg renumbers the priorities of every strongly connected component before computing the alphas, so that fewer alpha levels are needed, default is False
+SCC_LOCAL_ALPHAS = False  # If True, spg_to_ssg computes the alphas of every strongly connected component from its own size and probabilities, only used with an epsilon, default is False
+MINIMIZE_SSG = False  # If True, ssg_to_smgspec replaces the SSG by its bisimulation quotient before the SMG is emitted, default is False
+SOLVE_DETERMINISTIC_SPG_NATIVELY = True  # If True, SPGs without random transitions are solved directly as parity games instead of with the reduction and PRISM, default is True
+PARITY_GAME_ALGORITHM = "zielonka"  # "zielonka" (recursive) or "priority_promotion", algorithm for SPGs without random transitions, default is "zielonka"
+FIX_QUALITATIVE_REGIONS = False  # If True, spg_to_ssg replaces the almost-sure winning regions of both players by winning and losing sinks before the reduction, default is False
 SSG_TO_SMG_VERSION = 1  # 1: Performant alternating version, 2: Older alternating version, 3: Synchronous version, default is 1
 
 GLOBAL_IN_OUT_PATH_LINUX = ""  # only assign if the OS is Linux, otherwise it will be set to GLOBAL_IN_OUT_PATH_WINDOWS
@@ -18,42 +38,324 @@ ENSURE_EVE_AND_ADAM_VERTICES = False  # If True, ensures that every SPG and SSG
 PRISM_EPSILON = 1e-6  # Epsilon for PRISM, used for numerical stability in value iteration algorithms, default is 1e-6
 MAX_ITERS = 1_000_000_000  # Maximum number of iterations for PRISM algorithms, default is 10000
 PRISM_PATH = "/mnt/c/Uni_Zeug/6.Semester/Bachelorarbeit/prism_extension/Algorithms-For-Stochastic-Games/prism-games-3.0.beta-src/prism/bin/prism"  # Path to the PRISM executable, needs to be in Linux format
+PRISM_TIMEOUT = None  # Wall-clock limit of a single PRISM run in seconds, the run is killed when it is exceeded, None means no limit
+PRISM_MEMORY_LIMIT = None  # Address space limit of a single PRISM run in bytes (Linux only), None means no limit
+MODEL_HANDOFF = "tmpfs"  # How SMG models that are only needed by PRISM are handed over: "file" (GLOBAL_IN_OUT_PATH), "tmpfs" (/dev/shm), "memfd" (anonymous memory file) or "fifo" (named pipe), default is "tmpfs"
 PRISM_SOLVING_ALGORITHM = "POLICY_ITERATION"  # "VALUE_ITERATION" or "GAUSS_SEIDEL_VALUE_ITERATION" or "POLICY_ITERATION" or "MODIFIED_POLICY_ITERATION" or "INTERVAL_ITERATION" or "SOUND_VALUE_ITERATION" or "TOPOLOGICAL VALUE_ITERATION" or "SOUND_TOPOLOGICAL_VALUE_ITERATION" or "SOUND_POLICY_ITERATION" or "SOUND_MODIFIED_POLICY_ITERATION"
 
+USE_ARTIFACT_CACHE = False  # If True, reduced games, SMG specifications and property results are cached on disk and reused, default is False
+ARTIFACT_CACHE_PATH = ""  # Directory of the artifact cache, if empty the directory .stargate_cache in GLOBAL_IN_OUT_PATH is used
+ARTIFACT_CACHE_MAX_SIZE = 2_147_483_648  # Maximum size of the artifact cache in bytes, least recently used artifacts are evicted first, default is 2 GiB
 
-# ---------------------------------------------Automatic Settings-------------------------------------------------------
 
-if GLOBAL_IN_OUT_PATH_LINUX == "" and GLOBAL_IN_OUT_PATH_WINDOWS == "":
-    print("Global input/output path is not set. Please set GLOBAL_IN_OUT_PATH_LINUX or GLOBAL_IN_OUT_PATH_WINDOWS.")
-    sys.exit(1)
-if GLOBAL_IN_OUT_PATH_LINUX == "":
-    GLOBAL_IN_OUT_PATH_LINUX = windows_to_linux_path(GLOBAL_IN_OUT_PATH_WINDOWS)
+# ---------------------------------------------Automatic Settings-------------------------------------------------------
 
-GLOBAL_IN_OUT_PATH = GLOBAL_IN_OUT_PATH_LINUX if os.name == 'posix' else GLOBAL_IN_OUT_PATH_WINDOWS
+_DEFAULTS = {name: value for name, value in globals().items() if name.isupper()}
+for _name in _DEFAULTS:
+    # Removed from the module so that reading them goes through __getattr__ and sees all overrides
+    del globals()[_name]
 
 IS_OS_LINUX = os.name == 'posix'  # Check if the OS is Linux
-if not IS_OS_LINUX:
-    # Test if WSL is installed
-    result = subprocess.run(["wsl", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    IS_WSL_INSTALLED = result.returncode == 0
-else:
-    IS_WSL_INSTALLED = False
-if not IS_OS_LINUX and not IS_WSL_INSTALLED:
-    print("Error: The current OS is not Linux nor is WSL installed. Please run this script on a Linux system or install WSL.")
-match PRISM_SOLVING_ALGORITHM:  # Set the PRISM solving algorithm, used for property checking
-    case "VALUE_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-valiter"
-    case "GAUSS_SEIDEL_VALUE_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-gaussseidel"
-    case "POLICY_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-politer"
-    case "MODIFIED_POLICY_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-modpoliter"
-    case "INTERVAL_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-intervaliter"
-    case "SOUND_VALUE_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-soundvaliter"
-    case "TOPOLOGICAL_VALUE_ITERATION":
-        PRISM_SOLVING_ALGORITHM = "-topological"
-    case _:
-        PRISM_SOLVING_ALGORITHM = ""  # PRISM default algorithm, which is "VALUE_ITERATION"
+ENVIRONMENT_PREFIX = "STARGATE_"
+CONFIG_FILE_ENVIRONMENT_VARIABLE = "STARGATE_CONFIG"
+DEFAULT_CONFIG_FILE = "stargate.toml"
+
+_PRISM_SOLVING_ALGORITHM_FLAGS = {
+    "VALUE_ITERATION": "-valiter",
+    "GAUSS_SEIDEL_VALUE_ITERATION": "-gaussseidel",
+    "POLICY_ITERATION": "-politer",
+    "MODIFIED_POLICY_ITERATION": "-modpoliter",
+    "INTERVAL_ITERATION": "-intervaliter",
+    "SOUND_VALUE_ITERATION": "-soundvaliter",
+    "TOPOLOGICAL_VALUE_ITERATION": "-topological",
+}
+_overrides: contextvars.ContextVar[dict[str, Any]] = contextvars.ContextVar("stargate_setting_overrides", default={})
+
+
+def prism_algorithm_flag(algorithm: str) -> str:
+    """
+    Returns the PRISM command line flag of a solving algorithm.
+    :param algorithm: Name of the algorithm, e.g. "VALUE_ITERATION", or a flag, which is returned unchanged
+    :type algorithm: str
+    :return: Flag, e.g. "-valiter", or "" for the PRISM default algorithm, which is "VALUE_ITERATION"
+    :rtype: str
+    """
+    if not algorithm or algorithm.startswith("-"):
+        return algorithm
+    return _PRISM_SOLVING_ALGORITHM_FLAGS.get(algorithm, "")
+
+
+def parse_setting_value(name: str, value: str) -> Any:
+    """
+    Converts a setting given as text, e.g. in an environment variable or on the command line, to the type of its default.
+    :param name: Name of the setting
+    :type name: str
+    :param value: Value as text
+    :type value: str
+    :return: Converted value
+    :rtype: Any
+    """
+    if name == "GLOBAL_IN_OUT_PATH":
+        # Derived setting without a default, it can still be set directly as a path
+        return value
+    if name not in _DEFAULTS:
+        raise ValueError(f"Unknown setting {name}")
+    default = _DEFAULTS[name]
+    if isinstance(default, bool):
+        if value.strip().lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.strip().lower() in ("0", "false", "no", "off", ""):
+            return False
+        raise ValueError(f"Setting {name} must be a boolean, got {value}")
+    if isinstance(default, str):
+        return value
+    try:
+        parsed = json.loads(value.replace("_", ""))
+    except ValueError:
+        raise ValueError(f"Setting {name} must be a number, got {value}") from None
+    if isinstance(default, int) and isinstance(parsed, float) and parsed.is_integer():
+        parsed = int(parsed)
+    return parsed
+
+
+def _load_config_file() -> dict[str, Any]:
+    """
+    Reads the TOML configuration file, its top-level keys are setting names in any case.
+    :return: Values of the file, empty if there is no file
+    :rtype: dict[str, Any]
+    """
+    path = os.environ.get(CONFIG_FILE_ENVIRONMENT_VARIABLE) or DEFAULT_CONFIG_FILE
+    if not os.path.isfile(path):
+        if os.environ.get(CONFIG_FILE_ENVIRONMENT_VARIABLE):
+            raise FileNotFoundError(f"Configuration file {path} does not exist")
+        return {}
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+    with open(path, "rb") as file:
+        values = tomllib.load(file)
+    unknown = [key for key in values if key.upper() not in _DEFAULTS and key.upper() != "GLOBAL_IN_OUT_PATH"]
+    if unknown:
+        raise ValueError(f"Unknown settings in {path}: {', '.join(unknown)}")
+    return {key.upper(): value for key, value in values.items()}
+
+
+class _Overrides(dict):
+    """
+    Overridden settings of a context together with the values resolved under them, so reads in hot loops under override resolve every setting only once.
+    The mapping is never changed after it is set, override sets a new one.
+    """
+    __slots__ = ("resolved", "generation")
+
+    def __init__(self, values: dict[str, Any]):
+        super().__init__(values)
+        self.resolved: dict[str, Any] = {}
+        # Generation of the Settings whose values are cached, configure and reload start a new one
+        self.generation = -1
+
+
+class Settings:
+    def __init__(self, defaults: dict[str, Any]):
+        """
+        Configuration that resolves every setting when it is read. Sources in the order of precedence:
+        overrides of the current context (override), process-wide values (configure), environment variables STARGATE_<NAME>,
+        the TOML configuration file and the defaults of settings.py.
+        Reading settings does no I/O apart from reading the configuration file once and, on Windows, checking for WSL once.
+        Resolved values are cached until configure or reload is called, so environment variables that are changed later are only seen after reload.
+        The values resolved under overrides are cached with the overrides, so they are resolved once per override context.
+        :param defaults: Default values of all settings
+        :type defaults: dict[str, Any]
+        """
+        self._defaults = defaults
+        self._configured: dict[str, Any] = {}
+        self._file_values: dict[str, Any] | None = None
+        self._resolved: dict[str, Any] = {}
+        self._generation = 0
+        self._wsl_installed: bool | None = None
+
+    def names(self) -> list[str]:
+        """
+        Returns the names of all settings.
+        :return: Setting names
+        :rtype: list[str]
+        """
+        return [*self._defaults, "GLOBAL_IN_OUT_PATH", "IS_WSL_INSTALLED"]
+
+    def _raw(self, name: str, overrides: dict[str, Any]) -> Any:
+        """
+        Returns the value of a setting from the source with the highest precedence, without any conversion.
+        """
+        if name in overrides:
+            return overrides[name]
+        if name in self._configured:
+            return self._configured[name]
+        environment_value = os.environ.get(ENVIRONMENT_PREFIX + name)
+        if environment_value is not None:
+            return parse_setting_value(name, environment_value)
+        if self._file_values is None:
+            self._file_values = _load_config_file()
+        if name in self._file_values:
+            return self._file_values[name]
+        return self._defaults.get(name, "")
+
+    def _resolve(self, name: str, overrides: dict[str, Any]) -> Any:
+        """
+        Returns the value of a setting including the values that are derived from other settings.
+        """
+        match name:
+            case "GLOBAL_IN_OUT_PATH_LINUX":
+                in_out_path = self._raw("GLOBAL_IN_OUT_PATH", overrides)
+                if in_out_path:
+                    # A directly set GLOBAL_IN_OUT_PATH also moves the directory of the PRISM helpers
+                    return in_out_path if IS_OS_LINUX else windows_to_linux_path(in_out_path)
+                linux_path = self._raw("GLOBAL_IN_OUT_PATH_LINUX", overrides)
+                if linux_path:
+                    return linux_path
+                windows_path = self._raw("GLOBAL_IN_OUT_PATH_WINDOWS", overrides)
+                if not windows_path:
+                    raise ValueError("Global input/output path is not set. Please set GLOBAL_IN_OUT_PATH_LINUX or GLOBAL_IN_OUT_PATH_WINDOWS.")
+                return windows_to_linux_path(windows_path)
+            case "GLOBAL_IN_OUT_PATH":
+                in_out_path = self._raw("GLOBAL_IN_OUT_PATH", overrides)
+                if in_out_path:
+                    return in_out_path
+                return self._resolve("GLOBAL_IN_OUT_PATH_LINUX", overrides) if IS_OS_LINUX else self._raw("GLOBAL_IN_OUT_PATH_WINDOWS", overrides)
+            case "PRISM_SOLVING_ALGORITHM":
+                return prism_algorithm_flag(self._raw("PRISM_SOLVING_ALGORITHM", overrides))
+            case "IS_WSL_INSTALLED":
+                if IS_OS_LINUX:
+                    return False
+                if self._wsl_installed is None:
+                    try:
+                        self._wsl_installed = subprocess.run(["wsl", "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+                    except OSError:
+                        self._wsl_installed = False
+                return self._wsl_installed
+        if name not in self._defaults:
+            raise AttributeError(f"Unknown setting {name}")
+        return self._raw(name, overrides)
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the current value of a setting.
+        :param name: Name of the setting, e.g. "PRISM_PATH"
+        :type name: str
+        :return: Value of the setting
+        :rtype: Any
+        """
+        overrides = _overrides.get()
+        resolved = self._resolved
+        if overrides:
+            if overrides.generation != self._generation:
+                overrides.resolved = {}
+                overrides.generation = self._generation
+            resolved = overrides.resolved
+        try:
+            return resolved[name]
+        except KeyError:
+            value = resolved[name] = self._resolve(name, overrides)
+            return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get(name)
+
+    def configure(self, **values) -> None:
+        """
+        Sets settings for the whole process, e.g. in the initializer of a worker process.
+        :param values: New values by setting name
+        """
+        self._check_names(values)
+        self._configured.update(values)
+        self._resolved.clear()
+        self._generation += 1
+
+    def reload(self) -> None:
+        """
+        Forgets all process-wide values and cached values, so environment variables and the configuration file are read again.
+        """
+        self._configured.clear()
+        self._file_values = None
+        self._resolved.clear()
+        self._generation += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the current values of all settings, e.g. to pass them to another process.
+        :return: Values by setting name
+        :rtype: dict[str, Any]
+        """
+        overrides = _overrides.get()
+        values = {name: self._raw(name, overrides) for name in self._defaults}
+        in_out_path = self._raw("GLOBAL_IN_OUT_PATH", overrides)
+        if in_out_path:
+            values["GLOBAL_IN_OUT_PATH"] = in_out_path
+        return values
+
+    def _check_names(self, values: dict[str, Any]) -> None:
+        unknown = [name for name in values if name not in self._defaults and name != "GLOBAL_IN_OUT_PATH"]
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(unknown)}")
+
+
+settings = Settings(_DEFAULTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Resolves the module attributes, e.g. settings.PRISM_PATH, at the time they are read.
+    """
+    if name.isupper():
+        return settings.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def configure(**values) -> None:
+    """
+    Sets settings for the whole process.
+    :param values: New values by setting name, e.g. PRISM_SOLVING_ALGORITHM="VALUE_ITERATION"
+    """
+    settings.configure(**values)
+
+
+@contextlib.contextmanager
+def override(**values) -> Iterator[None]:
+    """
+    Overrides settings for the current thread or asyncio task until the context is left.
+    :param values: New values by setting name, e.g. PRISM_EPSILON=1e-8
+    """
+    settings._check_names(values)
+    token = _overrides.set(_Overrides({**_overrides.get(), **values}))
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def current_overrides() -> dict[str, Any]:
+    """
+    Returns the settings that were set with configure or override in this process, e.g. to apply them in a worker process.
+    :return: Values by setting name
+    :rtype: dict[str, Any]
+    """
+    return {**settings._configured, **_overrides.get()}
+
+
+def call_with_settings(values: dict[str, Any], method: Callable, args: tuple = (), kwargs: dict | None = None) -> Any:
+    """
+    Calls a function with overridden settings. Since it is picklable, it can be submitted to a WorkerPool so that tasks of the same pool run with different settings.
+    :param values: Overridden settings by name
+    :type values: dict[str, Any]
+    :param method: Function to call
+    :type method: Callable
+    :param args: Positional arguments of the function
+    :type args: tuple
+    :param kwargs: Keyword arguments of the function
+    :type kwargs: dict | None
+    :return: Return value of the function
+    :rtype: Any
+    """
+    with override(**values):
+        return method(*args, **(kwargs or {}))
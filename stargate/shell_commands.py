@@ -1,7 +1,19 @@
+import os
+import signal
 import subprocess
+import threading
+import time
+
+from typing import Callable
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 from error_handling import print_error, print_debug, print_warning
-from settings import GLOBAL_DEBUG, IS_OS_LINUX, IS_WSL_INSTALLED
+import settings
+from settings import IS_OS_LINUX
 
 
 def sh_escape(s: str) -> str:
@@ -15,7 +27,7 @@ def sh_escape(s: str) -> str:
     return "'" + s.replace("'", "'\\''") + "'"
 
 
-def run_command(command: str | list[str], use_shell: bool = True, debug: bool = GLOBAL_DEBUG) -> subprocess.CompletedProcess | None:
+def run_command(command: str | list[str], use_shell: bool = True, debug: bool | None = None) -> subprocess.CompletedProcess | None:
     """
     Runs a shell command and returns the result.
     :param command: Command to run, can be a string or a list of strings
@@ -23,10 +35,11 @@ def run_command(command: str | list[str], use_shell: bool = True, debug: bool =
     :param use_shell: Whether to use the shell to execute the command, default is True
     :type use_shell: bool
     :param debug: Whether to print debug information, default is GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :return: Result of the command execution, or None if the command failed
     :rtype: subprocess.CompletedProcess | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if isinstance(command, str) and not use_shell:
         command = command.split(' ')
         if debug:
@@ -46,7 +59,7 @@ def run_command(command: str | list[str], use_shell: bool = True, debug: bool =
         return None
 
 
-def run_command_linux(command: str | list[str], use_shell: bool = True, debug: bool = GLOBAL_DEBUG) -> subprocess.CompletedProcess | None:
+def run_command_linux(command: str | list[str], use_shell: bool = True, debug: bool | None = None, check: bool = True) -> subprocess.CompletedProcess | None:
     """
     Runs a shell command on a Linux system or WSL and returns the result.
     :param command: Command to run, can be a string or a list of strings
@@ -54,22 +67,25 @@ def run_command_linux(command: str | list[str], use_shell: bool = True, debug: b
     :param use_shell: Whether to use the shell to execute the command, default is True
     :type use_shell: bool
     :param debug: Whether to print debug information, default is GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
+    :param check: Whether a non-zero exit code counts as failure, if False the result is returned together with its exit code
+    :type check: bool
     :return: Result of the command execution, or None if the command failed
     :rtype: subprocess.CompletedProcess | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     try:
         if use_shell:
             if IS_OS_LINUX:
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
-            elif IS_WSL_INSTALLED:
-                result = subprocess.run(["wsl", "bash", "-c", command], capture_output=True, text=True, check=True)
+                result = subprocess.run(command, shell=True, capture_output=True, text=True, check=check)
+            elif settings.IS_WSL_INSTALLED:
+                result = subprocess.run(["wsl", "bash", "-c", command], capture_output=True, text=True, check=check)
             else:
                 print_error(
                     "Error: The current OS is not Linux nor is WSL installed. Please run this script on a Linux system or install WSL.")
                 return None
         else:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
+            result = subprocess.run(command, shell=True, capture_output=True, text=True, check=check)
 
         if debug:
             print(result.stdout)
@@ -81,3 +97,307 @@ def run_command_linux(command: str | list[str], use_shell: bool = True, debug: b
         else:
             print_warning(f"Command {command} failed with error")
         return None
+
+
+class ProcessResult:
+    def __init__(self, argv: list[str], returncode: int | None, stdout: str, stderr: str, wall_time: float, timed_out: bool = False, memory_exceeded: bool = False, user_time: float | None = None, system_time: float | None = None, max_rss: int | None = None):
+        """
+        Result of a process started by run_process.
+        :param argv: Argument vector the process was started with
+        :type argv: list[str]
+        :param returncode: Exit code of the process, negative if it was killed by a signal
+        :type returncode: int | None
+        :param stdout: Captured standard output
+        :type stdout: str
+        :param stderr: Captured standard error
+        :type stderr: str
+        :param wall_time: Wall-clock time of the process in seconds
+        :type wall_time: float
+        :param timed_out: Whether the process group was killed because it exceeded its timeout
+        :type timed_out: bool
+        :param memory_exceeded: Whether the process reported that it ran out of memory
+        :type memory_exceeded: bool
+        :param user_time: User CPU time of the process in seconds, None if rusage is not available
+        :type user_time: float | None
+        :param system_time: System CPU time of the process in seconds, None if rusage is not available
+        :type system_time: float | None
+        :param max_rss: Peak resident set size of the process in bytes, None if rusage is not available
+        :type max_rss: int | None
+        """
+        self.argv = argv
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.wall_time = wall_time
+        self.timed_out = timed_out
+        self.memory_exceeded = memory_exceeded
+        self.user_time = user_time
+        self.system_time = system_time
+        self.max_rss = max_rss
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the process exited with code 0 within its limits.
+        :return: True if the process succeeded
+        :rtype: bool
+        """
+        return self.returncode == 0 and not self.timed_out and not self.memory_exceeded
+
+    @property
+    def cpu_time(self) -> float | None:
+        """
+        User and system CPU time of the process.
+        :return: CPU time in seconds or None if rusage is not available
+        :rtype: float | None
+        """
+        if self.user_time is None or self.system_time is None:
+            return None
+        return self.user_time + self.system_time
+
+    def __repr__(self):
+        return f"ProcessResult({self.argv[0] if self.argv else ''!r}, returncode={self.returncode}, wall_time={self.wall_time:.3f}, timed_out={self.timed_out}, max_rss={self.max_rss})"
+
+
+_OUT_OF_MEMORY_MESSAGES = ("java.lang.OutOfMemoryError", "Could not reserve enough space", "Cannot allocate memory", "MemoryError")
+
+
+def _pump_stream(stream, lines: list[str], callback: Callable[[str], None] | None) -> None:
+    """
+    Reads a stream of a child process line by line until it is closed.
+    :param stream: Text stream to read
+    :type stream: io.TextIOBase
+    :param lines: List the lines are appended to
+    :type lines: list[str]
+    :param callback: Function that is called with every line as soon as it was read
+    :type callback: Callable[[str], None] | None
+    """
+    try:
+        for line in iter(stream.readline, ""):
+            lines.append(line)
+            if callback is not None:
+                try:
+                    callback(line)
+                except Exception as e:
+                    print_warning(f"Output callback failed: {e}")
+    finally:
+        stream.close()
+
+
+def _kill_process_group(process: "subprocess.Popen | asyncio.subprocess.Process") -> None:
+    """
+    Kills a process that was started in its own session together with all processes of its group.
+    :param process: Process to kill
+    :type process: subprocess.Popen | asyncio.subprocess.Process
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def run_process(argv: list[str], timeout: float | None = None, memory_limit: int | None = None, on_stdout: Callable[[str], None] | None = None, on_stderr: Callable[[str], None] | None = None, cwd: str | None = None, debug: bool | None = None) -> ProcessResult | None:
+    """
+    Runs a program without a shell, streams its output line by line and measures its resource usage.
+    On Linux the process is started in a new session, so that a timeout kills the whole process group (e.g. the JVM started by the PRISM script).
+    On Windows the program is run in WSL.
+    :param argv: Program and its arguments
+    :type argv: list[str]
+    :param timeout: Wall-clock limit in seconds, None for no limit
+    :type timeout: float | None
+    :param memory_limit: Limit of the address space of the process in bytes (RLIMIT_AS), None for no limit. Only supported on Linux
+    :type memory_limit: int | None
+    :param on_stdout: Function that is called with every line of the standard output
+    :type on_stdout: Callable[[str], None] | None
+    :param on_stderr: Function that is called with every line of the standard error
+    :type on_stderr: Callable[[str], None] | None
+    :param cwd: Working directory of the process
+    :type cwd: str | None
+    :param debug: Whether to print debug information, default is GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Result of the process, or None if it could not be started
+    :rtype: ProcessResult | None
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    argv = [str(arg) for arg in argv]
+    if not IS_OS_LINUX:
+        if not settings.IS_WSL_INSTALLED:
+            print_error("Error: The current OS is not Linux nor is WSL installed. Please run this script on a Linux system or install WSL.")
+            return None
+        argv = ["wsl", *argv]
+    preexec_fn = None
+    if memory_limit is not None and resource is not None:
+        def preexec_fn():
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if debug:
+        print_debug(f"Running {' '.join(sh_escape(arg) for arg in argv)}")
+    start_time = time.perf_counter()
+    try:
+        process = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL, text=True, bufsize=1, cwd=cwd, start_new_session=os.name == "posix", preexec_fn=preexec_fn)
+    except OSError as e:
+        print_warning(f"Could not start {argv[0]}: {e}")
+        return None
+    stdout_lines: list[str] = []
+    stderr_lines: list[str] = []
+    readers = [threading.Thread(target=_pump_stream, args=(process.stdout, stdout_lines, on_stdout), daemon=True),
+               threading.Thread(target=_pump_stream, args=(process.stderr, stderr_lines, on_stderr), daemon=True)]
+    for reader in readers:
+        reader.start()
+    timed_out = threading.Event()
+    # The pid of the process, which is also the id of its group, can be reused once it is reaped, so the group is only killed before
+    reaped = False
+    reap_lock = threading.Lock()
+
+    def on_timeout():
+        with reap_lock:
+            if not reaped:
+                timed_out.set()
+                _kill_process_group(process)
+
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+    user_time = system_time = max_rss = None
+    status = rusage = None
+    try:
+        if hasattr(os, "waitid"):
+            # Waits for the exit without reaping, so the exited process keeps its pid
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            with reap_lock:
+                # Kill descendants that outlived the process and still hold its pipes
+                _kill_process_group(process)
+                _, status, rusage = os.wait4(process.pid, 0)
+                reaped = True
+        else:
+            # Without waitid the exit is polled under the lock, so the timer never kills the group of a reaped process
+            delay = 0.001
+            while True:
+                with reap_lock:
+                    if hasattr(os, "wait4"):
+                        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+                        reaped = pid != 0
+                    else:
+                        reaped = process.poll() is not None
+                if reaped:
+                    break
+                time.sleep(delay)
+                delay = min(2 * delay, 0.05)
+        if rusage is not None:
+            process.returncode = os.waitstatus_to_exitcode(status)
+            user_time, system_time, max_rss = rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss * 1024
+    except BaseException:
+        with reap_lock:
+            if not reaped:
+                _kill_process_group(process)
+        process.wait()
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+    wall_time = time.perf_counter() - start_time
+    for reader in readers:
+        reader.join(5)
+    stdout = "".join(stdout_lines)
+    stderr = "".join(stderr_lines)
+    memory_exceeded = process.returncode != 0 and any(message in stdout or message in stderr for message in _OUT_OF_MEMORY_MESSAGES)
+    result = ProcessResult(argv, process.returncode, stdout, stderr, wall_time, timed_out=timed_out.is_set(), memory_exceeded=memory_exceeded, user_time=user_time, system_time=system_time, max_rss=max_rss)
+    if debug:
+        print_debug(f"{argv[0]} finished in {wall_time:.6f} seconds with exit code {process.returncode}" + (" after its timeout" if result.timed_out else ""))
+    return result
+
+
+async def _pump_stream_async(stream: "asyncio.StreamReader", lines: list[str], callback: Callable[[str], None] | None) -> None:
+    """
+    Reads a stream of an asyncio child process line by line until it is closed.
+    :param stream: Stream to read
+    :type stream: asyncio.StreamReader
+    :param lines: List the decoded lines are appended to
+    :type lines: list[str]
+    :param callback: Function that is called with every line as soon as it was read
+    :type callback: Callable[[str], None] | None
+    """
+    while True:
+        line = await stream.readline()
+        if not line:
+            break
+        line = line.decode(errors="replace")
+        lines.append(line)
+        if callback is not None:
+            try:
+                callback(line)
+            except Exception as e:
+                print_warning(f"Output callback failed: {e}")
+
+
+async def run_process_async(argv: list[str], timeout: float | None = None, memory_limit: int | None = None, on_stdout: Callable[[str], None] | None = None, on_stderr: Callable[[str], None] | None = None, cwd: str | None = None, debug: bool | None = None) -> ProcessResult | None:
+    """
+    Asynchronous variant of run_process based on asyncio.create_subprocess_exec.
+    If the calling task is cancelled, the process group is killed before the cancellation is propagated.
+    The child is reaped by asyncio, therefore its CPU time and peak resident set size are not available.
+    :param argv: Program and its arguments
+    :type argv: list[str]
+    :param timeout: Wall-clock limit in seconds, None for no limit
+    :type timeout: float | None
+    :param memory_limit: Limit of the address space of the process in bytes (RLIMIT_AS), None for no limit. Only supported on Linux
+    :type memory_limit: int | None
+    :param on_stdout: Function that is called with every line of the standard output
+    :type on_stdout: Callable[[str], None] | None
+    :param on_stderr: Function that is called with every line of the standard error
+    :type on_stderr: Callable[[str], None] | None
+    :param cwd: Working directory of the process
+    :type cwd: str | None
+    :param debug: Whether to print debug information, default is GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Result of the process, or None if it could not be started
+    :rtype: ProcessResult | None
+    """
+    import asyncio  # Imported on first use, asyncio is slow to import and only needed by the asynchronous API
+
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    argv = [str(arg) for arg in argv]
+    if not IS_OS_LINUX:
+        if not settings.IS_WSL_INSTALLED:
+            print_error("Error: The current OS is not Linux nor is WSL installed. Please run this script on a Linux system or install WSL.")
+            return None
+        argv = ["wsl", *argv]
+    preexec_fn = None
+    if memory_limit is not None and resource is not None:
+        def preexec_fn():
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if debug:
+        print_debug(f"Running {' '.join(sh_escape(arg) for arg in argv)}")
+    start_time = time.perf_counter()
+    try:
+        process = await asyncio.create_subprocess_exec(*argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, stdin=asyncio.subprocess.DEVNULL, cwd=cwd, start_new_session=os.name == "posix", preexec_fn=preexec_fn)
+    except OSError as e:
+        print_warning(f"Could not start {argv[0]}: {e}")
+        return None
+    stdout_lines: list[str] = []
+    stderr_lines: list[str] = []
+    communication = asyncio.gather(_pump_stream_async(process.stdout, stdout_lines, on_stdout), _pump_stream_async(process.stderr, stderr_lines, on_stderr), process.wait())
+    timed_out = False
+    try:
+        await asyncio.wait_for(asyncio.shield(communication), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_process_group(process)
+        await communication
+    except BaseException:
+        _kill_process_group(process)
+        await asyncio.shield(communication)
+        raise
+    if os.name == "posix":
+        _kill_process_group(process)
+    wall_time = time.perf_counter() - start_time
+    stdout = "".join(stdout_lines)
+    stderr = "".join(stderr_lines)
+    memory_exceeded = process.returncode != 0 and any(message in stdout or message in stderr for message in _OUT_OF_MEMORY_MESSAGES)
+    result = ProcessResult(argv, process.returncode, stdout, stderr, wall_time, timed_out=timed_out, memory_exceeded=memory_exceeded)
+    if debug:
+        print_debug(f"{argv[0]} finished in {wall_time:.6f} seconds with exit code {process.returncode}" + (" after its timeout" if timed_out else ""))
+    return result
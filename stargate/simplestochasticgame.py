@@ -4,7 +4,10 @@ import time
 
 from fractions import Fraction
 from error_handling import print_warning, print_error, print_debug, is_float_expr
-from settings import GLOBAL_DEBUG, PRINT_VERTEX_CREATION_WARNINGS, ENSURE_EVE_AND_ADAM_VERTICES, GLOBAL_IN_OUT_PATH, USE_EXACT_ARITHMETIC, MAX_DENOMINATOR
+from run_report import measured
+from probability_table import canonical_probabilities, probability_string
+from integer_distribution import integer_distribution
+import settings
 
 
 class SsgVertex:
@@ -42,7 +45,8 @@ class SsgVertex:
 
 
 class SsgTransition:
-    def __init__(self, start_vertex: SsgVertex, end_vertices: set[tuple[float | Fraction, SsgVertex]], action: str):
+    def __init__(self, start_vertex: SsgVertex, end_vertices: set[tuple[float | Fraction, SsgVertex]], action: str, exact_arithmetic: bool | None = None, integer_probabilities: bool | None = None,
+                 check_probabilities: bool = True):
         """
         Creates a transition of a simple stochastic game.
         :param start_vertex: Starting vertex of the transition
@@ -51,25 +55,47 @@ class SsgTransition:
         :type end_vertices: set[(float | Fraction, SsgVertex)]
         :param action:
         :type action: str
+        :param exact_arithmetic: Whether the probabilities are made exact, if None USE_EXACT_ARITHMETIC is used, code that creates many transitions should read it once and pass it
+        :type exact_arithmetic: bool | None
+        :param integer_probabilities: Whether exact probabilities are checked as integers, if None INTEGER_PROBABILITIES is used
+        :type integer_probabilities: bool | None
+        :param check_probabilities: Whether to warn about negative probabilities and probabilities that do not add up to 1, False for transitions that are valid by construction
+        :type check_probabilities: bool
         """
         self.start_vertex = start_vertex
         self.end_vertices = end_vertices
         self.action = action
-        total_prob = 0
-        neg_probs = False
-        for prob, vert in end_vertices:
-            if prob < 0:
-                neg_probs = True
-            total_prob += prob
-        if abs(total_prob-1) > 0.0001:
-            print_warning(f"Sum ({total_prob}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
-        if neg_probs:
-            print_warning(f"There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
-        if USE_EXACT_ARITHMETIC:
-            # Change all probabilities to fractions
-            self.end_vertices = set()
+        exact_arithmetic = settings.USE_EXACT_ARITHMETIC if exact_arithmetic is None else exact_arithmetic
+        if exact_arithmetic:
+            integer_probabilities = settings.INTEGER_PROBABILITIES if integer_probabilities is None else integer_probabilities
+        # Integer numerators in the iteration order of end_vertices over their common denominator, only with integer probabilities
+        self.distribution: tuple[list[int], int] | None = None
+        if exact_arithmetic and integer_probabilities:
+            # Checked on the integers, the sums of fractions are not needed
+            self.end_vertices = canonical_probabilities(end_vertices)
+            self.distribution = integer_distribution(prob for prob, _ in self.end_vertices)
+            if not check_probabilities:
+                return
+            numerators, denominator = self.distribution
+            if abs(sum(numerators) - denominator) * 10_000 > denominator:
+                print_warning(f"Sum ({Fraction(sum(numerators), denominator)}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
+            if min(numerators, default=0) < 0:
+                print_warning(f"There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
+            return
+        if check_probabilities:
+            total_prob = 0
+            neg_probs = False
             for prob, vert in end_vertices:
-                self.end_vertices.add((Fraction(prob).limit_denominator(MAX_DENOMINATOR), vert))
+                if prob < 0:
+                    neg_probs = True
+                total_prob += prob
+            if abs(total_prob-1) > 0.0001:
+                print_warning(f"Sum ({total_prob}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
+            if neg_probs:
+                print_warning(f"There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
+        if exact_arithmetic:
+            # Change all probabilities to fractions, the shared probability table converts every distinct probability only once
+            self.end_vertices = canonical_probabilities(end_vertices)
 
     def __str__(self):
         """
@@ -100,7 +126,7 @@ class SimpleStochasticGame:
         self.transitions = transitions
         self.init_vertex = init_vertex
 
-        if ENSURE_EVE_AND_ADAM_VERTICES:
+        if settings.ENSURE_EVE_AND_ADAM_VERTICES:
             has_eve = False
             has_adam = False
             for vertex in self.vertices.values():
@@ -110,18 +136,23 @@ class SimpleStochasticGame:
                     has_adam = True
             if not has_eve:
                 self.add_extra_vert(is_eve=True, is_target=False)
-                if GLOBAL_DEBUG:
+                if settings.GLOBAL_DEBUG:
                     print_debug("No Eve vertex was found. An extra Eve vertex was added.")
             if not has_adam:
                 self.add_extra_vert(is_eve=False, is_target=False)
-                if GLOBAL_DEBUG:
+                if settings.GLOBAL_DEBUG:
                     print_debug("No Adam vertex was found. An extra Adam vertex was added.")
+        print_warnings = settings.GLOBAL_DEBUG and settings.PRINT_VERTEX_CREATION_WARNINGS
+        # Computed once for all vertices, is_deadlock_vertex and has_ssg_vertex_ingoing_transition scan all transitions per vertex
+        start_vertices = {transition.start_vertex for transition in self.transitions.values()}
+        if print_warnings:
+            end_vertices = {end_vertex for transition in self.transitions.values() for _, end_vertex in transition.end_vertices}
         for vertex in self.vertices.values():
-            if GLOBAL_DEBUG and PRINT_VERTEX_CREATION_WARNINGS and not has_ssg_vertex_ingoing_transition(vertex, self.transitions):
+            if print_warnings and vertex not in end_vertices:
                 print_debug(f"Vertex {vertex.name} has no ingoing transition.")
-            if is_deadlock_vertex(vertex, self.transitions):
+            if vertex not in start_vertices:
                 self.transitions[vertex, "selfloop"] = SsgTransition(vertex, {(1.0, vertex)}, "selfloop")
-                if GLOBAL_DEBUG and PRINT_VERTEX_CREATION_WARNINGS:
+                if print_warnings:
                     print_debug(f"Vertex {vertex.name} is a deadlock vertex. A selfloop was added.")
         for vertex_name in vertices:
             if vertex_name != vertices[vertex_name].name:
@@ -209,7 +240,8 @@ def is_deadlock_vertex(vertex: SsgVertex, transitions: dict[tuple[SsgVertex, str
     return True
 
 
-def read_ssg_from_file(file_name, use_global_path: bool = False, debug: bool = GLOBAL_DEBUG) -> SimpleStochasticGame:
+@measured("parse")
+def read_ssg_from_file(file_name, use_global_path: bool = False, debug: bool | None = None) -> SimpleStochasticGame:
     """
     Reads a simple stochastic game from a file and returns the corresponding SimpleStochasticGame object.
     :param file_name: Path to the file that is joined with the global global_in_out_path
@@ -217,14 +249,15 @@ def read_ssg_from_file(file_name, use_global_path: bool = False, debug: bool = G
     :param use_global_path: If True, the file name is joined with the global global_in_out_path
     :type use_global_path: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     :return: SimpleStochasticGame object
     :rtype: SimpleStochasticGame
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     if file_name[-4:] != ".ssg":
         print_error("Not a .ssg file")
     try:
@@ -396,14 +429,14 @@ def ssg_to_ssgspec(ssg: SimpleStochasticGame) -> str:
         else:
             transition_str = f"\t{vert_act[0].name} {vert_act[1]} : "
             for end_vert in trans.end_vertices:
-                transition_str += f"{end_vert[0]} | {end_vert[1].name} + "
+                transition_str += f"{probability_string(end_vert[0])} | {end_vert[1].name} + "
             transition_str = transition_str[:-3] + "\n"
             content += transition_str
     content += "endtransitions"
     return content
 
 
-def save_ssg_file(ssg_spec: str, file_name: str = "", use_global_path: bool = False, force: bool = False, debug: bool = GLOBAL_DEBUG):
+def save_ssg_file(ssg_spec: str, file_name: str = "", use_global_path: bool = False, force: bool = False, debug: bool | None = None):
     """
     Saves the given content to a file with the given name. If the file already exists and force is not set to True, nothing is changed.
     :param ssg_spec: SSG specification to save
@@ -415,14 +448,15 @@ def save_ssg_file(ssg_spec: str, file_name: str = "", use_global_path: bool = Fa
     :param force: True if the file should be overwritten if it already exists
     :type force: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if not file_name:
         file_name = "out.ssg"
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     if not file_name.endswith(".ssg"):
         print_warning(f"File {file_name} is not an .ssg file. Nothing was changed")
     elif not force and os.path.exists(file_name) and os.path.getsize(file_name) != 0:
@@ -436,7 +470,7 @@ def save_ssg_file(ssg_spec: str, file_name: str = "", use_global_path: bool = Fa
         print_debug(f"SSG file {file_name} created in {(time.perf_counter() - start_time):.6f} seconds")
 
 
-def reformat_ssgspec(file_name: str, use_global_path: bool = False, debug: bool = GLOBAL_DEBUG):
+def reformat_ssgspec(file_name: str, use_global_path: bool = False, debug: bool | None = None):
     """
     Reformats the SSG specification file to the default format.
     :param file_name: Name of the file to reformat
@@ -444,12 +478,13 @@ def reformat_ssgspec(file_name: str, use_global_path: bool = False, debug: bool
     :param use_global_path: True if the file name should be joined with the global global_in_out_path
     :type use_global_path: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     ssg = read_ssg_from_file(file_name=file_name, use_global_path=use_global_path, debug=False)
     content = ssg_to_ssgspec(ssg)
     save_ssg_file(ssg_spec=content, file_name=file_name, use_global_path=use_global_path, force=True, debug=False)
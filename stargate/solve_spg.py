@@ -2,6 +2,10 @@ import argparse
 from stochasticparitygame import read_spg_from_file
 from spg_to_ssg_reduction import spg_to_ssg
 from ssg_to_smg import ssg_to_smgspec, save_smg_file, check_target_reachability
+from parity_game_solver import is_deterministic_spg, solve_parity_game
+from run_report import RunReport
+from adaptive_epsilon import solve_spg_adaptively
+import settings
 
 
 def main():
@@ -18,15 +22,38 @@ def main():
     parser.add_argument("--smg_to_in_out_directory", action="store_true", help="Write SSG to in/out directory")
     parser.add_argument("--print_alphas", action="store_true", help="Print alphas during SPG to SSG reduction")
     parser.add_argument("--print_vertex_mapping", action="store_true", help="Print mapping of SSG vertices to SMG states")
+    parser.add_argument("--report", action="store_true", help="Print wall time, CPU time and peak memory of every pipeline stage")
+    parser.add_argument("--precision", type=float, default=None, help="Solve natively with epsilons from ADAPTIVE_EPSILON_START downwards until the value of the initial vertex is known up to this precision, no SMG file is written")
 
 
     args = parser.parse_args()
 
-    spg = read_spg_from_file(args.input_file, use_global_path=args.spg_from_in_out_directory, debug=False)
-    ssg = spg_to_ssg(spg=spg, epsilon=args.epsilon, print_alphas=args.print_alphas)
-    smgspec = ssg_to_smgspec(ssg=ssg, version=args.version, debug=False, print_correspondingvertices=args.print_vertex_mapping)
-    save_smg_file(smg_spec=smgspec, file_name=args.output_file, force=args.force, use_global_path=args.smg_to_in_out_directory, debug=False)
-    check_target_reachability(smg_file=args.output_file, print_probabilities=True, use_global_path=args.smg_to_in_out_directory, debug=False)
+    with RunReport(trace_memory=args.report, debug=False) as report:
+        spg = read_spg_from_file(args.input_file, use_global_path=args.spg_from_in_out_directory, debug=False)
+        if settings.SOLVE_DETERMINISTIC_SPG_NATIVELY and is_deterministic_spg(spg):
+            solution = solve_parity_game(spg, debug=False)
+            print(f"The SPG has no random transitions and was solved directly with {solution.algorithm}, no SMG file was written.")
+            print(f"Minimum probability of reaching a target state for eve: {solution.value()}\nMaximum probability of reaching a target state for eve: {solution.value()}")
+        elif args.precision is not None:
+            solution = solve_spg_adaptively(spg, target_precision=args.precision, debug=False)
+            for level in solution.levels:
+                print(f"Epsilon {level['epsilon']:.3g}: value {level['value']} with bound {level['bound']:.3g}, interval [{level['lower']}, {level['upper']}], {level['iterations']} sweeps in {level['solving_time']:.6f} seconds")
+            print(f"Probability of reaching a target state for eve: {solution.value} with epsilon {solution.epsilon:.3g}, the value of the SPG is in [{solution.lower}, {solution.upper}]")
+            if solution.stop_reason == "underflow":
+                print(f"Stopped before reaching the precision {args.precision}, the alphas of the next epsilon would underflow in floating point.")
+            elif solution.stop_reason == "min_epsilon":
+                print(f"Stopped before reaching the precision {args.precision} at the smallest allowed epsilon.")
+            elif solution.stop_reason == "bound":
+                print(f"Stopped before reaching the precision {args.precision}, the value iteration could not bound its values tightly enough.")
+            elif solution.stop_reason == "inconsistent":
+                print("Stopped because the intervals of two epsilons did not overlap, the interval is the hull of all levels.")
+        else:
+            ssg = spg_to_ssg(spg=spg, epsilon=args.epsilon, print_alphas=args.print_alphas)
+            smgspec = ssg_to_smgspec(ssg=ssg, version=args.version, debug=False, print_correspondingvertices=args.print_vertex_mapping)
+            save_smg_file(smg_spec=smgspec, file_name=args.output_file, force=args.force, use_global_path=args.smg_to_in_out_directory, debug=False)
+            check_target_reachability(smg_file=args.output_file, print_probabilities=True, use_global_path=args.smg_to_in_out_directory, debug=False)
+    if args.report:
+        print(report)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,17 @@
 from fractions import Fraction
 from math import factorial
 
-from error_handling import print_error
-from stochasticparitygame import StochasticParityGame, read_spg_from_file
+from error_handling import print_error, print_warning
+from run_report import measured, start_stage
+from artifact_cache import get_artifact_cache, is_cache_enabled, make_cache_key, game_fingerprint
+from stochasticparitygame import SpgVertex, StochasticParityGame, read_spg_from_file
+from priority_compression import compress_spg_priorities
+from qualitative_analysis import fix_qualitative_regions
+from probability_table import get_probability_table
+from integer_distribution import alpha_gadget_probabilities
+from game_graph import successor_lists, strongly_connected_components, is_trivial_component
 from simplestochasticgame import SimpleStochasticGame, SsgVertex, SsgTransition
-from settings import USE_EXACT_ARITHMETIC, MAX_DENOMINATOR
+import settings
 
 
 def max_denom_and_min_prob(spg: StochasticParityGame, max_d: int=10_000) -> (float | Fraction, int):
@@ -22,10 +29,11 @@ def max_denom_and_min_prob(spg: StochasticParityGame, max_d: int=10_000) -> (flo
     for transition in spg.transitions.values():
         for prob, vert in transition.end_vertices:
             floats.add(prob)
-    fractions = [Fraction(f).limit_denominator(max_d) for f in floats]
+    fractions = [get_probability_table().rational(f, max_d) for f in floats]
     return (min(floats), max(fr.denominator for fr in fractions))
 
 
+@measured("alpha_computation")
 def compute_alphas_for_spg(spg: StochasticParityGame, epsilon: float = None, max_d: int = 10_000) -> dict[int, Fraction | float]:
     """
     Computes the alphas for a StochasticParityGame to convert it to a SimpleStochasticGame.
@@ -38,13 +46,72 @@ def compute_alphas_for_spg(spg: StochasticParityGame, epsilon: float = None, max
     :return: Dictionary mapping priorities to alphas where the alphas are either Fractions or floats depending on the USE_EXACT_ARITHMETIC setting.
     :rtype: dict[int, Fraction | float]
     """
-    delta_min_float, max_denominator_M = max_denom_and_min_prob(spg, max_d)
+    probabilities = {prob for transition in spg.transitions.values() for prob, vert in transition.end_vertices}
+    return compute_alphas(len(spg.vertices), {v.priority for v in spg.vertices.values()}, probabilities, epsilon=epsilon, max_d=max_d)
+
+
+@measured("alpha_computation")
+def compute_scc_alphas_for_spg(spg: StochasticParityGame, epsilon: float, max_d: int = 10_000) -> dict[SpgVertex, Fraction | float]:
+    """
+    Computes alphas for every vertex of a StochasticParityGame from the strongly connected component of the vertex instead of the whole game.
+    A play passes through the components along a path of the condensation graph and stays in the last one, so it visits at most as many components as the longest such path has.
+    Every component therefore gets the share epsilon / length of that path, and its alphas are computed with compute_alphas from the number of vertices, the priorities
+    and the edge probabilities of the component only. On modular games this gives much larger alphas than compute_alphas_for_spg.
+    :param spg: StochasticParityGame to compute alphas for
+    :type spg: StochasticParityGame
+    :param epsilon: Precision parameter for the conversion, must not be None
+    :type epsilon: float
+    :param max_d: Maximum denominator for the fractions, defaults to 10_000
+    :type max_d: int
+    :return: Dictionary mapping every vertex to its alpha where the alphas are either Fractions or floats depending on the USE_EXACT_ARITHMETIC setting.
+    :rtype: dict[SpgVertex, Fraction | float]
+    """
+    successors = successor_lists(spg)
+    components = strongly_connected_components(spg.vertices.values(), successors)
+    component_of = {vertex: index for index, component in enumerate(components) for vertex in component}
+    depth = []
+    for index, component in enumerate(components):
+        # Components come in reverse topological order, so all successors already have their depth
+        depth.append(1 + max((depth[component_of[successor]] for vertex in component for successor in successors[vertex] if component_of[successor] != index), default=0))
+    component_epsilon = Fraction(epsilon) / max(depth, default=1)
+    probabilities: list[set] = [set() for _ in components]
+    for transition in spg.transitions.values():
+        probabilities[component_of[transition.start_vertex]].update(prob for prob, vert in transition.end_vertices if prob > 0)
+    vertex_alphas = dict()
+    for index, component in enumerate(components):
+        component_probabilities = probabilities[index] or {1.0}
+        if not is_trivial_component(component, successors) and min(component_probabilities) == 1:
+            # Without randomness in the component the bound of compute_alphas collapses to 0 for all but the smallest priority
+            component_probabilities = component_probabilities | {0.5}
+        alphas = compute_alphas(len(component), {vertex.priority for vertex in component}, component_probabilities, epsilon=component_epsilon, max_d=max_d)
+        for vertex in component:
+            vertex_alphas[vertex] = alphas[vertex.priority]
+    return vertex_alphas
+
+
+def compute_alphas(n_states: int, priorities: set[int], probabilities: set[float], epsilon: float = None, max_d: int = 10_000) -> dict[int, Fraction | float]:
+    """
+    Computes the alphas of compute_alphas_for_spg from the parameters of a game, for games that are not available as StochasticParityGame objects.
+    :param n_states: Number of vertices of the game
+    :type n_states: int
+    :param priorities: Priorities used by the vertices
+    :type priorities: set[int]
+    :param probabilities: Probabilities of all transition edges
+    :type probabilities: set[float]
+    :param epsilon: Precision parameter for the conversion, if None, alphas are computed such that the strategy is optimal for the game.
+    :type epsilon: float
+    :param max_d: Maximum denominator for the fractions, defaults to 10_000
+    :type max_d: int
+    :return: Dictionary mapping priorities to alphas where the alphas are either Fractions or floats depending on the USE_EXACT_ARITHMETIC setting.
+    :rtype: dict[int, Fraction | float]
+    """
+    delta_min_float = min(probabilities)
+    max_denominator_M = max(get_probability_table().rational(f, max_d).denominator for f in probabilities)
     # if float(delta_min_float == 1.0):
         # print_error("The StochasticParity is not stochastic, therefore the reduction cannot be performed.")
-    n_states = len(spg.vertices)
-    used = sorted({v.priority for v in spg.vertices.values()})
+    used = sorted(priorities)
 
-    delta_min = Fraction(delta_min_float).limit_denominator(max_d)
+    delta_min = get_probability_table().rational(delta_min_float, max_d)
     one_minus = Fraction(1, 1) - delta_min
     if epsilon is None:
         numerator   = delta_min ** n_states
@@ -67,28 +134,57 @@ def compute_alphas_for_spg(spg: StochasticParityGame, epsilon: float = None, max
         for prev_k, next_k in zip(used, used[1:]):
             gap = next_k - prev_k
             alphas[next_k] = alphas[prev_k] * ratio_bound
-    if not USE_EXACT_ARITHMETIC:
+    if not settings.USE_EXACT_ARITHMETIC:
         alphas = {k: float(v) for k, v in alphas.items()}
     return alphas
 
 
-def spg_to_ssg(spg: StochasticParityGame, epsilon: float = None, print_alphas: bool = False) -> SimpleStochasticGame:
+def alpha_gadget_pair(alpha: float | Fraction) -> tuple[float | Fraction, float | Fraction]:
     """
-    Converts a StochasticParityGame to a SimpleStochasticGame.
-    :param spg: The StochasticParityGame to convert
+    Returns the probabilities (alpha, 1 - alpha) of an alpha gadget, with integer probabilities see alpha_gadget_probabilities.
+    :param alpha: Alpha of the gadget
+    :type alpha: float | Fraction
+    :return: Alpha and its complement
+    :rtype: tuple[float | Fraction, float | Fraction]
+    """
+    if settings.USE_EXACT_ARITHMETIC and settings.INTEGER_PROBABILITIES:
+        return alpha_gadget_probabilities(alpha)
+    return alpha, 1 - alpha
+
+
+def alpha_gadget_transition(intermediate_vertex: SsgVertex, probabilities: tuple[float | Fraction, float | Fraction], sink: SsgVertex, vertex: SsgVertex,
+                            exact_arithmetic: bool | None = None, integer_probabilities: bool | None = None) -> SsgTransition:
+    """
+    Creates the transition of an alpha gadget, which moves from the intermediate vertex to the sink with probability alpha and to the vertex otherwise.
+    :param intermediate_vertex: Intermediate vertex of the vertex
+    :type intermediate_vertex: SsgVertex
+    :param probabilities: Alpha and its complement, see alpha_gadget_pair
+    :type probabilities: tuple[float | Fraction, float | Fraction]
+    :param sink: Winning sink for even priorities, losing sink for odd priorities
+    :type sink: SsgVertex
+    :param vertex: Vertex of the SSG that corresponds to the vertex of the SPG
+    :type vertex: SsgVertex
+    :param exact_arithmetic: Passed to SsgTransition, if None USE_EXACT_ARITHMETIC is used
+    :type exact_arithmetic: bool | None
+    :param integer_probabilities: Passed to SsgTransition, if None INTEGER_PROBABILITIES is used
+    :type integer_probabilities: bool | None
+    :return: Alpha transition
+    :rtype: SsgTransition
+    """
+    return SsgTransition(intermediate_vertex, {(probabilities[0], sink), (probabilities[1], vertex)}, "alpha", exact_arithmetic, integer_probabilities, check_probabilities=False)
+
+
+def reduce_spg(spg: StochasticParityGame, vertex_alphas: dict[SpgVertex, float | Fraction]) -> tuple[SimpleStochasticGame, dict[SpgVertex, SsgVertex], dict[SpgVertex, SsgVertex], SsgVertex, SsgVertex]:
+    """
+    Builds the simple stochastic game of the reduction for given alphas. Every vertex of the SPG gets a vertex of the same name and an intermediate vertex
+    of the other player, every transition leads to the intermediate vertices of its end vertices, and the intermediate vertex continues with an alpha gadget.
+    :param spg: Stochastic parity game
     :type spg: StochasticParityGame
-    :param epsilon: The epsilon value for the conversion, if None, it will be computed based on the game
-    :type epsilon: float, optional
-    :param print_alphas: Whether to print the computed alphas, defaults to False
-    :type print_alphas: bool, optional
-    :return: The converted SimpleStochasticGame
-    :rtype: SimpleStochasticGame
+    :param vertex_alphas: Alpha of every vertex
+    :type vertex_alphas: dict[SpgVertex, float | Fraction]
+    :return: SSG, dictionaries mapping every vertex of the SPG to its vertex and to its intermediate vertex in the SSG, the winning and the losing sink
+    :rtype: tuple[SimpleStochasticGame, dict[SpgVertex, SsgVertex], dict[SpgVertex, SsgVertex], SsgVertex, SsgVertex]
     """
-    alphas = compute_alphas_for_spg(spg, epsilon=epsilon)
-    if print_alphas:
-        print("Computed alphas:")
-        for k, v in alphas.items():
-            print(f"Priority {k}: {float(v)}" + (f" | Optimized to {v.limit_denominator(MAX_DENOMINATOR)}" if USE_EXACT_ARITHMETIC else ""))
     vertices: dict[str, SsgVertex] = dict()
     transitions: dict[tuple[SsgVertex, str], SsgTransition] = dict()
     respective_spg_ssg_vertixes: dict[SpgVertex, SsgVertex] = dict()
@@ -126,17 +222,86 @@ def spg_to_ssg(spg: StochasticParityGame, epsilon: float = None, print_alphas: b
             i += 1
         vertices["v_lose"+str(i)] = SsgVertex(name="v_lose" + str(i), is_eve=False, is_target=False)
 
+    exact_arithmetic = settings.USE_EXACT_ARITHMETIC
+    integer_probabilities = settings.INTEGER_PROBABILITIES
     for transition in spg.transitions.values():
         start_v = vertices[transition.start_vertex.name]
         action = transition.action
         end_vs = set()
         for prob, end_v in transition.end_vertices:
             end_vs.add((prob, respective_intermediate_vertices[vertices[end_v.name]]))
-        transitions[(start_v, action)] = SsgTransition(start_v, end_vs, action)
+        # The distributions of the SPG were checked when it was created
+        transitions[(start_v, action)] = SsgTransition(start_v, end_vs, action, exact_arithmetic, integer_probabilities, check_probabilities=False)
 
+    # The probabilities of the alpha gadgets are computed once per alpha object, exact alphas have huge denominators and are expensive to hash
+    gadgets = dict()
     for vertex in spg.vertices.values():
-        if vertex.priority % 2 == 0:
-            transitions[(respective_intermediate_vertices[respective_spg_ssg_vertixes[vertex]], "alpha")] = SsgTransition(respective_intermediate_vertices[respective_spg_ssg_vertixes[vertex]], {(alphas[vertex.priority], vertices["v_win"]), (1 - alphas[vertex.priority], vertices[respective_spg_ssg_vertixes[vertex].name])}, "alpha")
+        alpha = vertex_alphas[vertex]
+        if id(alpha) not in gadgets:
+            gadgets[id(alpha)] = alpha_gadget_pair(alpha)
+        intermediate_vertex = respective_intermediate_vertices[respective_spg_ssg_vertixes[vertex]]
+        transitions[(intermediate_vertex, "alpha")] = alpha_gadget_transition(intermediate_vertex, gadgets[id(alpha)], vertices["v_win"] if vertex.priority % 2 == 0 else vertices["v_lose"], respective_spg_ssg_vertixes[vertex],
+                                                                               exact_arithmetic, integer_probabilities)
+    ssg = SimpleStochasticGame(vertices, transitions, initial_vertex)
+    intermediate_of = {vertex: respective_intermediate_vertices[ssg_vertex] for vertex, ssg_vertex in respective_spg_ssg_vertixes.items()}
+    return ssg, respective_spg_ssg_vertixes, intermediate_of, vertices["v_win"], vertices["v_lose"]
+
+
+def spg_to_ssg(spg: StochasticParityGame, epsilon: float = None, print_alphas: bool = False, use_cache: bool | None = None, compress_priorities: bool | None = None,
+               scc_local_alphas: bool | None = None, fix_qualitative: bool | None = None) -> SimpleStochasticGame:
+    """
+    Converts a StochasticParityGame to a SimpleStochasticGame.
+    :param spg: The StochasticParityGame to convert
+    :type spg: StochasticParityGame
+    :param epsilon: The epsilon value for the conversion, if None, it will be computed based on the game
+    :type epsilon: float, optional
+    :param print_alphas: Whether to print the computed alphas, defaults to False
+    :type print_alphas: bool, optional
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None, optional
+    :param compress_priorities: Whether to compress the priorities with compress_spg_priorities first, if None COMPRESS_PRIORITIES is used
+    :type compress_priorities: bool | None, optional
+    :param scc_local_alphas: Whether to compute the alphas per strongly connected component with compute_scc_alphas_for_spg, if None SCC_LOCAL_ALPHAS is used
+    :type scc_local_alphas: bool | None, optional
+    :param fix_qualitative: Whether to fix the almost-sure winning regions with fix_qualitative_regions first, if None FIX_QUALITATIVE_REGIONS is used
+    :type fix_qualitative: bool | None, optional
+    :return: The converted SimpleStochasticGame
+    :rtype: SimpleStochasticGame
+    """
+    compress_priorities = settings.COMPRESS_PRIORITIES if compress_priorities is None else compress_priorities
+    scc_local_alphas = settings.SCC_LOCAL_ALPHAS if scc_local_alphas is None else scc_local_alphas
+    fix_qualitative = settings.FIX_QUALITATIVE_REGIONS if fix_qualitative is None else fix_qualitative
+    if scc_local_alphas and epsilon is None:
+        print_warning("SCC-local alphas need an epsilon, the alphas are computed for the whole game instead.")
+        scc_local_alphas = False
+    cache_key = None
+    if is_cache_enabled(use_cache) and not print_alphas:
+        cache_key = make_cache_key("ssg", game_fingerprint(spg), epsilon, settings.USE_EXACT_ARITHMETIC, settings.INTEGER_PROBABILITIES, settings.MAX_DENOMINATOR, compress_priorities, scc_local_alphas, fix_qualitative)
+        cached_ssg = get_artifact_cache().get(cache_key, "ssg")
+        if cached_ssg is not None:
+            return cached_ssg
+    if fix_qualitative:
+        spg = fix_qualitative_regions(spg, debug=False)
+    if compress_priorities:
+        original_priorities = len({v.priority for v in spg.vertices.values()})
+        spg = compress_spg_priorities(spg, debug=False)
+    if scc_local_alphas:
+        vertex_alphas = compute_scc_alphas_for_spg(spg, epsilon=epsilon)
+    else:
+        alphas = compute_alphas_for_spg(spg, epsilon=epsilon)
+        vertex_alphas = {v: alphas[v.priority] for v in spg.vertices.values()}
+    if print_alphas:
+        if compress_priorities:
+            print(f"Priorities compressed from {original_priorities} to {len({v.priority for v in spg.vertices.values()})} distinct values, smallest alpha: {float(min(vertex_alphas.values()))}")
+        if scc_local_alphas:
+            print(f"Computed {len(set(vertex_alphas.values()))} SCC-local alphas, smallest alpha: {float(min(vertex_alphas.values()))}, largest alpha: {float(max(vertex_alphas.values()))}")
         else:
-            transitions[(respective_intermediate_vertices[respective_spg_ssg_vertixes[vertex]], "alpha")] = SsgTransition(respective_intermediate_vertices[respective_spg_ssg_vertixes[vertex]], {(alphas[vertex.priority], vertices["v_lose"]), (1 - alphas[vertex.priority], vertices[respective_spg_ssg_vertixes[vertex].name])}, "alpha")
-    return SimpleStochasticGame(vertices, transitions, initial_vertex)
+            print("Computed alphas:")
+            for k, v in alphas.items():
+                print(f"Priority {k}: {float(v)}" + (f" | Optimized to {v.limit_denominator(settings.MAX_DENOMINATOR)}" if settings.USE_EXACT_ARITHMETIC else ""))
+    reduction_stage = start_stage("reduction")
+    ssg, _, _, _, _ = reduce_spg(spg, vertex_alphas)
+    reduction_stage.stop()
+    if cache_key is not None:
+        get_artifact_cache().put(cache_key, "ssg", ssg)
+    return ssg
@@ -0,0 +1,174 @@
+import time
+
+from error_handling import print_debug
+from integer_distribution import IntegerDistributions
+from run_report import measured
+from simplestochasticgame import SimpleStochasticGame, SsgVertex, SsgTransition
+import settings
+
+
+def _ssg_csr(ssg: SimpleStochasticGame):
+    """
+    Converts a SimpleStochasticGame into arrays in compressed sparse row format.
+    Transitions are numbered in the order of their start vertex, edges in the order of their transition.
+    :param ssg: Simple stochastic game
+    :type ssg: SimpleStochasticGame
+    :return: Vertices, transitions, owner and target label of every vertex, start vertex of every transition, transition, target and probability index of every edge and the distinct probabilities
+    :rtype: tuple
+    """
+    import numpy as np
+    vertices = list(ssg.vertices.values())
+    index_of = {vertex: index for index, vertex in enumerate(vertices)}
+    transitions = sorted(ssg.transitions.values(), key=lambda transition: index_of[transition.start_vertex])
+    probabilities = sorted({prob for transition in transitions for prob, _ in transition.end_vertices})
+    probability_index = {prob: index for index, prob in enumerate(probabilities)}
+    edge_transition = []
+    edge_target = []
+    edge_probability = []
+    for transition_index, transition in enumerate(transitions):
+        for prob, end_vertex in transition.end_vertices:
+            edge_transition.append(transition_index)
+            edge_target.append(index_of[end_vertex])
+            edge_probability.append(probability_index[prob])
+    return (vertices, transitions,
+            np.fromiter((vertex.is_eve for vertex in vertices), dtype=bool, count=len(vertices)),
+            np.fromiter((vertex.is_target for vertex in vertices), dtype=bool, count=len(vertices)),
+            np.fromiter((index_of[transition.start_vertex] for transition in transitions), dtype=np.int64, count=len(transitions)),
+            np.asarray(edge_transition, dtype=np.int64), np.asarray(edge_target, dtype=np.int64), np.asarray(edge_probability, dtype=np.int64),
+            np.asarray(probabilities, dtype=object if settings.USE_EXACT_ARITHMETIC else float))
+
+
+def _row_ids(groups, values, number_of_groups: int):
+    """
+    Numbers the distinct rows of a ragged table, where row i consists of the values whose group is i, in the given order.
+    :param groups: Group of every value, sorted
+    :type groups: np.ndarray
+    :param values: Values, 2-dimensional with one column per component
+    :type values: np.ndarray
+    :param number_of_groups: Number of rows
+    :type number_of_groups: int
+    :return: Number of every row, equal rows get equal numbers
+    :rtype: np.ndarray
+    """
+    import numpy as np
+    lengths = np.bincount(groups, minlength=number_of_groups)
+    width = int(lengths.max(initial=0))
+    table = np.full((number_of_groups, width, values.shape[1]), -1, dtype=np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    table[groups, np.arange(len(groups)) - starts[groups]] = values
+    return np.unique(table.reshape(number_of_groups, -1), axis=0, return_inverse=True)[1].reshape(-1)
+
+
+def bisimulation_classes(ssg: SimpleStochasticGame) -> dict[SsgVertex, int]:
+    """
+    Computes the coarsest probabilistic bisimulation of a simple stochastic game by signature refinement.
+    Two vertices are bisimilar if they have the same owner and target label and their actions lead to the same set of distributions over the classes.
+    Bisimilar vertices have the same value for both players. Action names are not distinguished.
+    :param ssg: Simple stochastic game
+    :type ssg: SimpleStochasticGame
+    :return: Dictionary mapping every vertex to the number of its class
+    :rtype: dict[SsgVertex, int]
+    """
+    import numpy as np
+    vertices, transitions, is_eve, is_target, transition_start, edge_transition, edge_target, edge_probability, probabilities = _ssg_csr(ssg)
+    number_of_vertices = len(vertices)
+    block = np.unique(2 * is_eve.astype(np.int64) + is_target, return_inverse=True)[1].reshape(-1)
+    number_of_blocks = len(np.unique(block))
+    # With integer probabilities the merged probabilities are compared as reduced integer pairs instead of as sums of fractions
+    distributions = None
+    if settings.USE_EXACT_ARITHMETIC and settings.INTEGER_PROBABILITIES:
+        distributions = IntegerDistributions(transitions)
+        if distributions.numerators.dtype == object:
+            distributions = None
+    while True:
+        # Signature of a transition: its distribution over the current classes, edges into the same class are added up in a fixed order
+        edge_block = block[edge_target]
+        order = np.lexsort((edge_probability, edge_block, edge_transition))
+        sorted_transition = edge_transition[order]
+        sorted_block = edge_block[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (sorted_transition[1:] != sorted_transition[:-1]) | (sorted_block[1:] != sorted_block[:-1])
+        starts = np.flatnonzero(first)
+        if distributions is None:
+            merged_probability = np.add.reduceat(probabilities[edge_probability[order]], starts)
+            merged_index = np.unique(merged_probability, return_inverse=True)[1].reshape(-1)
+        else:
+            merged_numerators = np.add.reduceat(distributions.numerators[order], starts)
+            merged_index = np.unique(distributions.reduced_edge_probabilities(merged_numerators, sorted_transition[starts]), axis=0, return_inverse=True)[1].reshape(-1)
+        transition_signature = _row_ids(sorted_transition[starts], np.stack((sorted_block[starts], merged_index), axis=1), len(transitions))
+        # Signature of a vertex: its current class followed by the signatures of its transitions, sorted and without duplicates
+        transition_order = np.lexsort((transition_signature, transition_start))
+        keep = np.ones(len(transitions), dtype=bool)
+        keep[1:] = (transition_start[transition_order][1:] != transition_start[transition_order][:-1]) | (transition_signature[transition_order][1:] != transition_signature[transition_order][:-1])
+        transition_order = transition_order[keep]
+        groups = np.concatenate((np.arange(number_of_vertices), transition_start[transition_order]))
+        values = np.concatenate((block, transition_signature[transition_order]))
+        vertex_order = np.argsort(groups, kind="stable")
+        block = _row_ids(groups[vertex_order], values[vertex_order][:, None], number_of_vertices)
+        new_number_of_blocks = int(block.max(initial=-1)) + 1
+        if new_number_of_blocks == number_of_blocks:
+            break
+        number_of_blocks = new_number_of_blocks
+    return {vertex: int(block[index]) for index, vertex in enumerate(vertices)}
+
+
+@measured("minimization")
+def minimize_ssg(ssg: SimpleStochasticGame, debug: bool | None = None) -> tuple[SimpleStochasticGame, dict[SsgVertex, SsgVertex]]:
+    """
+    Builds the quotient of a simple stochastic game under bisimulation_classes.
+    Every class is represented by one of its vertices, the initial vertex represents its own class. The quotient keeps the actions of the representative
+    with pairwise different distributions over the classes, so the vertices of the class that differ only in the names of their actions are merged as well.
+    :param ssg: Simple stochastic game
+    :type ssg: SimpleStochasticGame
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Quotient game and dictionary mapping every vertex of the given game to its vertex in the quotient
+    :rtype: tuple[SimpleStochasticGame, dict[SsgVertex, SsgVertex]]
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    classes = bisimulation_classes(ssg)
+    representatives: dict[int, SsgVertex] = {classes[ssg.init_vertex]: ssg.init_vertex}
+    for vertex in ssg.vertices.values():
+        representatives.setdefault(classes[vertex], vertex)
+    quotient_vertices = {block: SsgVertex(name=vertex.name, is_eve=vertex.is_eve, is_target=vertex.is_target) for block, vertex in representatives.items()}
+    transitions_of: dict[SsgVertex, list[SsgTransition]] = {vertex: [] for vertex in representatives.values()}
+    for transition in ssg.transitions.values():
+        if transition.start_vertex in transitions_of:
+            transitions_of[transition.start_vertex].append(transition)
+    quotient_transitions: dict[tuple[SsgVertex, str], SsgTransition] = dict()
+    for block, vertex in representatives.items():
+        start_vertex = quotient_vertices[block]
+        distributions = set()
+        for transition in transitions_of[vertex]:
+            merged: dict[int, list] = dict()
+            for prob, end_vertex in transition.end_vertices:
+                merged.setdefault(classes[end_vertex], []).append(prob)
+            distribution = frozenset((sum(sorted(probs)), end_block) for end_block, probs in merged.items())
+            if distribution in distributions:
+                continue
+            distributions.add(distribution)
+            quotient_transitions[(start_vertex, transition.action)] = SsgTransition(start_vertex, {(prob, quotient_vertices[end_block]) for prob, end_block in distribution}, transition.action)
+    quotient = SimpleStochasticGame(vertices={vertex.name: vertex for vertex in quotient_vertices.values()}, transitions=quotient_transitions, init_vertex=quotient_vertices[classes[ssg.init_vertex]])
+    mapping = {vertex: quotient_vertices[classes[vertex]] for vertex in ssg.vertices.values()}
+    if debug:
+        print_debug(f"SSG minimized from {len(ssg.vertices)} to {len(quotient.vertices)} vertices and from {len(ssg.transitions)} to {len(quotient.transitions)} transitions in {(time.perf_counter() - start_time):.6f} seconds")
+    return quotient, mapping
+
+
+def ssg_minimization_report(ssg: SimpleStochasticGame) -> dict[str, int]:
+    """
+    Reports the effect of minimize_ssg on a simple stochastic game.
+    :param ssg: Simple stochastic game
+    :type ssg: SimpleStochasticGame
+    :return: Number of vertices, transitions and edges before and after the minimization
+    :rtype: dict[str, int]
+    """
+    quotient, _ = minimize_ssg(ssg, debug=False)
+    report = dict()
+    for key, game in (("before", ssg), ("after", quotient)):
+        report[f"vertices_{key}"] = len(game.vertices)
+        report[f"transitions_{key}"] = len(game.transitions)
+        report[f"edges_{key}"] = sum(len(transition.end_vertices) for transition in game.transitions.values())
+    return report
@@ -1,35 +1,62 @@
 import copy
 import os.path
 import time
-import re
 import posixpath
 import itertools
 
 from path_conversion import windows_to_linux_path, linux_to_windows_path, is_linux_path
 from simplestochasticgame import SimpleStochasticGame, SsgTransition, SsgVertex
-from shell_commands import run_command, sh_escape, run_command_linux
+from ssg_minimization import minimize_ssg
+from shell_commands import run_command, sh_escape, run_command_linux, run_process, ProcessResult
 from error_handling import print_warning, print_debug, print_error
-from settings import GLOBAL_DEBUG, GLOBAL_IN_OUT_PATH_LINUX, GLOBAL_IN_OUT_PATH_WINDOWS, PRISM_PATH, MAX_ITERS, PRISM_EPSILON, PRISM_SOLVING_ALGORITHM, GLOBAL_IN_OUT_PATH, IS_OS_LINUX, SSG_TO_SMG_VERSION
+from run_report import start_stage, measure_stage, record_stage
+from prism_output import PrismResult, parse_prism_output
+from model_handoff import model_handoff
+from distribution_pool import DistributionPool
+from artifact_cache import get_artifact_cache, is_cache_enabled, make_cache_key, game_fingerprint, file_fingerprint
+import settings
+from settings import IS_OS_LINUX
 
 
-def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION, debug: bool = GLOBAL_DEBUG, print_correspondingvertices: bool = False) -> str:
+def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int | None = None, debug: bool | None = None, print_correspondingvertices: bool = False, use_cache: bool | None = None,
+                   minimize: bool | None = None) -> str:
     """
     Converts a SimpleStochasticGame to a SMG specification string.
     :param ssg: SimpleStochasticGame to convert
     :type ssg: SimpleStochasticGame
     :param version: Version of the SMG specification to use (1 : new alternating vertices, 2 : old alternating vertices,  3 : synchronizing vertices)
-    :type version: int
+    :type version: int | None
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param print_correspondingvertices: Whether to print the corresponding states for each vertex, defaults to False
     :type print_correspondingvertices: bool
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None
+    :param minimize: Whether to replace the game by its bisimulation quotient (see minimize_ssg) before the emission, if None MINIMIZE_SSG is used
+    :type minimize: bool | None
     :return: SMG specification string
     :rtype: str
     """
+    version = settings.SSG_TO_SMG_VERSION if version is None else version
+    minimize = settings.MINIMIZE_SSG if minimize is None else minimize
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
+    cache_key = None
+    if is_cache_enabled(use_cache) and not print_correspondingvertices:
+        cache_key = make_cache_key("smg", game_fingerprint(ssg), version, settings.USE_EXACT_ARITHMETIC, settings.MAX_DENOMINATOR, minimize)
+        cached_spec = get_artifact_cache().get(cache_key, "smg")
+        if cached_spec is not None:
+            if debug:
+                print_debug(f"SMG specification loaded from cache in {(time.perf_counter() - start_time):.6f} seconds")
+            return cached_spec
+    if minimize:
+        ssg, _ = minimize_ssg(ssg, debug=debug)
     content = ["smg\n\n"]
+    # Transitions with the same probabilities over different successors share one pattern, which is formatted only once
+    pool = DistributionPool()
     if version == 1 or version == 2:
+        alternation_stage = start_stage("alternation_fixing")
         ssg = copy.deepcopy(ssg)
         i = 1
         while True:
@@ -143,6 +170,8 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
         ssg.transitions |= additional_ssg_transitions
         if not sanity_check_alternating_vertices(ssg):
             print_warning("The SSG is not alternating. The generated SMG may not be correct.")
+        alternation_stage.stop()
+        emission_stage = start_stage("emission")
         new_vertices: dict[SsgVertex, tuple[int, int]] = dict()
         ssg_eve_actions: set[str] = set()
         ssg_adam_actions: set[str] = set()
@@ -202,8 +231,9 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
                         adam_mod.append(f"\t[{new_eve_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> (as'={next(iter(new_transitions[transition][2]))[1][1]}) ;\n")
                 else:
                     adam_mod.append(f"\t[{new_eve_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> ")
-                    for prob, vert in new_transitions[transition][2]:
-                        adam_mod.append(f"({prob}) : (as'={vert[1]}) + ")
+                    distribution_id, successors = pool.intern(new_transitions[transition][2])
+                    for prefix, vert in zip(pool.prism_prefixes(distribution_id), successors):
+                        adam_mod.append(f"{prefix}(as'={vert[1]}) + ")
                     adam_mod[-1] = adam_mod[-1][:-3] + " ;\n"
                 eve_mod.append(f"\t[{new_eve_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> (es'=0) ;\n")
             else:
@@ -216,8 +246,9 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
                         eve_mod.append(f"\t[{new_adam_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> (es'={next(iter(new_transitions[transition][2]))[1][0]}) ;\n")
                 else:
                     eve_mod.append(f"\t[{new_adam_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> ")
-                    for prob, vert in new_transitions[transition][2]:
-                        eve_mod.append(f"({prob}) : (es'={vert[0]}) + ")
+                    distribution_id, successors = pool.intern(new_transitions[transition][2])
+                    for prefix, vert in zip(pool.prism_prefixes(distribution_id), successors):
+                        eve_mod.append(f"{prefix}(es'={vert[0]}) + ")
                     eve_mod[-1] = eve_mod[-1][:-3] + " ;\n"
                 adam_mod.append(f"\t[{new_adam_actions[transition.action]}] (es={new_transitions[transition][0][0]} & as={new_transitions[transition][0][1]}) \t-> (as'=0) ;\n")
         content.extend(eve_mod)
@@ -226,6 +257,7 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
         content.append("endmodule")
 
     else:
+        emission_stage = start_stage("emission")
         new_vertices: dict[SsgVertex, tuple[int, int]] = dict()
         ssg_eve_actions: set[str] = set()
         ssg_adam_actions: set[str] = set()
@@ -296,8 +328,9 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
                         eve_mod.append(f"\t[{new_eve_actions[transition.action]}] (e1={new_transitions[transition][0][0]} & e2={new_transitions[transition][0][1]} & re=0) \t-> (e1'={next(iter(new_transitions[transition][2]))[1][0]}) & (e2'={next(iter(new_transitions[transition][2]))[1][1]}) & (re'=1) ;\n")
                     else:
                         eve_mod.append(f"\t[{new_eve_actions[transition.action]}] (e1={new_transitions[transition][0][0]} & e2={new_transitions[transition][0][1]} & re=0) \t-> ")
-                        for prob, vert in new_transitions[transition][2]:
-                            eve_mod.append(f"({prob}) : (e1'={vert[0]}) & (e2'={vert[1]}) & (re'=1) + ")
+                        distribution_id, successors = pool.intern(new_transitions[transition][2])
+                        for prefix, vert in zip(pool.prism_prefixes(distribution_id), successors):
+                            eve_mod.append(f"{prefix}(e1'={vert[0]}) & (e2'={vert[1]}) & (re'=1) + ")
                         eve_mod[-1] = eve_mod[-1][:-3] + " ;\n"
                     adam_mod.append(f"\t[{new_eve_actions[transition.action]}] (a1={new_transitions[transition][0][0]} & a2={new_transitions[transition][0][1]} & re=0) \t-> true ;\n")
             else:
@@ -309,8 +342,9 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
                         adam_mod.append(f"\t[{new_adam_actions[transition.action]}] (a1={new_transitions[transition][0][0]} & a2={new_transitions[transition][0][1]} & ra=0) \t-> (a1'={next(iter(new_transitions[transition][2]))[1][0]}) & (a2'={next(iter(new_transitions[transition][2]))[1][1]}) & (ra'=1) ;\n")
                     else:
                         adam_mod.append(f"\t[{new_adam_actions[transition.action]}] (a1={new_transitions[transition][0][0]} & a2={new_transitions[transition][0][1]} & ra=0) \t-> ")
-                        for prob, vert in new_transitions[transition][2]:
-                            adam_mod.append(f"({prob}) : (a1'={vert[0]}) & (a2'={vert[1]}) & (ra'=1) + ")
+                        distribution_id, successors = pool.intern(new_transitions[transition][2])
+                        for prefix, vert in zip(pool.prism_prefixes(distribution_id), successors):
+                            adam_mod.append(f"{prefix}(a1'={vert[0]}) & (a2'={vert[1]}) & (ra'=1) + ")
                         adam_mod[-1] = adam_mod[-1][:-3] + " ;\n"
                     eve_mod += f"\t[{new_adam_actions[transition.action]}] (e1={new_transitions[transition][0][0]} & e2={new_transitions[transition][0][1]} & ra=0) \t-> true ;\n"
         if has_eve_probabilistic_actions(ssg):
@@ -335,8 +369,12 @@ def ssg_to_smgspec(ssg: SimpleStochasticGame, version: int = SSG_TO_SMG_VERSION,
     else:
         content[-1] = content[-1][:-3] + ");"
     if debug:
-        print_debug(f"SMG specification created in {(time.perf_counter() - start_time):.6f} seconds with version {1 if version else 2}")
-    return "".join(content)
+        print_debug(f"SMG specification created in {(time.perf_counter() - start_time):.6f} seconds with version {1 if version else 2}, {len(pool)} distinct probability patterns")
+    smg_spec = "".join(content)
+    emission_stage.stop()
+    if cache_key is not None:
+        get_artifact_cache().put(cache_key, "smg", smg_spec)
+    return smg_spec
 
 
 def is_ssg_vertex_probabilistic(ssg: SimpleStochasticGame, state: SsgVertex) -> bool:
@@ -413,7 +451,45 @@ def sanity_check_alternating_vertices(ssg: SimpleStochasticGame) -> bool:
     return True
 
 
-def check_property(smg_file, property_string, use_global_path: bool = False, strategy_filename: str = None, debug: bool = GLOBAL_DEBUG, prism_path: str = PRISM_PATH, max_iters: int = MAX_ITERS, prism_epsilon: float = PRISM_EPSILON, prism_solving_algorithm: str = PRISM_SOLVING_ALGORITHM) -> float | None:
+def build_prism_argv(prism_path: str, model_file: str, property_string: str | None = None, max_iters: int | None = None, prism_epsilon: float | None = None, prism_solving_algorithm: str = "", strategy_filename: str | None = None, extra_arguments: list[str] | None = None) -> list[str]:
+    """
+    Builds the argument vector of a PRISM run.
+    :param prism_path: Path to the PRISM executable
+    :type prism_path: str
+    :param model_file: Model file in Linux format
+    :type model_file: str
+    :param property_string: Property to check, None to only build the model
+    :type property_string: str | None
+    :param max_iters: Maximum number of iterations for the PRISM solver
+    :type max_iters: int | None
+    :param prism_epsilon: Precision for the PRISM solver
+    :type prism_epsilon: float | None
+    :param prism_solving_algorithm: Command line switch of the solving algorithm, e.g. "-politer", empty for the PRISM default
+    :type prism_solving_algorithm: str
+    :param strategy_filename: File to export the strategy to, None for no export
+    :type strategy_filename: str | None
+    :param extra_arguments: Further arguments that are appended
+    :type extra_arguments: list[str] | None
+    :return: Argument vector
+    :rtype: list[str]
+    """
+    argv = [prism_path, model_file]
+    if property_string is not None:
+        argv += ["-pf", property_string]
+    if max_iters is not None:
+        argv += ["-maxiters", str(max_iters)]
+    if prism_epsilon is not None:
+        argv += ["-epsilon", str(prism_epsilon)]
+    if prism_solving_algorithm:
+        argv.append(prism_solving_algorithm)
+    if strategy_filename is not None:
+        argv += ["-exportstrat", f"{strategy_filename}:type=actions"]
+    if extra_arguments:
+        argv += extra_arguments
+    return argv
+
+
+def check_property(smg_file, property_string, use_global_path: bool = False, strategy_filename: str = None, debug: bool | None = None, prism_path: str | None = None, max_iters: int | None = None, prism_epsilon: float | None = None, prism_solving_algorithm: str | None = None, use_cache: bool | None = None, timeout: float | None = None, memory_limit: int | None = None) -> PrismResult:
     """
     Checks a property of the given SMG file using PRISM-games.
     :param smg_file: SMG file to check
@@ -425,43 +501,117 @@ def check_property(smg_file, property_string, use_global_path: bool = False, str
     :param strategy_filename: Name of the strategy file to export, if None no strategy will be exported (feature not implemented since PRISM-games extension does not support strategy exportation)
     :type strategy_filename: str | None
     :param debug: Whether to print debug information, defaults to False
-    :type debug: bool
+    :type debug: bool | None
     :param prism_path: Path to the PRISM executable, defaults to PRISM_PATH
-    :type prism_path: str
+    :type prism_path: str | None
     :param max_iters: Maximum number of iterations for the PRISM solver, defaults to MAX_ITERS
-    :type max_iters: int
+    :type max_iters: int | None
     :param prism_epsilon: Precision for the PRISM solver, defaults to PRISM_EPSILON
-    :type prism_epsilon: float
+    :type prism_epsilon: float | None
     :param prism_solving_algorithm: Algorithm to use for solving the PRISM model, defaults to PRISM_SOLVING_ALGORITHM
-    :type prism_solving_algorithm: str
-    :return: Resulting probability of the property, or -1.0 if the check failed
-    :rtype: float | None
+    :type prism_solving_algorithm: str | None
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used. Checks that export a strategy are never cached
+    :type use_cache: bool | None
+    :param timeout: Wall-clock limit of the PRISM run in seconds, PRISM is killed when it is exceeded, defaults to PRISM_TIMEOUT
+    :type timeout: float | None
+    :param memory_limit: Address space limit of the PRISM run in bytes, defaults to PRISM_MEMORY_LIMIT
+    :type memory_limit: int | None
+    :return: Parsed result of the PRISM run, its value is the resulting probability or None if the check failed
+    :rtype: PrismResult
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    prism_path = settings.PRISM_PATH if prism_path is None else prism_path
+    max_iters = settings.MAX_ITERS if max_iters is None else max_iters
+    prism_epsilon = settings.PRISM_EPSILON if prism_epsilon is None else prism_epsilon
+    prism_solving_algorithm = settings.PRISM_SOLVING_ALGORITHM if prism_solving_algorithm is None else prism_solving_algorithm
+    timeout = settings.PRISM_TIMEOUT if timeout is None else timeout
+    memory_limit = settings.PRISM_MEMORY_LIMIT if memory_limit is None else memory_limit
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        smg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, smg_file)
-        strategy_filename = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, strategy_filename) if strategy_filename else None
-    strategy_export = f" -exportstrat {sh_escape(strategy_filename)}" if strategy_filename is not None else ""
-    command = f"{sh_escape(prism_path)} {sh_escape(smg_file)} -pf {sh_escape(property_string)} -maxiters {str(max_iters)} -epsilon {str(prism_epsilon)} {sh_escape(prism_solving_algorithm)}{strategy_export}" + (":type=actions" if strategy_filename is not None else "")
-    result = run_command_linux(command=command, use_shell=True, debug=debug)
-    if result is None:
-        print_warning(f"Property {property_string} check failed. No result was returned.")
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+        strategy_filename = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, strategy_filename) if strategy_filename else None
+    cache_key = property_cache_key(smg_file, property_string, strategy_filename, prism_path, max_iters, prism_epsilon, prism_solving_algorithm, use_cache)
+    if cache_key is not None:
+        cached_result = get_artifact_cache().get(cache_key, "prism")
+        if cached_result is not None:
+            if debug:
+                print_debug(f"Property {property_string} loaded from cache in {(time.perf_counter() - start_time):.6f} seconds")
+            return cached_result
+    argv = build_prism_argv(prism_path, smg_file, property_string, max_iters, prism_epsilon, prism_solving_algorithm, strategy_filename)
+    with measure_stage("prism"):
+        result = run_process(argv, timeout=timeout, memory_limit=memory_limit, on_stdout=(lambda line: print(line, end="")) if debug else None, debug=debug)
+    prism_result = evaluate_property_run(result, property_string, timeout, cache_key)
+    if debug:
+        print_debug(f"Property {property_string} " + ("checked" if prism_result.ok else "check failed after") + f" {(time.perf_counter() - start_time):.6f} seconds")
+    return prism_result
+
+
+def property_cache_key(smg_file: str, property_string: str, strategy_filename: str | None, prism_path: str, max_iters: int, prism_epsilon: float, prism_solving_algorithm: str, use_cache: bool | None) -> str | None:
+    """
+    Returns the artifact cache key of a property check, or None if the check must not be cached.
+    :param smg_file: SMG file in Linux format
+    :type smg_file: str
+    :param property_string: Property to check
+    :type property_string: str
+    :param strategy_filename: Strategy file of the check, checks that export a strategy are never cached
+    :type strategy_filename: str | None
+    :param prism_path: Path to the PRISM executable
+    :type prism_path: str
+    :param max_iters: Maximum number of iterations for the PRISM solver
+    :type max_iters: int
+    :param prism_epsilon: Precision for the PRISM solver
+    :type prism_epsilon: float
+    :param prism_solving_algorithm: Algorithm to use for solving the PRISM model
+    :type prism_solving_algorithm: str
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None
+    :return: Cache key or None
+    :rtype: str | None
+    """
+    if not is_cache_enabled(use_cache) or strategy_filename is not None:
         return None
-    output = result.stdout
-    match = re.search(r'Result:\s*(\d\.\d+(E-\d+)?)', output)
-    if match:
-        probability = float(match.group(1))
-        if debug:
-            print_debug(f"Property {property_string} checked in {(time.perf_counter() - start_time):.6f} seconds")
-        return probability
-    else:
-        if debug:
-            print_debug(f"Property {property_string} check failed after {(time.perf_counter() - start_time):.6f} seconds")
-        return -1.0
+    smg_fingerprint = file_fingerprint(smg_file if IS_OS_LINUX else linux_to_windows_path(smg_file))
+    if smg_fingerprint is None:
+        return None
+    return make_cache_key("property", smg_fingerprint, property_string, prism_path, max_iters, prism_epsilon, prism_solving_algorithm)
 
 
-def check_target_reachability(smg_file: str, print_probabilities: bool = False, export_strategies: bool = False, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False, prism_path: str = PRISM_PATH, max_iters: int = MAX_ITERS, prism_epsilon: float = PRISM_EPSILON, prism_solving_algorithm: str = PRISM_SOLVING_ALGORITHM) -> tuple[float, float]:
+def evaluate_property_run(result: ProcessResult | None, property_string: str, timeout: float | None, cache_key: str | None) -> PrismResult:
+    """
+    Turns the PRISM process of a property check into a PrismResult, reports failures, records the PRISM stages in the active run report and caches successful results.
+    :param result: Finished PRISM process or None if it could not be started
+    :type result: ProcessResult | None
+    :param property_string: Checked property
+    :type property_string: str
+    :param timeout: Timeout of the run in seconds, used in the warning
+    :type timeout: float | None
+    :param cache_key: Artifact cache key of the check or None
+    :type cache_key: str | None
+    :return: Parsed result of the check
+    :rtype: PrismResult
+    """
+    if result is None:
+        print_warning(f"Property {property_string} check failed. PRISM could not be started.")
+        return PrismResult(errors=["PRISM could not be started"])
+    prism_result = parse_prism_output(result.stdout, process=result)
+    if result.timed_out:
+        print_warning(f"Property {property_string} check exceeded its timeout of {timeout} seconds and was killed.")
+    if prism_result.construction_time is not None:
+        record_stage("prism_model_construction", wall_time=prism_result.construction_time, source="prism")
+    if prism_result.checking_time is not None:
+        record_stage("prism_model_checking", wall_time=prism_result.checking_time, source="prism")
+    if prism_result.converged is False:
+        print_warning(f"PRISM did not converge while checking property {property_string}.")
+    if prism_result.ok:
+        if cache_key is not None:
+            get_artifact_cache().put(cache_key, "prism", prism_result)
+    elif result.returncode != 0 and not result.timed_out:
+        print_warning(f"Property {property_string} check failed" + (f": {prism_result.errors[0]}" if prism_result.errors else (f" with error: {result.stderr.strip()}" if result.stderr.strip() else "")))
+    return prism_result
+
+
+def check_target_reachability(smg_file: str, print_probabilities: bool = False, export_strategies: bool = False, debug: bool | None = None, use_global_path: bool = False, prism_path: str | None = None, max_iters: int | None = None, prism_epsilon: float | None = None, prism_solving_algorithm: str | None = None, use_cache: bool | None = None) -> tuple[PrismResult, PrismResult]:
     """
     Checks the minimum and maximum probabilities of reaching a target state for Eve in the given SMG file.
     :param smg_file: SMG file to check
@@ -471,52 +621,59 @@ def check_target_reachability(smg_file: str, print_probabilities: bool = False,
     :param export_strategies: Whether to export strategies, defaults to False
     :type export_strategies: bool
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the SMG file, defaults to False
     :type use_global_path: bool
     :param prism_path: Path to the PRISM executable, defaults to PRISM_PATH
-    :type prism_path: str
+    :type prism_path: str | None
     :param max_iters: Maximum number of iterations for the PRISM solver, defaults to MAX_ITERS
-    :type max_iters: int
+    :type max_iters: int | None
     :param prism_epsilon: Precision for the PRISM solver, defaults to PRISM_EPSILON
-    :type prism_epsilon: float
+    :type prism_epsilon: float | None
     :param prism_solving_algorithm: Algorithm to use for solving the PRISM model, defaults to PRISM_SOLVING_ALGORITHM
-    :type prism_solving_algorithm: str
-    :return: Result of both checks
-    :rtype: tuple[float, float]
+    :type prism_solving_algorithm: str | None
+    :param use_cache: Whether to consult the artifact cache, if None USE_ARTIFACT_CACHE is used
+    :type use_cache: bool | None
+    :return: Parsed PRISM results of the minimum and the maximum check
+    :rtype: tuple[PrismResult, PrismResult]
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    prism_path = settings.PRISM_PATH if prism_path is None else prism_path
+    max_iters = settings.MAX_ITERS if max_iters is None else max_iters
+    prism_epsilon = settings.PRISM_EPSILON if prism_epsilon is None else prism_epsilon
+    prism_solving_algorithm = settings.PRISM_SOLVING_ALGORITHM if prism_solving_algorithm is None else prism_solving_algorithm
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        smg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
     if debug:
         pre_prob1_time = time.perf_counter()
     strategie_filename = None
     if export_strategies:
         strategie_filename = "strat1.txt"
         if use_global_path:
-            strategie_filename = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, strategie_filename)
-    result1 = check_property(smg_file=smg_file, property_string=f"<<eve>> Pmin=? [F \"target\"]", strategy_filename=strategie_filename, debug=debug, prism_path=prism_path, max_iters=max_iters, prism_epsilon=prism_epsilon, prism_solving_algorithm=prism_solving_algorithm)
+            strategie_filename = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, strategie_filename)
+    result1 = check_property(smg_file=smg_file, property_string=f"<<eve>> Pmin=? [F \"target\"]", strategy_filename=strategie_filename, debug=debug, prism_path=prism_path, max_iters=max_iters, prism_epsilon=prism_epsilon, prism_solving_algorithm=prism_solving_algorithm, use_cache=use_cache)
     if debug:
         print_debug(f"First prob checking time: {(time.perf_counter() - pre_prob1_time):.6f}")
-    if result1 == -1.0:
+    if not result1.ok:
         result = "Could not check minimum probability of reaching a target for eve.\n"
     else:
-        result = f"Minimum probability of reaching a target state for eve: {str(result1)}\n"
+        result = f"Minimum probability of reaching a target state for eve: {str(result1.value)}\n"
     if debug:
         pre_prob2_time = time.perf_counter()
     strategie_filename = None
     if export_strategies:
         strategie_filename = "strat2.txt"
         if use_global_path:
-            strategie_filename = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, strategie_filename)
-    result2 = check_property(smg_file=smg_file, property_string=f"<<eve>> Pmax=? [F \"target\"]", strategy_filename=strategie_filename, debug=debug, prism_path=prism_path, max_iters=max_iters, prism_epsilon=prism_epsilon, prism_solving_algorithm=prism_solving_algorithm)
+            strategie_filename = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, strategie_filename)
+    result2 = check_property(smg_file=smg_file, property_string=f"<<eve>> Pmax=? [F \"target\"]", strategy_filename=strategie_filename, debug=debug, prism_path=prism_path, max_iters=max_iters, prism_epsilon=prism_epsilon, prism_solving_algorithm=prism_solving_algorithm, use_cache=use_cache)
     if debug:
         print_debug(f"Second prob checking time: {(time.perf_counter() - pre_prob2_time):.6f}")
-    if result2 == -1.0:
+    if not result2.ok:
         result += "Could not check maximum probability of reaching a target for eve.\n"
     else:
-        result += f"Maximum probability of reaching a target state for eve: {str(result2)}"
+        result += f"Maximum probability of reaching a target state for eve: {str(result2.value)}"
     if print_probabilities:
         print(result)
     if debug:
@@ -524,43 +681,89 @@ def check_target_reachability(smg_file: str, print_probabilities: bool = False,
     return result1, result2
 
 
-def check_smg_stats(smg_file: str, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False) -> tuple[int, int, float]:
+def check_smgspec_property(smg_spec: str, property_string: str, handoff_mode: str | None = None, debug: bool | None = None, **check_arguments) -> PrismResult:
+    """
+    Checks a property of an SMG specification that is only needed by PRISM, e.g. the output of ssg_to_smgspec, without writing it to GLOBAL_IN_OUT_PATH.
+    :param smg_spec: SMG specification to check
+    :type smg_spec: str
+    :param property_string: Property string to check
+    :type property_string: str
+    :param handoff_mode: How the model is handed to PRISM: "file", "tmpfs", "memfd" or "fifo", if None MODEL_HANDOFF is used
+    :type handoff_mode: str | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :param check_arguments: Further keyword arguments of check_property, e.g. prism_solving_algorithm or timeout
+    :return: Parsed result of the PRISM run
+    :rtype: PrismResult
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    with model_handoff(smg_spec, mode=handoff_mode, debug=debug) as smg_file:
+        return check_property(smg_file, property_string, use_global_path=False, debug=debug, **check_arguments)
+
+
+def check_smgspec_target_reachability(smg_spec: str, handoff_mode: str | None = None, print_probabilities: bool = False, debug: bool | None = None, **check_arguments) -> tuple[PrismResult, PrismResult]:
+    """
+    Checks the minimum and maximum probabilities of reaching a target state for Eve in an SMG specification, the model is handed to PRISM once for both checks.
+    :param smg_spec: SMG specification to check
+    :type smg_spec: str
+    :param handoff_mode: How the model is handed to PRISM: "file", "tmpfs", "memfd" or "fifo", if None MODEL_HANDOFF is used
+    :type handoff_mode: str | None
+    :param print_probabilities: Whether to print the probabilities, defaults to False
+    :type print_probabilities: bool
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :param check_arguments: Further keyword arguments of check_target_reachability
+    :return: Parsed PRISM results of the minimum and the maximum check
+    :rtype: tuple[PrismResult, PrismResult]
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    with model_handoff(smg_spec, mode=handoff_mode, debug=debug) as smg_file:
+        return check_target_reachability(smg_file, print_probabilities=print_probabilities, use_global_path=False, debug=debug, **check_arguments)
+
+
+def check_smg_stats(smg_file: str, debug: bool | None = None, use_global_path: bool = False, prism_result: PrismResult | None = None, timeout: float | None = None, memory_limit: int | None = None) -> PrismResult:
     """
     Check the statistics of an SMG file.
+    If the result of a property check of the same file is given, the statistics are taken from it and PRISM is not run again.
     :param smg_file: Path to the SMG file
     :type smg_file: str
     :param debug: Whether to print debug information
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the SMG file
     :type use_global_path: bool
+    :param prism_result: Result of a previous PRISM run on the SMG file
+    :type prism_result: PrismResult | None
+    :param timeout: Wall-clock limit of the PRISM run in seconds, defaults to PRISM_TIMEOUT
+    :type timeout: float | None
+    :param memory_limit: Address space limit of the PRISM run in bytes, defaults to PRISM_MEMORY_LIMIT
+    :type memory_limit: int | None
+    :return: Parsed PRISM result that contains the number of states and transitions and the construction time, see PrismResult.model_stats
+    :rtype: PrismResult
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    timeout = settings.PRISM_TIMEOUT if timeout is None else timeout
+    memory_limit = settings.PRISM_MEMORY_LIMIT if memory_limit is None else memory_limit
+    if prism_result is not None and prism_result.states is not None:
+        return prism_result
     if use_global_path:
         if not IS_OS_LINUX:
-            smg_file_win = os.path.join(GLOBAL_IN_OUT_PATH_WINDOWS, smg_file)
-        smg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+            smg_file_win = os.path.join(settings.GLOBAL_IN_OUT_PATH_WINDOWS, smg_file)
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
     if IS_OS_LINUX:
         if not os.path.exists(smg_file):
             print_error(f"SMG file {smg_file} does not exist.")
     else:
         if not os.path.exists(smg_file_win):
             print_error(f"SMG file {smg_file_win} does not exist.")
-    command = f"{sh_escape(PRISM_PATH)} {sh_escape(smg_file)} -noprobchecks"
-    if debug:
-        print_debug(f"Running command: {command}")
-    result = run_command_linux(command, use_shell=True)
+    result = run_process(build_prism_argv(settings.PRISM_PATH, smg_file, extra_arguments=["-noprobchecks"]), timeout=timeout, memory_limit=memory_limit, debug=debug)
+    if result is None:
+        return PrismResult(errors=["PRISM could not be started"])
     if result.returncode != 0:
-        print_error(f"Error running command: {result.stderr}")
-    output = result.stdout
-    match = re.search(r'States:(\s|\t)*(\d+)', output)
-    states = int(match.group(2)) if match else -1
-    match = re.search(r'Transitions:(\s|\t)*(\d+)', output)
-    transitions = int(match.group(2)) if match else -1
-    match = re.search(r'Time for model construction:(\s|\t)*(\d+\.\d+)', output)
-    constr_time = float(match.group(2)) if match else "-1"
-    return states, transitions, constr_time
+        print_warning(f"Error running PRISM on {smg_file}: {result.stderr.strip()}")
+    return parse_prism_output(result.stdout, process=result)
 
 
-def save_smg_file(smg_spec: str, file_name: str = "", force: bool = False, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False):
+def save_smg_file(smg_spec: str, file_name: str = "", force: bool = False, debug: bool | None = None, use_global_path: bool = False):
     """
     Saves the given SMG specification to an SMG file.
     :param smg_spec: SMG specification content to save
@@ -570,24 +773,26 @@ def save_smg_file(smg_spec: str, file_name: str = "", force: bool = False, debug
     :param force: Whether to overwrite the file if it already exists, defaults to False
     :type force: bool
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the file, defaults to False
     :type use_global_path: bool
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if not file_name:
         file_name = "out.smg"
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     if not file_name.endswith(".smg"):
         print_warning(f"File {file_name} is not an .smg file. Nothing was changed")
     elif not force and os.path.exists(file_name) and os.path.getsize(file_name) > 0:
         print_warning(f"File {file_name} already exists. Nothing was changed")
     else:
         try:
-            with open(file_name, "w") as file:
-                file.write(smg_spec)
+            with measure_stage("file_write"):
+                with open(file_name, "w") as file:
+                    file.write(smg_spec)
         except Exception as e:
             print_warning(f"Could not save SMG file {file_name}. Error: {str(e)}")
             return
@@ -595,7 +800,24 @@ def save_smg_file(smg_spec: str, file_name: str = "", force: bool = False, debug
         print_debug(f"SMG file {file_name} created in {(time.perf_counter() - start_time):.6f} seconds")
 
 
-def create_dot_file(smg_file: str, dot_file: str = "", force: bool = False, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False):
+def _export_dot_file(smg_file: str, dot_file: str, debug: bool | None = None) -> None:
+    """
+    Exports the transitions of an SMG file as DOT file with PRISM.
+    :param smg_file: SMG file in Linux format
+    :type smg_file: str
+    :param dot_file: DOT file in Linux format
+    :type dot_file: str
+    :param debug: Whether to print debug information
+    :type debug: bool | None
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    result = run_process(build_prism_argv(settings.PRISM_PATH, smg_file, extra_arguments=["-exporttransdotstates", dot_file]), timeout=settings.PRISM_TIMEOUT, memory_limit=settings.PRISM_MEMORY_LIMIT, debug=debug)
+    if result is not None and not result.ok:
+        message = result.stderr.strip() or (result.stdout.strip().splitlines() or [""])[-1]
+        print_warning(f"Could not export {smg_file} to DOT file: {message}")
+
+
+def create_dot_file(smg_file: str, dot_file: str = "", force: bool = False, debug: bool | None = None, use_global_path: bool = False):
     """
     Creates a DOT file from the given SMG file using PRISM.
     :param smg_file: Name of the SMG file to convert to DOT
@@ -605,20 +827,21 @@ def create_dot_file(smg_file: str, dot_file: str = "", force: bool = False, debu
     :param force: Whether to overwrite the DOT file if it already exists, defaults to False
     :type force: bool
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the SMG and DOT files, defaults to False
     :type use_global_path: bool
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path and (not dot_file or dot_file.endswith(".dot")):
-        smg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
         dot_file = smg_file.replace(".smg", ".dot")
         if not IS_OS_LINUX:
             dot_file_win = linux_to_windows_path(dot_file)
     elif use_global_path and not (not dot_file or dot_file.endswith(".dot")):
-        smg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, smg_file)
-        dot_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, dot_file)
+        smg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, smg_file)
+        dot_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, dot_file)
         if not IS_OS_LINUX:
             dot_file_win = linux_to_windows_path(dot_file)
     elif not use_global_path and (not dot_file or not dot_file.endswith(".dot")):
@@ -638,17 +861,17 @@ def create_dot_file(smg_file: str, dot_file: str = "", force: bool = False, debu
         if not force and os.path.exists(dot_file_win) and os.path.getsize(dot_file_win) > 0:
             print_warning("DOT file already exists. Nothing was changed")
         else:
-            run_command_linux(f"{sh_escape(PRISM_PATH)} {sh_escape(smg_file)} -exporttransdotstates {sh_escape(dot_file)}", use_shell=True, debug=debug)
+            _export_dot_file(smg_file, dot_file, debug)
     else:
         if not force and os.path.exists(dot_file) and os.path.getsize(dot_file) > 0:
             print_warning("DOT file already exists. Nothing was changed")
         else:
-            run_command_linux(f"{sh_escape(PRISM_PATH)} {sh_escape(smg_file)} -exporttransdotstates {sh_escape(dot_file)}", use_shell=True, debug=debug)
+            _export_dot_file(smg_file, dot_file, debug)
     if debug:
         print_debug(f"DOT file {dot_file} created in {(time.perf_counter() - start_time):.6f} seconds")
 
 
-def create_png_file(dot_file: str, png_file: str = "", open_png: bool = False, force: bool = False, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False):
+def create_png_file(dot_file: str, png_file: str = "", open_png: bool = False, force: bool = False, debug: bool | None = None, use_global_path: bool = False):
     """
     Creates a PNG file from the given DOT file using Graphviz's dot command. (Recommend using SVG instead of PNG for better quality)
     :param dot_file: Name of the DOT file to convert to PNG
@@ -660,20 +883,21 @@ def create_png_file(dot_file: str, png_file: str = "", open_png: bool = False, f
     :param force: Whether to overwrite the PNG file if it already exists, defaults to False
     :type force: bool
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the DOT and PNG files, defaults to False
     :type use_global_path: bool
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path and (not png_file or png_file.endswith(".png")):
-        dot_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, dot_file)
+        dot_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, dot_file)
         png_file = dot_file.replace(".dot", ".png")
         if not IS_OS_LINUX:
             png_file_win = linux_to_windows_path(png_file)
     elif use_global_path and not (not png_file or png_file.endswith(".png")):
-        dot_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, dot_file)
-        png_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, png_file)
+        dot_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, dot_file)
+        png_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, png_file)
         if not IS_OS_LINUX:
             png_file_win = linux_to_windows_path(png_file)
     elif not use_global_path and (not png_file or not png_file.endswith(".png")):
@@ -710,7 +934,7 @@ def create_png_file(dot_file: str, png_file: str = "", open_png: bool = False, f
             run_command(f"start {png_file_win}", use_shell=True, debug=debug)
 
 
-def create_svg_file(dot_file: str, svg_file: str = "", open_svg: bool = False, force: bool = False, debug: bool = GLOBAL_DEBUG, use_global_path: bool = False):
+def create_svg_file(dot_file: str, svg_file: str = "", open_svg: bool = False, force: bool = False, debug: bool | None = None, use_global_path: bool = False):
     """
     Creates an SVG file from the given DOT file using Graphviz's dot command.
     :param dot_file: Name of the DOT file to convert to SVG
@@ -722,20 +946,21 @@ def create_svg_file(dot_file: str, svg_file: str = "", open_svg: bool = False, f
     :param force: Whether to overwrite the SVG file if it already exists, defaults to False
     :type force: bool
     :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
-    :type debug: bool
+    :type debug: bool | None
     :param use_global_path: Whether to use the global path for the DOT and SVG files, defaults to False
     :type use_global_path: bool
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path and (not svg_file or svg_file.endswith(".svg")):
-        dot_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, dot_file)
+        dot_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, dot_file)
         svg_file = dot_file.replace(".dot", ".svg")
         if not IS_OS_LINUX:
             svg_file_win = linux_to_windows_path(svg_file)
     elif use_global_path and not (not svg_file or svg_file.endswith(".svg")):
-        dot_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, dot_file)
-        svg_file = posixpath.join(GLOBAL_IN_OUT_PATH_LINUX, svg_file)
+        dot_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, dot_file)
+        svg_file = posixpath.join(settings.GLOBAL_IN_OUT_PATH_LINUX, svg_file)
         if not IS_OS_LINUX:
             svg_file_win = linux_to_windows_path(svg_file)
     elif not use_global_path and (not svg_file or not svg_file.endswith(".svg")):
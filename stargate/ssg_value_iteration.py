@@ -0,0 +1,356 @@
+import math
+import time
+
+from error_handling import print_debug, print_warning
+from game_graph import successor_lists, strongly_connected_components, is_trivial_component
+from run_report import measured
+from simplestochasticgame import SimpleStochasticGame, SsgVertex, SsgTransition
+import settings
+
+
+class SsgSolution:
+    def __init__(self, ssg: SimpleStochasticGame, values: dict[SsgVertex, float], strategy: dict[SsgVertex, SsgTransition], iterations: int, solved_vertices: int,
+                 bounds: dict[SsgVertex, float] | None = None):
+        """
+        Values and optimal strategies of a simple stochastic game, where Eve maximizes and Adam minimizes the probability to reach a target vertex.
+        :param ssg: Solved simple stochastic game
+        :type ssg: SimpleStochasticGame
+        :param values: Value of every vertex
+        :type values: dict[SsgVertex, float]
+        :param strategy: Optimal transition of every vertex that is not a target vertex
+        :type strategy: dict[SsgVertex, SsgTransition]
+        :param iterations: Number of sweeps over the strongly connected components that were solved
+        :type iterations: int
+        :param solved_vertices: Number of vertices whose values were computed, the other values were taken from the initial values
+        :type solved_vertices: int
+        :param bounds: Certified bound of the error of the value of every vertex, inf if no bound is known, if None no bound is known for any vertex
+        :type bounds: dict[SsgVertex, float] | None
+        """
+        self.ssg = ssg
+        self.values = values
+        self.strategy = strategy
+        self.iterations = iterations
+        self.solved_vertices = solved_vertices
+        self.bounds = bounds if bounds is not None else {vertex: math.inf for vertex in values}
+
+    def value(self, vertex: SsgVertex | None = None) -> float:
+        """
+        Returns the value of a vertex.
+        :param vertex: Vertex, if None the initial vertex is used
+        :type vertex: SsgVertex | None
+        :return: Probability that the target is reached under optimal play
+        :rtype: float
+        """
+        return self.values[self.ssg.init_vertex if vertex is None else vertex]
+
+    def bound(self, vertex: SsgVertex | None = None) -> float:
+        """
+        Returns the certified bound of the error of the value of a vertex.
+        :param vertex: Vertex, if None the initial vertex is used
+        :type vertex: SsgVertex | None
+        :return: Bound of the distance between the value of the vertex and its computed value, inf if the value iteration could not bound it
+        :rtype: float
+        """
+        return self.bounds[self.ssg.init_vertex if vertex is None else vertex]
+
+    def __str__(self):
+        return f"SsgSolution(value: {self.value()}, bound: {self.bound()}, iterations: {self.iterations}, solved vertices: {self.solved_vertices})"
+
+
+_EVALUATION_INTERVAL = 16
+_EVALUATION_SIZE_LIMIT = 2048
+
+
+def _exit_time_bound(component: list[SsgVertex], transitions_of: dict[SsgVertex, list[SsgTransition]]) -> float | None:
+    """
+    Bounds the expected number of steps until any pair of strategies leaves a strongly connected component.
+    The component is stopping if every cycle passes a vertex all of whose transitions leave the component with positive probability, as the intermediate vertices
+    of the reduction do. Then every pair of strategies leaves the component with probability 1 and its values are the only fixed point. Between two visits of these
+    leaking vertices lies at most the longest path through the other vertices, and every visit leaves with at least the smallest leaving probability in floating point.
+    :return: None if the component is not stopping, inf if a leaving probability is below the floating point resolution
+    :rtype: float | None
+    """
+    members = set(component)
+    leaking = {vertex for vertex in component if all(any(prob > 0 and end_vertex not in members for prob, end_vertex in transition.end_vertices) for transition in transitions_of[vertex])}
+    rest = [vertex for vertex in component if vertex not in leaking]
+    rest_successors = {vertex: [end_vertex for transition in transitions_of[vertex] for prob, end_vertex in transition.end_vertices if prob > 0 and end_vertex in members and end_vertex not in leaking] for vertex in rest}
+    parts = strongly_connected_components(rest, rest_successors)
+    if not all(is_trivial_component(part, rest_successors) for part in parts):
+        return None
+    # The parts come in reverse topological order, so the longest paths of the successors of a vertex are known before it
+    longest_path = dict()
+    for [vertex] in parts:
+        longest_path[vertex] = 1 + max((longest_path[successor] for successor in rest_successors[vertex]), default=0)
+    # The part of a transition that stays in the component rounds up to 1 if the part that leaves is below the floating point resolution
+    leaving = min(min(sum(float(prob) for prob, end_vertex in transition.end_vertices if end_vertex not in members),
+                      1.0 - sum(float(prob) for prob, end_vertex in transition.end_vertices if end_vertex in members)) for vertex in leaking for transition in transitions_of[vertex])
+    return (1 + max(longest_path.values(), default=0)) / leaving if leaving > 0 else math.inf
+
+
+def _greedy_transitions(transition_values, vertex_values, transition_vertex):
+    """
+    Marks the first transition of every vertex whose value is the value of the vertex, i.e. the current greedy strategies of both players.
+    """
+    import numpy as np
+    candidates = np.flatnonzero(transition_values == vertex_values[transition_vertex])
+    chosen = np.zeros(len(transition_values), dtype=bool)
+    chosen[candidates[np.unique(transition_vertex[candidates], return_index=True)[1]]] = True
+    return chosen
+
+
+def _evaluate_strategies(values, component_index, chosen, transition_vertex, edge_transition, edge_target, edge_probability) -> bool:
+    """
+    Replaces the values of a stopping component by the exact values of given strategies of both players, solved as a dense linear system.
+    Small probabilities such as the alphas of the reduction make the sweeps converge very slowly, while the greedy strategies are optimal early.
+    Rounding can push the values of tiny probabilities slightly out of [0, 1], so they are clipped.
+    :return: False if the linear system is singular, then the component is only swept
+    :rtype: bool
+    """
+    import numpy as np
+    size = len(component_index)
+    edges = np.flatnonzero(chosen[edge_transition])
+    local = np.full(len(values), -1, dtype=np.int64)
+    local[component_index] = np.arange(size)
+    rows = transition_vertex[edge_transition[edges]]
+    columns = local[edge_target[edges]]
+    inside = columns >= 0
+    matrix = np.eye(size)
+    np.subtract.at(matrix, (rows[inside], columns[inside]), edge_probability[edges][inside])
+    right_side = np.bincount(rows[~inside], weights=edge_probability[edges][~inside] * values[edge_target[edges][~inside]], minlength=size)
+    try:
+        values[component_index] = np.clip(np.linalg.solve(matrix, right_side), 0.0, 1.0)
+    except np.linalg.LinAlgError:
+        return False
+    return True
+
+
+def _vertices_with_positive_value(transitions_of: dict[SsgVertex, list[SsgTransition]]) -> set[SsgVertex]:
+    """
+    Returns the vertices from which Eve reaches a target vertex with positive probability against every strategy of Adam, all other vertices have value 0.
+    Fixing them to 0 lets the upper values of the interval iteration leave the cycles in which Adam avoids the target.
+    """
+    transitions_into = {vertex: [] for vertex in transitions_of}
+    for transitions in transitions_of.values():
+        for transition in transitions:
+            for prob, end_vertex in transition.end_vertices:
+                if prob > 0:
+                    transitions_into[end_vertex].append(transition)
+    # Eve needs one transition into the positive vertices, Adam has to take one with all of his transitions
+    missing = {vertex: 1 if vertex.is_eve else len(transitions) for vertex, transitions in transitions_of.items()}
+    positive = {vertex for vertex in transitions_of if vertex.is_target}
+    entering = set()
+    queue = list(positive)
+    while queue:
+        for transition in transitions_into[queue.pop()]:
+            if id(transition) in entering:
+                continue
+            entering.add(id(transition))
+            vertex = transition.start_vertex
+            missing[vertex] -= 1
+            if missing[vertex] == 0 and vertex not in positive:
+                positive.add(vertex)
+                queue.append(vertex)
+    return positive
+
+
+@measured("value_iteration")
+def solve_ssg(ssg: SimpleStochasticGame, precision: float | None = None, max_iterations: int | None = None, initial_values: dict[SsgVertex, float] | None = None,
+              vertices: set[SsgVertex] | None = None, initial_strategy: dict[SsgVertex, SsgTransition] | None = None, initial_bounds: dict[SsgVertex, float] | None = None,
+              debug: bool | None = None) -> SsgSolution:
+    """
+    Solves a simple stochastic game natively by value iteration, one strongly connected component at a time in reverse topological order,
+    so every component is iterated only until its own values are certified, with the values of the components it reaches already fixed.
+    A small change of a sweep is no certificate, a probability of 1e-13 changes the values by 1e-13 per sweep far from the fixed point. So a stopping component,
+    as in the games of the reduction, is only finished when one more sweep leaves the exact values of the greedy strategies unchanged up to precision,
+    and every other component is iterated from below and from above until both are within precision. If the values from above stall above the values
+    from below, e.g. in an end component of Eve, or max_iterations is reached, a warning is printed and the bound of the component is inf.
+    Every vertex gets the bound of its component plus the largest bound of the vertices it leaves the component to.
+    The game is solved in floating point, also with exact arithmetic. A warning is printed if a positive probability is below the floating point resolution.
+    :param ssg: Simple stochastic game
+    :type ssg: SimpleStochasticGame
+    :param precision: Bound of the error that a component is iterated to, if None VALUE_ITERATION_PRECISION is used
+    :type precision: float | None
+    :param max_iterations: Maximum number of sweeps per component, if None VALUE_ITERATION_MAX_ITERATIONS is used
+    :type max_iterations: int | None
+    :param initial_values: Values to start from, for example of a previous solution. They are only used for the vertices that are not solved and for the stopping
+        components whose values are evaluated and whose leaving probabilities are above the floating point resolution, as only these converge from every start,
+        all other vertices start from 0
+    :type initial_values: dict[SsgVertex, float] | None
+    :param vertices: Vertices to solve, all vertices they reach must be in the set or have their values in initial_values, if None all vertices are solved
+    :type vertices: set[SsgVertex] | None
+    :param initial_strategy: Strategies of both players to start from, for example of a previous solution, the values of every stopping component
+        whose vertices all have a transition in it are first set to the values of these strategies
+    :type initial_strategy: dict[SsgVertex, SsgTransition] | None
+    :param initial_bounds: Bounds of the errors of initial_values, used for the vertices that are not solved, missing vertices have no bound
+    :type initial_bounds: dict[SsgVertex, float] | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Values, certified bounds of their errors and optimal strategies
+    :rtype: SsgSolution
+    """
+    import numpy as np
+    precision = settings.VALUE_ITERATION_PRECISION if precision is None else precision
+    max_iterations = settings.VALUE_ITERATION_MAX_ITERATIONS if max_iterations is None else max_iterations
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    if debug:
+        start_time = time.perf_counter()
+    all_vertices = list(ssg.vertices.values())
+    index_of = {vertex: index for index, vertex in enumerate(all_vertices)}
+    values = np.zeros(len(all_vertices))
+    bounds = np.full(len(all_vertices), np.inf)
+    if initial_values is not None:
+        for vertex, value in initial_values.items():
+            if vertex in index_of:
+                values[index_of[vertex]] = value
+    if initial_bounds is not None:
+        for vertex, bound in initial_bounds.items():
+            if vertex in index_of:
+                bounds[index_of[vertex]] = bound
+    transitions_of: dict[SsgVertex, list[SsgTransition]] = {vertex: [] for vertex in all_vertices}
+    for transition in ssg.transitions.values():
+        transitions_of[transition.start_vertex].append(transition)
+    successors = successor_lists(ssg)
+    positive = _vertices_with_positive_value(transitions_of)
+    for vertex in all_vertices:
+        if vertex.is_target:
+            values[index_of[vertex]] = 1.0
+            bounds[index_of[vertex]] = 0.0
+        elif vertex not in positive:
+            values[index_of[vertex]] = 0.0
+            bounds[index_of[vertex]] = 0.0
+    if vertices is None:
+        solve_vertices = [vertex for vertex in all_vertices if vertex in positive and not vertex.is_target]
+    else:
+        solve_vertices = [vertex for vertex in all_vertices if vertex in vertices and vertex in positive and not vertex.is_target]
+    solve_set = set(solve_vertices)
+    component_successors = {vertex: [successor for successor in successors[vertex] if successor in solve_set] for vertex in solve_vertices}
+    strategy: dict[SsgVertex, SsgTransition] = dict()
+    iterations = 0
+    unrepresentable_transitions = 0
+    for component in strongly_connected_components(solve_vertices, component_successors):
+        component_index = np.fromiter((index_of[vertex] for vertex in component), dtype=np.int64, count=len(component))
+        is_eve = np.fromiter((vertex.is_eve for vertex in component), dtype=bool, count=len(component))
+        component_transitions = []
+        transition_starts = []
+        edge_transition = []
+        edge_target = []
+        edge_probability = []
+        for vertex in component:
+            transition_starts.append(len(component_transitions))
+            for transition in transitions_of[vertex]:
+                for prob, end_vertex in transition.end_vertices:
+                    edge_transition.append(len(component_transitions))
+                    edge_target.append(index_of[end_vertex])
+                    edge_probability.append(float(prob))
+                component_transitions.append(transition)
+        transition_starts = np.asarray(transition_starts, dtype=np.int64)
+        edge_transition = np.asarray(edge_transition, dtype=np.int64)
+        edge_target = np.asarray(edge_target, dtype=np.int64)
+        edge_probability = np.asarray(edge_probability)
+        # A positive probability below the float resolution vanishes next to the rest of its transition, e.g. an alpha gadget whose 1 - alpha rounds to 1
+        unrepresentable = (edge_probability > 0) & (1.0 - edge_probability == 1.0)
+        if unrepresentable.any():
+            unrepresentable_transitions += len(np.unique(edge_transition[unrepresentable]))
+        transition_vertex = np.repeat(np.arange(len(component)), np.diff(np.append(transition_starts, len(component_transitions))))
+        in_component = np.zeros(len(all_vertices), dtype=bool)
+        in_component[component_index] = True
+        leaving = (edge_probability > 0) & ~in_component[edge_target]
+        exit_bound = float(np.max(bounds[edge_target[leaving]], initial=0.0))
+        sweeps = 1 if is_trivial_component(component, component_successors) else max_iterations
+        rounding = np.finfo(float).eps * (1 + np.max(np.bincount(edge_transition)))
+        exit_time = _exit_time_bound(component, transitions_of) if sweeps > 1 else None
+        stopping = exit_time is not None
+        evaluate = stopping and len(component) <= _EVALUATION_SIZE_LIMIT
+        # Whether the values of the component are the exact values of strategies, so that a sweep that leaves them unchanged certifies them
+        evaluated = False
+        if evaluate and exit_time < math.inf and initial_strategy is not None and all(vertex in initial_strategy for vertex in component):
+            chosen = np.fromiter((initial_strategy[transition.start_vertex] is transition for transition in component_transitions), dtype=bool, count=len(component_transitions))
+            # Strategies that choose transitions of an older version of the game are not evaluated
+            if chosen.sum() == len(component):
+                evaluated = _evaluate_strategies(values, component_index, chosen, transition_vertex, edge_transition, edge_target, edge_probability)
+        elif evaluate and exit_time == math.inf:
+            # Probabilities below the floating point resolution give the component several fixed points in floating point, it starts from 0 as without initial values
+            values[component_index] = 0.0
+        upper_values = None
+        if sweeps > 1 and not evaluate:
+            # Only stopping components converge from every start, so the values are iterated from 0 and bounded by values iterated from 1
+            values[component_index] = 0.0
+            upper_values = values.copy()
+            upper_values[component_index] = 1.0
+        component_bound = math.inf
+        for sweep in range(sweeps):
+            transition_values = np.bincount(edge_transition, weights=edge_probability * values[edge_target], minlength=len(component_transitions))
+            new_values = np.where(is_eve, np.maximum.reduceat(transition_values, transition_starts), np.minimum.reduceat(transition_values, transition_starts))
+            change = np.max(np.abs(new_values - values[component_index]))
+            values[component_index] = new_values
+            iterations += 1
+            if sweeps == 1:
+                component_bound = 0.0
+                break
+            if upper_values is None:
+                if evaluated and change <= precision:
+                    # A sweep that leaves the values within change of themselves leaves them within change times the exit time of their fixed point,
+                    # the rounding of a sweep counts as a further change
+                    component_bound = min(1.0, float(change + rounding) * exit_time)
+                    break
+                evaluated = False
+                if change <= precision or sweep % _EVALUATION_INTERVAL == _EVALUATION_INTERVAL - 1:
+                    chosen = _greedy_transitions(transition_values, new_values, transition_vertex)
+                    evaluated = _evaluate_strategies(values, component_index, chosen, transition_vertex, edge_transition, edge_target, edge_probability)
+                    if not evaluated:
+                        values[component_index] = 0.0
+                        upper_values = values.copy()
+                        upper_values[component_index] = 1.0
+                continue
+            upper_transition_values = np.bincount(edge_transition, weights=edge_probability * upper_values[edge_target], minlength=len(component_transitions))
+            new_upper = np.where(is_eve, np.maximum.reduceat(upper_transition_values, transition_starts), np.minimum.reduceat(upper_transition_values, transition_starts))
+            upper_change = np.max(np.abs(new_upper - upper_values[component_index]))
+            upper_values[component_index] = new_upper
+            gap = np.max(new_upper - new_values)
+            if gap <= precision:
+                component_bound = float(max(gap, 0.0))
+                break
+            # Only with a finite exit time the values from above have to reach the values from below
+            if (exit_time is None or exit_time == math.inf) and change <= precision and upper_change <= precision:
+                print_warning(f"Value iteration of a component with {len(component)} vertices stalled after {sweep + 1} sweeps with a gap of {gap} between its values from below and above, "
+                              f"its values are only lower bounds")
+                break
+        else:
+            if sweeps > 1:
+                print_warning(f"Value iteration of a component with {len(component)} vertices stopped after {max_iterations} sweeps without bounding its values within precision {precision}")
+        bounds[component_index] = component_bound + exit_bound
+        transition_values = np.bincount(edge_transition, weights=edge_probability * values[edge_target], minlength=len(component_transitions))
+        transition_ends = np.append(transition_starts[1:], len(component_transitions))
+        for position, vertex in enumerate(component):
+            segment = transition_values[transition_starts[position]:transition_ends[position]]
+            best = int(np.argmax(segment) if vertex.is_eve else np.argmin(segment))
+            strategy[vertex] = component_transitions[transition_starts[position] + best]
+    if unrepresentable_transitions:
+        print_warning(f"{unrepresentable_transitions} transitions have positive probabilities below the floating point resolution, e.g. alphas with 1 - alpha rounded to 1. "
+                      f"The values of the vertices that reach them are not reliable")
+    solution = SsgSolution(ssg, {vertex: float(values[index]) for index, vertex in enumerate(all_vertices)}, strategy, iterations, len(solve_vertices),
+                           {vertex: float(bounds[index]) for index, vertex in enumerate(all_vertices)})
+    if debug:
+        print_debug(f"SSG solved by value iteration in {(time.perf_counter() - start_time):.6f} seconds: {solution}")
+    return solution
+
+
+def transfer_solution(solution: SsgSolution, ssg: SimpleStochasticGame) -> tuple[dict[SsgVertex, float], dict[SsgVertex, SsgTransition]]:
+    """
+    Maps the values and strategies of a solution to the vertices and transitions of another game with the same vertex names and actions,
+    such as the reduction of the same SPG with another epsilon, so they can be used as initial_values and initial_strategy of solve_ssg.
+    :param solution: Solution of a game
+    :type solution: SsgSolution
+    :param ssg: Game to start the next solution in
+    :type ssg: SimpleStochasticGame
+    :return: Initial values and initial strategy for ssg
+    :rtype: tuple[dict[SsgVertex, float], dict[SsgVertex, SsgTransition]]
+    """
+    values = {ssg.vertices[vertex.name]: value for vertex, value in solution.values.items() if vertex.name in ssg.vertices}
+    strategy = dict()
+    for vertex, transition in solution.strategy.items():
+        if vertex.name in ssg.vertices:
+            ssg_vertex = ssg.vertices[vertex.name]
+            if (ssg_vertex, transition.action) in ssg.transitions:
+                strategy[ssg_vertex] = ssg.transitions[(ssg_vertex, transition.action)]
+    return values, strategy
@@ -1,10 +1,13 @@
 import re
 import os
 import time
-from fractions import Fraction
 
-from settings import GLOBAL_DEBUG, GLOBAL_IN_OUT_PATH_WINDOWS, PRINT_VERTEX_CREATION_WARNINGS, GLOBAL_IN_OUT_PATH, USE_EXACT_ARITHMETIC, MAX_DENOMINATOR
+from fractions import Fraction
+from probability_table import canonical_probabilities, probability_string
+from integer_distribution import integer_distribution
+import settings
 from error_handling import print_warning, print_error, print_debug, is_float_expr
+from run_report import measured
 
 
 class SpgVertex:
@@ -38,7 +41,8 @@ class SpgVertex:
 
 
 class SpgTransition:
-    def __init__(self, start_vertex: SpgVertex, end_vertices: set[tuple[float, SpgVertex]], action: str):
+    def __init__(self, start_vertex: SpgVertex, end_vertices: set[tuple[float, SpgVertex]], action: str, exact_arithmetic: bool | None = None, integer_probabilities: bool | None = None,
+                 check_probabilities: bool = True):
         """
         Creates a transition of a stochastic parity game.
         :param start_vertex: Starting vertex of the transition
@@ -47,25 +51,47 @@ class SpgTransition:
         :type end_vertices: set[(float, SpgVertex)]
         :param action: String representation of the action
         :type action: str
+        :param exact_arithmetic: Whether the probabilities are made exact, if None USE_EXACT_ARITHMETIC is used, code that creates many transitions should read it once and pass it
+        :type exact_arithmetic: bool | None
+        :param integer_probabilities: Whether exact probabilities are checked as integers, if None INTEGER_PROBABILITIES is used
+        :type integer_probabilities: bool | None
+        :param check_probabilities: Whether to warn about negative probabilities and probabilities that do not add up to 1, False for transitions that are valid by construction
+        :type check_probabilities: bool
         """
         self.start_vertex = start_vertex
         self.end_vertices = end_vertices
         self.action = action
-        total_prob = 0
-        neg_probs = False
-        for prob, vert in self.end_vertices:
-            if prob < 0:
-                neg_probs = True
-            total_prob += prob
-        if total_prob != 1:
-            print_warning(f"Sum ({total_prob}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
-        if neg_probs:
-            print_warning("There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
-        if USE_EXACT_ARITHMETIC:
-            # Change all probabilities to fractions
-            self.end_vertices = set()
+        exact_arithmetic = settings.USE_EXACT_ARITHMETIC if exact_arithmetic is None else exact_arithmetic
+        if exact_arithmetic:
+            integer_probabilities = settings.INTEGER_PROBABILITIES if integer_probabilities is None else integer_probabilities
+        # Integer numerators in the iteration order of end_vertices over their common denominator, only with integer probabilities
+        self.distribution: tuple[list[int], int] | None = None
+        if exact_arithmetic and integer_probabilities:
+            # Checked on the integers, the sums of fractions are not needed
+            self.end_vertices = canonical_probabilities(end_vertices)
+            self.distribution = integer_distribution(prob for prob, _ in self.end_vertices)
+            if not check_probabilities:
+                return
+            numerators, denominator = self.distribution
+            if sum(numerators) != denominator:
+                print_warning(f"Sum ({Fraction(sum(numerators), denominator)}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
+            if min(numerators, default=0) < 0:
+                print_warning(f"There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
+            return
+        if check_probabilities:
+            total_prob = 0
+            neg_probs = False
             for prob, vert in end_vertices:
-                self.end_vertices.add((Fraction(prob).limit_denominator(MAX_DENOMINATOR), vert))
+                if prob < 0:
+                    neg_probs = True
+                total_prob += prob
+            if total_prob != 1:
+                print_warning(f"Sum ({total_prob}) of probabilities does not equal 1 of edge from {self.start_vertex.name} with action {self.action}")
+            if neg_probs:
+                print_warning(f"There is at least one probability that is negative of edge from {self.start_vertex.name} with action {self.action}")
+        if exact_arithmetic:
+            # Change all probabilities to fractions, the shared probability table converts every distinct probability only once
+            self.end_vertices = canonical_probabilities(end_vertices)
 
     def __str__(self):
         """
@@ -96,12 +122,20 @@ class StochasticParityGame:
         self.transitions = transitions
         self.init_vertex = init_vertex
 
+        print_warnings = settings.GLOBAL_DEBUG and settings.PRINT_VERTEX_CREATION_WARNINGS
+        # Deadlock vertices whose "selfloop" transition was added here or by remove_transition, set_transition removes it again
+        self.added_selfloops: set[SpgVertex] = set()
+        # Computed once for all vertices, is_deadlock_vertex and has_ingoing_transition scan all transitions per vertex
+        start_vertices = {transition.start_vertex for transition in self.transitions.values()}
+        if print_warnings:
+            end_vertices = {end_vertex for transition in self.transitions.values() for _, end_vertex in transition.end_vertices}
         for vertex in self.vertices.values():
-            if GLOBAL_DEBUG and PRINT_VERTEX_CREATION_WARNINGS and has_ingoing_transition(vertex, self.transitions):
+            if print_warnings and vertex in end_vertices:
                 print_debug(f"Vertex {vertex.name} has no ingoing transition.")
-            if is_deadlock_vertex(vertex, self.transitions):
+            if vertex not in start_vertices:
                 self.transitions[vertex, "selfloop"] = SpgTransition(vertex, {(1.0, vertex)}, "selfloop")
-                if GLOBAL_DEBUG and PRINT_VERTEX_CREATION_WARNINGS:
+                self.added_selfloops.add(vertex)
+                if print_warnings:
                     print_debug(f"Vertex {vertex.name} is a deadlock vertex. A selfloop was added.")
         for vertex_name in vertices:
             if vertex_name != vertices[vertex_name].name:
@@ -111,6 +145,61 @@ class StochasticParityGame:
                 print_error(f"Key {transition_key[0]} in transitions dictionary does not match transition start vertex {transitions[transition_key].start_vertex}. This is needed for the SPG to work correctly.")
             if transition_key[1] != transitions[transition_key].action:
                 print_error(f"Key {transition_key[1]} in transitions dictionary does not match transition action {transitions[transition_key].action}. This is needed for the SPG to work correctly.")
+        # Vertices whose priority or transitions were changed by the edit methods, consumed by IncrementalSolver
+        self.edited_vertices: set[SpgVertex] = set()
+
+    def set_priority(self, vertex_name: str, priority: int) -> None:
+        """
+        Changes the priority of a vertex.
+        :param vertex_name: Name of the vertex
+        :type vertex_name: str
+        :param priority: New priority
+        :type priority: int
+        """
+        if vertex_name not in self.vertices:
+            print_error(f"Vertex {vertex_name} does not exist in the SPG.")
+        vertex = self.vertices[vertex_name]
+        vertex.priority = priority
+        self.edited_vertices.add(vertex)
+
+    def set_transition(self, vertex_name: str, action: str, end_vertices: set[tuple[float, str]]) -> None:
+        """
+        Adds a transition or replaces the transition of a vertex with the same action. A selfloop that was added because the vertex had no transitions is removed.
+        :param vertex_name: Name of the start vertex
+        :type vertex_name: str
+        :param action: Action of the transition
+        :type action: str
+        :param end_vertices: Set of tuples of probabilities and names of the respective end vertices
+        :type end_vertices: set[(float, str)]
+        """
+        for name in {vertex_name} | {name for _, name in end_vertices}:
+            if name not in self.vertices:
+                print_error(f"Vertex {name} does not exist in the SPG.")
+        vertex = self.vertices[vertex_name]
+        if vertex in self.added_selfloops:
+            self.added_selfloops.discard(vertex)
+            if action != "selfloop":
+                del self.transitions[(vertex, "selfloop")]
+        self.transitions[(vertex, action)] = SpgTransition(vertex, {(prob, self.vertices[name]) for prob, name in end_vertices}, action)
+        self.edited_vertices.add(vertex)
+
+    def remove_transition(self, vertex_name: str, action: str) -> None:
+        """
+        Removes a transition. If it was the last transition of the vertex, a selfloop is added as in the constructor.
+        :param vertex_name: Name of the start vertex
+        :type vertex_name: str
+        :param action: Action of the transition
+        :type action: str
+        """
+        vertex = self.vertices.get(vertex_name)
+        if vertex is None or (vertex, action) not in self.transitions:
+            print_error(f"Transition of vertex {vertex_name} with action {action} does not exist in the SPG.")
+        del self.transitions[(vertex, action)]
+        self.added_selfloops.discard(vertex)
+        if not any(start_vertex is vertex for start_vertex, _ in self.transitions):
+            self.transitions[vertex, "selfloop"] = SpgTransition(vertex, {(1.0, vertex)}, "selfloop")
+            self.added_selfloops.add(vertex)
+        self.edited_vertices.add(vertex)
 
 
 def has_ingoing_transition(vertex: SpgVertex, transitions: dict[tuple[SpgVertex, str], SpgTransition]) -> bool:
@@ -146,7 +235,8 @@ def is_deadlock_vertex(vertex: SpgVertex, transitions: dict[tuple[SpgVertex, str
     return True
 
 
-def read_spg_from_file(file_name: str, use_global_path: bool = False, debug: bool = GLOBAL_DEBUG) -> StochasticParityGame:
+@measured("parse")
+def read_spg_from_file(file_name: str, use_global_path: bool = False, debug: bool | None = None) -> StochasticParityGame:
     """
     Reads a stochastic parity game from a file and returns the corresponding StochasticParityGame object.
     :param file_name: Path to the file that is joined with the global_in_out_path
@@ -154,14 +244,15 @@ def read_spg_from_file(file_name: str, use_global_path: bool = False, debug: boo
     :param use_global_path: If True, the file_name is joined with the global_in_out_path
     :type use_global_path: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     :return: StochasticParityGame object
     :rtype: StochasticParityGame
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     if file_name[-4:] != ".spg":
         print_error("Not a .spg file")
     try:
@@ -309,16 +400,17 @@ def read_spg_from_file(file_name: str, use_global_path: bool = False, debug: boo
     return StochasticParityGame(spg_vertices, spg_transitions, spg_initial_vertex)
 
 
-def spg_to_spgspec(spg: StochasticParityGame, debug: bool = GLOBAL_DEBUG) -> str:
+def spg_to_spgspec(spg: StochasticParityGame, debug: bool | None = None) -> str:
     """
     Converts a StochasticParityGame object to a string representation in the spg specification format.
     :param spg: The StochasticParityGame object to convert
     :type spg: StochasticParityGame
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     :return: SPG specification string
     :rtype: str
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     content = "spg\n\n"
@@ -340,7 +432,7 @@ def spg_to_spgspec(spg: StochasticParityGame, debug: bool = GLOBAL_DEBUG) -> str
         else:
             transition_str = f"\t{vert_act[0].name} {vert_act[1]} : "
             for end_vert in trans.end_vertices:
-                transition_str += f"{[0]} | {end_vert[1].name} + "
+                transition_str += f"{probability_string(end_vert[0])} | {end_vert[1].name} + "
             transition_str = transition_str[:-3] + "\n"
             content += transition_str
     content += "endtransitions"
@@ -349,7 +441,7 @@ def spg_to_spgspec(spg: StochasticParityGame, debug: bool = GLOBAL_DEBUG) -> str
     return content
 
 
-def save_spg_file(spg_spec: str, file_name: str = "", use_global_path: bool = False, force: bool = False, debug: bool = GLOBAL_DEBUG):
+def save_spg_file(spg_spec: str, file_name: str = "", use_global_path: bool = False, force: bool = False, debug: bool | None = None):
     """
     Saves the given content to a file with the given name. If the file already exists and force is not set to True, nothing is changed.
     :param spg_spec: SPG specification to save
@@ -361,14 +453,15 @@ def save_spg_file(spg_spec: str, file_name: str = "", use_global_path: bool = Fa
     :param force: True if the file should be overwritten if it already exists
     :type force: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if not file_name:
         file_name = "out.spg"
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH, file_name)
     if not file_name.endswith(".spg"):
         print_warning(f"File {file_name} is not an .spg file. Nothing was changed")
     elif not force and os.path.exists(file_name) and os.path.getsize(file_name) != 0:
@@ -383,7 +476,7 @@ def save_spg_file(spg_spec: str, file_name: str = "", use_global_path: bool = Fa
         print_debug(f"SPG file {file_name} created in {(time.perf_counter() - start_time):.6f} seconds")
 
 
-def reformat_spgspec(file_name: str, use_global_path: bool = False, debug: bool = GLOBAL_DEBUG):
+def reformat_spgspec(file_name: str, use_global_path: bool = False, debug: bool | None = None):
     """
     Reformats the given SPG specification file to the default format.
     :param file_name: Name of the file to reformat
@@ -391,12 +484,13 @@ def reformat_spgspec(file_name: str, use_global_path: bool = False, debug: bool
     :param use_global_path: True if the file_name should be joined with the global_in_out_path
     :type use_global_path: bool
     :param debug: True if debug information should be printed
-    :type debug: bool
+    :type debug: bool | None
     """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
     if debug:
         start_time = time.perf_counter()
     if use_global_path:
-        file_name = os.path.join(GLOBAL_IN_OUT_PATH_WINDOWS, file_name)
+        file_name = os.path.join(settings.GLOBAL_IN_OUT_PATH_WINDOWS, file_name)
     spg = read_spg_from_file(file_name=file_name, use_global_path=use_global_path, debug=False)
     content = spg_to_spgspec(spg)
     save_spg_file(spg_spec=content, file_name=file_name, use_global_path=use_global_path, force=True, debug=False)
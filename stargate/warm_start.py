@@ -0,0 +1,83 @@
+import math
+import time
+
+from error_handling import print_debug, print_warning
+from spg_to_ssg_reduction import spg_to_ssg
+from ssg_value_iteration import SsgSolution, solve_ssg, transfer_solution
+from stochasticparitygame import StochasticParityGame
+import settings
+
+
+def sweep_order(epsilons: list[float | None]) -> list[tuple[float | None, float | None]]:
+    """
+    Orders the epsilons of a sweep so that every run can start from the solution of its nearest neighbor that was solved before.
+    The epsilons are sorted from the largest to the smallest, neighbors are measured on a logarithmic scale, and None, which gives the smallest alphas, comes last.
+    :param epsilons: Epsilons of the sweep
+    :type epsilons: list[float | None]
+    :return: Every epsilon in solving order together with the epsilon to warm-start from, None for the first run
+    :rtype: list[tuple[float | None, float | None]]
+    """
+    ordered = sorted({epsilon for epsilon in epsilons if epsilon is not None}, reverse=True)
+    if None in epsilons:
+        ordered.append(None)
+    order = []
+    for position, epsilon in enumerate(ordered):
+        if position == 0:
+            order.append((epsilon, None))
+        elif epsilon is None:
+            order.append((epsilon, ordered[position - 1]))
+        else:
+            # Sorted, so the nearest solved epsilon on a logarithmic scale is the previous one
+            order.append((epsilon, min(ordered[:position], key=lambda solved: abs(math.log(solved) - math.log(epsilon)))))
+    return order
+
+
+def solve_epsilon_sweep(spg: StochasticParityGame, epsilons: list[float | None], warm_start: bool = True, measure_savings: bool = False, precision: float | None = None,
+                        debug: bool | None = None) -> dict[float | None, dict]:
+    """
+    Reduces and solves a stochastic parity game natively for every epsilon of a sweep in the order of sweep_order.
+    With warm_start every run starts from the values and strategies of its neighbor, which move only slightly between epsilons. solve_ssg uses them only
+    for the stopping components it evaluates and stops only on a certified bound, so a warm start saves sweeps but does not change the values beyond their bounds.
+    :param spg: Stochastic parity game
+    :type spg: StochasticParityGame
+    :param epsilons: Epsilons of the sweep
+    :type epsilons: list[float | None]
+    :param warm_start: Whether every run starts from the solution of its neighbor
+    :type warm_start: bool
+    :param measure_savings: Whether every warm-started run is repeated from scratch to report the number of sweeps it saved and to check that the values of both runs
+        agree within their bounds, a warning is printed if they do not
+    :type measure_savings: bool
+    :param precision: Precision of the value iteration, if None VALUE_ITERATION_PRECISION is used
+    :type precision: float | None
+    :param debug: Whether to print debug information, defaults to GLOBAL_DEBUG
+    :type debug: bool | None
+    :return: Dictionary mapping every epsilon to its "value" of the initial vertex, its certified "bound", "iterations", "solving_time", the epsilon it was
+        "warm_started_from" and, with measure_savings, "cold_iterations", "iterations_saved" and whether the values of the warm and cold run "cold_agrees"
+    :rtype: dict[float | None, dict]
+    """
+    debug = settings.GLOBAL_DEBUG if debug is None else debug
+    solutions: dict[float | None, SsgSolution] = dict()
+    results = dict()
+    for epsilon, neighbor in sweep_order(epsilons):
+        ssg = spg_to_ssg(spg, epsilon=epsilon)
+        initial_values = initial_strategy = None
+        if warm_start and neighbor in solutions:
+            initial_values, initial_strategy = transfer_solution(solutions[neighbor], ssg)
+        start_time = time.perf_counter()
+        solution = solve_ssg(ssg, precision=precision, initial_values=initial_values, initial_strategy=initial_strategy, debug=False)
+        solving_time = time.perf_counter() - start_time
+        solutions[epsilon] = solution
+        results[epsilon] = {"value": solution.value(), "bound": solution.bound(), "iterations": solution.iterations, "solving_time": solving_time,
+                            "warm_started_from": neighbor if initial_values is not None else None}
+        if measure_savings and initial_values is not None:
+            cold_solution = solve_ssg(ssg, precision=precision, debug=False)
+            # Both values are within their bounds of the same value, any larger difference means a bound is wrong
+            disagreeing = [vertex for vertex, value in solution.values.items() if abs(value - cold_solution.values[vertex]) > solution.bounds[vertex] + cold_solution.bounds[vertex]]
+            if disagreeing:
+                print_warning(f"The warm-started solution of epsilon {epsilon} differs from the cold one beyond their bounds at {len(disagreeing)} vertices, e.g. {disagreeing[0].name}")
+            results[epsilon]["cold_iterations"] = cold_solution.iterations
+            results[epsilon]["iterations_saved"] = cold_solution.iterations - solution.iterations
+            results[epsilon]["cold_agrees"] = not disagreeing
+        if debug:
+            print_debug(f"Epsilon {epsilon} solved in {solving_time:.6f} seconds with {solution.iterations} sweeps" + (f", warm-started from epsilon {neighbor}" if initial_values is not None else ""))
+    return results
@@ -0,0 +1,336 @@
+import itertools
+import os
+import pickle
+import time
+import traceback
+import psutil
+
+from collections import deque
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import wait
+from typing import Any, Callable, Iterator
+
+from error_handling import print_debug, print_warning
+import settings
+
+
+def kill_process_and_children(pid: int) -> None:
+    """
+    Kills a process and all its child processes.
+    :param pid: Process ID of the parent process
+    :type pid: int
+    """
+    try:
+        parent = psutil.Process(pid)
+        for child in parent.children(recursive=True):
+            try:
+                child.kill()
+            except psutil.NoSuchProcess:
+                pass
+        parent.kill()
+    except psutil.NoSuchProcess:
+        pass
+
+
+class TaskResult:
+    def __init__(self, task_id: Any, value: Any = None, error: BaseException | None = None, elapsed_time: float = 0.0, timed_out: bool = False):
+        """
+        Result of a task that was executed by a WorkerPool.
+        :param task_id: Identifier of the task
+        :type task_id: Any
+        :param value: Return value of the task, None if the task failed
+        :type value: Any
+        :param error: Exception raised by the task or None
+        :type error: BaseException | None
+        :param elapsed_time: Wall-clock time of the task in seconds, measured inside the worker (or until the timeout)
+        :type elapsed_time: float
+        :param timed_out: Whether the task was killed because it exceeded its timeout
+        :type timed_out: bool
+        """
+        self.task_id = task_id
+        self.value = value
+        self.error = error
+        self.elapsed_time = elapsed_time
+        self.timed_out = timed_out
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the task finished in time without raising an exception.
+        :return: True if the task succeeded
+        :rtype: bool
+        """
+        return not self.timed_out and self.error is None
+
+    def __repr__(self):
+        status = "timeout" if self.timed_out else ("error" if self.error is not None else "ok")
+        return f"TaskResult({self.task_id!r}, {status}, {self.elapsed_time:.3f}s)"
+
+
+def _pool_worker(connection) -> None:
+    """
+    Main loop of a worker process: receives tasks through the connection, executes them and sends the pickled results back.
+    :param connection: Worker end of the pipe to the pool
+    :type connection: multiprocessing.connection.Connection
+    """
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        task_id, method, args, kwargs = task
+        start_time = time.perf_counter()
+        try:
+            value = method(*args, **kwargs)
+            elapsed_time = time.perf_counter() - start_time
+            payload = pickle.dumps((task_id, value, None, elapsed_time), protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException as e:
+            elapsed_time = time.perf_counter() - start_time
+            if isinstance(e, KeyboardInterrupt):
+                raise
+            if isinstance(e, SystemExit):
+                e = RuntimeError(f"Task called sys.exit({e.code})")
+            try:
+                payload = pickle.dumps((task_id, None, e, elapsed_time), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                payload = pickle.dumps((task_id, None, RuntimeError("".join(traceback.format_exception_only(type(e), e)).strip()), elapsed_time), protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            connection.send_bytes(payload)
+        except (EOFError, OSError):
+            break
+
+
+class _Worker:
+    def __init__(self):
+        """
+        Starts a worker process that is connected to the pool by a pipe.
+        """
+        self.connection, child_connection = Pipe(duplex=True)
+        self.process = Process(target=_pool_worker, args=(child_connection,), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self.task = None
+        self.deadline = None
+        self.start_time = None
+
+    def kill(self) -> None:
+        """
+        Kills the worker process together with all processes it started.
+        """
+        kill_process_and_children(self.process.pid)
+        self.process.join()
+        self.connection.close()
+
+    def stop(self) -> None:
+        """
+        Asks the worker process to terminate after its current task.
+        """
+        try:
+            self.connection.send(None)
+        except (EOFError, OSError):
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.connection.close()
+
+
+class WorkerPool:
+    def __init__(self, max_workers: int | None = None, timeout: float | None = None, debug: bool | None = None):
+        """
+        Pool of reusable worker processes for benchmark tasks.
+        Every task can have its own wall-clock timeout, a task that exceeds it is killed together with all processes it started (e.g. PRISM) and its worker is replaced.
+        Results are streamed in completion order by as_completed().
+        :param max_workers: Maximum number of tasks that run concurrently, defaults to the number of CPU cores
+        :type max_workers: int | None
+        :param timeout: Default timeout of a task in seconds, None means no timeout
+        :type timeout: float | None
+        :param debug: Whether to print debug information
+        :type debug: bool | None
+        """
+        debug = settings.GLOBAL_DEBUG if debug is None else debug
+        self.max_workers = max(1, max_workers if max_workers is not None else (os.cpu_count() or 1))
+        self.timeout = timeout
+        self.debug = debug
+        self._pending = deque()
+        self._workers: list[_Worker] = []
+        self._idle: list[_Worker] = []
+        self._finished: deque[TaskResult] = deque()
+        self._task_counter = itertools.count()
+        self._running = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.shutdown(kill=exc_type is not None)
+
+    def submit(self, method: Callable, args: tuple = (), kwargs: dict | None = None, task_id: Any = None, timeout: float | None = -1, overrides: dict[str, Any] | None = None) -> Any:
+        """
+        Queues a task for execution.
+        :param method: Function to execute, must be picklable (defined at module level)
+        :type method: Callable
+        :param args: Positional arguments of the function
+        :type args: tuple
+        :param kwargs: Keyword arguments of the function
+        :type kwargs: dict | None
+        :param task_id: Identifier that is returned with the result, defaults to a running number
+        :type task_id: Any
+        :param timeout: Timeout of this task in seconds, -1 uses the default timeout of the pool and None disables the timeout
+        :type timeout: float | None
+        :param overrides: Settings the task runs with, e.g. {"PRISM_SOLVING_ALGORITHM": "VALUE_ITERATION"}. The settings configured or overridden in the submitting process are passed on as well
+        :type overrides: dict[str, Any] | None
+        :return: Identifier of the task
+        :rtype: Any
+        """
+        if task_id is None:
+            task_id = next(self._task_counter)
+        if timeout == -1:
+            timeout = self.timeout
+        overrides = {**settings.current_overrides(), **(overrides or {})}
+        if overrides:
+            method, args, kwargs = settings.call_with_settings, (overrides, method, tuple(args), kwargs), None
+        self._pending.append((task_id, method, tuple(args), dict(kwargs) if kwargs else {}, timeout))
+        return task_id
+
+    def run(self, method: Callable, args: tuple = (), kwargs: dict | None = None, timeout: float | None = -1) -> TaskResult:
+        """
+        Executes a single task in a worker process and waits for its result.
+        Must not be used while results of other tasks are pending.
+        :param method: Function to execute
+        :type method: Callable
+        :param args: Positional arguments of the function
+        :type args: tuple
+        :param kwargs: Keyword arguments of the function
+        :type kwargs: dict | None
+        :param timeout: Timeout of the task in seconds, -1 uses the default timeout of the pool
+        :type timeout: float | None
+        :return: Result of the task
+        :rtype: TaskResult
+        """
+        self.submit(method, args=args, kwargs=kwargs, timeout=timeout)
+        return next(self.as_completed())
+
+    def map(self, method: Callable, args_list: list[tuple], timeout: float | None = -1) -> list[TaskResult]:
+        """
+        Executes the function for every argument tuple and returns the results in the order of args_list.
+        :param method: Function to execute
+        :type method: Callable
+        :param args_list: List of positional argument tuples
+        :type args_list: list[tuple]
+        :param timeout: Timeout of each task in seconds, -1 uses the default timeout of the pool
+        :type timeout: float | None
+        :return: Results in the order of args_list
+        :rtype: list[TaskResult]
+        """
+        task_ids = [self.submit(method, args=args, timeout=timeout) for args in args_list]
+        results = {result.task_id: result for result in self.as_completed()}
+        return [results[task_id] for task_id in task_ids]
+
+    def as_completed(self) -> Iterator[TaskResult]:
+        """
+        Yields the results of all submitted tasks as soon as they finish.
+        Tasks may be submitted while iterating, the generator ends when no task is pending or running anymore.
+        :return: Iterator over the task results in completion order
+        :rtype: Iterator[TaskResult]
+        """
+        while self._pending or self._running or self._finished:
+            self._dispatch()
+            if self._finished:
+                yield self._finished.popleft()
+                continue
+            busy = [worker for worker in self._workers if worker.task is not None]
+            if not busy:
+                continue
+            now = time.perf_counter()
+            deadlines = [worker.deadline for worker in busy if worker.deadline is not None]
+            wait_time = max(0.0, min(deadlines) - now) if deadlines else None
+            ready = wait([worker.connection for worker in busy] + [worker.process.sentinel for worker in busy], timeout=wait_time)
+            for worker in busy:
+                if worker.connection in ready:
+                    self._receive(worker)
+                elif worker.process.sentinel in ready:
+                    self._replace(worker, TaskResult(worker.task, error=RuntimeError(f"Worker process exited with code {worker.process.exitcode}"), elapsed_time=time.perf_counter() - worker.start_time))
+            now = time.perf_counter()
+            for worker in busy:
+                if worker.task is not None and worker.deadline is not None and now >= worker.deadline:
+                    if self.debug:
+                        print_debug(f"Task {worker.task!r} exceeded its timeout and is killed")
+                    self._replace(worker, TaskResult(worker.task, elapsed_time=now - worker.start_time, timed_out=True))
+
+    def _dispatch(self) -> None:
+        """
+        Starts pending tasks on idle workers and spawns new workers up to max_workers.
+        """
+        while self._pending:
+            if self._idle:
+                worker = self._idle.pop()
+            elif len(self._workers) < self.max_workers:
+                worker = _Worker()
+                self._workers.append(worker)
+            else:
+                break
+            task_id, method, args, kwargs, timeout = self._pending.popleft()
+            worker.task = task_id
+            worker.start_time = time.perf_counter()
+            worker.deadline = worker.start_time + timeout if timeout is not None else None
+            try:
+                worker.connection.send((task_id, method, args, kwargs))
+            except Exception as e:
+                worker.task = None
+                self._idle.append(worker)
+                self._finished.append(TaskResult(task_id, error=e))
+                continue
+            self._running += 1
+
+    def _receive(self, worker: _Worker) -> None:
+        """
+        Reads the result of a finished task from a worker.
+        :param worker: Worker whose task finished
+        :type worker: _Worker
+        """
+        try:
+            task_id, value, error, elapsed_time = pickle.loads(worker.connection.recv_bytes())
+        except Exception as e:
+            self._replace(worker, TaskResult(worker.task, error=e, elapsed_time=time.perf_counter() - worker.start_time))
+            return
+        worker.task = None
+        worker.deadline = None
+        self._running -= 1
+        self._idle.append(worker)
+        self._finished.append(TaskResult(task_id, value=value, error=error, elapsed_time=elapsed_time))
+
+    def _replace(self, worker: _Worker, result: TaskResult) -> None:
+        """
+        Kills a worker whose task timed out or crashed and records the result of the task.
+        A new worker is spawned lazily by the next dispatch.
+        :param worker: Worker to replace
+        :type worker: _Worker
+        :param result: Result that is reported for the task of the worker
+        :type result: TaskResult
+        """
+        worker.kill()
+        self._workers.remove(worker)
+        self._running -= 1
+        self._finished.append(result)
+
+    def shutdown(self, kill: bool = False) -> None:
+        """
+        Stops all worker processes and discards tasks that have not been started.
+        :param kill: Whether to kill running tasks instead of waiting for the workers to terminate
+        :type kill: bool
+        """
+        if self._pending:
+            print_warning(f"Worker pool shut down with {len(self._pending)} pending tasks")
+            self._pending.clear()
+        for worker in self._workers:
+            if kill or worker.task is not None:
+                worker.kill()
+            else:
+                worker.stop()
+        self._workers.clear()
+        self._idle.clear()
+        self._running = 0